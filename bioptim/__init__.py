@@ -168,8 +168,7 @@ from .dynamics.fatigue.fatigue_dynamics import FatigueList
 from .dynamics.fatigue.michaud_fatigue import MichaudFatigue, MichaudTauFatigue
 from .dynamics.fatigue.xia_fatigue import XiaFatigue, XiaTauFatigue, XiaFatigueStabilized
 from .dynamics.ode_solvers import OdeSolver, OdeSolverBase
-from .gui.online_callback_server import PlottingServer
-from .gui.plot import CustomPlot
+from .gui.custom_plot import CustomPlot
 from .interfaces import Solver
 from .limits.constraints import ConstraintFcn, ConstraintList, Constraint, ParameterConstraintList
 from .limits.fatigue_path_conditions import FatigueBounds, FatigueInitialGuess
@@ -199,6 +198,7 @@ from .misc.enums import (
     PhaseDynamics,
     OnlineOptim,
     ContactType,
+    ScalingStrategy,
 )
 from .misc.mapping import BiMappingList, BiMapping, Mapping, SelectionMapping, Dependency
 from .models.biorbd.biorbd_model import BiorbdModel
@@ -207,10 +207,13 @@ from .models.biorbd.holonomic_biorbd_model import HolonomicBiorbdModel
 from .models.biorbd.multi_biorbd_model import MultiBiorbdModel
 from .models.biorbd.stochastic_biorbd_model import StochasticBiorbdModel
 from .models.biorbd.variational_biorbd_model import VariationalBiorbdModel
+from .models.function_cache import FunctionDiskCache
 from .models.holonomic_constraints import HolonomicConstraintsFcn, HolonomicConstraintsList
 from .models.protocols.biomodel import BioModel
 from .models.protocols.stochastic_biomodel import StochasticBioModel
 from .optimization.multi_start import MultiStart
+from .optimization.work_queue import WorkQueue
+from .optimization.nlp_snapshot import NlpSnapshot, problem_fingerprint
 from .optimization.non_linear_program import NonLinearProgram
 from .optimization.optimal_control_program import OptimalControlProgram
 from .optimization.optimization_variable import OptimizationVariableList
@@ -221,9 +224,36 @@ from .optimization.receding_horizon_optimization import (
     CyclicMovingHorizonEstimator,
     MultiCyclicNonlinearModelPredictiveControl,
 )
-from .optimization.receding_horizon_optimization import MovingHorizonEstimator, NonlinearModelPredictiveControl
+from .optimization.receding_horizon_optimization import (
+    MovingHorizonEstimator,
+    NonlinearModelPredictiveControl,
+    RealTimeStats,
+)
 from .optimization.solution.solution import Solution
 from .optimization.solution.solution_data import SolutionMerge, TimeAlignment
+from .optimization.solution.solution_file import SolutionFile
+from .optimization.solve_future import SolveFuture
 from .optimization.stochastic_optimal_control_program import StochasticOptimalControlProgram
 from .optimization.variable_scaling import VariableScalingList, VariableScaling
 from .optimization.variational_optimal_control_program import VariationalOptimalControlProgram
+
+# The GUI stack (matplotlib, tkinter, pyqtgraph) is slow to import and may not be available on headless machines, so
+# these modules are only imported when one of their classes is first requested (PEP 562)
+_LAZY_IMPORTS = {
+    "PlottingServer": ".gui.online_callback_server",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
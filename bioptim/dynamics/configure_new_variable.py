@@ -2,7 +2,7 @@ import numpy as np
 from casadi import MX, SX, vertcat
 
 from .fatigue.fatigue_dynamics import FatigueList, MultiFatigueInterface
-from ..gui.plot import CustomPlot
+from ..gui.custom_plot import CustomPlot
 from ..limits.path_conditions import Bounds
 from ..misc.enums import PlotType, ControlType, VariableType, PhaseDynamics
 from ..misc.mapping import BiMapping
@@ -7,7 +7,7 @@ from .configure_new_variable import NewVariableConfiguration
 from .dynamics_functions import DynamicsFunctions
 from .fatigue.fatigue_dynamics import FatigueList
 from .ode_solvers import OdeSolver, OdeSolverBase
-from ..gui.plot import CustomPlot
+from ..gui.custom_plot import CustomPlot
 from ..limits.constraints import ImplicitConstraintFcn
 from ..misc.enums import (
     PlotType,
@@ -1,5 +1,7 @@
+from functools import lru_cache
+
 import numpy as np
-from casadi import Function, vertcat, horzcat, collocation_points, rootfinder, DM, MX, SX, linspace
+from casadi import Function, vertcat, horzcat, collocation_points, rootfinder, DM, MX, SX, linspace, mtimes, repmat, vec
 
 from .lagrange_interpolation import LagrangeInterpolation
 from ..misc.enums import ControlType, DefectType
@@ -36,6 +38,8 @@ class Integrator:
         The type of the controls
     function = casadi.Function
         The CasADi graph of the integration
+    _mapped_functions: dict
+        The mapped CasADi graphs of the integration already built, keyed by the arguments of map
 
     Methods
     -------
@@ -74,6 +78,7 @@ class Integrator:
         self.defects_type = ode_opt["defects_type"]
         self.control_type = ode_opt["control_type"]
         self.function = None
+        self._mapped_functions = {}
         self.duplicate_starting_point = ode_opt["duplicate_starting_point"]
 
         # Initialize is expected to set step_time
@@ -158,13 +163,15 @@ class Integrator:
 
     def map(self, *args) -> Function:
         """
-        Get the multithreaded CasADi graph of the integration
+        Get the multithreaded CasADi graph of the integration. The graph is built once for each set of arguments
 
         Returns
         -------
         The multithreaded CasADi graph of the integration
         """
-        return self.function.map(*args)
+        if args not in self._mapped_functions:
+            self._mapped_functions[args] = self.function.map(*args)
+        return self._mapped_functions[args]
 
     @property
     def _integration_time(self):
@@ -570,6 +577,8 @@ class COLLOCATION(Integrator):
     -------
     get_u(self, u: np.ndarray, t: float | MX | SX) -> np.ndarray
         Get the control at a given time
+    get_u_at_collocation_points(self, u: MX | SX) -> MX | SX
+        Get the controls at all the collocation points at once
     """
 
     def _initialize(self, ode: dict, ode_opt: dict):
@@ -644,6 +653,29 @@ class COLLOCATION(Integrator):
         else:
             raise RuntimeError(f"{self.control_type} ControlType not implemented yet")
 
+    def get_u_at_collocation_points(self, u: MX | SX) -> MX | SX:
+        """
+        Get the controls at all the collocation points at once
+
+        Parameters
+        ----------
+        u: MX | SX
+            The control matrix
+
+        Returns
+        -------
+        The controls, one column per collocation point (or u itself if it is the same at every point, the mapped
+        dynamics then broadcast it)
+        """
+
+        if self.control_type in (ControlType.CONSTANT, ControlType.CONSTANT_WITH_LAST_NODE):
+            return u
+        elif self.control_type == ControlType.LINEAR_CONTINUOUS:
+            t = np.array(self._integration_time[1:])
+            return mtimes(u[:, 0:2], DM(np.vstack((1 - t, t))))
+        else:
+            raise RuntimeError(f"{self.control_type} ControlType not implemented yet")
+
     def compute_states_end(
         self,
         states: MX | SX,
@@ -653,53 +685,71 @@ class COLLOCATION(Integrator):
         numerical_timeseries: MX | SX,
     ) -> tuple:
 
+        differentiation_matrix, end_interpolation = _collocation_matrices(self.degree, self.method)
         if self.method == "radau":
             # For Radau, the last collocation point is the same as the final point of the interval
             states_end = states[-1]
         else:
             # For Legendre, the final point is obtained by interpolation
-            states_end = self.lagrange_interpolation.interpolate(states[1:], 1.0)
-
-        defects = []
-        for j in range(1, self.degree + 1):
-            t = vertcat(self.t_span_sym[0] + self._integration_time[j] * self.h, self.h)
-
-            xp_j = self.lagrange_interpolation.interpolate_first_derivative(
-                states[0:1] + states[2:], self._integration_time[j]
+            states_end = mtimes(horzcat(*states[1:]), DM(end_interpolation))
+
+        # The derivative of the polynomial at every collocation point, one column per point
+        xp = mtimes(horzcat(*(states[0:1] + states[2:])), DM(differentiation_matrix.T))
+
+        # The dynamics are evaluated at all the collocation points in one mapped call
+        t = vertcat(self.t_span_sym[0] + DM(self._integration_time[1:]).T * self.h, repmat(self.h, 1, self.degree))
+        collocation_points_states = horzcat(*states[2:])
+        u = self.get_u_at_collocation_points(controls)
+        a = horzcat(*algebraic_states[2:])
+        if self.defects_type == DefectType.EXPLICIT:
+            f = self.fun.map(self.degree)(t, collocation_points_states, u, params, a, numerical_timeseries)
+            n_columns = self.fun.size2_out(0)
+            f = f[:, [self.ode_idx + j * n_columns for j in range(self.degree)]]
+            defects = xp - f * self.h
+
+        elif self.defects_type == DefectType.IMPLICIT:
+            defects = self.implicit_fun.map(self.degree)(
+                t, collocation_points_states, u, params, a, numerical_timeseries, xp / self.h
             )
+        else:
+            raise ValueError("Unknown defects type. Please use 'explicit' or 'implicit'")
 
-            if self.defects_type == DefectType.EXPLICIT:
-                f_j = self.fun(
-                    t,
-                    states[j + 1],
-                    self.get_u(controls, self._integration_time[j]),
-                    params,
-                    algebraic_states[j + 1],
-                    numerical_timeseries,
-                )[:, self.ode_idx]
-                defects.append(xp_j - f_j * self.h)
-
-            elif self.defects_type == DefectType.IMPLICIT:
-                defects.append(
-                    self.implicit_fun(
-                        t,
-                        states[j + 1],
-                        self.get_u(controls, self._integration_time[j]),
-                        params,
-                        algebraic_states[j + 1],
-                        numerical_timeseries,
-                        xp_j / self.h,
-                    )
-                )
-            else:
-                raise ValueError("Unknown defects type. Please use 'explicit' or 'implicit'")
-
-        # Concatenate constraints
-        defects = vertcat(*defects)
+        # Stack the defects of each collocation point
+        defects = vec(defects)
         collocation_states = horzcat(*states) if self.duplicate_starting_point else horzcat(*states[1:])
         return states_end, collocation_states, defects
 
 
+@lru_cache
+def _collocation_matrices(degree: int, method: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The numerical coefficients of the collocation polynomial, computed once per (degree, method)
+
+    Parameters
+    ----------
+    degree: int
+        The interpolation order of the polynomial approximation
+    method: str
+        The collocation method ("radau" or "legendre")
+
+    Returns
+    -------
+    The differentiation matrix (the derivative of the polynomial at each collocation point from its values at the
+    start of the interval and at each collocation point) and the interpolation weights of the final point of the
+    interval (from its values at the collocation time grid)
+    """
+
+    time_grid = [0] + collocation_points(degree, method)
+    lagrange_interpolation = LagrangeInterpolation(time_grid=time_grid)
+    differentiation_matrix = lagrange_interpolation.differentiation_matrix(time_grid[1:])
+    end_interpolation = lagrange_interpolation.interpolation_matrix([1.0])[0, :]
+
+    # The matrices are shared by all the integrators
+    differentiation_matrix.flags.writeable = False
+    end_interpolation.flags.writeable = False
+    return differentiation_matrix, end_interpolation
+
+
 class IRK(COLLOCATION):
     """
     Numerical integration using implicit Runge-Kutta method.
@@ -1,6 +1,5 @@
 from functools import cached_property
 
-import matplotlib.pyplot as plt
 import numpy as np
 from casadi import collocation_points, MX, SX
 
@@ -181,6 +180,49 @@ class LagrangeInterpolation:
             interpolated_value += y_values[j] * self.lagrange_polynomial_derivative(j, time_control_interval)
         return interpolated_value
 
+    def interpolation_matrix(self, evaluation_times: list[float]) -> np.ndarray:
+        """
+        Compute numerically the value of each Lagrange polynomial at the given times, so the interpolation of a set of
+        values is a single matrix product (values @ matrix.T)
+
+        Parameters
+        ----------
+        evaluation_times : list of float
+            The dimensionless times within the control interval to evaluate the polynomials at.
+
+        Returns
+        -------
+        np.ndarray
+            The matrix of shape (len(evaluation_times), polynomial_degree) where the element (i, j) is
+            \\(L_j(\\tau_i)\\).
+        """
+        return np.array(
+            [[float(self.lagrange_polynomial(j, t)) for j in range(self.polynomial_degree)] for t in evaluation_times]
+        )
+
+    def differentiation_matrix(self, evaluation_times: list[float]) -> np.ndarray:
+        """
+        Compute numerically the derivative of each Lagrange polynomial at the given times, so the first derivative of
+        the interpolation of a set of values is a single matrix product (values @ matrix.T)
+
+        Parameters
+        ----------
+        evaluation_times : list of float
+            The dimensionless times within the control interval to evaluate the derivatives at.
+
+        Returns
+        -------
+        np.ndarray
+            The matrix of shape (len(evaluation_times), polynomial_degree) where the element (i, j) is
+            \\(L_j'(\\tau_i)\\).
+        """
+        return np.array(
+            [
+                [float(self.lagrange_polynomial_derivative(j, t)) for j in range(self.polynomial_degree)]
+                for t in evaluation_times
+            ]
+        )
+
     def _check_y_values(self, y_values):
         if len(y_values) != self.polynomial_degree:
             raise ValueError(
@@ -189,6 +231,8 @@ class LagrangeInterpolation:
 
 
 def main():
+    import matplotlib.pyplot as plt
+
     # Choose polynomial_order and get collocation points
     polynomial_order = 5
     time_grid = collocation_points(polynomial_order, "legendre")
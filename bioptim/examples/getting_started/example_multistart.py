@@ -65,6 +65,41 @@ def prepare_ocp(
     # Dynamics
     dynamics = Dynamics(DynamicsFcn.TORQUE_DRIVEN, phase_dynamics=phase_dynamics)
 
+    x_bounds, u_bounds = prepare_bounds(bio_model)
+    x_init, u_init = prepare_initial_guess(bio_model, x_bounds, u_bounds, n_shooting, seed)
+
+    ocp = OptimalControlProgram(
+        bio_model,
+        dynamics,
+        n_shooting,
+        final_time,
+        x_init=x_init,
+        u_init=u_init,
+        x_bounds=x_bounds,
+        u_bounds=u_bounds,
+        objective_functions=objective_functions,
+        n_threads=1,  # You cannot use multi-threading for the resolution of the ocp with multi-start
+    )
+
+    ocp.add_plot_penalty(CostType.ALL)
+
+    return ocp
+
+
+def prepare_bounds(bio_model: BiorbdModel) -> tuple[BoundsList, BoundsList]:
+    """
+    The bounds of the states and of the controls
+
+    Parameters
+    ----------
+    bio_model: BiorbdModel
+        The model of the pendulum
+
+    Returns
+    -------
+    The bounds of the states and of the controls
+    """
+
     # Path constraint
     x_bounds = BoundsList()
     x_bounds["q"] = bio_model.bounds_from_ranges("q")
@@ -73,6 +108,40 @@ def prepare_ocp(
     x_bounds["qdot"] = bio_model.bounds_from_ranges("qdot")
     x_bounds["qdot"][:, [0, -1]] = 0
 
+    # Define control path constraint
+    n_tau = bio_model.nb_tau
+    tau_min, tau_max = -100, 100
+    u_bounds = BoundsList()
+    u_bounds["tau"] = [tau_min] * n_tau, [tau_max] * n_tau
+    u_bounds["tau"][1, :] = 0  # Prevent the model from actively rotate
+
+    return x_bounds, u_bounds
+
+
+def prepare_initial_guess(
+    bio_model: BiorbdModel, x_bounds: BoundsList, u_bounds: BoundsList, n_shooting: int, seed: int
+) -> tuple[InitialGuessList, InitialGuessList]:
+    """
+    The random initial guess of the states and of the controls
+
+    Parameters
+    ----------
+    bio_model: BiorbdModel
+        The model of the pendulum
+    x_bounds: BoundsList
+        The bounds of the states
+    u_bounds: BoundsList
+        The bounds of the controls
+    n_shooting: int
+        The number of shooting points
+    seed: int
+        The seed to use for the random initial guess
+
+    Returns
+    -------
+    The initial guess of the states and of the controls
+    """
+
     # Initial guess
     n_q = bio_model.nb_q
     n_qdot = bio_model.nb_qdot
@@ -87,13 +156,7 @@ def prepare_ocp(
         seed=seed,
     )
 
-    # Define control path constraint
     n_tau = bio_model.nb_tau
-    tau_min, tau_max, tau_init = -100, 100, 0
-    u_bounds = BoundsList()
-    u_bounds["tau"] = [tau_min] * n_tau, [tau_max] * n_tau
-    u_bounds["tau"][1, :] = 0  # Prevent the model from actively rotate
-
     u_init = InitialGuessList()
     u_init["tau"] = [0] * n_tau
     u_init["tau"].add_noise(
@@ -104,22 +167,45 @@ def prepare_ocp(
         seed=seed,
     )
 
-    ocp = OptimalControlProgram(
-        bio_model,
-        dynamics,
-        n_shooting,
-        final_time,
-        x_init=x_init,
-        u_init=u_init,
-        x_bounds=x_bounds,
-        u_bounds=u_bounds,
-        objective_functions=objective_functions,
-        n_threads=1,  # You cannot use multi-threading for the resolution of the ocp with multi-start
-    )
+    return x_init, u_init
 
-    ocp.add_plot_penalty(CostType.ALL)
 
-    return ocp
+def update_ocp(
+    ocp: OptimalControlProgram,
+    *combinatorial_parameters,
+    **extra_parameters,
+) -> bool:
+    """
+    Callback of the update_ocp_callback, this allows to reuse an ocp already built for another seed by only changing
+    its initial guess
+
+    Parameters
+    ----------
+    ocp: OptimalControlProgram
+        The ocp built for a previous combination
+    combinatorial_parameters:
+        The current values of the combinatorial_parameters being treated
+    extra_parameters:
+        All the non-combinatorial parameters sent by the user
+
+    Returns
+    -------
+    If the ocp could be reused
+    """
+
+    bio_model_path, final_time, n_shooting, seed = combinatorial_parameters
+    bio_model = ocp.nlp[0].model
+    if (
+        bio_model.path != os.path.abspath(bio_model_path)
+        or ocp.phase_time[0] != final_time
+        or ocp.nlp[0].ns != n_shooting
+    ):
+        return False
+
+    x_bounds, u_bounds = prepare_bounds(bio_model)
+    x_init, u_init = prepare_initial_guess(bio_model, x_bounds, u_bounds, n_shooting, seed)
+    ocp.update_initial_guess(x_init=x_init, u_init=u_init)
+    return True
 
 
 def construct_filepath(save_path, n_shooting, seed):
@@ -176,9 +262,11 @@ def prepare_multi_start(
     combinatorial_parameters: dict,
     save_folder: str = None,
     n_pools: int = 1,
+    queue_path: str = None,
 ) -> MultiStart:
     """
-    The initialization of the multi-start
+    The initialization of the multi-start. If queue_path is provided, the combinations are shared with the other
+    processes running this multi-start and the completed ones are not solved again when it is restarted
     """
     if not isinstance(save_folder, str):
         raise ValueError("save_folder must be an str")
@@ -192,6 +280,9 @@ def prepare_multi_start(
         should_solve_callback=(should_solve, {"save_folder": save_folder}),
         solver=Solver.IPOPT(show_online_optim=False),  # You cannot use show_online_optim with multi-start
         n_pools=n_pools,
+        update_ocp_callback=(update_ocp, {}),  # Each pool builds the ocp once per n_shooting and reuses it
+        timeout=60,  # A combination that takes longer than this is stopped (and reported as such)
+        queue_path=queue_path,
     )
 
 
@@ -217,7 +308,9 @@ def main():
         n_pools=2,
     )
 
-    multi_start.solve()
+    for record in multi_start.solve_iter():
+        print(f"{record['parameters']} finished with status '{record['status']}' in {record['wall_time']:.2f} s")
+    print(multi_start.summary_table())
 
     # Delete the solutions
     shutil.rmtree(save_folder)
@@ -68,9 +68,10 @@ def compute_all_states(sol, bio_model: HolonomicBiorbdModel):
         tau[dependent_joint_index, :-1] = controls["tau"][i, :]
 
     q_v_init = DM.zeros(bio_model.nb_dependent_joints)
+    # The Newton solve of each node starts from the dependent joints of the previous node
+    q_v, _ = bio_model.compute_q_v_trajectory(n)(states["q_u"], q_v_init)
     for i in range(n):
-        q_v_i = bio_model.compute_q_v()(states["q_u"][:, i], q_v_init).toarray()
-        q[:, i] = bio_model.state_from_partition(states["q_u"][:, i][:, np.newaxis], q_v_i).toarray().squeeze()
+        q[:, i] = bio_model.state_from_partition(states["q_u"][:, i][:, np.newaxis], q_v[:, i]).toarray().squeeze()
         qdot[:, i] = bio_model.compute_qdot()(q[:, i], states["qdot_u"][:, i]).toarray().squeeze()
         qddot_u_i = (
             bio_model.partitioned_forward_dynamics()(states["q_u"][:, i], states["qdot_u"][:, i], q_v_init, tau[:, i])
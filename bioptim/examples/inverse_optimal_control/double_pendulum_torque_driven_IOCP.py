@@ -2,6 +2,9 @@
 This is a basic example on how to use inverse optimal control to recover the weightings of the objective functions.
 The example is not well tuned, but it can be used as an example for your more meaningful problems.
 
+The ocp of the inner loop is built only once: at each fitness evaluation, the new weights are sent to the already
+compiled nlp (ocp.solve(weights=...)), which is warm started from the previous solution.
+
 Please note that this example is dependent on the external library Pygmo which can be installed through
 conda install -c conda-forge pygmo
 """
@@ -110,6 +113,8 @@ class prepare_iocp:
     def __init__(self, coefficients, solver, q_to_track, qdot_to_track, tau_to_track):
         self.coefficients = coefficients
         self.solver = solver
+        # All the objectives must be declared with a non-zero weight so they can be reweighted afterward
+        self.ocp = prepare_ocp(weights=[1, 1, 1], coefficients=[1, 1, 1])
         self.q_to_track = q_to_track
         self.qdot_to_track = qdot_to_track
         self.tau_to_track = tau_to_track
@@ -121,8 +126,8 @@ class prepare_iocp:
         """
         global i_inverse
         i_inverse += 1
-        ocp = prepare_ocp(weights, self.coefficients)
-        sol = ocp.solve(self.solver)
+        weights = [float(coefficient) * weight for coefficient, weight in zip(self.coefficients, weights)]
+        sol = self.ocp.solve(self.solver, weights=weights)
         print(
             f"+++++++++++++++++++++++++++ Optimized the {i_inverse}th ocp in the inverse algo +++++++++++++++++++++++++++"
         )
@@ -11,9 +11,14 @@ For each iteration, the new marker trajectory is taken into account so that a re
 For each iteration, the list of objectives is updated, the problem is solved with the new frame added to the window,
 the oldest frame is discarded with the warm_start_mhe function, and it is saved. The results are plotted so that
 estimated data can be compared to real data.
+
+When IPOPT is used in parametric mode (solver.set_parametric(True)), the targets of the objectives are sent as
+parameters of the nlp, so the solver is built once and each window only pushes the new numerical values. The latency
+per window is printed for both modes so they can be compared.
 """
 
 from copy import copy
+from time import perf_counter
 
 import biorbd_casadi as biorbd
 import casadi as cas
@@ -161,7 +166,7 @@ def prepare_mhe(
     )
 
 
-def get_solver_options(solver):
+def get_solver_options(solver, parametric: bool = False):
     mhe_dict = {"solver_first_iter": None, "solver": solver}
     if isinstance(solver, Solver.ACADOS):
         mhe_dict["solver"].set_maximum_iterations(1000)
@@ -175,6 +180,7 @@ def get_solver_options(solver):
         mhe_dict["solver"].set_print_level(0)
         mhe_dict["solver"].set_tol(1e-1)
         mhe_dict["solver"].set_initialization_options(1e-10)
+        mhe_dict["solver"].set_parametric(parametric)
 
         mhe_dict["solver_first_iter"] = copy(mhe_dict["solver"])
         mhe_dict["solver_first_iter"].set_maximum_iterations(50)
@@ -207,25 +213,36 @@ def main():
     u_init = np.zeros((bio_model.nb_q, window_len))
     torque_max = 5  # Give a bit of slack on the max torque
 
-    bio_model = BiorbdModel(biorbd_model_path)
-    mhe = prepare_mhe(
-        bio_model,
-        window_len=window_len,
-        window_duration=window_duration,
-        max_torque=torque_max,
-        x_init=x_init,
-        u_init=u_init,
-    )
-
     def update_functions(mhe, t, _):
         def target(i: int):
             return markers_noised[:, :, i : i + window_len + 1]
 
+        window_starts.append(perf_counter())
         mhe.update_objectives_target(target=target(t), list_index=0)
         return t < n_frames_total  # True if there are still some frames to reconstruct
 
-    # Solve the program
-    sol = mhe.solve(update_functions, **get_solver_options(solver))
+    # Solve the program, once building the solver at each window and once in parametric mode
+    for parametric in (False, True) if isinstance(solver, Solver.IPOPT) else (False,):
+        bio_model = BiorbdModel(biorbd_model_path)
+        mhe = prepare_mhe(
+            bio_model,
+            window_len=window_len,
+            window_duration=window_duration,
+            max_torque=torque_max,
+            x_init=x_init,
+            u_init=u_init,
+        )
+
+        window_starts = []
+        sol = mhe.solve(update_functions, **get_solver_options(type(solver)(), parametric=parametric))
+
+        # The first two windows are skipped as they build the solver in both modes (their options are different)
+        latencies = np.diff(window_starts)[2:] * 1000
+        print(
+            f"Latency per window of MHE ({'parametric' if parametric else 'rebuilt'} solver): "
+            f"mean = {np.mean(latencies):.2f} ms, median = {np.median(latencies):.2f} ms, "
+            f"max = {np.max(latencies):.2f} ms"
+        )
     sol_states = sol.decision_states(to_merge=SolutionMerge.NODES)
 
     print(f"{solver} with Bioptim")
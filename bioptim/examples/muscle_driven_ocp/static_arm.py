@@ -2,6 +2,9 @@
 This is a basic example on how to use biorbd model driven by muscle to perform an optimal reaching task.
 The arms must reach a marker placed upward in front while minimizing the muscles activity
 
+The program is then built again with the scaling derived by ocp.auto_scale, and the number of iterations IPOPT needs
+with and without this scaling is reported.
+
 Please note that using show_meshes=True in the animator may be long due to the creation of a huge CasADi graph of the
 mesh points.
 """
@@ -22,6 +25,8 @@ from bioptim import (
     Solver,
     PhaseDynamics,
     ControlType,
+    ScalingStrategy,
+    VariableScalingList,
 )
 
 
@@ -35,6 +40,8 @@ def prepare_ocp(
     expand_dynamics: bool = True,
     control_type: ControlType = ControlType.CONSTANT,
     n_threads: int = 8,
+    x_scaling: VariableScalingList = None,
+    u_scaling: VariableScalingList = None,
 ) -> OptimalControlProgram:
     """
     Prepare the ocp
@@ -65,6 +72,10 @@ def prepare_ocp(
         The type of control to use (CONSTANT, LINEAR_CONTROL, POLYNOMIAL_CONTROL)
     n_threads: int
         The number of threads to use in casadi (default: number of cores of your machine)
+    x_scaling: VariableScalingList
+        The scaling of the states (e.g. from ocp.auto_scale)
+    u_scaling: VariableScalingList
+        The scaling of the controls (e.g. from ocp.auto_scale)
 
     Returns
     -------
@@ -125,6 +136,8 @@ def prepare_ocp(
         objective_functions=objective_functions,
         control_type=control_type,
         n_threads=n_threads,
+        x_scaling=x_scaling,
+        u_scaling=u_scaling,
     )
 
 
@@ -134,9 +147,22 @@ def main():
     """
 
     ocp = prepare_ocp(biorbd_model_path="models/arm26.bioMod", final_time=0.5, n_shooting=50, weight=1000)
+    sol_unscaled = ocp.solve(Solver.IPOPT())
+
+    # --- Build the program again with the automatic scaling --- #
+    scaling = ocp.auto_scale(strategy=ScalingStrategy.JACOBIAN)
+    ocp = prepare_ocp(
+        biorbd_model_path="models/arm26.bioMod",
+        final_time=0.5,
+        n_shooting=50,
+        weight=1000,
+        x_scaling=scaling["x_scaling"],
+        u_scaling=scaling["u_scaling"],
+    )
 
     # --- Solve the program --- #
     sol = ocp.solve(Solver.IPOPT(show_online_optim=platform.system() == "Linux"))
+    print(f"Iterations without scaling: {sol_unscaled.iterations}, with the automatic scaling: {sol.iterations}")
 
     # --- Show results --- #
     sol.animate(show_meshes=True)
@@ -112,6 +112,8 @@ def main():
     solver = Solver.SQP_METHOD(show_online_optim=False)
     solver.set_tol_du(1e-1)
     solver.set_tol_pr(1e-1)
+    # Exploit the stage structure of the multiple shooting when solving the QP subproblems
+    solver.set_structured_qp(True)
     sol = ocp.solve(solver)
 
     # --- Show the results in a bioviz animation --- #
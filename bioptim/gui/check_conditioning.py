@@ -1,65 +1,77 @@
+import json
+import warnings
+
 import numpy as np
-from casadi import Function, jacobian, hessian, sum1
-from matplotlib import pyplot as plt
-import matplotlib.colors as mcolors
-import matplotlib.cm as mcm
+from casadi import Function, DM, jacobian, hessian, sum1, vec, vertcat
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh, lobpcg
+
 from ..interfaces.ipopt_interface import IpoptInterface
+from ..optimization.optimization_vector import OptimizationVectorHelper
+
+# Above this number of elements, a block of a matrix is not densified anymore and its properties are estimated
+_DENSE_SIZE_LIMIT = 4_000_000
+# The iterative eigen solvers stop (and their result is marked as an estimate) after this number of iterations
+_EIGEN_MAX_ITERATIONS = 5000
+# The largest number of null eigen values looked for in a block that is too large to be densified
+_MAX_NULLITY = 512
 
 
 def jacobian_hessian_constraints(variables_vector, all_g):
     """
     Returns
     -------
-    A list with jacobian matrix of constraints evaluates at initial time for each phase
-    A list with the rank of each jacobian matrix
-    A list with the different type of constraints
-    A list with norms of hessian matrix of constraints at initial time for each phase
+    The function of the jacobian matrix of the constraints
+    The function of the hessian matrices of all the constraints at once. The hessians are vertically stacked, so the
+    row j * n_constraints + i of the output is the row j of the hessian of the constraint i
     """
 
     # JACOBIAN
+    constraints_jacobian = jacobian(all_g, variables_vector)
     constraints_jac_func = Function(
         "constraints_jacobian",
         [variables_vector],
-        [jacobian(all_g, variables_vector)],
+        [constraints_jacobian],
     )
 
     # HESSIAN
-    constraints_hess_func = []
-    for i in range(all_g.shape[0]):
-        constraints_hess_func.append(
-            Function(
-                "constraints_hessian",
-                [variables_vector],
-                [hessian(all_g[i], variables_vector)[0]],
-            )
-        )
+    constraints_hess_func = Function(
+        "constraints_hessian",
+        [variables_vector],
+        [jacobian(vec(constraints_jacobian), variables_vector)],
+    )
 
     return constraints_jac_func, constraints_hess_func
 
 
-def evaluate_jacobian_hessian_constraints(v, ocp):
+def evaluate_jacobian_hessian_constraints(v, conditioning_functions: dict):
+    """
+    Returns
+    -------
+    The (sparse) jacobian matrix of the constraints
+    The rank of the jacobian matrix
+    The min, mean and max of the hessian matrix of each constraint
+    If the rank is an estimate (see _sparse_matrix_rank)
+    """
 
     # JACOBIAN
-    constraints_jac_func = ocp.conditioning_plots["constraints_jac_func"]
-    evaluated_constraints_jacobian = constraints_jac_func(v)
-    jacobian_matrix = np.array(evaluated_constraints_jacobian)
+    constraints_jac_func = conditioning_functions["constraints_jac_func"]
+    jacobian_matrix = _to_sparse(constraints_jac_func(v))
 
     # Jacobian rank
-    if jacobian_matrix.size > 0:
-        jacobian_rank = np.linalg.matrix_rank(jacobian_matrix)
+    if jacobian_matrix.shape[0] > 0:
+        jacobian_rank, rank_is_estimate = _sparse_matrix_rank(jacobian_matrix)
     else:
-        jacobian_rank = "No constraints"
+        jacobian_rank, rank_is_estimate = "No constraints", False
 
     # HESSIAN
-    constraints_hess_func = ocp.conditioning_plots["constraints_hess_func"]
-    hess_min_mean_max = np.zeros((len(constraints_hess_func), 3))
-    for i in range(len(constraints_hess_func)):
-        evaluated_constraints_hessian = constraints_hess_func[i](v)
-        hess_min_mean_max[i, 0] = np.min(evaluated_constraints_hessian)
-        hess_min_mean_max[i, 1] = np.mean(evaluated_constraints_hessian)
-        hess_min_mean_max[i, 2] = np.max(evaluated_constraints_hessian)
+    constraints_hess_func = conditioning_functions["constraints_hess_func"]
+    hess_min_mean_max = _stacked_hessians_min_mean_max(
+        _to_sparse(constraints_hess_func(v)), jacobian_matrix.shape[0], jacobian_matrix.shape[1]
+    )
 
-    return jacobian_matrix, jacobian_rank, hess_min_mean_max
+    return jacobian_matrix, jacobian_rank, hess_min_mean_max, rank_is_estimate
 
 
 def hessian_objective(variables_vector, all_objectives):
@@ -67,9 +79,7 @@ def hessian_objective(variables_vector, all_objectives):
 
     Returns
     -------
-    A list with the hessian of objectives evaluate at initial time for each phase
-    A list with the condition numbers of each phases
-    A list that indicates if the objective is convexe or not
+    The function of the hessian matrix of the objectives
     """
 
     objectives_hess_func = Function(
@@ -81,53 +91,418 @@ def hessian_objective(variables_vector, all_objectives):
     return objectives_hess_func
 
 
-def evaluate_hessian_objective(v, ocp):
+def evaluate_hessian_objective(v, conditioning_functions: dict):
     """
 
     Returns
     -------
-    A list with the hessian of objectives evaluate at initial time for each phase
-    A list with the condition numbers of each phases
-    A list that indicates if the objective is convexe or not
+    The (sparse) hessian matrix of the objectives
+    The condition number of the hessian matrix
+    If the hessian matrix is positive semi-definite (convexity of the objective)
+    If the extreme eigen values these are computed from are estimates (see _sparse_extreme_eigen_values)
+    """
+
+    objectives_hess_func = conditioning_functions["objectives_hess_func"]
+    hessian_matrix = _to_sparse(objectives_hess_func(v))
+    condition_number, convexity, eigen_values_are_estimates = _hessian_condition_and_convexity(hessian_matrix)
+
+    return hessian_matrix, condition_number, convexity, eigen_values_are_estimates
+
+
+def _hessian_condition_and_convexity(hessian_matrix: sparse.spmatrix) -> tuple:
     """
+    The condition number and the convexity of a (sparse) symmetric matrix, from its extreme eigen values
 
-    objectives_hess_func = ocp.conditioning_plots["objectives_hess_func"]
-    evaluated_objectives_hessian = objectives_hess_func(v)
-    hessian_matrix = np.array(evaluated_objectives_hessian)
+    Returns
+    -------
+    The condition number
+    If the matrix is positive semi-definite
+    If the extreme eigen values are estimates
+    """
 
     # Convexity checking (positive semi-definite hessian)
     # On R (convex), the objective is convex if and only if the hessian is positive semi definite (psd)
     # And, as the hessian is symmetric (Schwarz), the hessian is psd if and only if the eigenvalues are positive
-    eigen_values = np.linalg.eigvals(hessian_matrix)
-    ev_max = np.max(eigen_values)
-    ev_min = np.min(eigen_values)
+    ev_min, ev_max, are_estimates = _sparse_extreme_eigen_values(hessian_matrix)
     if ev_min == 0:
         condition_number = "/!\\ min eigen value is 0"
     if ev_min != 0:
         condition_number = np.abs(ev_max) / np.abs(ev_min)
-    convexity = (
-        "positive semi-definite"
-        if np.all(eigen_values > 0)
-        else f"not positive semi-definite (min: {ev_min}, max: {ev_max})"
-    )
+    convexity = "positive semi-definite" if ev_min > 0 else f"not positive semi-definite (min: {ev_min}, max: {ev_max})"
+    return condition_number, convexity, are_estimates
 
-    return hessian_matrix, condition_number, convexity
 
+def _to_sparse(matrix: DM) -> sparse.csc_matrix:
+    """
+    Convert a CasADi matrix to a scipy sparse matrix without densifying it
+    """
 
-def create_conditioning_plots(ocp):
+    matrix = DM(matrix)
+    rows, cols = matrix.sparsity().get_triplet()
+    return sparse.csc_matrix((np.array(matrix.nonzeros()), (rows, cols)), shape=matrix.shape)
+
+
+def _independent_blocks(matrix: sparse.spmatrix, symmetric: bool = False) -> list:
+    """
+    Split a sparse matrix into its independent blocks (connected components of its sparsity pattern). Rows and columns
+    without any nonzero are not part of any block
+
+    Parameters
+    ----------
+    matrix: sparse.spmatrix
+        The matrix to split
+    symmetric: bool
+        If the matrix is symmetric, in which case the blocks are principal submatrices (same rows and columns)
+
+    Returns
+    -------
+    The (rows, columns) indices of each block
+    """
+
+    matrix = sparse.coo_matrix(matrix)
+    n_rows, n_cols = matrix.shape
+    nonzero = matrix.data != 0
+    rows, cols = matrix.row[nonzero], matrix.col[nonzero]
+
+    if symmetric:
+        graph = sparse.coo_matrix((np.ones(rows.shape[0]), (rows, cols)), shape=(n_rows, n_rows))
+        is_used = np.zeros(n_rows, dtype=bool)
+        is_used[rows] = True
+    else:
+        # Bipartite graph where the first nodes are the rows and the last ones are the columns
+        graph = sparse.coo_matrix((np.ones(rows.shape[0]), (rows, cols + n_rows)), shape=(n_rows + n_cols,) * 2)
+        is_used = np.zeros(n_rows + n_cols, dtype=bool)
+        is_used[rows] = True
+        is_used[cols + n_rows] = True
+
+    _, labels = connected_components(graph, directed=False)
+    nodes = np.flatnonzero(is_used)
+    nodes = nodes[np.argsort(labels[nodes], kind="stable")]
+    groups = np.split(nodes, np.flatnonzero(np.diff(labels[nodes])) + 1) if nodes.shape[0] else []
+
+    if symmetric:
+        return [(group, group) for group in groups]
+    return [(group[group < n_rows], group[group >= n_rows] - n_rows) for group in groups]
+
+
+def _sparse_matrix_rank(matrix: sparse.spmatrix) -> tuple[int, bool]:
+    """
+    The numerical rank of a sparse matrix, computed on each of its independent blocks. The rank of the blocks that are
+    too large to be densified is estimated from the null eigen values of their (smallest) Gram matrix, which only
+    resolves the singular values above sqrt(n * eps) times the largest one (instead of n * eps for a dense matrix)
+
+    Returns
+    -------
+    The rank of the matrix
+    If the rank is an estimate (at least one block was too large to be densified)
+    """
+
+    matrix = sparse.csr_matrix(matrix)
+    rank = 0
+    is_estimate = False
+    for rows, cols in _independent_blocks(matrix):
+        block = matrix[rows, :][:, cols]
+        if rows.shape[0] * cols.shape[0] <= _DENSE_SIZE_LIMIT:
+            rank += np.linalg.matrix_rank(block.toarray())
+        else:
+            rank += _large_block_rank(block)
+            is_estimate = True
+    return int(rank), is_estimate
+
+
+def _large_block_rank(block: sparse.spmatrix) -> int:
+    """
+    Estimate the numerical rank of a block that is too large to be densified. The rank is the size of its smallest Gram
+    matrix (B @ B.T or B.T @ B) minus the number of its null eigen values, which are the ones closest to zero found by
+    the Lanczos algorithm in shift-invert mode (up to _MAX_NULLITY of them)
+    """
+
+    block = sparse.csc_matrix(block)
+    gram = block @ block.T if block.shape[0] <= block.shape[1] else block.T @ block
+    size = gram.shape[0]
+
+    # The largest eigen value of the Gram matrix is bounded by the product of the 1- and inf-norms of the block
+    norm_bound = sparse.linalg.norm(block, 1) * sparse.linalg.norm(block, np.inf)
+    tolerance = norm_bound * size * np.finfo(float).eps
+    if tolerance == 0:
+        return 0
+
+    nullity = 0
+    n_eigen_values = min(8, size - 1)
+    while n_eigen_values > 0:
+        # Shifting by -tolerance keeps the factorized matrix positive definite, even if the Gram matrix is singular
+        try:
+            eigen_values = eigsh(
+                gram,
+                k=n_eigen_values,
+                sigma=-tolerance,
+                which="LM",
+                maxiter=_EIGEN_MAX_ITERATIONS,
+                return_eigenvectors=False,
+            )
+        except ArpackNoConvergence as error:
+            eigen_values = error.eigenvalues
+        nullity = int(np.sum(eigen_values <= tolerance))
+        if nullity < n_eigen_values or n_eigen_values >= min(size - 1, _MAX_NULLITY):
+            break
+        n_eigen_values = min(2 * n_eigen_values, size - 1, _MAX_NULLITY)
+    return size - nullity
+
+
+def _sparse_extreme_eigen_values(matrix: sparse.spmatrix) -> tuple[float, float, bool]:
+    """
+    The smallest and largest eigen values of a sparse symmetric matrix, computed on each of its independent blocks.
+    The blocks that are too large to be densified are estimated with the Lanczos algorithm (see _extreme_eigen_value)
+
+    Returns
+    -------
+    The smallest eigen value
+    The largest eigen value
+    If one of them is an estimate, because an iterative solver did not converge
+    """
+
+    matrix = sparse.csr_matrix(matrix)
+    if matrix.shape[0] == 0:
+        return 0.0, 0.0, False
+
+    blocks = _independent_blocks(matrix, symmetric=True)
+    # The variables that are not part of any block have a null eigen value
+    ev_min = 0.0 if sum(rows.shape[0] for rows, _ in blocks) < matrix.shape[0] else np.inf
+    ev_max = 0.0 if ev_min == 0 else -np.inf
+    are_estimates = False
+    for rows, cols in blocks:
+        block = matrix[rows, :][:, cols]
+        if rows.shape[0] <= 2 or rows.shape[0] * cols.shape[0] <= _DENSE_SIZE_LIMIT:
+            eigen_values = np.linalg.eigvalsh(block.toarray())
+            block_min, block_max = np.min(eigen_values), np.max(eigen_values)
+        else:
+            block_min, min_is_estimate = _extreme_eigen_value(block, largest=False)
+            block_max, max_is_estimate = _extreme_eigen_value(block, largest=True)
+            are_estimates = are_estimates or min_is_estimate or max_is_estimate
+        ev_min = min(ev_min, block_min)
+        ev_max = max(ev_max, block_max)
+    return float(ev_min), float(ev_max), are_estimates
+
+
+def _extreme_eigen_value(block: sparse.spmatrix, largest: bool) -> tuple[float, bool]:
+    """
+    The smallest or largest eigen value of a symmetric block, with the Lanczos algorithm. If it does not converge, its
+    partial result is used or, if there is none, the eigen value is estimated with LOBPCG
+
+    Returns
+    -------
+    The eigen value
+    If it is an estimate
+    """
+
+    try:
+        eigen_values = eigsh(
+            block, k=1, which="LA" if largest else "SA", maxiter=_EIGEN_MAX_ITERATIONS, return_eigenvectors=False
+        )
+        return float(eigen_values[0]), False
+    except ArpackNoConvergence as error:
+        if error.eigenvalues.shape[0] > 0:
+            return float(error.eigenvalues[0]), True
+
+    initial_guess = np.random.default_rng(0).random((block.shape[0], 1))
+    with warnings.catch_warnings():
+        # LOBPCG warns when it does not converge, the value is marked as an estimate anyway
+        warnings.simplefilter("ignore")
+        eigen_values = lobpcg(block, initial_guess, largest=largest, maxiter=_EIGEN_MAX_ITERATIONS)[0]
+    return float(eigen_values[0]), True
+
+
+def _stacked_hessians_min_mean_max(
+    stacked_hessians: sparse.spmatrix, n_constraints: int, n_variables: int
+) -> np.ndarray:
+    """
+    The min, mean and max of the (dense) hessian matrix of each constraint, computed from their nonzeros only
+
+    Parameters
+    ----------
+    stacked_hessians: sparse.spmatrix
+        The hessians of the constraints as returned by the function of jacobian_hessian_constraints
+    n_constraints: int
+        The number of constraints
+    n_variables: int
+        The number of variables
+
+    Returns
+    -------
+    The min, mean and max of the hessian of each constraint (n_constraints x 3)
+    """
+
+    stacked_hessians = sparse.coo_matrix(stacked_hessians)
+    constraint_index = stacked_hessians.row % n_constraints if n_constraints else stacked_hessians.row
+    values = stacked_hessians.data
+    n_elements = n_variables * n_variables
+
+    hess_min_mean_max = np.zeros((n_constraints, 3))
+    if n_constraints == 0:
+        return hess_min_mean_max
+
+    n_nonzeros = np.bincount(constraint_index, minlength=n_constraints)
+    hess_min = np.full(n_constraints, np.inf)
+    hess_max = np.full(n_constraints, -np.inf)
+    np.minimum.at(hess_min, constraint_index, values)
+    np.maximum.at(hess_max, constraint_index, values)
+
+    # The elements that are not stored are zeros
+    has_zeros = n_nonzeros < n_elements
+    hess_min_mean_max[:, 0] = np.where(has_zeros, np.minimum(hess_min, 0), hess_min)
+    hess_min_mean_max[:, 1] = np.bincount(constraint_index, weights=values, minlength=n_constraints) / n_elements
+    hess_min_mean_max[:, 2] = np.where(has_zeros, np.maximum(hess_max, 0), hess_max)
+    return hess_min_mean_max
+
+
+def create_conditioning_functions(ocp) -> dict:
+    """
+    Create the functions of the jacobian and hessian of the constraints and of the hessian of the objectives, and the
+    rows and columns of each phase in these matrices
+
+    Returns
+    -------
+    The functions and the phase indices needed by the conditioning analysis
+    """
 
-    cmap = mcm.get_cmap("seismic")
-    cmap.set_bad(color="k")
     interface = IpoptInterface(ocp)
     variables_vector = ocp.variables_vector
-    all_g, _ = interface.dispatch_bounds(include_g=True, include_g_implicit=False, include_g_internal=False)
+
+    # The constraints are dispatched in the same order as dispatch_bounds(include_g=True) does
+    ocp_g = interface.get_all_penalties(ocp, ocp.g)
+    phases_g = [interface.get_all_penalties(nlp, nlp.g) for nlp in ocp.nlp]
+    all_g = vertcat(ocp_g, *phases_g)
     all_objectives = interface.dispatch_obj_func()
-    nb_variables = variables_vector.shape[0]
-    nb_constraints = all_g.shape[0]
 
     constraints_jac_func, constraints_hess_func = jacobian_hessian_constraints(variables_vector, all_g)
     objectives_hess_func = hessian_objective(variables_vector, all_objectives)
 
+    # Where each phase is in the constraints (rows) and in the variables (columns)
+    layout = OptimizationVectorHelper.vector_layout(ocp)
+    phases_rows = []
+    row = ocp_g.shape[0]
+    for phase_g in phases_g:
+        phases_rows.append(np.arange(row, row + phase_g.shape[0]))
+        row += phase_g.shape[0]
+    phases_cols = [
+        np.concatenate(
+            [
+                np.arange(layout[key][phase]["slice"].start, layout[key][phase]["slice"].stop)
+                for key in ("states", "controls", "algebraic_states")
+            ]
+        )
+        for phase in range(ocp.n_phases)
+    ]
+
+    return {
+        "constraints_jac_func": constraints_jac_func,
+        "constraints_hess_func": constraints_hess_func,
+        "objectives_hess_func": objectives_hess_func,
+        "phases_rows": phases_rows,
+        "phases_cols": phases_cols,
+    }
+
+
+def conditioning_report(v, conditioning_functions: dict) -> dict:
+    """
+    Evaluate all the conditioning statistics of the program at once, globally and for each phase. The matrices are
+    kept sparse all along, so this can be used on large programs
+
+    Parameters
+    ----------
+    v: np.ndarray
+        The optimization vector to evaluate the statistics at
+    conditioning_functions: dict
+        The functions as returned by create_conditioning_functions
+
+    Returns
+    -------
+    The conditioning report
+    """
+
+    jacobian_matrix, jacobian_rank, hess_min_mean_max, rank_is_estimate = evaluate_jacobian_hessian_constraints(
+        v, conditioning_functions
+    )
+    hessian_matrix, condition_number, convexity, eigen_values_are_estimates = evaluate_hessian_objective(
+        v, conditioning_functions
+    )
+
+    jacobian_matrix = sparse.csr_matrix(jacobian_matrix)
+    hessian_matrix = sparse.csr_matrix(hessian_matrix)
+    phases = []
+    for rows, cols in zip(conditioning_functions["phases_rows"], conditioning_functions["phases_cols"]):
+        phase_jacobian = jacobian_matrix[rows, :][:, cols]
+        if rows.shape[0] > 0:
+            phase_rank, phase_rank_is_estimate = _sparse_matrix_rank(phase_jacobian)
+        else:
+            phase_rank, phase_rank_is_estimate = "No constraints", False
+        phase_condition_number, phase_convexity, phase_eigen_values_are_estimates = _hessian_condition_and_convexity(
+            hessian_matrix[cols, :][:, cols]
+        )
+        phases.append(
+            {
+                "n_constraints": int(rows.shape[0]),
+                "n_variables": int(cols.shape[0]),
+                "jacobian_rank": phase_rank,
+                "jacobian_rank_is_estimate": phase_rank_is_estimate,
+                "objective_condition_number": phase_condition_number,
+                "objective_convexity": phase_convexity,
+                "objective_eigen_values_are_estimates": phase_eigen_values_are_estimates,
+            }
+        )
+
+    return {
+        "n_constraints": int(jacobian_matrix.shape[0]),
+        "n_variables": int(jacobian_matrix.shape[1]),
+        "jacobian_nnz": int(jacobian_matrix.nnz),
+        "jacobian_rank": jacobian_rank,
+        "jacobian_rank_is_estimate": rank_is_estimate,
+        "constraints_hessian_min_mean_max": hess_min_mean_max,
+        "objective_hessian_nnz": int(hessian_matrix.nnz),
+        "objective_condition_number": condition_number,
+        "objective_convexity": convexity,
+        "objective_eigen_values_are_estimates": eigen_values_are_estimates,
+        "phases": phases,
+    }
+
+
+def write_conditioning_report(report: dict, path: str):
+    """
+    Write a conditioning report to a json file
+
+    Parameters
+    ----------
+    report: dict
+        The report as returned by conditioning_report
+    path: str
+        The path of the file to write
+    """
+
+    def to_serializable(value):
+        if isinstance(value, dict):
+            return {key: to_serializable(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [to_serializable(item) for item in value]
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    with open(path, "w") as file:
+        json.dump(to_serializable(report), file, indent=2)
+
+
+def create_conditioning_plots(ocp):
+    from matplotlib import pyplot as plt
+    import matplotlib.cm as mcm
+
+    cmap = mcm.get_cmap("seismic")
+    cmap.set_bad(color="k")
+    conditioning_functions = create_conditioning_functions(ocp)
+    nb_variables = ocp.variables_vector.shape[0]
+    nb_constraints = conditioning_functions["constraints_jac_func"].size1_out(0)
+
     # PLOT CONSTRAINTS
     fig_constraints, axis_constraints = plt.subplots(1, 2, num="Check conditioning for constraints")
 
@@ -192,15 +567,18 @@ def create_conditioning_plots(ocp):
         "im_constraints_jacobian": im_constraints_jacobian,
         "im_constraints_hessian": im_constraints_hessian,
         "im_objectives_hessian": im_objectives_hessian,
-        "constraints_jac_func": constraints_jac_func,
-        "constraints_hess_func": constraints_hess_func,
-        "objectives_hess_func": objectives_hess_func,
+        **conditioning_functions,
     }
 
 
 def update_constraints_plot(v, ocp):
+    import matplotlib.colors as mcolors
 
-    jacobian_matrix, jacobian_rank, hess_min_mean_max = evaluate_jacobian_hessian_constraints(v, ocp)
+    jacobian_matrix, jacobian_rank, hess_min_mean_max, rank_is_estimate = evaluate_jacobian_hessian_constraints(
+        v, ocp.conditioning_plots
+    )
+    # Only the plot needs the dense matrix
+    jacobian_matrix = jacobian_matrix.toarray()
     axis_constraints = ocp.conditioning_plots["axis_constraints"]
     im_constraints_jacobian = ocp.conditioning_plots["im_constraints_jacobian"]
     im_constraints_hessian = ocp.conditioning_plots["im_constraints_hessian"]
@@ -212,8 +590,9 @@ def update_constraints_plot(v, ocp):
     norm = mcolors.TwoSlopeNorm(vmin=jac_min - 0.01, vmax=jac_max + 0.01, vcenter=0)
     im_constraints_jacobian.set_data(jacobian_matrix)
     im_constraints_jacobian.set_norm(norm)
+    rank_text = f"{jacobian_rank} (estimate)" if rank_is_estimate else str(jacobian_rank)
     axis_constraints[0].set_title(
-        f"Jacobian constraints \nMatrix rank = {str(jacobian_rank)}\n Number of constraints = {str(jacobian_matrix.shape[0])}",
+        f"Jacobian constraints \nMatrix rank = {rank_text}\n Number of constraints = {str(jacobian_matrix.shape[0])}",
         fontweight="bold",
         fontsize=12,
     )
@@ -227,8 +606,14 @@ def update_constraints_plot(v, ocp):
 
 
 def update_objective_plot(v, ocp):
+    import matplotlib.cm as mcm
+    import matplotlib.colors as mcolors
 
-    hessian_matrix, condition_number, convexity = evaluate_hessian_objective(v, ocp)
+    hessian_matrix, condition_number, convexity, eigen_values_are_estimates = evaluate_hessian_objective(
+        v, ocp.conditioning_plots
+    )
+    # Only the plot needs the dense matrix
+    hessian_matrix = hessian_matrix.toarray()
     axis_obj = ocp.conditioning_plots["axis_obj"]
     im_objectives_hessian = ocp.conditioning_plots["im_objectives_hessian"]
     cmap = mcm.get_cmap("seismic")
@@ -239,26 +624,49 @@ def update_objective_plot(v, ocp):
     norm = mcolors.TwoSlopeNorm(vmin=hess_min - 0.01, vmax=hess_max + 0.01, vcenter=0)
     im_objectives_hessian.set_data(hessian_matrix)
     im_objectives_hessian.set_norm(norm)
+    estimate_text = " (estimate)" if eigen_values_are_estimates else ""
     axis_obj.set_title(
-        f"Hessian objective \nConvexity = {convexity} \n|λmax|/|λmin| = Condition number = {condition_number}",
+        f"Hessian objective \nConvexity = {convexity}{estimate_text} \n"
+        f"|λmax|/|λmin| = Condition number = {condition_number}{estimate_text}",
         fontweight="bold",
         fontsize=12,
     )
 
 
 def update_conditioning_plots(v, ocp):
+    from matplotlib import pyplot as plt
+
     update_constraints_plot(v, ocp)
     update_objective_plot(v, ocp)
     plt.draw()
 
 
-def check_conditioning(ocp):
+def check_conditioning(ocp, report_path: str = None) -> dict | None:
     """
     Visualisation of jacobian and hessian contraints and hessian objective for each phase at initial time
+
+    Parameters
+    ----------
+    ocp: OptimalControlProgram
+        The program to check the conditioning of
+    report_path: str
+        If provided, nothing is drawn (headless mode) and the report is written to this path as json instead
+
+    Returns
+    -------
+    The conditioning report (see conditioning_report) in headless mode
     """
 
-    create_conditioning_plots(ocp)
     v_init = ocp.init_vector
+    if report_path is not None:
+        report = conditioning_report(v_init, create_conditioning_functions(ocp))
+        write_conditioning_report(report, report_path)
+        return report
+
+    # Only the plots need matplotlib, so the report can be written on a machine that does not have it
+    from matplotlib import pyplot as plt
+
+    create_conditioning_plots(ocp)
     update_constraints_plot(v_init, ocp)
     update_objective_plot(v_init, ocp)
 
@@ -3,7 +3,6 @@ import json
 import logging
 import platform
 import socket
-import struct
 import time
 import threading
 
@@ -18,6 +17,7 @@ from ..misc.parameters_types import (
     Bool,
     Int,
     Str,
+    Float,
     Bytes,
     StrOptional,
     IntOptional,
@@ -29,10 +29,12 @@ from ..misc.parameters_types import (
     IntIterableOptional,
 )
 
-
 _DEFAULT_HOST = "localhost"
 _DEFAULT_PORT = 3050
 _HEADER_GENERIC_LEN = 1024
+_HEADER_DTYPE = np.int64
+# The iterates are parsed in the process of the solver, so they cannot take more than this share of its time
+_MAX_PARSING_SHARE = 0.05
 
 
 def _serialize_show_options(show_options: AnyDict) -> Bytes:
@@ -284,9 +286,15 @@ class PlottingServer:
         try:
             for len_data in len_all_data:
                 self._logger.debug(f"Waiting for {len_data} bytes from client")
-                data_tp = b""
-                while len(data_tp) != len_data:
-                    data_tp += client_socket.recv(len_data - len(data_tp))
+                # Receive directly in a preallocated buffer, so the chunks are never concatenated
+                data_tp = bytearray(len_data)
+                view = memoryview(data_tp)
+                n_received = 0
+                while n_received != len_data:
+                    n_chunk = client_socket.recv_into(view[n_received:], len_data - n_received)
+                    if n_chunk == 0:
+                        raise ConnectionError("The client closed the connexion while sending data")
+                    n_received += n_chunk
                 data_out.append(data_tp)
         except Exception as e:
             self._logger.error("Unknown message type received")
@@ -329,6 +337,9 @@ class PlottingServer:
             client_socket.sendall(_ResponseHeader.NOK.encode())
             raise e
 
+        # Older clients do not send the update interval
+        self._get_data_interval = data_json.get("update_interval", self._get_data_interval)
+
         try:
             dummy_time_vector = []
             for phase_times in data_json["dummy_phase_times"]:
@@ -461,7 +472,13 @@ class PlottingServer:
 
 class OnlineCallbackServer(OnlineCallbackAbstract):
     def __init__(
-        self, ocp, opts: AnyDictOptional = None, host: StrOptional = None, port: IntOptional = None, **show_options
+        self,
+        ocp,
+        opts: AnyDictOptional = None,
+        host: StrOptional = None,
+        port: IntOptional = None,
+        update_interval: Float = 1.0,
+        **show_options,
     ):
         """
         Initializes the client. This is not supposed to be called directly by the user, but by the solver. During the
@@ -480,16 +497,32 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
             The host to connect to, by default "localhost"
         port: int
             The port to connect to, by default 3050
+        update_interval: float
+            The minimal time (in seconds) between two updates of the plots, by default 1s
         """
 
         super().__init__(ocp, opts, **show_options)
 
+        if update_interval < 0:
+            raise ValueError("update_interval must be positive")
+
         self._host: Str = host if host else _DEFAULT_HOST
         self._port: Int = port if port else _DEFAULT_PORT
+        self._update_interval: Float = update_interval
         self._socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
         self._should_wait_ok_to_client_on_new_data: Bool = platform.system() == "Darwin"
 
+        # The iterates are parsed and sent by a background thread. It still shares the cores of the solver, so after
+        # each iterate it waits long enough for the parsing to stay under _MAX_PARSING_SHARE of the time
+        self._iterate_condition = threading.Condition()
+        self._server_is_ready: Bool = False
+        self._latest_iterate: AnyDictOptional = None
+        self._n_published: Int = 0
+        self._n_sent: Int = 0
+        self._is_sending: Bool = False
+        self._is_enforced: Bool = False
+
         if self.ocp.plot_ipopt_outputs:
             raise NotImplementedError("The online callback with TCP does not support the plot_ipopt_outputs option")
         if self.ocp.save_ipopt_iterations_info:
@@ -503,6 +536,9 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
 
         self._initialize_connexion(**show_options)
 
+        self._is_sending = True
+        threading.Thread(target=self._send_iterates, daemon=True).start()
+
     def _initialize_connexion(self, retries: Int = 0, **show_options) -> None:
         """
         Initializes the connexion to the server
@@ -537,6 +573,7 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
             ocp_plot["dummy_phase_times"].append([np.array(v)[:, 0].tolist() for v in phase_times])
 
         ocp_plot["request_confirmation_on_new_data"] = self._should_wait_ok_to_client_on_new_data
+        ocp_plot["update_interval"] = self._update_interval
         serialized_ocp = json.dumps(ocp_plot).encode()
 
         serialized_show_options = _serialize_show_options(show_options)
@@ -584,38 +621,91 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
 
     def eval(self, arg: AnyIterable, enforce: Bool = False) -> IntIterableOptional:
         """
-        Sends the current data to the plotter, this method is automatically called by the solver
+        Publishes the current data to the plotter, this method is automatically called by the solver. The data are
+        only copied if the server is waiting for them, the parsing and the sending are done by a background thread
+        (see _send_iterates)
 
         Parameters
         ----------
         arg: list | tuple
             The current data
         enforce: bool
-            If True, the client will block until the server is ready to receive new data. This is useful at the end of
-            the optimization to make sure the data are plot (and not discarded)
+            If True, the client will block until the data are sent to the server. This is useful at the end of the
+            optimization to make sure the data are plot (and not discarded)
 
         Returns
         -------
         A mandatory [0] to respect the CasADi callback signature
         """
 
-        if not enforce:
-            self._socket.setblocking(False)
+        with self._iterate_condition:
+            if not self._server_is_ready and not enforce:
+                # This is to prevent the solving to be slowed down by the plots if the server is not ready
+                return [0]
+
+            # The vectors provided by the solver are only valid during the call, so they are copied
+            self._latest_iterate = _snapshot_iterate(arg)
+            self._n_published += 1
+            published = self._n_published
+            # An enforced iterate is also sent without waiting for the parsing to be back under its share of the time
+            self._is_enforced = enforce
+            self._iterate_condition.notify_all()
+
+            if enforce:
+                self._iterate_condition.wait_for(lambda: self._n_sent >= published or not self._is_sending)
+                self._is_enforced = False
+
+        return [0]
+
+    def _send_iterates(self) -> None:
+        """
+        The loop of the background thread: waits for the server to be ready, then parses and sends the latest iterate
+        published by the solver. The parsing runs in the process of the solver, so it slows the solver down when they
+        share a core. The thread therefore waits after each iterate so the parsing takes at most _MAX_PARSING_SHARE of
+        the time, unless the solver enforces the sending of its last iterate
+        """
 
         try:
-            data = self._socket.recv(_ResponseHeader.response_len()).decode()
-            if data != _ResponseHeader.READY_FOR_NEXT_DATA:
-                return [0]
-        except BlockingIOError:
-            # This is to prevent the solving to be blocked by the server if it is not ready to update the plots
-            return [0]
+            while True:
+                if self._socket.recv(_ResponseHeader.response_len()).decode() != _ResponseHeader.READY_FOR_NEXT_DATA:
+                    break
+
+                with self._iterate_condition:
+                    self._server_is_ready = True
+                    self._iterate_condition.wait_for(lambda: self._n_published > self._n_sent)
+                    self._server_is_ready = False
+                    iterate, published = self._latest_iterate, self._n_published
+
+                sending_time = time.perf_counter()
+                self._send_iterate(iterate)
+                sending_time = time.perf_counter() - sending_time
+
+                with self._iterate_condition:
+                    self._n_sent = published
+                    self._iterate_condition.notify_all()
+                    self._iterate_condition.wait_for(
+                        lambda: self._is_enforced, timeout=sending_time * (1 / _MAX_PARSING_SHARE - 1)
+                    )
+        except OSError:
+            # The connexion was closed
+            pass
         finally:
-            self._socket.setblocking(True)
+            with self._iterate_condition:
+                self._server_is_ready = False
+                self._is_sending = False
+                self._iterate_condition.notify_all()
+
+    def _send_iterate(self, iterate: AnyDict) -> None:
+        """
+        Parses an iterate and sends it to the server
 
-        args_dict = {}
-        for i, s in enumerate(nlpsol_out()):
-            args_dict[s] = arg[i]
-        xdata, ydata = self._plotter.parse_data(**args_dict)
+        Parameters
+        ----------
+        iterate: dict
+            The outputs of the solver (see nlpsol_out)
+        """
+
+        xdata, ydata = self._plotter.parse_data(**iterate)
         header, data_serialized = _serialize_xydata(xdata, ydata)
 
         self._socket.sendall(
@@ -631,12 +721,36 @@ class OnlineCallbackServer(OnlineCallbackAbstract):
         if self._should_wait_ok_to_client_on_new_data and not self._has_received_ok():
             raise RuntimeError("The server did not acknowledge the connexion")
 
-        return [0]
+
+def _snapshot_iterate(arg: AnyIterable) -> AnyDict:
+    """
+    Copy the outputs of the solver in a single contiguous buffer
+
+    Parameters
+    ----------
+    arg: list | tuple
+        The outputs of the solver, in the order of nlpsol_out
+
+    Returns
+    -------
+    The outputs by name, as column views of the buffer
+    """
+
+    arrays = [np.asarray(value, dtype=np.float64).reshape(-1, order="F") for value in arg]
+    buffer = np.concatenate(arrays) if arrays else np.ndarray((0,))
+
+    iterate = {}
+    start = 0
+    for name, array in zip(nlpsol_out(), arrays):
+        iterate[name] = buffer[start : start + array.shape[0], np.newaxis]
+        start += array.shape[0]
+    return iterate
 
 
 def _serialize_xydata(xdata: AnyIterable, ydata: AnyIterable) -> AnyTuple:
     """
-    Serialize the data to send to the server, it will be deserialized by `_deserialize_xydata`
+    Serialize the data to send to the server, it will be deserialized by `_deserialize_xydata`. The header is an array
+    of int64 and the data are packed in a single contiguous float64 buffer
 
     Parameters
     ----------
@@ -650,35 +764,37 @@ def _serialize_xydata(xdata: AnyIterable, ydata: AnyIterable) -> AnyTuple:
     The serialized data as expected by the server (header, serialized_data)
     """
 
-    header = f"{len(xdata)}"
-    data_serialized = b""
+    header = [len(xdata)]
+    data = []
     for x_nodes in xdata:
-        header += f",{len(x_nodes)}"
+        header.append(len(x_nodes))
         for x_steps in x_nodes:
-            header += f",{x_steps.shape[0]}"
-            x_steps_tp = np.array(x_steps)[:, 0].tolist()
-            data_serialized += struct.pack("d" * len(x_steps_tp), *x_steps_tp)
+            x_steps = np.asarray(x_steps, dtype=np.float64).reshape(-1, order="F")
+            header.append(x_steps.shape[0])
+            data.append(x_steps)
 
-    header += f",{len(ydata)}"
+    header.append(len(ydata))
     for y_nodes_variable in ydata:
         if isinstance(y_nodes_variable, np.ndarray):
-            header += f",0"
+            header.append(0)
             y_nodes_variable = [y_nodes_variable]
         else:
-            header += f",{len(y_nodes_variable)}"
+            header.append(len(y_nodes_variable))
 
         for y_steps in y_nodes_variable:
-            header += f",{y_steps.shape[0]}"
-            y_steps_tp = y_steps.tolist()
-            data_serialized += struct.pack("d" * len(y_steps_tp), *y_steps_tp)
+            y_steps = np.asarray(y_steps, dtype=np.float64).reshape(-1)
+            header.append(y_steps.shape[0])
+            data.append(y_steps)
 
-    header = header.encode()
-    return header, data_serialized
+    header = np.array(header, dtype=_HEADER_DTYPE)
+    data = np.concatenate(data) if data else np.ndarray((0,), dtype=np.float64)
+    return memoryview(header).cast("B"), memoryview(data).cast("B")
 
 
 def _deserialize_xydata(serialized_raw_data: AnyIterable) -> AnyTuple:
     """
-    Deserialize the data from the client, based on the serialization used in _serialize_xydata`
+    Deserialize the data from the client, based on the serialization used in _serialize_xydata`. The returned arrays
+    are views of the received buffers, nothing is copied
 
     Parameters
     ----------
@@ -690,12 +806,8 @@ def _deserialize_xydata(serialized_raw_data: AnyIterable) -> AnyTuple:
     The deserialized data as expected by PlotOcp.update_data
     """
 
-    # Header is made of ints comma separated from the first line
-    header = [int(v) for v in serialized_raw_data[0].decode().split(",")]
-
-    # Data is made of doubles (d) from the second line, the length of which is 8 bytes each
-    data = serialized_raw_data[1]
-    all_data = np.array(struct.unpack("d" * (len(data) // 8), data))
+    header = np.frombuffer(serialized_raw_data[0], dtype=_HEADER_DTYPE)
+    all_data = np.frombuffer(serialized_raw_data[1], dtype=np.float64)
 
     # Based on the header, we can now parse the data, assuming the number of phases, nodes and steps from the header
     header_cmp = 0
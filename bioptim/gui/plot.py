@@ -1,5 +1,4 @@
 import tkinter
-from typing import Callable, Any
 
 import numpy as np
 from casadi import DM
@@ -7,12 +6,11 @@ from matplotlib import pyplot as plt, lines
 from matplotlib.ticker import FuncFormatter
 
 from ..optimization.non_linear_program import NonLinearProgram
+from .custom_plot import CustomPlot
 from .serializable_class import OcpSerializable
 from ..dynamics.ode_solvers import OdeSolver
-from ..limits.path_conditions import Bounds
 from ..limits.penalty_helpers import PenaltyHelpers
-from ..misc.enums import PlotType, Shooting, SolutionIntegrator, QuadratureRule, InterpolationType
-from ..misc.mapping import Mapping, BiMapping, BiMappingOrIterableOptional
+from ..misc.enums import PlotType, Shooting, SolutionIntegrator, InterpolationType
 from ..optimization.solution.solution import Solution
 from ..optimization.solution.solution_data import SolutionMerge
 from ..misc.parameters_types import (
@@ -22,7 +20,6 @@ from ..misc.parameters_types import (
     Str,
     Range,
     Tuple,
-    List,
     BoolOptional,
     IntOptional,
     FloatOptional,
@@ -32,17 +29,14 @@ from ..misc.parameters_types import (
     AnyList,
     NpArray,
     StrIterable,
-    StrIterableOptional,
     AnyIterableOptional,
     AnyIterableOrRangeOptional,
-    IntIterableOptional,
     IntDict,
     AnyDict,
     AnyTuple,
     DoubleFloatTuple,
     FloatIterableorNpArray,
     StrList,
-    StrListOptional,
     DMList,
     NpArrayList,
     DoubleIntTuple,
@@ -58,111 +52,6 @@ DEFAULT_COLORS = {
 DEFAULT_LINESTYLES = {PlotType.PLOT: "-", PlotType.INTEGRATED: None, PlotType.STEP: "-", PlotType.POINT: None}
 
 
-class CustomPlot:
-    """
-    Interface to create/add plots of the simulation
-
-    Attributes
-    ----------
-    function: Callable[time, states, controls, parameters, algebraic_states]
-        The function to call to update the graph
-    type: PlotType
-        Type of plot to use
-    phase_mappings: Mapping
-        The index of the plot across the phases
-    legend: tuple[str] | list[str]
-        The titles of the graphs
-    combine_to: str
-        The name of the variable to combine this one with
-    color: str
-        The color of the line as specified in matplotlib
-    linestyle: str
-        The style of the line as specified in matplotlib
-    ylim: tuple[float, float] | list[float, float]
-        The ylim of the axes as specified in matplotlib
-    bounds: Bounds
-        The bounds to show on the graph
-    node_idx : list
-        The node time to be plotted on the graphs
-    parameters: Any
-        The parameters of the function
-    """
-
-    def __init__(
-        self,
-        update_function: Callable,
-        plot_type: PlotType = PlotType.PLOT,
-        axes_idx: BiMappingOrIterableOptional = None,
-        legend: StrIterableOptional = None,
-        combine_to: StrOptional = None,
-        color: StrOptional = None,
-        linestyle: StrOptional = None,
-        ylim: DoubleFloatTuple | FloatList = None,
-        bounds: Bounds | None = None,
-        node_idx: IntIterableOptional = None,
-        label: StrListOptional = None,
-        compute_derivative: Bool = False,
-        integration_rule: QuadratureRule = QuadratureRule.RECTANGLE_LEFT,
-        all_variables_in_one_subplot: Bool = False,
-        **parameters: Any,
-    ):
-        """
-        Parameters
-        ----------
-        update_function: Callable[time, states, controls, parameters, algebraic_states]
-            The function to call to update the graph
-        plot_type: PlotType
-            Type of plot to use
-        axes_idx: Mapping | tuple | list
-            The index of the plot across the phases
-        legend: tuple[str] | list[str]
-            The titles of the graphs
-        combine_to: str
-            The name of the variable to combine this one with
-        color: str
-            The color of the line as specified in matplotlib
-        linestyle: str
-            The style of the line as specified in matplotlib
-        ylim: tuple[float, float] | list[float, float]
-            The ylim of the axes as specified in matplotlib
-        bounds: Bounds
-            The bounds to show on the graph
-        node_idx: list
-            The node time to be plotted on the graphs
-        label: list
-            Label of the curve to plot (to be added to the legend)
-        compute_derivative: bool
-            If the function should send the next node with x and u. Prevents from computing all at once (therefore a bit slower)
-        all_variables_in_one_subplot: bool
-            If all indices of the variables should be put on the same graph. This is not cute, but allows to display variables with a lot of entries.
-        """
-
-        self.function = update_function
-        self.type = plot_type
-        if axes_idx is None:
-            self.phase_mappings = None  # Will be set later
-        elif isinstance(axes_idx, (Tuple, List)):
-            self.phase_mappings = BiMapping(to_second=Mapping(axes_idx), to_first=Mapping(axes_idx))
-        elif isinstance(axes_idx, BiMapping):
-            self.phase_mappings = axes_idx
-        else:
-            raise RuntimeError("phase_mapping must be a list or a Mapping")
-        self.legend = legend if legend is not None else ()
-        self.combine_to = combine_to
-        self.color = color
-        self.linestyle = linestyle
-        self.ylim = ylim
-        self.bounds = bounds
-        self.node_idx = node_idx  # If this is None, it is all nodes and will be initialize when we know the dimension of the problem
-        self.label = label
-        self.compute_derivative = compute_derivative
-        if integration_rule == QuadratureRule.MIDPOINT or integration_rule == QuadratureRule.RECTANGLE_RIGHT:
-            raise NotImplementedError(f"{integration_rule} has not been implemented yet.")
-        self.integration_rule: QuadratureRule = integration_rule
-        self.parameters: Any = parameters
-        self.all_variables_in_one_subplot = all_variables_in_one_subplot
-
-
 class PlotOcp:
     """
     Attributes
@@ -261,7 +261,7 @@ class CustomPlotSerializable:
 
     @classmethod
     def from_custom_plot(cls, custom_plot) -> "CustomPlotSerializable":
-        from .plot import CustomPlot
+        from .custom_plot import CustomPlot
 
         custom_plot: CustomPlot = custom_plot
 
@@ -753,6 +753,24 @@ class AcadosInterface(SolverInterface):
             scale_init = self.ocp.parameter_init[key].scale(self.ocp.parameters[key].scaling.scaling)
             param_init = np.concatenate((param_init, scale_init.init[:, 0]))
 
+        # The x_init and u_init need to be ordered by index that's why we use a for loop. All the nodes are evaluated
+        # at once (and cached in the path conditions) so the node loop below only dispatches the values
+        nlp = self.ocp.nlp[0]
+        x_init_all = np.ndarray((nlp.states.shape, nlp.ns + 1))
+        x_init_end = np.ndarray((nlp.states.shape,))
+        for key in nlp.states.keys():
+            index = nlp.states[key].index
+            nlp.x_init[key].check_and_adjust_dimensions(nlp.states[key].shape, nlp.ns)
+            x_init_key = nlp.x_init[key].init.evaluate_all(nlp.ns)
+            x_init_all[index, :] = x_init_key / nlp.x_scaling[key].scaling
+            x_init_end[index] = x_init_key[:, self.acados_ocp.dims.N]
+
+        u_init_all = np.ndarray((self.acados_ocp.dims.nu, nlp.ns))
+        for key in nlp.controls.keys():
+            index = nlp.controls[key].index
+            nlp.u_init[key].check_and_adjust_dimensions(nlp.controls[key].shape, nlp.ns - 1)
+            u_init_all[index, :] = nlp.u_init[key].init.evaluate_all(nlp.ns - 1) / nlp.u_scaling[key].scaling
+
         for n in range(self.acados_ocp.dims.N):
             if n == 0:
                 # Initial node
@@ -773,31 +791,8 @@ class AcadosInterface(SolverInterface):
             # check following line
             # self.ocp_solver.cost_set(n, "W", self.W)
 
-            # The x_init need to be ordered by index that's why we use a for loop
-            x_init = np.ndarray((self.ocp.nlp[0].states.shape))
-            for key in self.ocp.nlp[0].states.keys():
-                index = self.ocp.nlp[0].states[key].index
-                self.ocp.nlp[0].x_init[key].check_and_adjust_dimensions(
-                    self.ocp.nlp[0].states[key].shape, self.ocp.nlp[0].ns
-                )
-                x_init[index] = (
-                    self.ocp.nlp[0].x_init[key].init.evaluate_at(n) / self.ocp.nlp[0].x_scaling[key].scaling[:, 0]
-                )
-
-            self.ocp_solver.set(n, "x", np.concatenate((param_init, x_init)))
-
-            # The u_init need to be ordered by index that's why we use a for loop
-            u_init = np.ndarray((self.acados_ocp.dims.nu, 1))
-            for key in self.ocp.nlp[0].controls.keys():
-                index = self.ocp.nlp[0].controls[key].index
-                self.ocp.nlp[0].u_init[key].check_and_adjust_dimensions(
-                    self.ocp.nlp[0].controls[key].shape, self.ocp.nlp[0].ns - 1
-                )
-                u_init[index, 0] = (
-                    self.ocp.nlp[0].u_init[key].init.evaluate_at(n) / self.ocp.nlp[0].u_scaling[key].scaling[:, 0]
-                )
-
-            self.ocp_solver.set(n, "u", u_init)
+            self.ocp_solver.set(n, "x", np.concatenate((param_init, x_init_all[:, n])))
+            self.ocp_solver.set(n, "u", u_init_all[:, n : n + 1])
 
             # The u_bounds need to be ordered by index that's why we use a for loop
             u_bounds_max = np.ndarray(self.acados_ocp.dims.nu)
@@ -828,13 +823,7 @@ class AcadosInterface(SolverInterface):
             self.ocp_solver.constraints_set(self.acados_ocp.dims.N, "uh", self.end_g_bounds.max[:, 0])
             self.ocp_solver.constraints_set(self.acados_ocp.dims.N, "lh", self.end_g_bounds.min[:, 0])
 
-        # The x_init need to be ordered by index that's why we use a for loop
-        x_init = np.ndarray((self.ocp.nlp[0].states.shape,))
-        for key in self.ocp.nlp[0].states.keys():
-            index = self.ocp.nlp[0].states[key].index
-            x_init[index] = self.ocp.nlp[0].x_init[key].init.evaluate_at(self.acados_ocp.dims.N)
-
-        self.ocp_solver.set(self.acados_ocp.dims.N, "x", np.concatenate((param_init, x_init)))
+        self.ocp_solver.set(self.acados_ocp.dims.N, "x", np.concatenate((param_init, x_init_end)))
 
     def online_optim(self, ocp):
         raise NotImplementedError("online_optim is not implemented yet with ACADOS backend")
@@ -1,4 +1,5 @@
 from time import perf_counter
+from typing import Callable
 
 import numpy as np
 from casadi import Importer, Function
@@ -6,9 +7,6 @@ from casadi import horzcat, vertcat, sum1, sum2, nlpsol, SX, MX, reshape
 
 from bioptim.optimization.solution.solution import Solution
 from .solver_interface import SolverInterface
-from ..gui.online_callback_multiprocess import OnlineCallbackMultiprocess
-from ..gui.online_callback_multiprocess_server import OnlineCallbackMultiprocessServer
-from ..gui.online_callback_server import OnlineCallbackServer
 from ..limits.path_conditions import Bounds
 from ..limits.penalty_helpers import PenaltyHelpers
 from ..misc.enums import InterpolationType, OnlineOptim
@@ -23,6 +21,7 @@ from ..misc.parameters_types import (
     DoubleNpArrayTuple,
     Int,
     Range,
+    Str,
 )
 
 
@@ -41,7 +40,13 @@ def generic_online_optim(interface: SolverInterface, ocp, show_options: AnyDictO
         additional options:
             - host: The host to connect to (only for OnlineOptim.SERVER)
             - port: The port to connect to (only for OnlineOptim.SERVER)
+            - update_interval: The minimal time (in seconds) between two updates of the plots
     """
+    # The online callbacks pull in the GUI stack, they are only imported when the graphs are requested
+    from ..gui.online_callback_multiprocess import OnlineCallbackMultiprocess
+    from ..gui.online_callback_multiprocess_server import OnlineCallbackMultiprocessServer
+    from ..gui.online_callback_server import OnlineCallbackServer
+
     if show_options is None:
         show_options = {}
 
@@ -78,12 +83,6 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
     v_bounds = interface.ocp.bounds_vectors
     v_init = interface.ocp.init_vector
 
-    all_objectives = interface.dispatch_obj_func()
-    all_objectives = _shake_tree_for_penalties(interface.ocp, all_objectives, v, v_bounds, expand_during_shake_tree)
-
-    all_g, all_g_bounds = interface.dispatch_bounds()
-    all_g = _shake_tree_for_penalties(interface.ocp, all_g, v, v_bounds, expand_during_shake_tree)
-
     if interface.opts.show_online_optim is not None:
         if interface.opts.online_optim is not None:
             raise ValueError("show_online_optim and online_optim cannot be simultaneous set")
@@ -92,18 +91,42 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
     if interface.opts.online_optim is not None:
         interface.online_optim(interface.ocp, interface.opts.show_options)
 
-    # Thread here on (f and all_g) instead of individually for each function?
-    interface.nlp = {"x": v, "f": sum1(all_objectives), "g": all_g}
     interface.c_compile = interface.opts.c_compile
     options = interface.opts.as_dict(interface)
 
-    if interface.c_compile:
-        if not interface.ocp_solver or interface.ocp.program_changed:
-            nlpsol("nlpsol", interface.solver_name.lower(), interface.nlp, options).generate_dependencies("nlp.c")
-            interface.ocp_solver = nlpsol("nlpsol", interface.solver_name, Importer("nlp.c", "shell"), options)
-            interface.ocp.program_changed = False
+    if interface.opts.parametric:
+        # The solver is only rebuilt if the structure of the program changed, otherwise the new numerical values of
+        # the targets, weights and timeseries are simply pushed as the parameters of the already built nlpsol
+        p = None
+        if (
+            interface.ocp_solver is not None
+            and not interface.ocp.program_changed
+            and interface.parametric_options == options
+        ):
+            p = _evaluate_nlp_parameters(interface.parametric_inputs)
+
+        if p is None:
+            _build_parametric_solver(interface, v, v_bounds, options, expand_during_shake_tree)
+            p = _evaluate_nlp_parameters(interface.parametric_inputs)
+        all_g_bounds = interface.parametric_g_bounds
+
     else:
-        interface.ocp_solver = nlpsol("solver", interface.solver_name.lower(), interface.nlp, options)
+        all_objectives = interface.dispatch_obj_func()
+        all_objectives = _shake_tree_for_penalties(interface.ocp, all_objectives, v, v_bounds, expand_during_shake_tree)
+
+        all_g, all_g_bounds = interface.dispatch_bounds()
+        all_g = _shake_tree_for_penalties(interface.ocp, all_g, v, v_bounds, expand_during_shake_tree)
+
+        # Thread here on (f and all_g) instead of individually for each function?
+        interface.nlp = {"x": v, "f": sum1(all_objectives), "g": all_g}
+
+        if interface.c_compile:
+            if not interface.ocp_solver or interface.ocp.program_changed:
+                nlpsol("nlpsol", interface.solver_name.lower(), interface.nlp, options).generate_dependencies("nlp.c")
+                interface.ocp_solver = nlpsol("nlpsol", interface.solver_name, Importer("nlp.c", "shell"), options)
+                interface.ocp.program_changed = False
+        else:
+            interface.ocp_solver = nlpsol("solver", interface.solver_name.lower(), interface.nlp, options)
 
     interface.limits = {
         "lbx": v_bounds[0],
@@ -112,6 +135,8 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
         "ubg": all_g_bounds.max,
         "x0": v_init,
     }
+    if interface.opts.parametric:
+        interface.limits["p"] = p
 
     if interface.lam_g is not None:
         interface.limits["lam_g0"] = interface.lam_g
@@ -148,7 +173,124 @@ def generic_solve(interface: SolverInterface, expand_during_shake_tree: Bool = F
     return interface.out
 
 
-def _shake_tree_for_penalties(ocp, penalties_cx: CX, v: CX, v_bounds: DoubleNpArrayTuple, expand: Bool):
+def _build_parametric_solver(
+    interface: SolverInterface, v: CX, v_bounds: DoubleNpArrayTuple, options: AnyDict, expand: Bool
+):
+    """
+    Build the nlpsol of the program where the targets, the weights and the numerical timeseries of the penalties are
+    declared as the parameters (p) of the nlp instead of being embedded as constants in the graph
+
+    Parameters
+    ----------
+    interface: SolverInterface
+        A reference to the current interface
+    v: CX
+        The full vector of variables of the ocp
+    v_bounds: tuple[np.ndarray, np.ndarray]
+        The bounds of the variables
+    options: dict
+        The options to send to nlpsol
+    expand: bool
+        If the tree should be expanded during the shake tree
+    """
+
+    interface.nlp, parametric_inputs, all_g_bounds = _build_parametric_nlp(interface, v, v_bounds, expand)
+
+    if interface.c_compile:
+        nlpsol("nlpsol", interface.solver_name.lower(), interface.nlp, options).generate_dependencies("nlp.c")
+        interface.ocp_solver = nlpsol("nlpsol", interface.solver_name, Importer("nlp.c", "shell"), options)
+    else:
+        interface.ocp_solver = nlpsol("solver", interface.solver_name.lower(), interface.nlp, options)
+
+    interface.parametric_inputs = parametric_inputs
+    interface.parametric_options = options
+    interface.parametric_g_bounds = all_g_bounds
+    interface.ocp.program_changed = False
+
+
+def _build_parametric_nlp(interface: SolverInterface, v: CX, v_bounds: DoubleNpArrayTuple, expand: Bool) -> tuple:
+    """
+    Build the symbolic nlp of the program where the targets, the weights and the numerical timeseries of the penalties
+    are declared as the parameters (p) of the nlp (see _build_parametric_solver for the description of the parameters)
+
+    Returns
+    -------
+    The nlp (x, p, f, g), the symbolic parameters with the functions to get their numerical values and the bounds of
+    the constraints
+    """
+
+    interface.nlp_parameters = []
+    all_objectives = interface.dispatch_obj_func()
+    all_g, all_g_bounds = interface.dispatch_bounds()
+    parametric_inputs = interface.nlp_parameters
+    interface.nlp_parameters = None
+
+    p = vertcat(interface.ocp.cx(), *[reshape(symbol, -1, 1) for symbol, _ in parametric_inputs])
+    # The dt are not replaced by their bounds since these bounds may change between the solves
+    all_objectives = _shake_tree_for_penalties(interface.ocp, all_objectives, v, v_bounds, expand, p=p)
+    all_g = _shake_tree_for_penalties(interface.ocp, all_g, v, v_bounds, expand, p=p)
+    return {"x": v, "p": p, "f": sum1(all_objectives), "g": all_g}, parametric_inputs, all_g_bounds
+
+
+def _declare_nlp_parameter(interface, name: str, value, get_value: Callable):
+    """
+    Replace a numerical input of a penalty by a symbolic parameter of the nlp, if the interface is currently
+    collecting them (parametric mode). The get_value callable is kept so the numerical value can be fetched again at
+    each solve
+
+    Parameters
+    ----------
+    interface:
+        A reference to the current interface
+    name: str
+        The name of the symbolic parameter
+    value:
+        The current value of the input
+    get_value: Callable
+        A function that returns the current numerical value of the input
+
+    Returns
+    -------
+    The symbolic parameter or the value itself if the interface is not collecting parameters or if it is not numerical
+    """
+
+    if getattr(interface, "nlp_parameters", None) is None or isinstance(value, (SX, MX)):
+        return value
+
+    value_np = np.array(value, dtype=float)
+    if value_np.size == 0:
+        return value
+
+    shape = value_np.shape if value_np.ndim == 2 else (value_np.size, 1)
+    symbol = interface.ocp.cx.sym(name, *shape)
+    interface.nlp_parameters.append((symbol, get_value))
+    return symbol
+
+
+def _evaluate_nlp_parameters(parametric_inputs: list) -> np.ndarray | None:
+    """
+    Fetch the current numerical values of the nlp parameters
+
+    Parameters
+    ----------
+    parametric_inputs: list[tuple[CX, Callable]]
+        The symbolic parameters and the function to get their numerical values
+
+    Returns
+    -------
+    The vector of parameters or None if the dimensions do not match the ones used to build the solver anymore
+    """
+
+    values = [np.ndarray((0,))]
+    for symbol, get_value in parametric_inputs:
+        value = np.array(get_value(), dtype=float)
+        if value.size != symbol.numel():
+            return None
+        values.append(value.reshape(-1, order="F"))
+    return np.concatenate(values)
+
+
+def _shake_tree_for_penalties(ocp, penalties_cx: CX, v: CX, v_bounds: DoubleNpArrayTuple, expand: Bool, p: CX = None):
     """
     Remove the dt in the objectives and constraints if they are constant
 
@@ -166,12 +308,24 @@ def _shake_tree_for_penalties(ocp, penalties_cx: CX, v: CX, v_bounds: DoubleNpAr
         all the bounds of the variables, use to detect constant variables if min == max
     expand : bool
         expand if possible the penalty but can failed but ignored if there is matrix inversion or newton descent for example
+    p
+        The parameters of the nlp (parametric mode). If sent, the dt are kept as variables since their bounds may
+        change between the solves
 
     Returns
     -------
     The penalties without extra variables
 
     """
+    if p is not None:
+        penalty = Function("penalty", [v, p], [penalties_cx])
+        if expand:
+            try:
+                penalty = penalty.expand()
+            except RuntimeError:
+                pass
+        return penalty(v, p)
+
     dt = []
     for i in range(ocp.n_phases):
         # If min == max, then it's a constant
@@ -191,6 +345,58 @@ def _shake_tree_for_penalties(ocp, penalties_cx: CX, v: CX, v_bounds: DoubleNpAr
     return penalty(vertcat(*dt, v[len(dt) :]))
 
 
+def generic_sensitivity(interface, sol: Solution) -> AnyDict:
+    """
+    Compute the derivatives of the optimal solution with respect to the parameters of the nlp (the targets, the weights
+    and the numerical timeseries of the penalties in parametric mode). The derivatives of the solver are evaluated from
+    the KKT system at the optimum, so all the parameters are treated at once without perturbing and solving the program
+    again. The derivative function is built once and reused as long as the nlpsol is not rebuilt
+
+    Parameters
+    ----------
+    interface:
+        A reference to the current interface
+    sol: Solution
+        The solution (of the last solve) to compute the sensitivities at
+
+    Returns
+    -------
+    The derivatives of the optimization vector ("vector", n_v x n_p) and of the cost ("cost", 1 x n_p) with respect to
+    p, and the name and size of each parameter of the nlp in the order of p ("parameter_names")
+    """
+
+    if interface.ocp_solver is None or "p" not in interface.nlp or "p" not in interface.limits:
+        raise RuntimeError(
+            "The sensitivities are only available after a solve in parametric mode (solver.set_parametric(True))"
+        )
+    if interface.ocp.program_changed:
+        raise RuntimeError("The program changed since the last solve, the sensitivities cannot be computed anymore")
+    if sol is not interface.ocp._last_solution:
+        # The bounds and the parameters of the nlp (interface.limits) are the ones of the last solve
+        raise RuntimeError("The sensitivities are only available for the solution of the last solve")
+
+    if interface.sensitivity_function is None or interface.sensitivity_function[0] is not interface.ocp_solver:
+        solver = interface.ocp_solver
+        interface.sensitivity_function = (
+            solver,
+            solver.factory("sensitivity", solver.name_in(), ["jac:x:p", "jac:f:p"]),
+        )
+    sensitivity_function = interface.sensitivity_function[1]
+
+    # Starting from the optimum, the solver converges right away and the KKT system of the solution is factorized
+    limits = {key: value for key, value in interface.limits.items() if key not in ("lam_g0", "lam_x0")}
+    limits["x0"] = sol.vector
+    limits["lam_x0"] = sol.lam_x
+    limits["lam_g0"] = sol.lam_g
+    out = sensitivity_function(**limits)
+
+    return {
+        "vector": np.array(out["jac_x_p"]),
+        "cost": np.array(out["jac_f_p"]),
+        "parameter_names": [(symbol.name(), symbol.numel()) for symbol, _ in interface.parametric_inputs],
+    }
+
+
 def generic_set_lagrange_multiplier(interface, sol: Solution):
     """
     Set the lagrange multiplier from a solution structure
@@ -329,7 +535,7 @@ def generic_get_all_penalties(interface, nlp: NonLinearProgram, penalties, scale
             a = nlp.cx()
             d = None
             weight = np.ndarray((1, 0))
-            target = nlp.cx()
+            target = []
             for idx in range(len(penalty.node_idx)):
                 t0_tp, x_tp, u_tp, p, a_tp, d_tp, weight_tp, target_tp = _get_weighted_function_inputs(
                     penalty, idx, ocp, nlp, scaled
@@ -353,7 +559,11 @@ def generic_get_all_penalties(interface, nlp: NonLinearProgram, penalties, scale
                 a = horzcat(a, a_tp)
                 d = horzcat(d, d_tp) if d is not None else d_tp
                 weight = np.concatenate((weight, [[float(weight_tp)]]), axis=1)
-                target = horzcat(target, target_tp)
+                target.append(target_tp)
+            # The targets are numerical, so they are kept as such to be declared as nlp parameters
+            target = horzcat(*target)
+
+            weight, target, d = _parametrize_multi_thread_inputs(interface, penalty, ocp, nlp, weight, target, d)
 
             # We can call penalty.weighted_function[0] since multi-thread declares all the node at [0]
             tp = reshape(penalty.weighted_function[0](t0, phases_dt, x, u, p, a, d, weight, target), -1, 1)
@@ -366,6 +576,9 @@ def generic_get_all_penalties(interface, nlp: NonLinearProgram, penalties, scale
                     nlp.controls.node_index = penalty.node_idx[idx]
                     nlp.algebraic_states.node_index = penalty.node_idx[idx]
                 t0, x, u, p, a, d, weight, target = _get_weighted_function_inputs(penalty, idx, ocp, nlp, scaled)
+                weight, target, d = _parametrize_weighted_function_inputs(
+                    interface, penalty, idx, ocp, nlp, weight, target, d
+                )
 
                 node_idx = penalty.node_idx[idx]
                 tp = vertcat(tp, penalty.weighted_function[node_idx](t0, phases_dt, x, u, p, a, d, weight, target))
@@ -374,6 +587,81 @@ def generic_get_all_penalties(interface, nlp: NonLinearProgram, penalties, scale
     return out
 
 
+def _parametrize_weighted_function_inputs(
+    interface, penalty, penalty_idx: Int, ocp, nlp: NonLinearProgram, weight, target, d
+):
+    """
+    Declare the weight, the target and the numerical timeseries of a penalty node as nlp parameters (only has an effect
+    if the interface is collecting the parameters, see _declare_nlp_parameter)
+    """
+
+    weight = _declare_nlp_parameter(
+        interface, _nlp_parameter_name(penalty, "weight", penalty_idx), weight, lambda: PenaltyHelpers.weight(penalty)
+    )
+    target = _declare_nlp_parameter(
+        interface,
+        _nlp_parameter_name(penalty, "target", penalty_idx),
+        target,
+        lambda: PenaltyHelpers.target(penalty, penalty_idx),
+    )
+    if nlp:
+        d = _declare_nlp_parameter(
+            interface,
+            _nlp_parameter_name(penalty, "timeseries", penalty_idx),
+            d,
+            lambda: _get_penalty_numerical_timeseries(penalty, penalty_idx, ocp),
+        )
+    return weight, target, d
+
+
+def _parametrize_multi_thread_inputs(interface, penalty, ocp, nlp: NonLinearProgram, weight, target, d):
+    """
+    Declare the weight, the target and the numerical timeseries of all the nodes of a multi_thread penalty as nlp
+    parameters, one column per node (only has an effect if the interface is collecting the parameters, see
+    _declare_nlp_parameter)
+    """
+
+    n_nodes = len(penalty.node_idx)
+    weight = _declare_nlp_parameter(
+        interface,
+        _nlp_parameter_name(penalty, "weight"),
+        weight,
+        lambda: np.array([[float(PenaltyHelpers.weight(penalty))] * n_nodes]),
+    )
+    target = _declare_nlp_parameter(
+        interface,
+        _nlp_parameter_name(penalty, "target"),
+        target,
+        lambda: horzcat(*[PenaltyHelpers.target(penalty, i) for i in range(n_nodes)]),
+    )
+    if nlp:
+        d = _declare_nlp_parameter(
+            interface,
+            _nlp_parameter_name(penalty, "timeseries"),
+            d,
+            lambda: horzcat(*[_get_penalty_numerical_timeseries(penalty, i, ocp) for i in range(n_nodes)]),
+        )
+    return weight, target, d
+
+
+def _nlp_parameter_name(penalty, kind: Str, node: Int = None) -> Str:
+    """
+    The name of a nlp parameter of a penalty, i.e. "<penalty name>_phase<phase>_<list index>_<kind>[_<node>]". The phase
+    and the list index are part of the name since several penalties can share the same name
+    """
+
+    name = f"{penalty.name}_phase{penalty.phase}_{penalty.list_index}_{kind}"
+    return name if node is None else f"{name}_{node}"
+
+
+def _get_penalty_numerical_timeseries(penalty, penalty_idx: Int, ocp):
+    return PenaltyHelpers.numerical_timeseries(
+        penalty,
+        penalty_idx,
+        lambda p_idx, n_idx, sn_idx: get_numerical_timeseries(ocp, p_idx, n_idx, sn_idx),
+    )
+
+
 def _get_weighted_function_inputs(penalty, penalty_idx: Int, ocp, nlp: NonLinearProgram, scaled: Bool):
     t0 = PenaltyHelpers.t0(penalty, penalty_idx, lambda p_idx, n_idx: ocp.node_time(phase_idx=p_idx, node_idx=n_idx))
 
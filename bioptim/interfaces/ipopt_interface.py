@@ -7,6 +7,7 @@ from .interface_utils import (
     generic_dispatch_obj_func,
     generic_get_all_penalties,
     generic_set_lagrange_multiplier,
+    generic_sensitivity,
 )
 from .solver_interface import SolverInterface
 from ..interfaces import Solver
@@ -42,6 +43,16 @@ class IpoptInterface(SolverInterface):
         The lagrange multiplier of the constraints to initialize the solver
     lam_x: np.ndarray
         The lagrange multiplier of the variables to initialize the solver
+    nlp_parameters: list | None
+        The nlp parameters being collected while the graph is built (parametric mode only)
+    parametric_inputs: list
+        The symbolic parameters of the nlp and the functions to get their numerical values (parametric mode only)
+    parametric_options: dict
+        The options the parametric solver was built with
+    parametric_g_bounds: Bounds
+        The bounds of the constraints of the parametric solver
+    sensitivity_function: tuple[Function, Function] | None
+        The nlpsol and the derivative function of its solution with respect to the parameters of the nlp
 
     Methods
     -------
@@ -51,6 +62,8 @@ class IpoptInterface(SolverInterface):
         Solve the prepared ocp
     set_lagrange_multiplier(self, sol: dict)
         Set the lagrange multiplier from a solution structure
+    sensitivity(self, sol: Solution) -> dict
+        Compute the derivatives of the optimal solution with respect to the parameters of the nlp
     __dispatch_bounds(self)
         Parse the bounds of the full ocp to a Ipopt-friendly one
     __dispatch_obj_func(self)
@@ -79,6 +92,12 @@ class IpoptInterface(SolverInterface):
         self.lam_g = None
         self.lam_x = None
 
+        self.nlp_parameters = None
+        self.parametric_inputs = []
+        self.parametric_options = None
+        self.parametric_g_bounds = None
+        self.sensitivity_function = None
+
     def online_optim(self, ocp, show_options: AnyDictOptional = None):
         """
         Declare the online callback to update the graphs while optimizing
@@ -114,6 +133,21 @@ class IpoptInterface(SolverInterface):
         """
         sol = generic_set_lagrange_multiplier(self, sol)
 
+    def sensitivity(self, sol: Solution) -> AnyDict:
+        """
+        Compute the derivatives of the optimal solution with respect to the parameters of the nlp
+
+        Parameters
+        ----------
+        sol: Solution
+            The solution to compute the sensitivities at
+
+        Returns
+        -------
+        The sensitivities (see generic_sensitivity)
+        """
+        return generic_sensitivity(self, sol)
+
     def dispatch_bounds(self, include_g: Bool = True, include_g_internal: Bool = True, include_g_implicit: Bool = True):
         """
         Parse the bounds of the full ocp to a Ipopt-friendly one
@@ -10,6 +10,7 @@ from ..misc.parameters_types import (
     BoolOptional,
     Int,
     Float,
+    FloatOptional,
     Str,
     AnyDictOptional,
 )
@@ -49,6 +50,8 @@ class IPOPT(GenericSolver):
         "Acceptance" threshold for the complementarity conditions.
     _max_iter: int
         Maximum number of iterations.
+    _max_wall_time: float
+        Maximum wall time (in seconds) of the optimization. If None, the option is not sent to ipopt (no limit)
     _hessian_approximation: str
         Indicates what Hessian information is to be used.
     _nlp_scaling_method: str
@@ -79,6 +82,9 @@ class IPOPT(GenericSolver):
         The valid range for this integer option is 0 ≤ print_level ≤ 12 and its default value is 5.
     _c_compile: bool
         True if you want to compile in C the code.
+    _parametric: bool
+        True if the targets, weights and numerical timeseries of the penalties should be sent as parameters of the nlp.
+        The solver is then built once and reused by the subsequent solves as long as the program does not change
     _check_derivatives_for_naninf: bool
         If true, the Hessian will be checked for nan/inf values. If false this computational problem is silent.
     """
@@ -96,6 +102,7 @@ class IPOPT(GenericSolver):
     _acceptable_constr_viol_tol: Float = 1e-2
     _acceptable_compl_inf_tol: Float = 1e-2
     _max_iter: Int = 1000
+    _max_wall_time: FloatOptional = None
     _hessian_approximation: Str = "exact"  # "exact", "limited-memory"
     _nlp_scaling_method: Str = "gradient-based"  # "none"
     _limited_memory_max_history: Int = 50
@@ -111,6 +118,7 @@ class IPOPT(GenericSolver):
     _bound_frac: Float = 0.01
     _print_level: Int = 5
     _c_compile: Bool = False
+    _parametric: Bool = False
     _check_derivatives_for_naninf: Str = "no"  # "yes"
 
     @property
@@ -149,6 +157,10 @@ class IPOPT(GenericSolver):
     def max_iter(self) -> Int:
         return self._max_iter
 
+    @property
+    def max_wall_time(self) -> FloatOptional:
+        return self._max_wall_time
+
     @property
     def hessian_approximation(self) -> Str:
         return self._hessian_approximation
@@ -209,6 +221,10 @@ class IPOPT(GenericSolver):
     def c_compile(self) -> Bool:
         return self._c_compile
 
+    @property
+    def parametric(self) -> Bool:
+        return self._parametric
+
     @property
     def check_derivatives_for_naninf(self) -> Bool:
         return self._check_derivatives_for_naninf
@@ -240,6 +256,9 @@ class IPOPT(GenericSolver):
     def set_maximum_iterations(self, num: Int) -> None:
         self._max_iter = num
 
+    def set_maximum_wall_time(self, val: FloatOptional) -> None:
+        self._max_wall_time = val
+
     def set_hessian_approximation(self, val: Str) -> None:
         self._hessian_approximation = val
 
@@ -285,6 +304,9 @@ class IPOPT(GenericSolver):
     def set_c_compile(self, val: Bool) -> None:
         self._c_compile = val
 
+    def set_parametric(self, val: Bool) -> None:
+        self._parametric = val
+
     def set_check_derivatives_for_naninf(self, val: Bool) -> None:
         string_val = "yes" if val else "no"
         self._check_derivatives_for_naninf = string_val
@@ -340,8 +362,18 @@ class IPOPT(GenericSolver):
     def as_dict(self, solver):
         solver_options = self.__dict__
         options = {}
-        non_python_options = ["_c_compile", "type", "show_online_optim", "online_optim", "show_options"]
+        non_python_options = [
+            "_c_compile",
+            "_parametric",
+            "type",
+            "show_online_optim",
+            "online_optim",
+            "show_options",
+        ]
         for key in solver_options:
+            if key == "_max_wall_time" and solver_options[key] is None:
+                # Not sent unless required, so it is not sent to the versions of ipopt that do not have it
+                continue
             if key not in non_python_options:
                 ipopt_key = "ipopt." + key[1:]
                 options[ipopt_key] = solver_options[key]
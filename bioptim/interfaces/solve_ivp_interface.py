@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Any
 
 import numpy as np
@@ -6,8 +7,10 @@ from scipy.integrate import solve_ivp
 from scipy.interpolate import interp1d
 
 from ..optimization.non_linear_program import NonLinearProgram
-from ..misc.enums import Shooting, ControlType, SolutionIntegrator
+from ..misc.enums import Shooting, ControlType, SolutionIntegrator, PhaseDynamics
 from ..misc.parameters_types import (
+    Bool,
+    Int,
     NpArrayList,
     NpArray,
     Float,
@@ -25,6 +28,7 @@ def solve_ivp_interface(
     a: NpArrayList,
     d: NpArrayList,
     method: SolutionIntegrator = SolutionIntegrator.SCIPY_RK45,
+    n_threads: Int = 1,
 ):
     """
     This function solves the initial value problem with the dynamics_func built by bioptim
@@ -49,6 +53,8 @@ def solve_ivp_interface(
         The way we integrate the solution such as SINGLE, SINGLE_CONTINUOUS, MULTIPLE
     method: SolutionIntegrator
         The integrator to use to solve the OCP
+    n_threads: int
+        The number of threads to use. It is only used for Shooting.MULTIPLE as the intervals are then independent
 
     Returns
     -------
@@ -56,23 +62,204 @@ def solve_ivp_interface(
         array of the solution of the system at the times t_eval
     """
 
+    def integrate_node(node: Int, x0i: NpArray) -> NpArray:
+        return _solve_ivp_node(list_of_dynamics, nlp, node, t, x0i, u, p, a, d, method)
+
+    if shooting_type == Shooting.MULTIPLE and _can_map_intervals(nlp, x, u, a, d, method):
+        # All the intervals are integrated in a single call of the integrator mapped over the nodes
+        y = _solve_ivp_bioptim_mapped_interface(nlp, t, x, u, p, a, d, n_threads)
+
+    elif shooting_type == Shooting.MULTIPLE and n_threads > 1 and nlp.ns > 1:
+        # The intervals are independent, so they are dispatched to a pool of threads
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            y = list(pool.map(lambda node: integrate_node(node, np.array(x[node])), range(nlp.ns)))
+
+    else:
+        y = []
+        for node in range(nlp.ns):
+            # If multiple shooting, we need to set the first x0, otherwise use the previous answer
+            y.append(
+                integrate_node(
+                    node, np.array(x[node] if node == 0 or shooting_type == Shooting.MULTIPLE else y[-1][:, -1])
+                )
+            )
+
+    y.append(x[-1] if shooting_type == Shooting.MULTIPLE else y[-1][:, -1][:, np.newaxis])
+
+    return y
+
+
+def _solve_ivp_node(
+    list_of_dynamics: list[Callable],
+    nlp: NonLinearProgram,
+    node: Int,
+    t: NpArrayList,
+    x0i: NpArray,
+    u: NpArrayList,
+    p: NpArrayList,
+    a: NpArrayList,
+    d: NpArrayList,
+    method: SolutionIntegrator,
+) -> NpArray:
+    """
+    Solve the initial value problem of one interval (see solve_ivp_interface for the description of the parameters)
+
+    Returns
+    -------
+    The solution of the system at the times t_eval of the interval
+    """
+
+    if method == SolutionIntegrator.OCP:
+        t_span = vertcat(t[node][0], t[node][1] - t[node][0])
+    else:
+        t_span = t[node]
+    t_eval = np.linspace(float(t_span[0]), float(t_span[1]), nlp.n_states_stepwise_steps(node))
+
+    if method == SolutionIntegrator.OCP:
+        return _solve_ivp_bioptim_interface(
+            lambda t, x: nlp.dynamics[node](t, x, u[node], p, a[node], d[node])[1], x0=x0i, t_span=np.array(t_span)
+        )
+
+    elif method in (
+        SolutionIntegrator.SCIPY_RK45,
+        SolutionIntegrator.SCIPY_RK23,
+        SolutionIntegrator.SCIPY_DOP853,
+        SolutionIntegrator.SCIPY_BDF,
+        SolutionIntegrator.SCIPY_LSODA,
+    ):
+        # Prevent from integrating collocation points
+        if len(x0i.shape) > 1:
+            x0i = x0i[:, 0]
+
+        return _solve_ivp_scipy_interface(
+            lambda t, x: np.array(
+                list_of_dynamics[node](
+                    t, x, _control_function(nlp.control_type, t, t_span, u[node]), p, a[node], d[node]
+                )
+            )[:, 0],
+            x0=x0i,
+            t_span=np.array(t_span),
+            t_eval=t_eval,
+            method=method.value,
+        )
+
+    else:
+        raise NotImplementedError(f"{method} is not implemented yet")
+
+
+def _can_map_intervals(
+    nlp: NonLinearProgram, x: NpArrayList, u: NpArrayList, a: NpArrayList, d: NpArrayList, method: SolutionIntegrator
+) -> Bool:
+    """
+    If the intervals can be integrated in a single call of the integrator of the ocp mapped over the nodes. This
+    requires the same integrator for all the nodes and inputs of the same shape at each node
+    """
+
+    if method != SolutionIntegrator.OCP or nlp.phase_dynamics != PhaseDynamics.SHARED_DURING_THE_PHASE or nlp.ns < 2:
+        return False
+    for data in (x, u, a, d):
+        if len(set(np.array(data[node]).shape for node in range(nlp.ns))) > 1:
+            return False
+    return True
+
+
+def _solve_ivp_bioptim_mapped_interface(
+    nlp: NonLinearProgram,
+    t: NpArrayList,
+    x: NpArrayList,
+    u: NpArrayList,
+    p: NpArrayList,
+    a: NpArrayList,
+    d: NpArrayList,
+    n_threads: Int,
+) -> NpArrayList:
+    """
+    Integrate all the intervals of a phase at once (multiple shooting) with the integrator of the ocp mapped over the
+    nodes (see solve_ivp_interface for the description of the parameters)
+
+    Returns
+    -------
+    The solution of the system at the times t_eval of each interval
+    """
+
+    def stack(data: NpArrayList) -> NpArray:
+        if np.array(data[0]).size == 0:
+            return np.array([])
+        return np.concatenate([np.array(data[node]).reshape(len(data[node]), -1) for node in range(nlp.ns)], axis=1)
+
+    t_span = np.concatenate([np.array(vertcat(t[node][0], t[node][1] - t[node][0])) for node in range(nlp.ns)], axis=1)
+    integrator = nlp.dynamics[0].map(nlp.ns, "thread", n_threads)
+    xall = np.array(integrator(t_span, stack(x), stack(u), p, stack(a), stack(d))[1])
+
+    # The outputs of the nodes are horizontally concatenated
+    return np.split(xall, nlp.ns, axis=1)
+
+
+def solve_ivp_batch_interface(
+    list_of_dynamics: list[Callable],
+    nlp: NonLinearProgram,
+    t: NpArrayList,
+    x0: NpArray,
+    u: NpArrayList,
+    p: NpArrayList,
+    a: NpArrayList,
+    d: NpArrayList,
+    method: SolutionIntegrator = SolutionIntegrator.SCIPY_RK45,
+    reduce: Callable = None,
+) -> list:
+    """
+    This function solves the initial value problem of a batch of trajectories in lock-step (single shooting). The
+    dynamics of each node must be mapped over the trajectories, so each trajectory is a column of the states and of the
+    parameters. For SolutionIntegrator.OCP, the dynamics are the mapped integrators of the ocp, otherwise they are the
+    mapped ordinary differential equations (t, x, u, p, a, d) -> xdot
+
+    Parameters
+    ----------
+    list_of_dynamics: list[Callable]
+        The mapped dynamics of each node
+    nlp: NonLinearProgram
+        The current instance of the NonLinearProgram
+    t : np.ndarray
+        array of time
+    x0 : np.ndarray
+        The initial conditions of each trajectory (n_states x n_trajectories)
+    u : np.ndarray
+        arrays of controls u evaluated at t_eval (shared by all the trajectories)
+    p : np.ndarray
+        The parameters of each trajectory at each node (n_parameters x n_trajectories)
+    a : np.ndarray
+        array of the algebraic states of the system (shared by all the trajectories)
+    d : np.ndarray
+        array of the numerical timeseries (shared by all the trajectories)
+    method: SolutionIntegrator
+        The integrator to use to solve the OCP
+    reduce: Callable
+        A function applied to the states of each node (n_states x n_steps x n_trajectories) as soon as the node is
+        integrated. Its output is kept instead of the states, so only one node of states is in memory at a time
+
+    Returns
+    -------
+    y: list
+        The states of each node (n_states x n_steps x n_trajectories), or their reduction if reduce is provided
+    """
+
     y = []
     control_type = nlp.control_type
+    n_states, n_trajectories = x0.shape
 
     for node in range(nlp.ns):
         if method == SolutionIntegrator.OCP:
             t_span = vertcat(t[node][0], t[node][1] - t[node][0])
         else:
             t_span = t[node]
-        t_eval = np.linspace(float(t_span[0]), float(t_span[1]), nlp.n_states_stepwise_steps(node))
-
-        # If multiple shooting, we need to set the first x0, otherwise use the previous answer
-        x0i = np.array(x[node] if node == 0 or shooting_type == Shooting.MULTIPLE else y[-1][:, -1])
+        n_steps = nlp.n_states_stepwise_steps(node)
+        t_eval = np.linspace(float(t_span[0]), float(t_span[1]), n_steps)
+        x0i = x0 if node == 0 else x_end
 
         if method == SolutionIntegrator.OCP:
-            result = _solve_ivp_bioptim_interface(
-                lambda t, x: nlp.dynamics[node](t, x, u[node], p, a[node], d[node])[1], x0=x0i, t_span=np.array(t_span)
-            )
+            # The outputs of the trajectories are horizontally concatenated
+            result = np.array(list_of_dynamics[node](t_span, x0i, u[node], p[node], a[node], d[node])[1])
+            result = result.reshape((n_states, n_trajectories, -1)).transpose((0, 2, 1))
 
         elif method in (
             SolutionIntegrator.SCIPY_RK45,
@@ -81,28 +268,33 @@ def solve_ivp_interface(
             SolutionIntegrator.SCIPY_BDF,
             SolutionIntegrator.SCIPY_LSODA,
         ):
-            # Prevent from integrating collocation points
-            if len(x0i.shape) > 1:
-                x0i = x0i[:, 0]
-
+            # All the trajectories are stacked in a single (column-major) vector so they share the same time steps
             result = _solve_ivp_scipy_interface(
                 lambda t, x: np.array(
                     list_of_dynamics[node](
-                        t, x, _control_function(control_type, t, t_span, u[node]), p, a[node], d[node]
+                        t,
+                        x.reshape((n_states, n_trajectories), order="F"),
+                        _control_function(control_type, t, t_span, u[node]),
+                        p[node],
+                        a[node],
+                        d[node],
                     )
-                )[:, 0],
-                x0=x0i,
+                ).reshape(-1, order="F"),
+                x0=x0i.reshape(-1, order="F"),
                 t_span=np.array(t_span),
                 t_eval=t_eval,
                 method=method.value,
             )
+            result = result.reshape((n_states, n_trajectories, n_steps), order="F").transpose((0, 2, 1))
 
         else:
             raise NotImplementedError(f"{method} is not implemented yet")
 
-        y.append(result)
+        # Copied so the states of the node are not kept alive once reduced
+        x_end = np.array(result[:, -1, :])
+        y.append(result if reduce is None else reduce(result))
 
-    y.append(x[-1] if shooting_type == Shooting.MULTIPLE else y[-1][:, -1][:, np.newaxis])
+    y.append(x_end[:, np.newaxis, :] if reduce is None else reduce(x_end[:, np.newaxis, :]))
 
     return y
 
@@ -30,6 +30,8 @@ class SolverInterface:
         Create the necessary folder and create the file to store the iterations while optimizing
     finish_get_iterations(self)
         Close the file where iterations are saved and remove temporary folders
+    sensitivity(self, sol) -> dict
+        Compute the derivatives of the optimal solution with respect to the parameters of the nlp
     finalize_objective_value(j: dict) -> MX | SX
         Apply weight and dt to all objective values and convert them to scalar value
     """
@@ -113,3 +115,19 @@ class SolverInterface:
         """
 
         raise RuntimeError("Get Iteration not implemented for solver")
+
+    def sensitivity(self, sol) -> AnyDict:
+        """
+        Compute the derivatives of the optimal solution with respect to the parameters of the nlp
+
+        Parameters
+        ----------
+        sol: Solution
+            The solution to compute the sensitivities at
+
+        Returns
+        -------
+        The sensitivities
+        """
+
+        raise NotImplementedError("The sensitivities are not implemented for this solver")
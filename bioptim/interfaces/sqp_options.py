@@ -16,6 +16,12 @@ from ..misc.parameters_types import (
     AnyDictOptional,
 )
 
+# The sparse active-set QP solver shipped with CasADi. Unlike the dense qpoases, it factorizes the block-banded KKT
+# system of the multiple shooting with a sparse QR, so the cost of an SQP iteration grows linearly with the number of
+# shooting nodes. It also accepts the indefinite exact hessian of the lagrangian, which the convex QP solvers reject
+STRUCTURED_QP_SOLVER = "qrqp"
+STRUCTURED_QP_SOLVER_OPTIONS = {"print_header": False, "print_iter": False, "print_info": False}
+
 
 @dataclass
 class SQP_METHOD(GenericSolver):
@@ -51,8 +57,12 @@ class SQP_METHOD(GenericSolver):
         Print the header with problem statistics
     set_print_time(print_time: bool):
         Print information about execution time
+    set_parametric(parametric: bool):
+        Send the targets, weights and numerical timeseries as parameters of the nlp so the solver is built only once
     set_qpsol(qpsol: str):
         The QP solver to be used by the SQP method
+    set_structured_qp(structured_qp: bool):
+        Solve the QP subproblems with a sparse solver that exploits the stage structure of the ocp (overrides qpsol)
     set_tol_du(tol_du: float):
         Stopping criterion for dual infeasability
     set_tol_pr(tol_pr: float):
@@ -77,9 +87,11 @@ class SQP_METHOD(GenericSolver):
     _max_iter: int
     _max_iter_ls: int
     _merit_memory: int
+    _parametric: bool
     _print_header: bool
     _print_time: bool
     _qpsol: str
+    _structured_qp: bool
     _tol_du: float
     _tol_pr: float
 
@@ -90,6 +102,7 @@ class SQP_METHOD(GenericSolver):
     online_optim: OnlineOptim | None = None
     show_options: AnyDictOptional = None
     _c_compile: Bool = False
+    _parametric: Bool = False
     _beta: Float = 0.8
     _c1: Float = 1e-4
     _hessian_approximation: Str = "exact"  # "exact", "limited-memory"
@@ -100,6 +113,7 @@ class SQP_METHOD(GenericSolver):
     _print_header: Bool = True
     _print_time: Bool = True
     _qpsol: Str = "qpoases"
+    _structured_qp: Bool = False
     _tol_du: Float = 1e-6
     _tol_pr: Float = 1e-6
 
@@ -107,6 +121,10 @@ class SQP_METHOD(GenericSolver):
     def c_compile(self) -> Bool:
         return self._c_compile
 
+    @property
+    def parametric(self) -> Bool:
+        return self._parametric
+
     @property
     def beta(self) -> Float:
         return self._beta
@@ -147,6 +165,10 @@ class SQP_METHOD(GenericSolver):
     def qpsol(self) -> Str:
         return self._qpsol
 
+    @property
+    def structured_qp(self) -> Bool:
+        return self._structured_qp
+
     @property
     def tol_du(self) -> Float:
         return self._tol_du
@@ -158,6 +180,12 @@ class SQP_METHOD(GenericSolver):
     def set_c_compile(self, c_compile: Bool) -> None:
         self._c_compile = c_compile
 
+    def set_parametric(self, parametric: Bool) -> None:
+        """
+        Send the targets, weights and numerical timeseries as parameters of the nlp so the solver is built only once
+        """
+        self._parametric = parametric
+
     def set_beta(self, beta: Float) -> None:
         """
         Line-search parameter, restoration factor of stepsize
@@ -218,6 +246,14 @@ class SQP_METHOD(GenericSolver):
         """
         self._qpsol = qpsol
 
+    def set_structured_qp(self, structured_qp: Bool) -> None:
+        """
+        Solve the QP subproblems with a sparse solver that exploits the block-banded (stage by stage) structure of the
+        multiple shooting, instead of the qpsol one. The cost of an SQP iteration then grows linearly with the number of
+        shooting nodes (instead of cubically with the dense qpoases)
+        """
+        self._structured_qp = structured_qp
+
     def set_tol_du(self, tol_du: Float) -> None:
         """
         Stopping criterion for dual infeasability
@@ -255,11 +291,23 @@ class SQP_METHOD(GenericSolver):
     def as_dict(self, solver) -> AnyDict:
         solver_options = self.__dict__
         options = {}
-        non_python_options = ["_c_compile", "type", "show_online_optim", "online_optim", "show_options"]
+        non_python_options = [
+            "_c_compile",
+            "_parametric",
+            "_structured_qp",
+            "type",
+            "show_online_optim",
+            "online_optim",
+            "show_options",
+        ]
         for key in solver_options:
             if key not in non_python_options:
                 sqp_key = key[1:]
                 options[sqp_key] = solver_options[key]
+
+        if self._structured_qp:
+            options["qpsol"] = STRUCTURED_QP_SOLVER
+            options["qpsol_options"] = {**STRUCTURED_QP_SOLVER_OPTIONS, **options.get("qpsol_options", {})}
         return {**options, **solver.options_common}
 
     def set_print_level(self, num: Int) -> None:
@@ -10,6 +10,7 @@ from ..misc.options import OptionList
 from ..misc.parameters_types import (
     Bool,
     Int,
+    Float,
     Str,
     FloatOptional,
     NpArrayorFloatOptional,
@@ -325,6 +326,34 @@ class ObjectiveFunction:
 
         ocp_or_nlp.J[list_index].target = new_target
 
+    @staticmethod
+    def update_weight(ocp_or_nlp: Any, list_index: Int, new_weight: Float):
+        """
+        Update a specific weight. Since the weight is an input of the weighted function of the penalty, the program does
+        not have to be rebuilt (in parametric mode, the new value is simply sent as a parameter of the nlp)
+
+        Parameters
+        ----------
+        ocp_or_nlp: OptimalControlProgram  NonLinearProgram
+            The reference to where to find J
+        list_index: int
+            The index in J
+        new_weight: float
+            The weight to set
+        """
+
+        if list_index >= len(ocp_or_nlp.J) or list_index < 0 or ocp_or_nlp.J[list_index] is None:
+            raise ValueError("'list_index' must be defined properly")
+
+        objective = ocp_or_nlp.J[list_index]
+        if not objective.has_weight_input:
+            # The weighted function of an objective declared with a weight of 0 does not depend on its weight input
+            raise ValueError(
+                "The weight of an objective declared with a weight of 0 cannot be updated, declare it with a non-zero "
+                "weight instead"
+            )
+        objective.weight = float(new_weight)
+
 
 class ObjectiveFcn:
     """
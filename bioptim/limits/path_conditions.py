@@ -56,6 +56,12 @@ class PathCondition(np.ndarray):
         Slice of the array
     custom_function: Callable
         Custom function to describe the path condition interpolation
+    _evaluated: dict
+        The cached evaluations of evaluate_all, reset when the values, the time or the dimensions change
+    _interpolant: interp1d
+        The cached spline interpolant (InterpolationType.SPLINE only)
+    _cached_source: tuple
+        A copy of the values and time the caches were computed from
 
     Methods
     -------
@@ -70,6 +76,12 @@ class PathCondition(np.ndarray):
         of required elements and time. If the function exit, then everything is okay
     evaluate_at(self, shooting_point: int)
         Evaluate the interpolation at a specific shooting point
+    evaluate_at_points(self, shooting_points: np.ndarray, repeat: int)
+        Evaluate the interpolation at multiple shooting points at once
+    evaluate_all(self, n_shooting: int, repeat: int)
+        Evaluate the interpolation at every shooting point, caching the result
+    _refresh_caches(self)
+        Reset the caches if the values or the time changed since they were computed
     """
 
     def __new__(
@@ -161,6 +173,9 @@ class PathCondition(np.ndarray):
         obj.t = t
         obj.extra_params = extra_params
         obj.slice_list = slice_list
+        obj._evaluated = {}
+        obj._interpolant = None
+        obj._cached_source = None
         if interpolation == InterpolationType.CUSTOM:
             obj.custom_function = custom_function
 
@@ -184,6 +199,10 @@ class PathCondition(np.ndarray):
         self.t = getattr(obj, "t", None)
         self.extra_params = getattr(obj, "extra_params", None)
         self.slice_list = getattr(obj, "slice_list", None)
+        # The cached evaluations are not shared since the values may differ
+        self._evaluated = {}
+        self._interpolant = None
+        self._cached_source = None
 
     def __array__(self) -> NpArray:
         return array([self])
@@ -216,6 +235,9 @@ class PathCondition(np.ndarray):
         self.t = state[-3]
         self.extra_params = state[-2]
         self.slice_list = state[-1]
+        self._evaluated = {}
+        self._interpolant = None
+        self._cached_source = None
         # Call the parent's __setstate__ with the other tuple elements.
         super(PathCondition, self).__setstate__(state[0:-5], *args, **kwargs)
 
@@ -234,6 +256,7 @@ class PathCondition(np.ndarray):
             The human readable name of the data structure
         """
 
+        previous_n_shooting = self.n_shooting
         if (
             self.type == InterpolationType.CONSTANT
             or self.type == InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT
@@ -249,6 +272,8 @@ class PathCondition(np.ndarray):
                 raise RuntimeError(
                     f"Invalid number of shooting ({self.n_shooting}), the expected number is {n_shooting}"
                 )
+        if self.n_shooting != previous_n_shooting:
+            self._evaluated = {}
 
         if self.type == InterpolationType.CUSTOM:
             parameters = {}
@@ -315,8 +340,7 @@ class PathCondition(np.ndarray):
         elif self.type == InterpolationType.ALL_POINTS:
             return self[:, shooting_point]
         elif self.type == InterpolationType.SPLINE:
-            spline = interp1d(self.t, self)
-            return spline(shooting_point / self.n_shooting * (self.t[-1] - self.t[0]))
+            return self._spline(shooting_point / self.n_shooting * (self.t[-1] - self.t[0]))
         elif self.type == InterpolationType.CUSTOM:
             if self.slice_list is not None:
                 slice_list = self.slice_list
@@ -334,6 +358,112 @@ class PathCondition(np.ndarray):
         else:
             raise RuntimeError(f"InterpolationType is not implemented yet")
 
+    def evaluate_at_points(self, shooting_points: IntIterableorNpArray, repeat: Int = 1) -> NpArray:
+        """
+        Evaluate the interpolation at multiple shooting points at once. This is the vectorized equivalent of calling
+        evaluate_at for each of the shooting points
+
+        Parameters
+        ----------
+        shooting_points: list | np.ndarray
+            The shooting points to evaluate the path condition at
+        repeat: int
+            The number of collocation points (only used for InterpolationType.LINEAR in collocations)
+
+        Returns
+        -------
+        The values of the components (rows) at each of the shooting points (columns)
+        """
+
+        if self.n_shooting is None:
+            raise RuntimeError(f"check_and_adjust_dimensions must be called at least once before evaluating at")
+
+        shooting_points = np.asarray(shooting_points, dtype=int)
+        values = self.view(np.ndarray)
+        if self.type == InterpolationType.CONSTANT:
+            return np.repeat(values[:, 0:1], shooting_points.shape[0], axis=1)
+        elif self.type == InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT:
+            if (shooting_points > self.n_shooting).any():
+                raise RuntimeError("shooting point too high")
+            columns = np.ones(shooting_points.shape, dtype=int)
+            columns[shooting_points == 0] = 0
+            columns[shooting_points == self.n_shooting] = 2
+            return values[:, columns]
+        elif self.type == InterpolationType.LINEAR:
+            return values[:, 0:1] + (values[:, 1:2] - values[:, 0:1]) * shooting_points / (self.n_shooting * repeat)
+        elif self.type == InterpolationType.EACH_FRAME or self.type == InterpolationType.ALL_POINTS:
+            return values[:, shooting_points]
+        elif self.type == InterpolationType.SPLINE:
+            return self._spline(shooting_points / self.n_shooting * (self.t[-1] - self.t[0]))
+        elif self.type == InterpolationType.CUSTOM:
+            # There is no way to vectorize a user defined function
+            out = [np.array(self.evaluate_at(point, repeat)).reshape(-1) for point in shooting_points]
+            return np.array(out).T if out else np.ndarray((0, 0))
+        else:
+            raise RuntimeError(f"InterpolationType is not implemented yet")
+
+    def evaluate_all(self, n_shooting: Int, repeat: Int = 1) -> NpArray:
+        """
+        Evaluate the interpolation at every shooting point from 0 to n_shooting (included). The result is cached so
+        subsequent calls only compare the values and the time with the ones the cache was computed from, whatever the
+        way they were modified (item assignment, views, in-place operations). The evaluations of InterpolationType.CUSTOM
+        are never cached since the function may depend on a state that changes between the calls. The returned matrix
+        is read-only
+
+        Parameters
+        ----------
+        n_shooting: int
+            The last shooting point to evaluate the path condition at
+        repeat: int
+            The number of collocation points (only used for InterpolationType.LINEAR in collocations)
+
+        Returns
+        -------
+        The values of the components (rows) at each of the shooting points (columns)
+        """
+
+        if self.type == InterpolationType.CUSTOM:
+            values = self.evaluate_at_points(np.arange(n_shooting + 1), repeat)
+            values.flags.writeable = False
+            return values
+
+        self._refresh_caches()
+        key = (n_shooting, repeat, self.n_shooting)
+        if key not in self._evaluated:
+            values = self.evaluate_at_points(np.arange(n_shooting + 1), repeat)
+            values.flags.writeable = False
+            self._evaluated[key] = values
+        return self._evaluated[key]
+
+    @property
+    def _spline(self) -> interp1d:
+        """
+        The spline interpolant of the path condition, built once for each values and time
+        """
+
+        self._refresh_caches()
+        if self._interpolant is None:
+            self._interpolant = interp1d(self.t, self.view(np.ndarray))
+        return self._interpolant
+
+    def _refresh_caches(self):
+        """
+        Reset the caches if the values or the time changed since they were computed. Comparing with a copy catches all
+        the ways of modifying the values (including through a view or an in-place operation), and is much cheaper than
+        evaluating again
+        """
+
+        values = self.view(np.ndarray)
+        t = np.array(() if self.t is None else self.t, dtype=float)
+        if self._cached_source is not None:
+            cached_values, cached_t = self._cached_source
+            if np.array_equal(cached_values, values, equal_nan=True) and np.array_equal(cached_t, t):
+                return
+
+        self._evaluated = {}
+        self._interpolant = None
+        self._cached_source = (values.copy(), t)
+
 
 class Bounds(OptionGeneric):
     """
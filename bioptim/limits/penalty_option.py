@@ -1,7 +1,7 @@
 from typing import Any, Callable
 
 import numpy as np
-from casadi import vertcat, Function, jacobian, diag
+from casadi import vertcat, Function, jacobian, diag, MX, SX
 
 from ..optimization.optimization_variable import OptimizationVariableList
 from .penalty_controller import PenaltyController
@@ -63,6 +63,8 @@ class PenaltyOption(OptionGeneric):
         The casadi function of the penalty
     weighted_function: Function
         The casadi function of the penalty weighted
+    has_weight_input: bool
+        If the weighted function depends on its weight input (False if the penalty was declared with a weight of 0)
     derivative: bool
         If the minimization is applied on the numerical derivative of the state [f(t+1) - f(t)]
     explicit_derivative: bool
@@ -75,6 +77,10 @@ class PenaltyOption(OptionGeneric):
         If the penalty is from the user or from bioptim (implicit or internal)
     multi_thread: bool
         If the penalty is multithreaded
+    _node_groups: list[list[int]] | None
+        The cached node_groups, reset when the functions are set again
+    _mapped_functions: dict
+        The cached mapped_function, reset when the functions are set again
 
     Methods
     -------
@@ -99,6 +105,10 @@ class PenaltyOption(OptionGeneric):
         Resets a penalty. A negative penalty index creates a new empty penalty (abstract)
     _get_penalty_node_list(self, ocp, nlp) -> PenaltyController
         Get the actual node (time, X and U) specified in the penalty
+    node_groups(self) -> list[list[int]]
+        The nodes grouped by what their weighted function computes
+    mapped_function(self, function: Function, n_nodes: int, n_threads: int) -> Function
+        A function of the penalty mapped over several nodes
     """
 
     def __init__(
@@ -209,10 +219,13 @@ class PenaltyOption(OptionGeneric):
         self.multinode_idx = None
         self.dt = 0
         self.weight = weight
+        self.has_weight_input = False
         self.function: list[Function | None] = []
         self.function_non_threaded: list[Function | None] = []
         self.weighted_function: list[Function | None] = []
         self.weighted_function_non_threaded: list[Function | None] = []
+        self._node_groups = None
+        self._mapped_functions = {}
 
         self.multinode_penalty = False
         self.nodes_phase = None  # This is relevant for multinodes
@@ -420,6 +433,10 @@ class PenaltyOption(OptionGeneric):
         # Alias some variables
         node = controller.node_index
 
+        # The functions change, so do their groups and mappings
+        self._node_groups = None
+        self._mapped_functions = {}
+
         dt = controller.dt.cx
         time = controller.time.cx
         phases_dt = controller.phases_dt.cx
@@ -451,6 +468,7 @@ class PenaltyOption(OptionGeneric):
         target_cx = controller.cx.sym("target", target_shape)
         weight_cx = controller.cx.sym("weight", 1, 1)
         exponent = 2 if self.quadratic and self.weight else 1
+        self.has_weight_input = bool(self.weight)
 
         if is_trapezoidal:
             # Hypothesis for APPROXIMATE_TRAPEZOIDAL: the function is continuous on states
@@ -621,6 +639,58 @@ class PenaltyOption(OptionGeneric):
             self.function[node] = self.function[node].expand()
             self.weighted_function[node] = self.weighted_function[node].expand()
 
+    @property
+    def node_groups(self) -> list[list[int]]:
+        """
+        The indices (in node_idx) of the nodes grouped by what their weighted function computes, so each group can be
+        evaluated with a single mapped call. Each node has its own Function, so they are compared structurally, which
+        is only done once for the penalty
+
+        Returns
+        -------
+        The indices of the nodes of each group
+        """
+
+        if self._node_groups is None:
+            groups = {}
+            keys = {}
+            for idx, node in enumerate(self.node_idx):
+                function = self.weighted_function_non_threaded[node]
+                if id(function) not in keys:
+                    keys[id(function)] = _function_key(function)
+                groups.setdefault(keys[id(function)], []).append(idx)
+            self._node_groups = list(groups.values())
+        return self._node_groups
+
+    def mapped_function(self, function: Function, n_nodes: Int, n_threads: Int) -> Function:
+        """
+        A function of the penalty (function_non_threaded or weighted_function_non_threaded) mapped over several nodes.
+        The mapping is cached, so it is shared by all the solutions of the program
+
+        Parameters
+        ----------
+        function: Function
+            The function of a single node
+        n_nodes: int
+            The number of nodes to evaluate at once
+        n_threads: int
+            The number of threads of the ocp
+
+        Returns
+        -------
+        The mapped function
+        """
+
+        key = (id(function), n_nodes, n_threads)
+        if key not in self._mapped_functions:
+            if n_threads > 1:
+                mapped = function.map(n_nodes, "thread", n_threads)
+            else:
+                mapped = function.map(n_nodes)
+            # The function is kept in the cache so its id cannot be reused by another one
+            self._mapped_functions[key] = (function, mapped)
+        return self._mapped_functions[key][1]
+
     def _check_sanity_of_penalty_interactions(self, controller: PenaltyController):
         if self.multinode_penalty and self.explicit_derivative:
             raise ValueError("multinode_penalty and explicit_derivative cannot be true simultaneously")
@@ -1007,3 +1077,26 @@ class PenaltyOption(OptionGeneric):
             a_scaled = [nlp.A_scaled[idx] for idx in t_idx]
         d = [nlp.numerical_timeseries for idx in t_idx]
         return PenaltyController(ocp, nlp, t_idx, x, u, x_scaled, u_scaled, nlp.parameters.cx, a, a_scaled, d)
+
+
+def _function_key(function: Function):
+    """
+    A key that is the same for the functions that compute the same values
+
+    Parameters
+    ----------
+    function: Function
+        The function of a node of the penalty
+
+    Returns
+    -------
+    The serialized function, or the id of the function if it cannot be serialized
+    """
+
+    # The symbols of each node have their own names, so the function is rebuilt from anonymous inputs
+    cx = SX if function.is_a("SXFunction") else MX
+    inputs = [cx.sym(f"i{i}", function.sparsity_in(i)) for i in range(function.n_in())]
+    try:
+        return Function("key", inputs, function.call(inputs, True, False)).serialize()
+    except RuntimeError:
+        return id(function)
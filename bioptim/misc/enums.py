@@ -223,6 +223,16 @@ class DefectType(Enum):
     NOT_APPLICABLE = "not_applicable"
 
 
+class ScalingStrategy(Enum):
+    """
+    Selection of the way the magnitude of the variables is estimated by OptimalControlProgram.auto_scale
+    """
+
+    BOUNDS = "bounds"  # The largest finite bound of each variable
+    INITIAL_GUESS = "initial_guess"  # The largest absolute initial guess of each variable
+    JACOBIAN = "jacobian"  # The largest derivative of the objective and constraints at the initial guess
+
+
 class MagnitudeType(Enum):
     RELATIVE = "relative"
     ABSOLUTE = "absolute"
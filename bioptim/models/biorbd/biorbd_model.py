@@ -1,3 +1,5 @@
+import hashlib
+import os
 from typing import Callable
 
 import biorbd_casadi as biorbd
@@ -14,6 +16,7 @@ from bioptim.models.biorbd.external_forces import (
     ExternalForceSetTimeSeries,
     ExternalForceSetVariables,
 )
+from ..function_cache import FunctionDiskCache, _signature
 from ..utils import _var_mapping, bounds_from_ranges, cache_function
 from ...limits.path_conditions import Bounds
 from ...misc.mapping import BiMapping, BiMappingList
@@ -34,6 +37,7 @@ class BiorbdModel:
         friction_coefficients: np.ndarray = None,
         parameters: ParameterList = None,
         external_force_set: ExternalForceSetTimeSeries | ExternalForceSetVariables = None,
+        function_cache: FunctionDiskCache | str = None,
     ):
         """
         Parameters
@@ -47,6 +51,9 @@ class BiorbdModel:
             parameters. The user can use this callback to modify the model.
         external_force_set: ExternalForceSetTimeSeries
             The external forces to add to the model
+        function_cache: FunctionDiskCache | str
+            The persistent cache (or the directory of the cache) where the CasADi functions of the model are
+            serialized. If None, the functions are only cached in memory
         """
 
         if not isinstance(bio_model, str) and not isinstance(bio_model, biorbd.Model):
@@ -68,6 +75,8 @@ class BiorbdModel:
         self.parameters = parameters.mx if parameters else MX()
 
         self._cached_functions = {}
+        self.function_cache = FunctionDiskCache(function_cache) if isinstance(function_cache, str) else function_cache
+        self._model_signature = self._compute_model_signature(parameters) if self.function_cache is not None else None
 
     def _symbolic_variables(self):
         """Declaration of MX variables of the right shape for the creation of CasADi Functions"""
@@ -107,7 +116,76 @@ class BiorbdModel:
         return BiorbdModel(self.path)
 
     def serialize(self) -> tuple[Callable, dict]:
-        return BiorbdModel, dict(bio_model=self.path, external_force_set=self.external_force_set)
+        return BiorbdModel, dict(
+            bio_model=self.path, external_force_set=self.external_force_set, function_cache=self.function_cache
+        )
+
+    def _compute_model_signature(self, parameters: ParameterList = None) -> str | None:
+        """
+        The part of the signature of the model that cannot change after its creation: the content of the bioMod file,
+        the parameters and the layout of the external forces
+
+        Returns
+        -------
+        The signature, or None if the model was not loaded from a file (the persistent cache is then not used)
+        """
+
+        if not os.path.isfile(self.path):
+            return None
+
+        hasher = hashlib.sha256()
+        with open(self.path, "rb") as file:
+            hasher.update(file.read())
+        hasher.update(biorbd.__version__.encode())
+
+        if parameters is not None:
+            # The parameters modify the model through their callback, so the callback is part of the signature
+            for param_key in parameters:
+                param = parameters[param_key]
+                function = param.function
+                hasher.update(
+                    _signature(
+                        (
+                            param.name,
+                            param.size,
+                            param.scaling.scaling,
+                            function.__code__.co_code if function else None,
+                            function.__code__.co_consts if function else None,
+                            [cell.cell_contents for cell in function.__closure__ or ()] if function else None,
+                            param.kwargs,
+                        )
+                    ).encode()
+                )
+
+        if self.external_force_set is not None:
+            hasher.update(type(self.external_force_set).__name__.encode())
+            for force_type in (
+                "in_global",
+                "torque_in_global",
+                "translational_in_global",
+                "in_local",
+                "torque_in_local",
+            ):
+                for force_name, force in getattr(self.external_force_set, force_type).items():
+                    point_of_application = force["point_of_application"]
+                    if not isinstance(point_of_application, str) and point_of_application is not None:
+                        point_of_application = isinstance(point_of_application, MX)
+                    hasher.update(repr((force_type, force_name, force["segment"], point_of_application)).encode())
+
+        return hasher.hexdigest()
+
+    def _function_cache_signature(self) -> str | None:
+        """
+        The signature of the current state of the model, used as a key of the persistent function cache
+
+        Returns
+        -------
+        The signature, or None if the functions of the model cannot be cached on disk
+        """
+
+        if self._model_signature is None:
+            return None
+        return f"{type(self).__name__}:{self._model_signature}:{self.model.getGravity().to_mx()}"
 
     @property
     def friction_coefficients(self) -> MX | SX | np.ndarray:
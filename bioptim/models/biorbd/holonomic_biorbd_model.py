@@ -6,7 +6,7 @@ import scipy.linalg as la
 from biorbd_casadi import (
     GeneralizedCoordinates,
 )
-from casadi import MX, DM, vertcat, horzcat, Function, solve, rootfinder, inv, nlpsol
+from casadi import MX, DM, vertcat, horzcat, Function, solve, rootfinder, inv, nlpsol, norm_inf
 
 from .biorbd_model import BiorbdModel
 from ..holonomic_constraints import HolonomicConstraintsList
@@ -14,6 +14,7 @@ from ...optimization.parameters import ParameterList
 
 from ...misc.parameters_types import (
     Str,
+    Int,
     Float,
     NpArray,
     IntListOptional,
@@ -537,6 +538,41 @@ class HolonomicBiorbdModel(BiorbdModel):
         casadi_fun = Function("compute_q_v", [self.q_u, self.q_v_init], [v_opt], ["q_u", "q_v_init"], ["q_v"])
         return casadi_fun
 
+    @cache_function
+    def compute_q_v_trajectory(self, n_nodes: Int) -> Function:
+        """
+        Compute the dependent joint positions (q_v) along a whole trajectory of independent joint positions (q_u) in
+        one call. The Newton solve of each node starts from the solution of the previous node (the first one starts
+        from q_v_init), so along a smooth trajectory each solve starts next to its solution
+
+        Parameters
+        ----------
+        n_nodes: int
+            The number of nodes (columns) of the trajectory
+
+        Returns
+        -------
+        The function (q_u, q_v_init) -> (q_v, residuals), where q_u and q_v have one column per node and residuals is
+        the largest violation of the holonomic constraints at each node after the Newton solve
+        """
+        q_v = self.compute_q_v()(self.q_u, self.q_v_init)
+        residuals = norm_inf(self.holonomic_constraints(self.state_from_partition(self.q_u, q_v)))
+        node = Function("compute_q_v_node", [self.q_v_init, self.q_u], [q_v, residuals])
+
+        # The solution of each node is fed back as the initial guess of the next node
+        trajectory = node.mapaccum("compute_q_v_nodes", n_nodes, [0], [0])
+
+        q_u = MX.sym("q_u_trajectory", self.nb_independent_joints, n_nodes)
+        q_v, residuals = trajectory(self.q_v_init, q_u)
+        casadi_fun = Function(
+            "compute_q_v_trajectory",
+            [q_u, self.q_v_init],
+            [q_v, residuals],
+            ["q_u", "q_v_init"],
+            ["q_v", "residuals"],
+        )
+        return casadi_fun
+
     @cache_function
     def compute_q(self) -> Function:
         """
@@ -0,0 +1,233 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+from casadi import Function, __version__ as casadi_version
+
+from ..misc.parameters_types import Int, Str, Float
+
+
+class FunctionDiskCache:
+    """
+    A persistent cache of the CasADi functions of the models. The functions are serialized in a local directory, so
+    that another process (or a later run) building the same model does not have to regenerate their graph. The entries
+    are keyed by a signature of the model (content of the bioMod file, layout of the external forces, ...), the name of
+    the method and its arguments. When the directory grows larger than max_size, the least recently used entries are
+    evicted.
+
+    Attributes
+    ----------
+    path: str
+        The directory where the functions are serialized
+    max_size: int
+        The maximum size of the directory (in bytes)
+    hits: int
+        The number of functions loaded from the disk
+    misses: int
+        The number of functions that had to be generated
+
+    Methods
+    -------
+    key(self, model_signature: str, method_name: str, args: tuple, kwargs: dict) -> str
+        The key of an entry of the cache
+    load(self, key: str) -> Function | None
+        Load a function from the cache
+    store(self, key: str, function: Function)
+        Serialize a function in the cache
+    clear(self)
+        Remove all the entries of the cache
+    hit_rate(self) -> float
+        The proportion of the requests that were served by the cache
+    size(self) -> int
+        The current size of the cache (in bytes)
+    """
+
+    _extension = ".casadi"
+
+    def __init__(self, path: Str, max_size: Int = 512 * 1024 * 1024):
+        """
+        Parameters
+        ----------
+        path: str
+            The directory where the functions are serialized. It is created if it does not exist
+        max_size: int
+            The maximum size of the directory (in bytes)
+        """
+
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def __getstate__(self) -> dict:
+        # The statistics are local to each process
+        return {"path": self.path, "max_size": self.max_size}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["path"], state["max_size"])
+
+    def key(self, model_signature: Str, method_name: Str, args: tuple, kwargs: dict) -> Str:
+        """
+        The key of an entry of the cache
+
+        Parameters
+        ----------
+        model_signature: str
+            The signature of the model (see BiorbdModel._function_cache_signature)
+        method_name: str
+            The name of the method that generates the function
+        args: tuple
+            The positional arguments of the method
+        kwargs: dict
+            The keyword arguments of the method
+
+        Returns
+        -------
+        The key of the entry
+        """
+
+        hasher = hashlib.sha256()
+        for value in (casadi_version, model_signature, method_name, args, sorted(kwargs.items())):
+            hasher.update(_signature(value).encode())
+        return hasher.hexdigest()
+
+    def load(self, key: Str) -> Function | None:
+        """
+        Load a function from the cache
+
+        Parameters
+        ----------
+        key: str
+            The key of the entry
+
+        Returns
+        -------
+        The function if it is in the cache, None otherwise
+        """
+
+        file_path = self._file_path(key)
+        try:
+            function = Function.load(file_path)
+            # Mark the entry as recently used
+            os.utime(file_path)
+        except (OSError, RuntimeError):
+            # The entry does not exist, was evicted in the meantime or is corrupted
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return function
+
+    def store(self, key: Str, function: Function):
+        """
+        Serialize a function in the cache. The file is written atomically, so concurrent processes never read a
+        partially written entry
+
+        Parameters
+        ----------
+        key: str
+            The key of the entry
+        function: Function
+            The function to serialize
+        """
+
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(file_descriptor)
+        try:
+            function.save(tmp_path)
+            os.replace(tmp_path, self._file_path(key))
+        except RuntimeError:
+            # Some functions cannot be serialized (e.g. they embed a python callback), they are simply not cached
+            os.remove(tmp_path)
+            return
+        self._evict()
+
+    def clear(self):
+        """
+        Remove all the entries of the cache
+        """
+
+        for entry in self._entries():
+            _remove(entry.path)
+
+    @property
+    def hit_rate(self) -> Float:
+        """
+        The proportion of the requests that were served by the cache
+        """
+
+        n_requests = self.hits + self.misses
+        return self.hits / n_requests if n_requests else 0.0
+
+    @property
+    def size(self) -> Int:
+        """
+        The current size of the cache (in bytes)
+        """
+
+        return sum(_entry_size(entry) for entry in self._entries())
+
+    def _file_path(self, key: Str) -> Str:
+        return os.path.join(self.path, key + self._extension)
+
+    def _entries(self) -> list:
+        return [entry for entry in os.scandir(self.path) if entry.name.endswith(self._extension)]
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the cache fits in max_size
+        """
+
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, entry_path in sorted(entries):
+            if size <= self.max_size:
+                break
+            _remove(entry_path)
+            size -= entry_size
+
+
+def _signature(value) -> Str:
+    """
+    A deterministic text representation of a value, used to build the keys of the cache. Contrary to repr, the
+    numpy arrays are never truncated
+    """
+
+    if isinstance(value, np.ndarray):
+        return (
+            f"ndarray({value.dtype},{value.shape},{hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()})"
+        )
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}({','.join(_signature(v) for v in value)})"
+    if isinstance(value, dict):
+        return f"dict({','.join(f'{_signature(k)}:{_signature(v)}' for k, v in sorted(value.items(), key=str))})"
+    if isinstance(value, (set, frozenset)):
+        return f"set({','.join(sorted(_signature(v) for v in value))})"
+    return repr(value)
+
+
+def _entry_size(entry: os.DirEntry) -> Int:
+    try:
+        return entry.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _remove(path: Str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        # Another process evicted it first
+        pass
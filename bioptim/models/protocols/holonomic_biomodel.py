@@ -344,6 +344,14 @@ class HolonomicBioModel(BioModel, Protocol):
         At the end of this step, we get admissible generalized coordinates w.r.t. the holonomic constraints
         """
 
+    @cache_function
+    def compute_q_v_trajectory(self, n_nodes: Int) -> Function:
+        """
+        Compute the dependent joints along a trajectory of independent joints in one call, the Newton solve of each node
+        starting from the solution of the previous node. The largest violation of the holonomic constraints at each
+        node is also returned
+        """
+
     @cache_function
     def compute_q(self) -> Function:
         """
@@ -1,4 +1,5 @@
 from functools import wraps
+from casadi import Function
 from ..limits.path_conditions import Bounds
 from ..misc.mapping import BiMapping, BiMappingList
 
@@ -93,6 +94,19 @@ def cache_function(method):
         if key in self._cached_functions:
             return self._cached_functions[key]
 
+        # If the model opted in for a persistent cache, try to load the function from the disk before generating it
+        function_cache = getattr(self, "function_cache", None)
+        model_signature = self._function_cache_signature() if function_cache is not None else None
+        if model_signature is not None:
+            disk_key = function_cache.key(model_signature, method.__name__, args, kwargs)
+            casadi_fun = function_cache.load(disk_key)
+            if casadi_fun is None:
+                casadi_fun = method(self, *args, **kwargs)
+                if isinstance(casadi_fun, Function):
+                    function_cache.store(disk_key, casadi_fun)
+            self._cached_functions[key] = casadi_fun
+            return casadi_fun
+
         # Call the original function to create the CasADi function
         casadi_fun = method(self, *args, **kwargs)
 
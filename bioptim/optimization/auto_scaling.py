@@ -0,0 +1,188 @@
+import numpy as np
+from casadi import Function, jacobian, gradient, sum1
+
+from .optimization_vector import OptimizationVectorHelper
+from .variable_scaling import VariableScalingList
+from ..misc.enums import ScalingStrategy
+
+# The scaling factors are kept in this range, so a variable that is almost free (or almost fixed) does not wreck the
+# conditioning of the others
+MIN_SCALING = 1e-4
+MAX_SCALING = 1e4
+
+
+def compute_auto_scaling(ocp, strategy: ScalingStrategy) -> dict:
+    """
+    Derive the scaling of each state, control, algebraic state and parameter (one factor per row of each key) so the
+    scaled variables are of order one
+
+    Parameters
+    ----------
+    ocp: OptimalControlProgram
+        A reference to the ocp
+    strategy: ScalingStrategy
+        How the magnitude of the variables is estimated. The rows the strategy cannot estimate (e.g. unbounded variables
+        for ScalingStrategy.BOUNDS) fall back on the bounds, then on the initial guess, then on 1
+
+    Returns
+    -------
+    The scaling as {"x_scaling", "u_scaling", "a_scaling", "parameter_scaling"} VariableScalingList
+    """
+
+    if not isinstance(strategy, ScalingStrategy):
+        raise ValueError("strategy must be a ScalingStrategy")
+
+    layout = OptimizationVectorHelper.vector_layout(ocp)
+    current_scaling = _current_scaling_vector(ocp, layout)
+
+    # The magnitude of each element of the optimization vector (nan where it cannot be estimated)
+    v_min, v_max = OptimizationVectorHelper.bounds_vectors(ocp)
+    v_init = OptimizationVectorHelper.init_vector(ocp)
+    bounds_magnitude = np.maximum(np.abs(v_min[:, 0]), np.abs(v_max[:, 0])) * current_scaling
+    bounds_magnitude[~np.isfinite(bounds_magnitude)] = np.nan
+    init_magnitude = np.abs(v_init[:, 0]) * current_scaling
+
+    if strategy == ScalingStrategy.BOUNDS:
+        sources = (bounds_magnitude, init_magnitude)
+    elif strategy == ScalingStrategy.INITIAL_GUESS:
+        sources = (init_magnitude, bounds_magnitude)
+    elif strategy == ScalingStrategy.JACOBIAN:
+        # The scaling that brings the largest derivative of each variable to one
+        with np.errstate(divide="ignore"):
+            jacobian_magnitude = current_scaling / _jacobian_columns_max(ocp, v_init)
+        sources = (jacobian_magnitude, bounds_magnitude, init_magnitude)
+    else:
+        raise NotImplementedError(f"{strategy} is not implemented yet")
+
+    # All the elements of a row must fit, except for the jacobian where the largest derivative sets the scaling
+    take_max = strategy != ScalingStrategy.JACOBIAN
+    out = {key: VariableScalingList() for key in ("x_scaling", "u_scaling", "a_scaling", "parameter_scaling")}
+    for phase, nlp in enumerate(ocp.nlp):
+        nlp.set_node_index(0)
+        for name, variables, block in (
+            ("x_scaling", nlp.states, layout["states"][phase]),
+            ("u_scaling", nlp.controls, layout["controls"][phase]),
+            ("a_scaling", nlp.algebraic_states, layout["algebraic_states"][phase]),
+        ):
+            rows_scaling = _rows_scaling(sources, block["slice"], block["n_rows"], take_max)
+            for key in variables.keys():
+                out[name].add(key, rows_scaling[list(variables[key].index)], phase=phase)
+
+    parameters_scaling = _rows_scaling(sources, layout["parameters"], ocp.parameters.shape, take_max)
+    for key in ocp.parameters.keys():
+        out["parameter_scaling"].add(key, parameters_scaling[list(ocp.parameters[key].index)])
+
+    return out
+
+
+def _current_scaling_vector(ocp, layout: dict) -> np.ndarray:
+    """
+    The scaling each element of the optimization vector is currently declared with
+    """
+
+    scaling = np.ones(layout["size"])
+    for nlp, states_block, controls_block, algebraic_states_block in zip(
+        ocp.nlp, layout["states"], layout["controls"], layout["algebraic_states"]
+    ):
+        nlp.set_node_index(0)
+        for variables, variables_scaling, block in (
+            (nlp.states, nlp.x_scaling, states_block),
+            (nlp.controls, nlp.u_scaling, controls_block),
+            (nlp.algebraic_states, nlp.a_scaling, algebraic_states_block),
+        ):
+            rows = np.ones(block["n_rows"])
+            for key in variables.keys():
+                rows[list(variables[key].index)] = variables_scaling[key].scaling[:, 0]
+            scaling[block["slice"]] = np.tile(rows, block["n_cols"])
+
+    for key in ocp.parameters.keys():
+        indices = [layout["parameters"].start + i for i in ocp.parameters[key].index]
+        scaling[indices] = ocp.parameters[key].scaling.scaling[:, 0]
+
+    return scaling
+
+
+def _jacobian_columns_max(ocp, v: np.ndarray) -> np.ndarray:
+    """
+    The largest derivative of the objective and of the constraints with respect to each (scaled) variable, evaluated at
+    v. Each constraint is first normalized by its largest derivative, as the solver does (gradient-based scaling), so
+    only the relative weight of the variables in each constraint matters
+
+    Parameters
+    ----------
+    ocp: OptimalControlProgram
+        A reference to the ocp
+    v: np.ndarray
+        The point to evaluate the derivatives at
+
+    Returns
+    -------
+    The largest absolute derivative of each column
+    """
+
+    from ..interfaces.interface_utils import generic_dispatch_bounds
+    from ..interfaces.ipopt_interface import IpoptInterface
+
+    interface = IpoptInterface(ocp)
+    all_g, _ = generic_dispatch_bounds(interface, include_g=True, include_g_internal=True, include_g_implicit=True)
+    objective = interface.dispatch_obj_func()
+    variables = ocp.variables_vector
+
+    derivatives = Function(
+        "auto_scaling_derivatives",
+        [variables],
+        [jacobian(all_g, variables), gradient(sum1(objective), variables)],
+    )
+    jacobian_value, gradient_value = derivatives(v)
+
+    rows, columns = jacobian_value.sparsity().get_triplet()
+    values = np.abs(np.array(jacobian_value.nonzeros()))
+    rows_max = np.zeros(jacobian_value.shape[0])
+    np.maximum.at(rows_max, rows, values)
+    values = values / np.where(rows_max[rows] > 0, rows_max[rows], 1)
+
+    # The objective is normalized as one more constraint
+    columns_max = np.abs(np.array(gradient_value)[:, 0])
+    if columns_max.max(initial=0) > 0:
+        columns_max /= columns_max.max()
+    np.maximum.at(columns_max, columns, values)
+    return columns_max
+
+
+def _rows_scaling(sources: tuple, block: slice, n_rows: int, take_max: bool) -> np.ndarray:
+    """
+    Reduce the magnitude of each element of a block to one scaling factor per row (variable)
+
+    Parameters
+    ----------
+    sources: tuple
+        The magnitudes of each element of the optimization vector, by order of preference
+    block: slice
+        Where the block is in the optimization vector
+    n_rows: int
+        The number of variables of the block, the elements of the block are stored column by column (node by node)
+    take_max: bool
+        If the largest magnitude of the row is kept (True) or the smallest one (False)
+
+    Returns
+    -------
+    The scaling factor of each row
+    """
+
+    scaling = np.full(n_rows, np.nan)
+    if n_rows == 0:
+        return scaling
+
+    for source in sources:
+        values = source[block].reshape((n_rows, -1), order="F")
+        values = np.where(np.isfinite(values) & (values > 0), values, np.nan)
+        missing = np.isnan(scaling) & ~np.all(np.isnan(values), axis=1)
+        if take_max:
+            scaling[missing] = np.nanmax(values[missing, :], axis=1)
+        else:
+            scaling[missing] = np.nanmin(values[missing, :], axis=1)
+        # Only the first source may use the smallest magnitude, the fallbacks are bounds and initial guesses
+        take_max = True
+
+    scaling[np.isnan(scaling)] = 1
+    return np.clip(scaling, MIN_SCALING, MAX_SCALING)
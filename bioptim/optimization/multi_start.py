@@ -1,10 +1,19 @@
-from multiprocessing import Pool
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from itertools import product
-from typing import Any, Callable
+from multiprocessing import SimpleQueue
+import os
+import signal
+from time import perf_counter
+from typing import Any, Callable, Iterator
 
 from ..optimization.optimal_control_program import OptimalControlProgram
 from ..interfaces import Solver
 from ..optimization.solution.solution import Solution
+from ..optimization.work_queue import WorkQueue
+
+# The state of each worker of the pool: the multi-start it works for and the ocp it built (reused between the tasks)
+_worker = {"multi_start": None, "ocp": None}
 
 
 class MultiStart:
@@ -12,10 +21,24 @@ class MultiStart:
     The main class to define a multi-start. This class executes the optimal control problems with the possibility to
     vary parameters.
 
+    Attributes
+    ----------
+    summary: list[dict]
+        The record of each task of the last run (parameters, status, wall time, number of iterations, number of
+        attempts, error message and output of the post_optimization_callback)
+    work_queue: WorkQueue | None
+        The queue the combinations are taken from when the multi-start is distributed (see queue_path)
+
     Methods
     -------
-    solve()
+    solve() -> list[dict]
         Run the multi-start in the pools for multi-threading
+    solve_iter() -> Iterator[dict]
+        Run the multi-start and yield the record of each task as soon as it completes
+    summary_table() -> str
+        The summary of the last run as a table
+    checkpointed_records() -> list[dict]
+        The records of all the combinations completed so far by all the processes consuming the work queue
     """
 
     def __init__(
@@ -26,6 +49,11 @@ class MultiStart:
         should_solve_callback: tuple[Callable[[Any, dict], bool], dict] = None,
         solver: Solver = None,
         n_pools: int = 1,
+        update_ocp_callback: tuple[Callable[[OptimalControlProgram, Any], bool], dict] = None,
+        timeout: float = None,
+        n_retries: int = 0,
+        queue_path: str = None,
+        queue_lease: float = None,
     ):
         """
         Parameters
@@ -47,6 +75,26 @@ class MultiStart:
             The solver to use for the ocp. Default is IPOPT
         n_pools: int
             The number of pools to be used for multi-threading. If 1 is sent, then the built-in for loop is used
+        update_ocp_callback: Callable
+            The function which is called to reuse the ocp already built by the worker for another combination
+            (e.g. with update_initial_guess or update_bounds) instead of preparing it again.
+            The inputs are the ocp and the combination of the combinatorial_parameters. It returns if the ocp could be
+            updated [True] or if it must be prepared again [False]. If the callback is not defined, the ocp is prepared
+            for each combination
+        timeout: float
+            The maximum time (in seconds) a task can take before its worker is stopped. It is only used when n_pools
+            is greater than 1
+        n_retries: int
+            The number of times a task that failed or timed out is submitted again
+        queue_path: str
+            The path of a SQLite work queue (see WorkQueue). If provided, each combination is a task of the queue and
+            several processes (possibly on several hosts sharing the filesystem) running the same multi-start consume
+            it together. The record of each completed combination is checkpointed in the queue, so running the
+            multi-start again only solves the combinations that are not completed yet
+        queue_lease: float
+            The time (in seconds) after which a combination claimed by a process of another host is considered
+            abandoned and solved again. If None, only the combinations abandoned by the processes of the current host
+            are recovered
         """
         # errors : post, prep,
         if not isinstance(combinatorial_parameters, dict):
@@ -67,13 +115,31 @@ class MultiStart:
             raise ValueError("should_solve_callback first argument must be a dictionary")
         if not isinstance(n_pools, int):
             raise ValueError("n_pools must be an int")
+        if update_ocp_callback is not None:
+            if not isinstance(update_ocp_callback, tuple):
+                raise ValueError("update_ocp_callback must be a tuple")
+            if not isinstance(update_ocp_callback[0], Callable):
+                raise ValueError("update_ocp_callback first argument must be a Callable")
+            if not isinstance(update_ocp_callback[1], dict):
+                raise ValueError("update_ocp_callback second argument must be a dictionary")
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError("timeout must be a positive number")
+        if not isinstance(n_retries, int) or n_retries < 0:
+            raise ValueError("n_retries must be a positive int")
+        if queue_path is not None and not isinstance(queue_path, str):
+            raise ValueError("queue_path must be a str")
 
         self.prepare_ocp_callback = prepare_ocp_callback
         self.post_optimization_callback = post_optimization_callback
         self.should_solve_callback = should_solve_callback
+        self.update_ocp_callback = update_ocp_callback
         self.solver = solver if solver else Solver.IPOPT()
         self.n_pools = n_pools
+        self.timeout = timeout
+        self.n_retries = n_retries
         self.combined_ocp_parameters = self._generate_parameters_combinations(combinatorial_parameters)
+        self.summary = []
+        self.work_queue = None if queue_path is None else WorkQueue(queue_path, lease=queue_lease)
         # self.save_folder = save_folder
 
     @staticmethod
@@ -88,20 +154,301 @@ class MultiStart:
             combined_args_to_list += [[instance for instance in combined_args[i]]]
         return combined_args_to_list
 
-    def _prepare_and_solve_ocp(self, ocp_parameters):
+    def _prepare_ocp(self, ocp_parameters, ocp: OptimalControlProgram = None) -> OptimalControlProgram:
+        """
+        Get the ocp of a combination, reusing the one already built if the update_ocp_callback allows it
+        """
+
+        if (
+            ocp is not None
+            and self.update_ocp_callback is not None
+            and self.update_ocp_callback[0](ocp, *ocp_parameters, **self.update_ocp_callback[1])
+        ):
+            return ocp
+        return self.prepare_ocp_callback(*ocp_parameters)
+
+    def _prepare_and_solve_ocp(self, ocp_parameters, ocp: OptimalControlProgram = None) -> tuple:
+        """
+        Solve the ocp of a combination
+
+        Returns
+        -------
+        The record of the task and the ocp that was solved (so it can be reused)
+        """
+
+        record = {
+            "parameters": ocp_parameters,
+            "status": "skipped",
+            "wall_time": 0.0,
+            "iterations": None,
+            "error": None,
+            "output": None,
+        }
         if self.should_solve_callback is None or self.should_solve_callback[0](
             *ocp_parameters, **self.should_solve_callback[1]
         ):
-            sol = self.prepare_ocp_callback(*ocp_parameters).solve(self.solver)
-            self.post_optimization_callback[0](sol, *ocp_parameters, **self.post_optimization_callback[1])
+            tic = perf_counter()
+            ocp = self._prepare_ocp(ocp_parameters, ocp)
+            sol = ocp.solve(self.solver)
+            record["output"] = self.post_optimization_callback[0](
+                sol, *ocp_parameters, **self.post_optimization_callback[1]
+            )
+            record["wall_time"] = perf_counter() - tic
+            record["iterations"] = sol.iterations
+            record["status"] = "success" if sol.status == 0 else "not converged"
+        return record, ocp
 
-    def solve(self):
+    def solve(self) -> list[dict]:
         """
         Run the multi-start in the pools for multi-threading
+
+        Returns
+        -------
+        The record of each task (see summary)
+        """
+        for _ in self.solve_iter():
+            pass
+        return self.summary
+
+    def solve_iter(self) -> Iterator[dict]:
+        """
+        Run the multi-start and yield the record of each task as soon as it completes (not necessarily in the order of
+        the combinations). A task that raises or times out is isolated: it is retried up to n_retries times, then
+        reported with the "failed" or "timeout" status without stopping the other tasks
+
+        Returns
+        -------
+        The record of each task (see summary)
         """
-        if self.n_pools == 1:
-            for ocp_parameters in self.combined_ocp_parameters:
-                self._prepare_and_solve_ocp(ocp_parameters)
+
+        self.summary = []
+        if self.work_queue is None:
+            combinations = iter(self.combined_ocp_parameters)
         else:
-            with Pool(self.n_pools) as p:
-                p.map(self._prepare_and_solve_ocp, self.combined_ocp_parameters)
+            # The combinations are claimed one at a time, so the other processes can take the next ones
+            self.work_queue.add(self.combined_ocp_parameters)
+            combinations = self.work_queue.claim_iter()
+
+        tasks = self._solve_serial(combinations) if self.n_pools == 1 else self._solve_in_pools(combinations)
+        try:
+            for record in tasks:
+                if self.work_queue is not None:
+                    self.work_queue.complete(record["parameters"], record)
+                self.summary.append(record)
+                yield record
+        finally:
+            if self.work_queue is not None:
+                # The combinations claimed by an interrupted run are given back to the queue
+                self.work_queue.release()
+
+    def checkpointed_records(self) -> list[dict]:
+        """
+        The records of all the combinations completed so far by all the processes consuming the work queue (including
+        the previous runs), in the order of the combinations
+
+        Returns
+        -------
+        The records (see summary). The outputs of the post_optimization_callback are only kept if they can be pickled
+        """
+
+        if self.work_queue is None:
+            raise RuntimeError("The records are only checkpointed when the multi-start uses a work queue (queue_path)")
+        return self.work_queue.records()
+
+    def summary_table(self) -> str:
+        """
+        The summary of the last run as a table
+        """
+
+        header = f"{'parameters':<50} {'status':<14} {'wall time (s)':>14} {'iterations':>11} {'attempts':>9}"
+        lines = [header, "-" * len(header)]
+        for record in self.summary:
+            iterations = "" if record["iterations"] is None else record["iterations"]
+            lines.append(
+                f"{str(record['parameters']):<50} {record['status']:<14} {record['wall_time']:>14.3f} "
+                f"{iterations:>11} {record['attempts']:>9}"
+            )
+        return "\n".join(lines)
+
+    def _solve_serial(self, combinations: Iterator) -> Iterator[dict]:
+        """
+        Run the tasks one after the other in the current process (timeout is not supported)
+        """
+
+        ocp = None
+        for ocp_parameters in combinations:
+            for attempt in range(1, self.n_retries + 2):
+                try:
+                    record, ocp = self._prepare_and_solve_ocp(ocp_parameters, ocp)
+                except Exception as error:
+                    # The ocp may be in an inconsistent state, so it is prepared again for the next task
+                    ocp = None
+                    record = _failed_record(ocp_parameters, "failed", error)
+                record["attempts"] = attempt
+                if record["status"] != "failed":
+                    break
+            yield record
+
+    def _solve_in_pools(self, combinations: Iterator) -> Iterator[dict]:
+        """
+        Run the tasks in a pool of processes. Each worker builds its ocp once and reuses it for its next tasks (see
+        update_ocp_callback). Only as many tasks as workers are submitted at once, so a task starts as soon as it is
+        submitted and its timeout can be measured from there. The combinations are only taken when a worker is
+        available for them
+        """
+
+        # Each task is (ocp_parameters, attempt, isolated). An isolated task runs alone in the pool. The tasks to
+        # submit again are run before the next combinations
+        queue = []
+        executor, worker_pids = _new_executor(self)
+        running = {}
+        has_combinations = True
+        try:
+            while queue or running or has_combinations:
+                while len(running) < self.n_pools and not any(task[2] for task in running.values()):
+                    if not queue:
+                        ocp_parameters = next(combinations, None) if has_combinations else None
+                        if ocp_parameters is None:
+                            has_combinations = False
+                            break
+                        queue.append((ocp_parameters, 1, False))
+                    if queue[-1][2] and running:
+                        break
+                    ocp_parameters, attempt, isolated = queue.pop()
+                    future = executor.submit(_worker_task, ocp_parameters)
+                    running[future] = (ocp_parameters, attempt, isolated, perf_counter())
+                if not running:
+                    continue
+
+                done, _ = wait(
+                    running, timeout=_time_to_next_timeout(running, self.timeout), return_when=FIRST_COMPLETED
+                )
+
+                restart = False
+                broken = []
+                for future in done:
+                    ocp_parameters, attempt, isolated, tic = running.pop(future)
+                    try:
+                        record = future.result()
+                    except BrokenProcessPool as error:
+                        # A worker died (e.g. a crash in the solver). The pool cannot be used anymore
+                        restart = True
+                        broken.append((ocp_parameters, attempt, _failed_record(ocp_parameters, "failed", error)))
+                        continue
+                    except Exception as error:
+                        record = _failed_record(ocp_parameters, "failed", error)
+                    if record["status"] == "failed":
+                        record["wall_time"] = perf_counter() - tic
+                    yield from self._finalize(record, attempt, isolated, queue)
+
+                if len(broken) == 1 and not running:
+                    ocp_parameters, attempt, record = broken[0]
+                    yield from self._finalize(record, attempt, True, queue)
+                elif broken:
+                    # There is no way to know which of the tasks crashed the pool, so they are run again one at a time
+                    for ocp_parameters, attempt, _ in broken:
+                        queue.append((ocp_parameters, attempt, True))
+                    for ocp_parameters, attempt, _, _ in running.values():
+                        queue.append((ocp_parameters, attempt, True))
+                    running = {}
+
+                if self.timeout is not None:
+                    now = perf_counter()
+                    for future, (ocp_parameters, attempt, isolated, tic) in list(running.items()):
+                        if now - tic >= self.timeout:
+                            running.pop(future)
+                            restart = True
+                            record = _failed_record(ocp_parameters, "timeout", None, now - tic)
+                            yield from self._finalize(record, attempt, isolated, queue)
+
+                if restart:
+                    # The workers cannot be interrupted, so the pool is replaced and the tasks it was running are
+                    # submitted again (they do not count as an attempt)
+                    for ocp_parameters, attempt, isolated, _ in running.values():
+                        queue.append((ocp_parameters, attempt, isolated))
+                    running = {}
+                    _terminate_executor(executor, worker_pids)
+                    executor, worker_pids = _new_executor(self)
+        finally:
+            _terminate_executor(executor, worker_pids)
+
+    def _finalize(self, record: dict, attempt: int, isolated: bool, queue: list) -> Iterator[dict]:
+        """
+        Yield the record of a task, or submit it again if it failed and can still be retried
+        """
+
+        if record["status"] in ("failed", "timeout") and attempt <= self.n_retries:
+            queue.append((record["parameters"], attempt + 1, isolated))
+            return
+        record["attempts"] = attempt
+        yield record
+
+
+def _new_executor(multi_start: MultiStart) -> tuple[ProcessPoolExecutor, SimpleQueue]:
+    """
+    A pool of processes for the multi-start, and the queue each of its workers sends its pid to when it starts
+    """
+
+    worker_pids = SimpleQueue()
+    executor = ProcessPoolExecutor(
+        multi_start.n_pools, initializer=_worker_initializer, initargs=(multi_start, worker_pids)
+    )
+    return executor, worker_pids
+
+
+def _terminate_executor(executor: ProcessPoolExecutor, worker_pids: SimpleQueue):
+    """
+    Stop the pool without waiting for the running tasks. The executor cannot interrupt them, so its workers are
+    terminated from the pids they sent when they started (a worker that did not start yet has no task to interrupt
+    and exits by itself once the pool is shut down)
+    """
+
+    executor.shutdown(wait=False, cancel_futures=True)
+    pids = []
+    while not worker_pids.empty():
+        pids.append(worker_pids.get())
+    worker_pids.close()
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            # The worker already exited
+            pass
+
+
+def _worker_initializer(multi_start: MultiStart, worker_pids: SimpleQueue):
+    _worker["multi_start"] = multi_start
+    _worker["ocp"] = None
+    worker_pids.put(os.getpid())
+
+
+def _worker_task(ocp_parameters) -> dict:
+    """
+    Solve a combination in a worker, reusing the ocp the worker already built
+    """
+
+    try:
+        record, _worker["ocp"] = _worker["multi_start"]._prepare_and_solve_ocp(ocp_parameters, _worker["ocp"])
+    except Exception as error:
+        # The ocp may be in an inconsistent state, so it is prepared again for the next task
+        _worker["ocp"] = None
+        return _failed_record(ocp_parameters, "failed", error)
+    return record
+
+
+def _failed_record(ocp_parameters, status: str, error: Exception | None, wall_time: float = 0.0) -> dict:
+    return {
+        "parameters": ocp_parameters,
+        "status": status,
+        "wall_time": wall_time,
+        "iterations": None,
+        "error": None if error is None else f"{type(error).__name__}: {error}",
+        "output": None,
+    }
+
+
+def _time_to_next_timeout(running: dict, timeout: float | None) -> float | None:
+    if timeout is None:
+        return None
+    now = perf_counter()
+    return max(0.0, min(task[-1] + timeout - now for task in running.values()))
@@ -0,0 +1,393 @@
+import hashlib
+import inspect
+import os
+import pickle
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+from casadi import Function, MX, nlpsol, __version__ as casadi_version
+
+from ..interfaces import Solver
+from ..interfaces.interface_utils import _build_parametric_nlp, _evaluate_nlp_parameters
+from ..interfaces.ipopt_interface import IpoptInterface
+from ..misc.__version__ import __version__ as bioptim_version
+from ..models.function_cache import _signature
+from .optimization_vector import OptimizationVectorHelper
+from ..misc.parameters_types import AnyDict, Bool, NpArray, Str
+
+
+class NlpSnapshot:
+    """
+    A fully built nonlinear program, detached from the OptimalControlProgram it was built from. The symbolic nlp
+    (x, p) -> (f, g) is kept as a single CasADi Function together with the bounds, the initial guess and the map of
+    the variables in the optimization vector, so it can be saved to the disk and reloaded in another process that
+    solves it without constructing the ocp again. The weights, targets and numerical timeseries of the penalties are
+    the parameters (p) of the nlp (as in the parametric mode of the solvers), so they can be changed between the
+    solves.
+
+    Attributes
+    ----------
+    nlp_function: Function
+        The function (x, p) -> (f, g) of the program
+    x_bounds: tuple[np.ndarray, np.ndarray]
+        The bounds of the (scaled) optimization vector
+    x_init: np.ndarray
+        The initial guess of the (scaled) optimization vector
+    g_bounds: tuple[np.ndarray, np.ndarray]
+        The bounds of the constraints
+    p: np.ndarray
+        The values of the parameters of the nlp at the time the snapshot was taken
+    parameter_names: list[tuple[str, int]]
+        The name and the size of each parameter of the nlp, in the order of p
+    variables: dict
+        Where each variable (with its scaling) is in the optimization vector (see OptimizationVectorHelper.vector_layout)
+    fingerprint: str
+        The fingerprint of the problem definition the snapshot was built from
+    options_common: dict
+        The options sent to every nlpsol (as in the solver interfaces)
+
+    Methods
+    -------
+    from_ocp(cls, ocp, fingerprint: str = None, expand: bool = False) -> NlpSnapshot
+        Take the snapshot of a program
+    save(self, path: str)
+        Write the snapshot to the disk
+    load(cls, path: str, fingerprint: str = None) -> NlpSnapshot
+        Read a snapshot from the disk
+    cached(cls, directory: str, prepare_ocp: Callable, **kwargs) -> NlpSnapshot
+        Get the snapshot of a problem definition from the disk, or build it if it is not there yet
+    parameter_slice(self, name: str) -> slice
+        Where a parameter of the nlp is in p
+    solve(self, solver=None, x_init: np.ndarray = None, p: np.ndarray = None) -> dict
+        Solve the program
+    unpack(self, v: np.ndarray) -> dict
+        Split an optimization vector into the (unscaled) variables of each phase
+    """
+
+    def __init__(
+        self,
+        nlp_function: Function,
+        x_bounds: tuple,
+        x_init: NpArray,
+        g_bounds: tuple,
+        p: NpArray,
+        parameter_names: list,
+        variables: dict,
+        fingerprint: Str = None,
+    ):
+        """
+        Parameters
+        ----------
+        See the attributes of the class
+        """
+
+        self.nlp_function = nlp_function
+        self.x_bounds = x_bounds
+        self.x_init = x_init
+        self.g_bounds = g_bounds
+        self.p = p
+        self.parameter_names = parameter_names
+        self.variables = variables
+        self.fingerprint = fingerprint
+        self.options_common = {}
+
+        self._solver = None
+        self._solver_options = None
+
+    @classmethod
+    def from_ocp(cls, ocp, fingerprint: Str = None, expand: Bool = False) -> "NlpSnapshot":
+        """
+        Take the snapshot of a program
+
+        Parameters
+        ----------
+        ocp: OptimalControlProgram
+            The program to take the snapshot of
+        fingerprint: str
+            The fingerprint of the problem definition (see problem_fingerprint)
+        expand: bool
+            If the graph of the nlp should be expanded (SX) when possible
+
+        Returns
+        -------
+        The snapshot
+        """
+
+        v = ocp.variables_vector
+        v_bounds = ocp.bounds_vectors
+        nlp, parametric_inputs, g_bounds = _build_parametric_nlp(IpoptInterface(ocp), v, v_bounds, expand)
+        nlp_function = Function("nlp", [nlp["x"], nlp["p"]], [nlp["f"], nlp["g"]], ["x", "p"], ["f", "g"])
+
+        return cls(
+            nlp_function=nlp_function,
+            x_bounds=(np.array(v_bounds[0]).reshape(-1), np.array(v_bounds[1]).reshape(-1)),
+            x_init=np.array(ocp.init_vector).reshape(-1),
+            g_bounds=(np.array(g_bounds.min).reshape(-1), np.array(g_bounds.max).reshape(-1)),
+            p=_evaluate_nlp_parameters(parametric_inputs),
+            parameter_names=[(symbol.name(), symbol.numel()) for symbol, _ in parametric_inputs],
+            variables=_variables_map(ocp),
+            fingerprint=fingerprint,
+        )
+
+    def save(self, path: Str):
+        """
+        Write the snapshot to the disk
+
+        Parameters
+        ----------
+        path: str
+            The path of the file to write
+        """
+
+        data = {
+            "casadi_version": casadi_version,
+            "nlp_function": self.nlp_function.serialize(),
+            "x_bounds": self.x_bounds,
+            "x_init": self.x_init,
+            "g_bounds": self.g_bounds,
+            "p": self.p,
+            "parameter_names": self.parameter_names,
+            "variables": self.variables,
+            "fingerprint": self.fingerprint,
+        }
+
+        # Written atomically so a concurrent job never reads a partial snapshot
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(data, file)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Str, fingerprint: Str = None) -> "NlpSnapshot":
+        """
+        Read a snapshot from the disk
+
+        Parameters
+        ----------
+        path: str
+            The path of the file to read
+        fingerprint: str
+            If sent, the fingerprint the snapshot must have been built with
+
+        Returns
+        -------
+        The snapshot
+        """
+
+        with open(path, "rb") as file:
+            data = pickle.load(file)
+
+        if data["casadi_version"] != casadi_version:
+            raise RuntimeError(
+                f"The snapshot was saved with casadi {data['casadi_version']}, but casadi {casadi_version} is used"
+            )
+        if fingerprint is not None and data["fingerprint"] != fingerprint:
+            raise ValueError("The snapshot was not built from the same problem definition (fingerprint mismatch)")
+
+        return cls(
+            nlp_function=Function.deserialize(data["nlp_function"]),
+            x_bounds=data["x_bounds"],
+            x_init=data["x_init"],
+            g_bounds=data["g_bounds"],
+            p=data["p"],
+            parameter_names=data["parameter_names"],
+            variables=data["variables"],
+            fingerprint=data["fingerprint"],
+        )
+
+    @classmethod
+    def cached(cls, directory: Str, prepare_ocp: Callable, **kwargs) -> "NlpSnapshot":
+        """
+        Get the snapshot of a problem definition from the disk, or build the ocp and save its snapshot if it is not
+        there yet. The entries are keyed by the fingerprint of the problem definition (see problem_fingerprint)
+
+        Parameters
+        ----------
+        directory: str
+            The directory where the snapshots are saved
+        prepare_ocp: Callable
+            The function that builds the OptimalControlProgram
+        kwargs
+            The arguments to send to prepare_ocp
+
+        Returns
+        -------
+        The snapshot
+        """
+
+        fingerprint = problem_fingerprint(prepare_ocp, **kwargs)
+        path = os.path.join(directory, f"{fingerprint}.nlp")
+        if os.path.isfile(path):
+            return cls.load(path, fingerprint=fingerprint)
+
+        os.makedirs(directory, exist_ok=True)
+        snapshot = cls.from_ocp(prepare_ocp(**kwargs), fingerprint=fingerprint)
+        snapshot.save(path)
+        return snapshot
+
+    def parameter_slice(self, name: Str) -> slice:
+        """
+        Where a parameter of the nlp is in p
+
+        Parameters
+        ----------
+        name: str
+            The name of the parameter (e.g. "<penalty name>_phase<phase>_<list index>_weight")
+
+        Returns
+        -------
+        The slice of the parameter in p
+        """
+
+        offset = 0
+        found = []
+        for parameter_name, size in self.parameter_names:
+            if parameter_name == name:
+                found.append(slice(offset, offset + size))
+            offset += size
+
+        if not found:
+            raise ValueError(f"{name} is not a parameter of the nlp")
+        if len(found) > 1:
+            raise ValueError(f"{name} is ambiguous, {len(found)} parameters of the nlp have this name")
+        return found[0]
+
+    def solve(self, solver=None, x_init: NpArray = None, p: NpArray = None) -> AnyDict:
+        """
+        Solve the program. The nlpsol is built at the first call and reused as long as the options do not change
+
+        Parameters
+        ----------
+        solver: Solver.IPOPT | Solver.SQP_METHOD
+            The solver to use and its options
+        x_init: np.ndarray
+            The initial guess of the (scaled) optimization vector. If None, the one of the snapshot is used
+        p: np.ndarray
+            The parameters of the nlp. If None, the ones of the snapshot are used
+
+        Returns
+        -------
+        The output of the solver
+        """
+
+        if solver is None:
+            solver = Solver.IPOPT()
+
+        options = solver.as_dict(self)
+        if self._solver is None or self._solver_options != options:
+            x = MX.sym("x", self.nlp_function.size1_in(0))
+            p_sym = MX.sym("p", self.nlp_function.size1_in(1))
+            f, g = self.nlp_function(x, p_sym)
+            self._solver = nlpsol("solver", solver.type.value.lower(), {"x": x, "p": p_sym, "f": f, "g": g}, options)
+            self._solver_options = options
+
+        tic = perf_counter()
+        out = self._solver(
+            x0=self.x_init if x_init is None else x_init,
+            p=self.p if p is None else p,
+            lbx=self.x_bounds[0],
+            ubx=self.x_bounds[1],
+            lbg=self.g_bounds[0],
+            ubg=self.g_bounds[1],
+        )
+        out["real_time_to_optimize"] = perf_counter() - tic
+        out["iter"] = self._solver.stats()["iter_count"]
+        # To match acados convention (0 = success, 1 = error)
+        out["status"] = int(not self._solver.stats()["success"])
+        return out
+
+    def unpack(self, v: NpArray) -> AnyDict:
+        """
+        Split an optimization vector into the (unscaled) variables of each phase
+
+        Parameters
+        ----------
+        v: np.ndarray
+            The (scaled) optimization vector, as returned by solve
+
+        Returns
+        -------
+        The dt of each phase, the states, controls and algebraic states of each phase (one n_rows x n_cols matrix per
+        key) and the parameters
+        """
+
+        v = np.array(v, dtype=float).reshape(-1)
+        out = {"dt": v[self.variables["dt"]], "parameters": {}}
+        for key, (index, scaling) in self.variables["parameters"].items():
+            out["parameters"][key] = v[self.variables["parameters_slice"]][index] * scaling[:, 0]
+
+        for variable_type in ("states", "controls", "algebraic_states"):
+            out[variable_type] = []
+            for block in self.variables[variable_type]:
+                values = v[block["slice"]].reshape((block["n_rows"], block["n_cols"]), order="F")
+                out[variable_type].append(
+                    {key: values[index, :] * scaling for key, (index, scaling) in block["keys"].items()}
+                )
+        return out
+
+
+def problem_fingerprint(prepare_ocp: Callable, **kwargs) -> Str:
+    """
+    The fingerprint of a problem definition: the source of the module that defines prepare_ocp, the arguments sent
+    to it (and the content of the files they point to, such as the bioMod) and the versions of bioptim and casadi
+
+    Parameters
+    ----------
+    prepare_ocp: Callable
+        The function that builds the OptimalControlProgram
+    kwargs
+        The arguments to send to prepare_ocp
+
+    Returns
+    -------
+    The fingerprint
+    """
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{bioptim_version}:{casadi_version}:{prepare_ocp.__module__}.{prepare_ocp.__qualname__}".encode())
+    hasher.update(inspect.getsource(inspect.getmodule(prepare_ocp)).encode())
+    for key in sorted(kwargs):
+        value = kwargs[key]
+        hasher.update(f"{key}={_signature(value)}".encode())
+        if isinstance(value, str) and os.path.isfile(value):
+            with open(value, "rb") as file:
+                hasher.update(file.read())
+    return hasher.hexdigest()
+
+
+def _variables_map(ocp) -> AnyDict:
+    """
+    Where each variable of the ocp is in the optimization vector, with the scaling to apply to get its real value
+    """
+
+    layout = OptimizationVectorHelper.vector_layout(ocp)
+    variables = {
+        "dt": layout["dt"],
+        "parameters_slice": layout["parameters"],
+        "parameters": {
+            key: (np.array(ocp.parameters[key].index), ocp.parameters[key].scaling.scaling)
+            for key in ocp.parameters.keys()
+        },
+    }
+
+    for variable_type, scaling_name in (
+        ("states", "x_scaling"),
+        ("controls", "u_scaling"),
+        ("algebraic_states", "a_scaling"),
+    ):
+        variables[variable_type] = []
+        for nlp, block in zip(ocp.nlp, layout[variable_type]):
+            variable_list = getattr(nlp, variable_type)
+            scaling = getattr(nlp, scaling_name)
+            variables[variable_type].append(
+                {
+                    "slice": block["slice"],
+                    "n_rows": block["n_rows"],
+                    "n_cols": block["n_cols"],
+                    "keys": {
+                        key: (np.array(variable_list[key].index), scaling[key].scaling) for key in variable_list.keys()
+                    },
+                }
+            )
+    return variables
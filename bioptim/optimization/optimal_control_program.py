@@ -1,20 +1,21 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from copy import copy
 from math import inf
+from threading import Event, Lock
 from typing import Callable, Any
 
 import biorbd_casadi as biorbd
 import casadi
 import numpy as np
 from casadi import MX, SX, sum1, horzcat
-from matplotlib import pyplot as plt
 
+from .auto_scaling import compute_auto_scaling
 from .non_linear_program import NonLinearProgram as NLP
 from .optimization_vector import OptimizationVectorHelper
 from ..dynamics.configure_problem import DynamicsList, Dynamics, ConfigureProblem
 from ..dynamics.ode_solvers import OdeSolver
-from ..gui.check_conditioning import check_conditioning
 from ..gui.graph import OcpToConsole, OcpToGraph
-from ..gui.ipopt_output_plot import SaveIterationsInfo
-from ..gui.plot import CustomPlot, PlotOcp
+from ..gui.custom_plot import CustomPlot
 from ..interfaces import Solver
 from ..interfaces.abstract_options import GenericSolver
 from ..limits.constraints import (
@@ -52,6 +53,7 @@ from ..misc.enums import (
     InterpolationType,
     PenaltyType,
     Node,
+    ScalingStrategy,
 )
 from ..misc.mapping import BiMappingList, Mapping, BiMapping
 from ..misc.options import OptionDict
@@ -61,6 +63,7 @@ from ..optimization.optimization_variable import OptimizationVariableList
 from ..optimization.parameters import ParameterList, Parameter, ParameterContainer
 from ..optimization.solution.solution import Solution
 from ..optimization.solution.solution_data import SolutionMerge
+from ..optimization.solve_future import CancellationCallback, SolveFuture
 from ..optimization.variable_scaling import VariableScalingList, VariableScaling
 
 
@@ -93,6 +96,8 @@ class OptimalControlProgram:
         The list of transition constraint between phases
     ocp_solver: SolverInterface
         A reference to the ocp solver
+    vector_layout: dict
+        The cached position of each block of variables in the optimization vector (see OptimizationVectorHelper)
     version: dict
         The version of all the underlying software. This is important when loading a previous ocp
 
@@ -103,6 +108,8 @@ class OptimalControlProgram:
     update_objectives_target(self, target, phase=None, list_index=None)
         Fast accessor to update the target of a specific objective function. To update target of global objective
         (usually defined by parameters), one can pass 'phase=-1
+    update_objectives_weight(self, weight, phase=None, list_index=None)
+        Fast accessor to update the weight of a specific objective function without rebuilding the program
     update_constraints(self, new_constraint: Constraint | ConstraintList)
         The main user interface to add or modify constraint in the ocp
     update_parameters(self, new_parameters: Parameter | ParameterList)
@@ -121,8 +128,12 @@ class OptimalControlProgram:
     prepare_plots(self, automatically_organize: bool, show_bounds: bool,
             shooting_type: Shooting) -> PlotOCP
         Create all the plots associated with the OCP
-    solve(self, solver: Solver) -> Solution
+    auto_scale(self, strategy: ScalingStrategy = ScalingStrategy.BOUNDS) -> dict
+        Derive the scaling of the variables from their bounds, initial guess or derivatives
+    solve(self, solver: Solver, warm_start: Solution, expand_during_shake_tree: bool, weights: list | dict) -> Solution
         Call the solver to actually solve the ocp
+    solve_async(self, *args, executor: Executor = None, **kwargs) -> SolveFuture
+        Same as solve, but the ocp is solved in a worker thread and a cancellable future is returned immediately
     _define_time(self, phase_time: float | tuple, objective_functions: ObjectiveList, constraints: ConstraintList)
         Declare the phase_time vector in v. If objective_functions or constraints defined a time optimization,
         a sanity check is perform and the values of initial guess and bounds for these particular phases
@@ -290,6 +301,10 @@ class OptimalControlProgram:
             integrated_value_functions,
         )
         self._is_warm_starting = False
+        self._last_solution = None
+        self._async_executor = None
+        self._cancellation_callback = None
+        self._solve_lock = Lock()
 
         # Do not copy singleton since x_scaling was already dealt with before
         NLP.add(self, "x_scaling", x_scaling, True)
@@ -510,6 +525,7 @@ class OptimalControlProgram:
 
         # Declare optimization variables
         self.program_changed = True
+        self.vector_layout = None
         self.J = []
         self.J_internal = []
         self.g = []
@@ -940,6 +956,31 @@ class OptimalControlProgram:
 
         ObjectiveFunction.update_target(self.nlp[phase] if phase >= 0 else self, list_index, target)
 
+    def update_objectives_weight(self, weight: float, phase: int = None, list_index: int = None):
+        """
+        Fast accessor to update the weight of a specific objective function. The program is not rebuilt, so when the
+        solver is in parametric mode (solver.set_parametric(True)), the same compiled nlp is reused. To update the
+        weight of a global objective (usually defined by parameters), one can pass 'phase=-1'
+
+        Parameters
+        ----------
+        weight: float
+            The new weight of the objective function
+        phase: int
+            The phase the objective is in. None is interpreted as zero if the program has one phase. The value -1
+            changes the values of ocp.J
+        list_index: int
+            The objective index
+        """
+
+        if phase is None and len(self.nlp) == 1:
+            phase = 0
+
+        if phase is None or list_index is None:
+            raise ValueError("'phase' and 'list_index' must be defined")
+
+        ObjectiveFunction.update_weight(self.nlp[phase] if phase >= 0 else self, list_index, weight)
+
     def update_constraints(self, new_constraints: Constraint | ConstraintList):
         """
         The main user interface to add or modify constraint in the ocp
@@ -1180,6 +1221,8 @@ class OptimalControlProgram:
             """
             Penalty plot with different name have a different color on the graph
             """
+            from matplotlib import pyplot as plt
+
             name_unique_objective = []
             for nlp in self.nlp:
                 if cost_type == CostType.OBJECTIVES:
@@ -1298,6 +1341,8 @@ class OptimalControlProgram:
         self.plot_check_conditioning = True
 
     def save_intermediary_ipopt_iterations(self, path_to_results, result_file_name, nb_iter_save):
+        from ..gui.ipopt_output_plot import SaveIterationsInfo
+
         self.save_ipopt_iterations_info = SaveIterationsInfo(path_to_results, result_file_name, nb_iter_save)
 
     def prepare_plots(
@@ -1306,7 +1351,7 @@ class OptimalControlProgram:
         show_bounds: bool = False,
         shooting_type: Shooting = Shooting.MULTIPLE,
         integrator: SolutionIntegrator = SolutionIntegrator.OCP,
-    ) -> PlotOcp:
+    ) -> "PlotOcp":
         """
         Create all the plots associated with the OCP
 
@@ -1325,6 +1370,7 @@ class OptimalControlProgram:
         -------
         The PlotOcp class
         """
+        from ..gui.plot import PlotOcp
 
         return PlotOcp(
             self,
@@ -1335,14 +1381,50 @@ class OptimalControlProgram:
             dummy_phase_times=OptimizationVectorHelper.extract_step_times(self, casadi.DM(np.ones(self.n_phases))),
         )
 
-    def check_conditioning(self):
+    def check_conditioning(self, report_path: str = None) -> dict | None:
         """
         Visualisation of jacobian and hessian contraints and hessian objective for each phase at initial time
+
+        Parameters
+        ----------
+        report_path: str
+            If provided, nothing is drawn (headless mode) and the conditioning report is written to this path as json
+
+        Returns
+        -------
+        The conditioning report in headless mode
+        """
+        from ..gui.check_conditioning import check_conditioning
+
+        return check_conditioning(self, report_path=report_path)
+
+    def auto_scale(self, strategy: ScalingStrategy = ScalingStrategy.BOUNDS) -> dict:
+        """
+        Derive the scaling of each state, control, algebraic state and parameter so the scaled variables are of order
+        one. As the scaling is embedded in the graph of the program when it is built, the scaling is returned to be sent
+        to the OptimalControlProgram (x_scaling, u_scaling and a_scaling) and to the ParameterList (parameter_scaling)
+        of a new program
+
+        Parameters
+        ----------
+        strategy: ScalingStrategy
+            How the magnitude of the variables is estimated (see ScalingStrategy). ScalingStrategy.JACOBIAN evaluates
+            the derivatives of the objective and constraints at the initial guess, the constraints being normalized
+            row by row as IPOPT does with its gradient-based scaling
+
+        Returns
+        -------
+        The scaling as {"x_scaling", "u_scaling", "a_scaling", "parameter_scaling"} VariableScalingList
         """
-        check_conditioning(self)
+
+        return compute_auto_scaling(self, strategy)
 
     def solve(
-        self, solver: GenericSolver = None, warm_start: Solution = None, expand_during_shake_tree=False
+        self,
+        solver: GenericSolver = None,
+        warm_start: Solution = None,
+        expand_during_shake_tree=False,
+        weights: list | tuple | np.ndarray | dict = None,
     ) -> Solution:
         """
         Call the solver to actually solve the ocp
@@ -1355,6 +1437,13 @@ class OptimalControlProgram:
             The solution to pass to the warm start method
         expand_during_shake_tree: bool
             If the tree should be expanded during the shake phase
+        weights: list | tuple | np.ndarray | dict
+            The new weights of the objective functions, either as {(phase, list_index): weight} or, if the program has
+            one phase, as a sequence of weights indexed by list_index. This is the fast path of the loops that solve
+            the same program for many weightings (e.g. inverse optimal control): the weights are sent as parameters of
+            the nlp, so the solver is built once (a copy of the solver is put in parametric mode, the solver sent is left
+            untouched) and, if warm_start is not provided, the solve is warm started from the previous successful
+            solution
 
         Returns
         -------
@@ -1364,6 +1453,15 @@ class OptimalControlProgram:
         if solver is None:
             solver = Solver.IPOPT()
 
+        if weights is not None:
+            if solver.type not in (SolverType.IPOPT, SolverType.SQP):
+                raise NotImplementedError("Updating the weights is only implemented for IPOPT and SQP solvers")
+            self._update_weights(weights)
+            solver = copy(solver)
+            solver.set_parametric(True)
+            if warm_start is None and self._last_solution is not None and self._last_solution.status == 0:
+                warm_start = self._last_solution
+
         if self.ocp_solver is None:
             if solver.type == SolverType.IPOPT:
                 from ..interfaces.ipopt_interface import IpoptInterface
@@ -1391,11 +1489,90 @@ class OptimalControlProgram:
                 solver.set_warm_start_options(1e-10)
 
         self.ocp_solver.opts = solver
-
-        self.ocp_solver.solve(expand_during_shake_tree=expand_during_shake_tree)
+        is_cancellable = False
+        if self._cancellation_callback is not None and self._cancellation_callback.event is not None:
+            # This solve was started by solve_async, so the solver must check for the cancellation at each iteration
+            if solver.type in (SolverType.IPOPT, SolverType.SQP):
+                if solver.show_online_optim or solver.online_optim is not None:
+                    raise ValueError("The online optimization graphs cannot be shown while solving asynchronously")
+                self.ocp_solver.options_common["iteration_callback"] = self._cancellation_callback
+                is_cancellable = True
+
+        try:
+            self.ocp_solver.solve(expand_during_shake_tree=expand_during_shake_tree)
+        finally:
+            if is_cancellable:
+                # The next solves are not necessarily asynchronous
+                del self.ocp_solver.options_common["iteration_callback"]
         self._is_warm_starting = False
 
-        return Solution.from_dict(self, self.ocp_solver.get_optimized_value())
+        self._last_solution = Solution.from_dict(self, self.ocp_solver.get_optimized_value())
+        return self._last_solution
+
+    def solve_async(self, *args, executor: Executor = None, **kwargs) -> SolveFuture:
+        """
+        Same as solve, but the ocp is solved in a worker thread and a future is returned immediately. The solvers
+        release the GIL while iterating, so the calling thread can keep working (e.g. prepare the next ocp) or serve
+        other requests from an event loop (the future can be awaited). The solve can be cancelled with future.cancel(),
+        the IPOPT and SQP solvers then stop at their next iteration.
+
+        The solves of a same ocp are run one after the other (even with an executor that has several workers), since
+        they share the solver. The ocp must not be modified while it is being solved.
+
+        Parameters
+        ----------
+        args: Any
+            The positional arguments of solve
+        executor: Executor
+            The executor to run the solve in. If None, a single worker thread owned by the ocp is used
+        kwargs: Any
+            The keyword arguments of solve
+
+        Returns
+        -------
+        The future of the solution
+        """
+
+        if self._cancellation_callback is None:
+            self._cancellation_callback = CancellationCallback()
+        if executor is None:
+            if self._async_executor is None:
+                self._async_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bioptim_solve")
+            executor = self._async_executor
+
+        event = Event()
+        return SolveFuture(executor.submit(self._solve_in_worker, event, *args, **kwargs), event)
+
+    def _solve_in_worker(self, event: Event, *args, **kwargs) -> Solution:
+        """
+        Solve the ocp with the cancellation event of a solve_async call. The solves of a same ocp are run one after the
+        other, even if the executor has several workers
+        """
+
+        with self._solve_lock:
+            self._cancellation_callback.event = event
+            try:
+                return self.solve(*args, **kwargs)
+            finally:
+                self._cancellation_callback.event = None
+
+    def _update_weights(self, weights: list | tuple | np.ndarray | dict):
+        """
+        Update the weights of the objective functions (see solve)
+
+        Parameters
+        ----------
+        weights: list | tuple | np.ndarray | dict
+            The new weights as {(phase, list_index): weight} or, for a single phase program, indexed by list_index
+        """
+
+        if not isinstance(weights, dict):
+            if self.n_phases != 1:
+                raise ValueError("The weights must be sent as {(phase, list_index): weight} for multiphase programs")
+            weights = {(0, list_index): weight for list_index, weight in enumerate(np.array(weights).reshape(-1))}
+
+        for (phase, list_index), weight in weights.items():
+            self.update_objectives_weight(weight, phase=phase, list_index=list_index)
 
     def set_warm_start(self, sol: Solution):
         """
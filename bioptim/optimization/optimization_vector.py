@@ -3,6 +3,9 @@ from casadi import vertcat, DM, SX, MX
 
 from ..misc.enums import ControlType, InterpolationType
 
+# The blocks of variables of the optimization vector, in the order they are stacked
+VECTOR_BLOCKS = ("dt", "states", "controls", "parameters", "algebraic_states")
+
 
 class OptimizationVectorHelper:
     """
@@ -16,6 +19,8 @@ class OptimizationVectorHelper:
         Format the x, u, p and s bounds so they are in one nice (and useful) vector
     init(self)
         Format the x, u, p and s init so they are in one nice (and useful) vector
+    vector_layout(ocp) -> dict
+        Get where each block of variables is in the optimization vector (cached in the ocp)
     extract_phase_time(self, data: np.ndarray | DM) -> list
         Get the phase time. If time is optimized, the MX/SX values are replaced by their actual optimized time
     to_dictionaries(self, data: np.ndarray | DM) -> tuple
@@ -62,174 +67,230 @@ class OptimizationVectorHelper:
         return vertcat(t_scaled, *x_scaled, *u_scaled, p_scaled, *a_scaled)
 
     @staticmethod
-    def bounds_vectors(ocp) -> tuple[np.ndarray, np.ndarray]:
+    def vector_layout(ocp) -> dict:
         """
-        Format the x, u and p bounds so they are in one nice (and useful) vector
+        Get where each block of variables (time, states, controls, parameters and algebraic states of each phase) is
+        in the optimization vector. The layout is computed once and cached in the ocp as long as the dimensions of
+        the program do not change
 
         Returns
         -------
-        The vector of all bounds (min, max)
+        The layout of the optimization vector
         """
-        v_bounds_min = np.ndarray((0, 1))
-        v_bounds_max = np.ndarray((0, 1))
 
-        # For time
-        v_bounds_min = np.concatenate((v_bounds_min, ocp.dt_parameter_bounds.min))
-        v_bounds_max = np.concatenate((v_bounds_max, ocp.dt_parameter_bounds.max))
+        signature = _vector_layout_signature(ocp)
+        if ocp.vector_layout is not None and ocp.vector_layout["signature"] == signature:
+            return ocp.vector_layout
 
-        # For states
-        for nlp in ocp.nlp:
-            min_bounds, max_bounds = _dispatch_state_bounds(
-                nlp, nlp.states, nlp.x_bounds, nlp.x_scaling, lambda n: nlp.n_states_decision_steps(n)
-            )
+        offset = 0
+        n_dt = ocp.dt_parameter_bounds.shape[0]
+        layout = {"signature": signature, "dt": slice(offset, offset + n_dt)}
+        offset += n_dt
 
-            v_bounds_min = np.concatenate((v_bounds_min, min_bounds))
-            v_bounds_max = np.concatenate((v_bounds_max, max_bounds))
+        layout["states"] = []
+        for nlp in ocp.nlp:
+            nlp.states.node_index = 0
+            block = _state_block_layout(offset, nlp.ns, nlp.states.shape, nlp.n_states_decision_steps(0))
+            layout["states"].append(block)
+            offset = block["slice"].stop
 
-        # For controls
+        layout["controls"] = []
         for nlp in ocp.nlp:
-            nlp.set_node_index(0)
             if nlp.control_type in (ControlType.CONSTANT,):
-                ns = nlp.ns
+                n_cols = nlp.ns
             elif nlp.control_type in (ControlType.LINEAR_CONTINUOUS, ControlType.CONSTANT_WITH_LAST_NODE):
-                ns = nlp.ns + 1
+                n_cols = nlp.ns + 1
             else:
                 raise NotImplementedError(f"Multiple shooting problem not implemented yet for {nlp.control_type}")
+            n_rows = nlp.controls.shape
+            layout["controls"].append(
+                {
+                    "slice": slice(offset, offset + n_rows * n_cols),
+                    "n_rows": n_rows,
+                    "n_cols": n_cols,
+                }
+            )
+            offset += n_rows * n_cols
 
-            for key in nlp.controls.keys():
-                if key in nlp.u_bounds.keys():
-                    nlp.u_bounds[key].check_and_adjust_dimensions(nlp.controls[key].cx.shape[0], ns - 1)
+        layout["parameters"] = slice(offset, offset + ocp.parameters.shape)
+        offset += ocp.parameters.shape
 
-            for k in range(ns):
-                nlp.set_node_index(k)
-                collapsed_values_min = np.ndarray((nlp.controls.shape, 1))
-                collapsed_values_max = np.ndarray((nlp.controls.shape, 1))
-                for key in nlp.controls:
+        layout["algebraic_states"] = []
+        for nlp in ocp.nlp:
+            nlp.algebraic_states.node_index = 0
+            block = _state_block_layout(
+                offset, nlp.ns, nlp.algebraic_states.shape, nlp.n_algebraic_states_decision_steps(0)
+            )
+            layout["algebraic_states"].append(block)
+            offset = block["slice"].stop
+
+        layout["size"] = offset
+        ocp.vector_layout = layout
+        return layout
+
+    @staticmethod
+    def bounds_vectors(
+        ocp, out: tuple[np.ndarray, np.ndarray] = None, blocks: tuple = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Format the x, u and p bounds so they are in one nice (and useful) vector
+
+        Parameters
+        ----------
+        out: tuple[np.ndarray, np.ndarray]
+            Previously assembled vectors (min, max) to update in place. If None (or if the dimensions of the program
+            changed since), new vectors are allocated and all the blocks are filled
+        blocks: tuple
+            The blocks ("dt", "states", "controls", "parameters", "algebraic_states") to fill in out. It is ignored
+            when new vectors are allocated
+
+        Returns
+        -------
+        The vector of all bounds (min, max)
+        """
+        layout = OptimizationVectorHelper.vector_layout(ocp)
+        if out is None or out[0].shape[0] != layout["size"]:
+            v_bounds_min = np.ndarray((layout["size"], 1))
+            v_bounds_max = np.ndarray((layout["size"], 1))
+            blocks = VECTOR_BLOCKS
+        else:
+            v_bounds_min, v_bounds_max = out
+
+        # For time
+        if "dt" in blocks:
+            v_bounds_min[layout["dt"], :] = ocp.dt_parameter_bounds.min
+            v_bounds_max[layout["dt"], :] = ocp.dt_parameter_bounds.max
+
+        # For states
+        if "states" in blocks:
+            for nlp, block in zip(ocp.nlp, layout["states"]):
+                v_bounds_min[block["slice"], 0], v_bounds_max[block["slice"], 0] = _dispatch_state_bounds(
+                    nlp, nlp.states, nlp.x_bounds, nlp.x_scaling, block
+                )
+
+        # For controls
+        if "controls" in blocks:
+            for nlp, block in zip(ocp.nlp, layout["controls"]):
+                nlp.set_node_index(0)
+                for key in nlp.controls.keys():
                     if key in nlp.u_bounds.keys():
-                        value_min = (
-                            nlp.u_bounds[key].min.evaluate_at(shooting_point=k)[:, np.newaxis]
-                            / nlp.u_scaling[key].scaling
+                        nlp.u_bounds[key].check_and_adjust_dimensions(
+                            nlp.controls[key].cx.shape[0], block["n_cols"] - 1
                         )
-                        value_max = (
-                            nlp.u_bounds[key].max.evaluate_at(shooting_point=k)[:, np.newaxis]
-                            / nlp.u_scaling[key].scaling
-                        )
-                        value_min = value_min[:, 0]
-                        value_max = value_max[:, 0]
-                    else:
-                        value_min = -np.inf
-                        value_max = np.inf
+
+                collapsed_values_min = np.full((block["n_rows"], block["n_cols"]), -np.inf)
+                collapsed_values_max = np.full((block["n_rows"], block["n_cols"]), np.inf)
+                for key in nlp.controls:
+                    if key not in nlp.u_bounds.keys():
+                        continue
 
                     # Organize the controls according to the correct indices
-                    collapsed_values_min[nlp.controls[key].index, 0] = value_min
-                    collapsed_values_max[nlp.controls[key].index, 0] = value_max
+                    collapsed_values_min[nlp.controls[key].index, :] = (
+                        nlp.u_bounds[key].min.evaluate_all(block["n_cols"] - 1) / nlp.u_scaling[key].scaling
+                    )
+                    collapsed_values_max[nlp.controls[key].index, :] = (
+                        nlp.u_bounds[key].max.evaluate_all(block["n_cols"] - 1) / nlp.u_scaling[key].scaling
+                    )
 
-                v_bounds_min = np.concatenate((v_bounds_min, np.reshape(collapsed_values_min.T, (-1, 1))))
-                v_bounds_max = np.concatenate((v_bounds_max, np.reshape(collapsed_values_max.T, (-1, 1))))
+                v_bounds_min[block["slice"], 0] = collapsed_values_min.reshape(-1, order="F")
+                v_bounds_max[block["slice"], 0] = collapsed_values_max.reshape(-1, order="F")
 
         # For parameters
-        collapsed_values_min = np.ones((ocp.parameters.shape, 1)) * -np.inf
-        collapsed_values_max = np.ones((ocp.parameters.shape, 1)) * np.inf
-        for key in ocp.parameters.keys():
-            if key not in ocp.parameter_bounds.keys():
-                continue
-
-            scaled_bounds = ocp.parameter_bounds[key].scale(ocp.parameters[key].scaling.scaling)
-            collapsed_values_min[ocp.parameters[key].index, :] = scaled_bounds.min
-            collapsed_values_max[ocp.parameters[key].index, :] = scaled_bounds.max
-        v_bounds_min = np.concatenate((v_bounds_min, np.reshape(collapsed_values_min.T, (-1, 1))))
-        v_bounds_max = np.concatenate((v_bounds_max, np.reshape(collapsed_values_max.T, (-1, 1))))
+        if "parameters" in blocks:
+            collapsed_values_min = np.ones((ocp.parameters.shape, 1)) * -np.inf
+            collapsed_values_max = np.ones((ocp.parameters.shape, 1)) * np.inf
+            for key in ocp.parameters.keys():
+                if key not in ocp.parameter_bounds.keys():
+                    continue
+
+                scaled_bounds = ocp.parameter_bounds[key].scale(ocp.parameters[key].scaling.scaling)
+                collapsed_values_min[ocp.parameters[key].index, :] = scaled_bounds.min
+                collapsed_values_max[ocp.parameters[key].index, :] = scaled_bounds.max
+            v_bounds_min[layout["parameters"], :] = collapsed_values_min
+            v_bounds_max[layout["parameters"], :] = collapsed_values_max
 
         # For algebraic_states variables
-        for nlp in ocp.nlp:
-            min_bounds, max_bounds = _dispatch_state_bounds(
-                nlp,
-                nlp.algebraic_states,
-                nlp.a_bounds,
-                nlp.a_scaling,
-                lambda n: nlp.n_algebraic_states_decision_steps(n),
-            )
-
-            v_bounds_min = np.concatenate((v_bounds_min, min_bounds))
-            v_bounds_max = np.concatenate((v_bounds_max, max_bounds))
+        if "algebraic_states" in blocks:
+            for nlp, block in zip(ocp.nlp, layout["algebraic_states"]):
+                v_bounds_min[block["slice"], 0], v_bounds_max[block["slice"], 0] = _dispatch_state_bounds(
+                    nlp, nlp.algebraic_states, nlp.a_bounds, nlp.a_scaling, block
+                )
 
         return v_bounds_min, v_bounds_max
 
     @staticmethod
-    def init_vector(ocp):
+    def init_vector(ocp, out: np.ndarray = None, blocks: tuple = None):
         """
         Format the x, u and p bounds so they are in one nice (and useful) vector
 
+        Parameters
+        ----------
+        out: np.ndarray
+            A previously assembled vector to update in place. If None (or if the dimensions of the program changed
+            since), a new vector is allocated and all the blocks are filled
+        blocks: tuple
+            The blocks ("dt", "states", "controls", "parameters", "algebraic_states") to fill in out. It is ignored
+            when a new vector is allocated
+
         Returns
         -------
         The vector of all bounds (min, max)
         """
-        v_init = np.ndarray((0, 1))
+        layout = OptimizationVectorHelper.vector_layout(ocp)
+        if out is None or out.shape[0] != layout["size"]:
+            v_init = np.ndarray((layout["size"], 1))
+            blocks = VECTOR_BLOCKS
+        else:
+            v_init = out
 
         # For time
-        v_init = np.concatenate((v_init, ocp.dt_parameter_initial_guess.init))
+        if "dt" in blocks:
+            v_init[layout["dt"], :] = ocp.dt_parameter_initial_guess.init
 
         # For states
-        for nlp in ocp.nlp:
-            init = _dispatch_state_initial_guess(
-                nlp, nlp.states, nlp.x_init, nlp.x_scaling, lambda n: nlp.n_states_decision_steps(n)
-            )
-            v_init = np.concatenate((v_init, init))
+        if "states" in blocks:
+            for nlp, block in zip(ocp.nlp, layout["states"]):
+                v_init[block["slice"], 0] = _dispatch_state_initial_guess(
+                    nlp, nlp.states, nlp.x_init, nlp.x_scaling, block
+                )
 
         # For controls
-        for nlp in ocp.nlp:
-            nlp.set_node_index(0)
-            if nlp.control_type in (ControlType.CONSTANT,):
-                ns = nlp.ns - 1
-            elif nlp.control_type in (ControlType.LINEAR_CONTINUOUS, ControlType.CONSTANT_WITH_LAST_NODE):
-                ns = nlp.ns
-            else:
-                raise NotImplementedError(f"Multiple shooting problem not implemented yet for {nlp.control_type}")
-
-            for key in nlp.controls.keys():
-                if key in nlp.u_init.keys():
-                    nlp.u_init[key].check_and_adjust_dimensions(nlp.controls[key].cx.shape[0], ns)
+        if "controls" in blocks:
+            for nlp, block in zip(ocp.nlp, layout["controls"]):
+                nlp.set_node_index(0)
+                for key in nlp.controls.keys():
+                    if key in nlp.u_init.keys():
+                        nlp.u_init[key].check_and_adjust_dimensions(nlp.controls[key].cx.shape[0], block["n_cols"] - 1)
 
-            for k in range(ns + 1):
-                nlp.set_node_index(k)
-                collapsed_values = np.ndarray((nlp.controls.shape, 1))
+                collapsed_values = np.zeros((block["n_rows"], block["n_cols"]))
                 for key in nlp.controls:
-                    if key in nlp.u_init.keys():
-                        value = (
-                            nlp.u_init[key].init.evaluate_at(shooting_point=k)[:, np.newaxis]
-                            / nlp.u_scaling[key].scaling
-                        )
-                        value = value[:, 0]
-                    else:
-                        value = 0
+                    if key not in nlp.u_init.keys():
+                        continue
 
                     # Organize the controls according to the correct indices
-                    collapsed_values[nlp.controls[key].index, 0] = value
+                    collapsed_values[nlp.controls[key].index, :] = (
+                        nlp.u_init[key].init.evaluate_all(block["n_cols"] - 1) / nlp.u_scaling[key].scaling
+                    )
 
-                v_init = np.concatenate((v_init, np.reshape(collapsed_values.T, (-1, 1))))
+                v_init[block["slice"], 0] = collapsed_values.reshape(-1, order="F")
 
         # For parameters
-        collapsed_values = np.zeros((ocp.parameters.shape, 1))
-        for key in ocp.parameters.keys():
-            if key not in ocp.parameter_init.keys():
-                v_init = np.concatenate((v_init, np.zeros((ocp.parameters[key].size, 1))))
-                continue
+        if "parameters" in blocks:
+            collapsed_values = np.zeros((ocp.parameters.shape, 1))
+            for key in ocp.parameters.keys():
+                if key not in ocp.parameter_init.keys():
+                    continue
 
-            scaled_init = ocp.parameter_init[key].scale(ocp.parameters[key].scaling.scaling)
-            collapsed_values[ocp.parameters[key].index, :] = scaled_init.init
-        v_init = np.concatenate((v_init, np.reshape(collapsed_values.T, (-1, 1))))
+                scaled_init = ocp.parameter_init[key].scale(ocp.parameters[key].scaling.scaling)
+                collapsed_values[ocp.parameters[key].index, :] = scaled_init.init
+            v_init[layout["parameters"], :] = collapsed_values
 
         # For algebraic_states variables
-        for nlp in ocp.nlp:
-            init = _dispatch_state_initial_guess(
-                nlp,
-                nlp.algebraic_states,
-                nlp.a_init,
-                nlp.a_scaling,
-                lambda n: nlp.n_algebraic_states_decision_steps(n),
-            )
-
-            v_init = np.concatenate((v_init, init))
+        if "algebraic_states" in blocks:
+            for nlp, block in zip(ocp.nlp, layout["algebraic_states"]):
+                v_init[block["slice"], 0] = _dispatch_state_initial_guess(
+                    nlp, nlp.algebraic_states, nlp.a_init, nlp.a_scaling, block
+                )
 
         return v_init
 
@@ -364,9 +425,91 @@ class OptimizationVectorHelper:
         return data_states, data_controls, data_parameters, data_algebraic_states
 
 
-def _dispatch_state_bounds(nlp, states, states_bounds, states_scaling, n_steps_callback):
+def _vector_layout_signature(ocp) -> tuple:
+    """
+    The dimensions of the program the layout of the optimization vector depends on
+    """
+
+    signature = [ocp.dt_parameter_bounds.shape[0], ocp.parameters.shape]
+    for nlp in ocp.nlp:
+        nlp.set_node_index(0)
+        signature.append(
+            (
+                nlp.ns,
+                nlp.states.shape,
+                nlp.n_states_decision_steps(0),
+                nlp.control_type,
+                nlp.controls.shape,
+                nlp.algebraic_states.shape,
+            )
+        )
+    return tuple(signature)
+
+
+def _state_block_layout(offset: int, ns: int, n_rows: int, repeat: int) -> dict:
+    """
+    The layout of a states-like block (states or algebraic states) of a phase. Each of the shooting node has 'repeat'
+    columns (collocation points), except for the last one
+
+    Parameters
+    ----------
+    offset: int
+        The index of the first element of the block in the optimization vector
+    ns: int
+        The number of shooting nodes of the phase
+    n_rows: int
+        The number of variables at each column
+    repeat: int
+        The number of columns per shooting node
+
+    Returns
+    -------
+    The layout of the block
+    """
+
+    n_cols = ns * repeat + 1
+    columns = np.arange(n_cols)
+    nodes = columns // repeat
+    subnodes = columns - nodes * repeat
+    return {
+        "slice": slice(offset, offset + n_rows * n_cols),
+        "n_rows": n_rows,
+        "n_cols": n_cols,
+        "repeat": repeat,
+        # This allows CONSTANT_WITH_FIRST_AND_LAST to work in collocations, but is flawed for the other ones
+        # points refers to the column to use in the bounds matrix
+        "points": np.where((nodes == 0) & (subnodes != 0), 1, nodes),
+    }
+
+
+def _evaluate_block(path_condition, interpolation: InterpolationType, ns: int, block: dict) -> np.ndarray:
+    """
+    Evaluate a path condition at each column of a states-like block, reusing the evaluation cached in the path condition
+
+    Parameters
+    ----------
+    path_condition: PathCondition
+        The path condition to evaluate
+    interpolation: InterpolationType
+        The interpolation type of the path condition
+    ns: int
+        The number of shooting nodes of the phase
+    block: dict
+        The layout of the block (see _state_block_layout)
+
+    Returns
+    -------
+    The values of the path condition at each column of the block
+    """
+
+    if interpolation == InterpolationType.ALL_POINTS:
+        return path_condition.evaluate_all(ns * block["repeat"], repeat=block["repeat"])
+    return path_condition.evaluate_all(ns, repeat=block["repeat"])[:, block["points"]]
+
+
+def _dispatch_state_bounds(nlp, states, states_bounds, states_scaling, block: dict) -> tuple[np.ndarray, np.ndarray]:
     states.node_index = 0
-    repeat = n_steps_callback(0)
+    repeat = block["repeat"]
 
     for key in states.keys():
         if key in states_bounds.keys():
@@ -375,47 +518,28 @@ def _dispatch_state_bounds(nlp, states, states_bounds, states_scaling, n_steps_c
             else:
                 states_bounds[key].check_and_adjust_dimensions(states[key].cx.shape[0], nlp.ns)
 
-    v_bounds_min = np.ndarray((0, 1))
-    v_bounds_max = np.ndarray((0, 1))
-    for k in range(nlp.n_states_nodes):
-        states.node_index = k
-
-        for p in range(repeat if k != nlp.ns else 1):
-            collapsed_values_min = np.ndarray((states.shape, 1))
-            collapsed_values_max = np.ndarray((states.shape, 1))
-            for key in states:
-                if key in states_bounds.keys():
-                    if states_bounds[key].type == InterpolationType.ALL_POINTS:
-                        point = k * n_steps_callback(0) + p
-                    else:
-                        # This allows CONSTANT_WITH_FIRST_AND_LAST to work in collocations, but is flawed for the other ones
-                        # point refers to the column to use in the bounds matrix
-                        point = k if k != 0 else 0 if p == 0 else 1
-
-                    value_min = (
-                        states_bounds[key].min.evaluate_at(shooting_point=point, repeat=repeat)[:, np.newaxis]
-                        / states_scaling[key].scaling
-                    )
-                    value_max = (
-                        states_bounds[key].max.evaluate_at(shooting_point=point, repeat=repeat)[:, np.newaxis]
-                        / states_scaling[key].scaling
-                    )
-                else:
-                    value_min = -np.inf
-                    value_max = np.inf
-                # Organize the controls according to the correct indices
-                collapsed_values_min[states[key].index, :] = value_min
-                collapsed_values_max[states[key].index, :] = value_max
+    collapsed_values_min = np.full((block["n_rows"], block["n_cols"]), -np.inf)
+    collapsed_values_max = np.full((block["n_rows"], block["n_cols"]), np.inf)
+    for key in states:
+        if key not in states_bounds.keys():
+            continue
 
-            v_bounds_min = np.concatenate((v_bounds_min, np.reshape(collapsed_values_min.T, (-1, 1))))
-            v_bounds_max = np.concatenate((v_bounds_max, np.reshape(collapsed_values_max.T, (-1, 1))))
+        # Organize the states according to the correct indices
+        collapsed_values_min[states[key].index, :] = (
+            _evaluate_block(states_bounds[key].min, states_bounds[key].type, nlp.ns, block)
+            / states_scaling[key].scaling
+        )
+        collapsed_values_max[states[key].index, :] = (
+            _evaluate_block(states_bounds[key].max, states_bounds[key].type, nlp.ns, block)
+            / states_scaling[key].scaling
+        )
 
-    return v_bounds_min, v_bounds_max
+    return collapsed_values_min.reshape(-1, order="F"), collapsed_values_max.reshape(-1, order="F")
 
 
-def _dispatch_state_initial_guess(nlp, states, states_init, states_scaling, n_steps_callback):
+def _dispatch_state_initial_guess(nlp, states, states_init, states_scaling, block: dict) -> np.ndarray:
     states.node_index = 0
-    repeat = n_steps_callback(0)
+    repeat = block["repeat"]
 
     for key in states.keys():
         if key in states_init.keys():
@@ -424,32 +548,14 @@ def _dispatch_state_initial_guess(nlp, states, states_init, states_scaling, n_st
             else:
                 states_init[key].check_and_adjust_dimensions(states[key].cx.shape[0], nlp.ns)
 
-    v_init = np.ndarray((0, 1))
-    for k in range(nlp.n_states_nodes):
-        states.node_index = k
-
-        for p in range(repeat if k != nlp.ns else 1):
-            collapsed_values_init = np.ndarray((states.shape, 1))
-            for key in states:
-                if key in states_init.keys():
-                    if states_init[key].type == InterpolationType.ALL_POINTS:
-                        point = k * n_steps_callback(0) + p
-                    else:
-                        # This allows CONSTANT_WITH_FIRST_AND_LAST to work in collocations, but is flawed for the other ones
-                        # point refers to the column to use in the bounds matrix
-                        point = k if k != 0 else 0 if p == 0 else 1
-
-                    value_init = (
-                        states_init[key].init.evaluate_at(shooting_point=point, repeat=repeat)[:, np.newaxis]
-                        / states_scaling[key].scaling
-                    )
-
-                else:
-                    value_init = 0
-
-                # Organize the controls according to the correct indices
-                collapsed_values_init[states[key].index, :] = value_init
+    collapsed_values_init = np.zeros((block["n_rows"], block["n_cols"]))
+    for key in states:
+        if key not in states_init.keys():
+            continue
 
-            v_init = np.concatenate((v_init, np.reshape(collapsed_values_init.T, (-1, 1))))
+        # Organize the states according to the correct indices
+        collapsed_values_init[states[key].index, :] = (
+            _evaluate_block(states_init[key].init, states_init[key].type, nlp.ns, block) / states_scaling[key].scaling
+        )
 
-    return v_init
+    return collapsed_values_init.reshape(-1, order="F")
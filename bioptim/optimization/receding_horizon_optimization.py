@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 from math import inf
 from typing import Callable
 from time import perf_counter
@@ -7,13 +7,15 @@ from casadi import SX
 import numpy as np
 
 from .optimal_control_program import OptimalControlProgram
+from .optimization_vector import OptimizationVectorHelper, VECTOR_BLOCKS
 from ..optimization.solution.solution import Solution
 from ..dynamics.configure_problem import Dynamics, DynamicsList
 from ..dynamics.ode_solvers import OdeSolver
 from ..limits.constraints import ConstraintFcn, ConstraintList
 from ..limits.objective_functions import ObjectiveFcn, ObjectiveList
-from ..limits.path_conditions import InitialGuessList
+from ..limits.path_conditions import Bounds, BoundsList, InitialGuessList
 from ..misc.enums import SolverType, InterpolationType, MultiCyclicCycleSolutions, ControlType, OnlineOptim
+from ..misc.options import OptionDict
 from ..interfaces import Solver
 from ..interfaces.abstract_options import GenericSolver
 from ..models.protocols.biomodel import BioModel
@@ -21,15 +23,201 @@ from ..optimization.solution.solution_data import SolutionMerge
 from ..optimization.parameters import ParameterList
 
 
+def _path_conditions_fingerprint(conditions: list) -> tuple | None:
+    """
+    The content of bounds or initial guesses (Bounds, InitialGuess or their lists), used to detect that they were
+    edited. None is returned if the content cannot be compared (e.g. custom functions)
+    """
+
+    fingerprint = []
+    for condition in conditions:
+        if isinstance(condition, OptionDict):
+            items = [(key, condition[key]) for key in condition.keys()]
+        else:
+            items = [(None, condition)]
+
+        for key, value in items:
+            for path in (value.min, value.max) if isinstance(value, Bounds) else (value.init,):
+                if not isinstance(path, np.ndarray) or path.type == InterpolationType.CUSTOM:
+                    return None
+                fingerprint.append((key, path.type, path.shape, path.tobytes()))
+    return tuple(fingerprint)
+
+
+class _ExportBuffer:
+    """
+    Accumulate the frames exported at each window in preallocated arrays. The capacity is doubled each time it is
+    reached, so appending a window is amortized constant time instead of concatenating all the windows at the end
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._capacity = capacity
+        self._data = {}
+        self._n_frames = {}
+
+    def append(self, frames: dict):
+        for key, value in frames.items():
+            value = np.asarray(value)
+            if value.ndim == 1:
+                value = value[:, np.newaxis]
+
+            n_frames = self._n_frames.get(key, 0)
+            if key not in self._data:
+                self._data[key] = np.ndarray((value.shape[0], max(self._capacity, value.shape[1])))
+            elif n_frames + value.shape[1] > self._data[key].shape[1]:
+                new_data = np.ndarray((value.shape[0], 2 * max(self._data[key].shape[1], value.shape[1])))
+                new_data[:, :n_frames] = self._data[key][:, :n_frames]
+                self._data[key] = new_data
+
+            self._data[key][:, n_frames : n_frames + value.shape[1]] = value
+            self._n_frames[key] = n_frames + value.shape[1]
+
+    def to_dict(self) -> dict:
+        return {key: self._data[key][:, : self._n_frames[key]] for key in self._data}
+
+
+class RealTimeStats:
+    """
+    The timings of each window of a receding horizon optimization
+
+    Attributes
+    ----------
+    control_period: float | None
+        The deadline of each window (in seconds), None if the loop was not run in real-time mode
+    steps: tuple[str, ...]
+        The steps of a window that are timed: "build" (update_function and preparation of the solver), "solve" (the
+        solver itself), "shift" (advance of the window) and "export" (extraction of the frames of the window)
+    overruns: list[int]
+        The index of the windows that missed their deadline
+    fallbacks: list[int]
+        The index of the windows for which the shifted previous solution was used instead of the one of the solver
+
+    Methods
+    -------
+    record(self, build: float, solve: float, shift: float, export: float)
+        Add the timings of a window
+    latencies(self) -> dict
+        The duration of each step of each window, and the latency to get the solution of the window ("latency")
+    histogram(self, step: str = "latency", bins: int | np.ndarray = 20) -> tuple[np.ndarray, np.ndarray]
+        The histogram of the durations of a step
+    summary(self) -> dict
+        The mean, median, 95th percentile and maximum duration of each step
+    """
+
+    steps = ("build", "solve", "shift", "export")
+
+    def __init__(self, control_period: float = None):
+        """
+        Parameters
+        ----------
+        control_period: float
+            The deadline of each window (in seconds)
+        """
+
+        self.control_period = control_period
+        self.overruns = []
+        self.fallbacks = []
+        self._timings = {step: [] for step in self.steps}
+
+    @property
+    def n_windows(self) -> int:
+        return len(self._timings["solve"])
+
+    def record(self, build: float, solve: float, shift: float, export: float):
+        """
+        Add the timings of a window (in seconds)
+
+        Parameters
+        ----------
+        build: float
+            The time spent in the update_function and in the preparation of the solver
+        solve: float
+            The time spent in the solver
+        shift: float
+            The time spent to advance the window
+        export: float
+            The time spent to extract the frames of the window
+        """
+
+        for step, value in zip(self.steps, (build, solve, shift, export)):
+            self._timings[step].append(value)
+
+    @property
+    def latencies(self) -> dict:
+        """
+        The duration (in seconds) of each step of each window. The "latency" of a window is the time between its
+        start and the moment its solution is available (build + solve), which is what the deadline applies to
+        """
+
+        latencies = {step: np.array(values) for step, values in self._timings.items()}
+        latencies["latency"] = latencies["build"] + latencies["solve"]
+        return latencies
+
+    def histogram(self, step: str = "latency", bins: int | np.ndarray = 20) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The histogram of the durations of a step
+
+        Parameters
+        ----------
+        step: str
+            The step to get the histogram of ("build", "solve", "shift", "export" or "latency")
+        bins: int | np.ndarray
+            The number of bins or their edges (see numpy.histogram)
+
+        Returns
+        -------
+        The number of windows in each bin and the edges of the bins
+        """
+
+        latencies = self.latencies
+        if step not in latencies:
+            raise ValueError(f"step must be one of {list(latencies.keys())}, not {step}")
+        return np.histogram(latencies[step], bins=bins)
+
+    def summary(self) -> dict:
+        """
+        The mean, median, 95th percentile and maximum duration (in seconds) of each step
+        """
+
+        summary = {}
+        for step, values in self.latencies.items():
+            if values.shape[0] == 0:
+                continue
+            summary[step] = {
+                "mean": float(np.mean(values)),
+                "median": float(np.median(values)),
+                "p95": float(np.percentile(values, 95)),
+                "max": float(np.max(values)),
+            }
+        summary["n_windows"] = self.n_windows
+        summary["n_overruns"] = len(self.overruns)
+        summary["n_fallbacks"] = len(self.fallbacks)
+        return summary
+
+
 class RecedingHorizonOptimization(OptimalControlProgram):
     """
     The main class to define an MHE. This class prepares the full program and gives all
-    the needed interface to modify and solve the program
+    the needed interface to modify and solve the program.
+
+    Between two windows, the bounds and initial guess vectors sent to the solver are not reassembled from scratch:
+    only the blocks of variables that were modified through update_bounds and update_initial_guess (which is what the
+    advance_window methods do) are rewritten. Therefore, the bounds and initial guesses modified in the
+    update_function must be declared via update_bounds and update_initial_guess.
+
+    Attributes
+    ----------
+    total_optimization_run: int
+        The number of windows solved so far
 
     Methods
     -------
     solve(self, solver: Solver) -> Solution
         Call the solver to actually solve the ocp
+    update_bounds(self, x_bounds: BoundsList, u_bounds: BoundsList, parameter_bounds: BoundsList, a_bounds: BoundsList)
+        Same as OCP, but flags the corresponding blocks of the bounds vectors so they are rewritten before next solve
+    update_initial_guess(self, x_init: InitialGuessList, u_init: InitialGuessList, parameter_init: InitialGuessList, a_init: InitialGuessList)
+        Same as OCP, but flags the corresponding blocks of the initial guess vector so it is rewritten before next solve
     """
 
     def __init__(
@@ -70,6 +258,12 @@ class RecedingHorizonOptimization(OptimalControlProgram):
 
         self.common_objective_functions = deepcopy(common_objective_functions)
 
+        # The vectors sent to the solver at the previous window and the blocks that must be rewritten before the next
+        self._assembled_vectors = {"bounds": None, "init": None}
+        self._outdated_blocks = {"bounds": set(VECTOR_BLOCKS), "init": set(VECTOR_BLOCKS)}
+        self._fingerprints = {"bounds": {}, "init": {}}
+        self._merged_window_cache = None
+
         super(RecedingHorizonOptimization, self).__init__(
             bio_model=bio_model,
             dynamics=dynamics,
@@ -80,6 +274,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             **kwargs,
         )
         self.total_optimization_run = 0
+        self._exported_windows_overlap = False
         if isinstance(self.nlp[0].dynamics_type.ode_solver, OdeSolver.COLLOCATION):
             self.nb_intermediate_frames = self.nlp[0].dynamics_type.ode_solver.polynomial_degree + 1
         else:
@@ -95,6 +290,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
         max_consecutive_failing: int = inf,
         update_function_extra_params: dict = None,
         get_all_iterations: bool = False,
+        real_time_options: dict = None,
         **advance_options,
     ) -> Solution | tuple:
         """
@@ -127,6 +323,19 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             Any parameters to pass to the update function
         get_all_iterations: bool
             If an extra output value that includes all the individual solution should be returned
+        real_time_options: dict
+            The options of the real-time mode, where each window must be solved within a control period:
+                - control_period: The deadline of each window (in seconds), from the call to update_function to the
+                  availability of the solution
+                - max_iterations: The maximum number of iterations of the solver (default: unchanged, not available
+                  for ACADOS)
+                - max_solve_time: The maximum wall time of the solver (IPOPT only, default: control_period)
+                - fallback: If the previous solution, shifted by one frame, should be used instead of the solution
+                  of a window that missed its deadline (default: True)
+            The windows after the first one are solved with a copy of the solver capped with these options, the
+            solvers sent are left untouched.
+            The timings of each window are available in the real_time_stats attribute of the returned solution,
+            whether the real-time mode is used or not
         advance_options: Any
             The extra options to pass to the advancing methods
 
@@ -139,8 +348,8 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             raise NotImplementedError("MHE is only available for 1 phase program")
 
         sol = None
-        states = []
-        controls = []
+        states = _ExportBuffer()
+        controls = _ExportBuffer()
         parameters = []
 
         solver_all_iter = Solver.ACADOS() if solver is None else solver
@@ -148,9 +357,14 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             # If not first iter was sent, the all iter becomes the first and is not updated afterward
             solver_first_iter = solver_all_iter
             solver_all_iter = None
-        solver_current = solver_first_iter
 
         self._initialize_frame_to_export(export_options)
+        real_time_options = self._initialize_real_time_options(real_time_options)
+        if real_time_options["control_period"] is not None:
+            # The first window is not capped since it is not warm started from a previous window
+            solver_all_iter = self._real_time_solver(real_time_options, solver_all_iter or solver_first_iter)
+        solver_current = solver_first_iter
+        stats = RealTimeStats(real_time_options["control_period"])
 
         total_time = 0
         real_time = perf_counter()
@@ -160,6 +374,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
         update_function_extra_params = {} if update_function_extra_params is None else update_function_extra_params
 
         self.total_optimization_run = 0
+        window_start = perf_counter()
         while (
             update_function(self, self.total_optimization_run, sol, **update_function_extra_params)
             and consecutive_failing < max_consecutive_failing
@@ -168,8 +383,16 @@ class RecedingHorizonOptimization(OptimalControlProgram):
                 solver=solver_current,
                 warm_start=warm_start,
             )
+            solve_time = sol.real_time_to_optimize
+            build_time = perf_counter() - window_start - solve_time
             consecutive_failing = 0 if sol.status == 0 else consecutive_failing + 1
 
+            if stats.control_period is not None and build_time + solve_time > stats.control_period:
+                stats.overruns.append(self.total_optimization_run)
+                if real_time_options["fallback"] and self.total_optimization_run > 0:
+                    sol = self._fallback_solution(sol)
+                    stats.fallbacks.append(self.total_optimization_run)
+
             # Set the option for the next iteration
             if self.total_optimization_run == 0:
                 # Update the solver if first and the rest are different
@@ -189,26 +412,38 @@ class RecedingHorizonOptimization(OptimalControlProgram):
                 real_time = perf_counter()  # Reset timer to skip the compiling time (so skip the first call to solve)
 
             # Solve and save the current window of interest
+            tic = perf_counter()
             _states, _controls, _parameters = self.export_data(sol)
+            if self._exported_windows_overlap:
+                # The last exported frame is the first frame of the next window
+                _states = {key: value[:, :-1] for key, value in _states.items()}
             states.append(_states)
             controls.append(_controls)
             parameters.append(_parameters)
             # Solve and save the full window of the OCP
             if get_all_iterations:
                 all_solutions.append(sol)
+            export_time = perf_counter() - tic
+
             # Update the initial frame bounds and initial guess
+            tic = perf_counter()
             self.advance_window(sol, **advance_options)
+            stats.record(build=build_time, solve=solve_time, shift=perf_counter() - tic, export=export_time)
 
             self.total_optimization_run += 1
+            window_start = perf_counter()
 
-        states.append({key: sol.decision_states()[key][-1] for key in sol.decision_states().keys()})
+        last_node = sol.decision_states()
+        states.append({key: last_node[key][-1] for key in last_node.keys()})
+        self._merged_window_cache = None
         real_time = perf_counter() - real_time
 
         # Prepare the modified ocp that fits the solution dimension
         dt = sol.t_span()[0][-1]
-        final_sol = self._initialize_solution(float(dt), states, controls, parameters)
+        final_sol = self._initialize_solution(float(dt), states.to_dict(), controls.to_dict(), parameters)
         final_sol.solver_time_to_optimize = total_time
         final_sol.real_time_to_optimize = real_time
+        final_sol.real_time_stats = stats
 
         return (final_sol, all_solutions, split_solutions) if get_all_iterations else final_sol
 
@@ -226,20 +461,63 @@ class RecedingHorizonOptimization(OptimalControlProgram):
 
         self.frame_to_export = export_options["frame_to_export"]
 
-    def _initialize_solution(self, dt: float, states: list, controls: list, parameters: list):
+    @staticmethod
+    def _initialize_real_time_options(real_time_options: dict) -> dict:
+        """
+        Fill the default values of the real-time options
+        """
+
+        real_time_options = {} if real_time_options is None else dict(real_time_options)
+        real_time_options.setdefault("control_period", None)
+        real_time_options.setdefault("max_iterations", None)
+        real_time_options.setdefault("max_solve_time", real_time_options["control_period"])
+        real_time_options.setdefault("fallback", True)
+
+        if real_time_options["control_period"] is not None and real_time_options["control_period"] <= 0:
+            raise ValueError("The control_period of the real-time options must be positive")
+        return real_time_options
+
+    @staticmethod
+    def _real_time_solver(real_time_options: dict, solver: GenericSolver) -> GenericSolver:
+        """
+        A copy of the solver capped so it fits in the control period (the solver sent is left untouched)
+        """
+
+        if solver.type == SolverType.ACADOS:
+            if real_time_options["max_iterations"] is not None:
+                raise ValueError(
+                    "The options of ACADOS are fixed when its solver is built, the maximum number of iterations must "
+                    "be set on the solver instead of in the real-time options"
+                )
+            return solver
+
+        solver = copy(solver)
+        if real_time_options["max_iterations"] is not None:
+            solver.set_maximum_iterations(real_time_options["max_iterations"])
+        if real_time_options["max_solve_time"] is not None and solver.type == SolverType.IPOPT:
+            solver.set_maximum_wall_time(real_time_options["max_solve_time"])
+        return solver
+
+    def _fallback_solution(self, sol: Solution) -> Solution:
+        """
+        The solution to use for a window that missed its deadline: the initial guess of the window, that is the
+        previous solution shifted by one frame
+        """
+
+        fallback = Solution.from_vector(self, OptimizationVectorHelper.init_vector(self))
+        fallback.status, fallback.iterations = sol.status, sol.iterations
+        fallback.solver_time_to_optimize = sol.solver_time_to_optimize
+        fallback.real_time_to_optimize = sol.real_time_to_optimize
+        return fallback
+
+    def _initialize_solution(self, dt: float, states: dict, controls: dict, parameters: list):
         x_init = InitialGuessList()
         for key in self.nlp[0].states.keys():
-            x_init.add(
-                key,
-                np.concatenate([state[key] for state in states], axis=1),
-                interpolation=InterpolationType.EACH_FRAME,
-                phase=0,
-            )
+            x_init.add(key, states[key], interpolation=InterpolationType.EACH_FRAME, phase=0)
 
         u_init = InitialGuessList()
         for key in self.nlp[0].controls.keys():
-            controls_tp = np.concatenate([control[key] for control in controls], axis=1)
-            u_init.add(key, controls_tp, interpolation=InterpolationType.EACH_FRAME, phase=0)
+            u_init.add(key, controls[key], interpolation=InterpolationType.EACH_FRAME, phase=0)
 
         model_serialized = self.nlp[0].model.serialize()
         model_class = model_serialized[0]
@@ -273,6 +551,98 @@ class RecedingHorizonOptimization(OptimalControlProgram):
         a_init = InitialGuessList()
         return Solution.from_initial_guess(solution_ocp, [np.array([dt]), x_init, u_init, p_init, a_init])
 
+    @property
+    def bounds_vectors(self):
+        self._flag_edited_blocks("bounds")
+        self._assembled_vectors["bounds"] = OptimizationVectorHelper.bounds_vectors(
+            self, out=self._assembled_vectors["bounds"], blocks=tuple(self._outdated_blocks["bounds"])
+        )
+        self._outdated_blocks["bounds"].clear()
+        return self._assembled_vectors["bounds"]
+
+    @property
+    def init_vector(self):
+        self._flag_edited_blocks("init")
+        self._assembled_vectors["init"] = OptimizationVectorHelper.init_vector(
+            self, out=self._assembled_vectors["init"], blocks=tuple(self._outdated_blocks["init"])
+        )
+        self._outdated_blocks["init"].clear()
+        return self._assembled_vectors["init"]
+
+    def update_bounds(
+        self,
+        x_bounds: BoundsList = None,
+        u_bounds: BoundsList = None,
+        parameter_bounds: BoundsList = None,
+        a_bounds: BoundsList = None,
+    ):
+        super(RecedingHorizonOptimization, self).update_bounds(x_bounds, u_bounds, parameter_bounds, a_bounds)
+        self._flag_outdated_blocks("bounds", x_bounds, u_bounds, parameter_bounds, a_bounds)
+
+    def update_initial_guess(
+        self,
+        x_init: InitialGuessList = None,
+        u_init: InitialGuessList = None,
+        parameter_init: InitialGuessList = None,
+        a_init: InitialGuessList = None,
+    ):
+        super(RecedingHorizonOptimization, self).update_initial_guess(x_init, u_init, parameter_init, a_init)
+        self._flag_outdated_blocks("init", x_init, u_init, parameter_init, a_init)
+
+    def _flag_outdated_blocks(self, vector: str, states, controls, parameters, algebraic_states):
+        """
+        Flag the blocks of the bounds ("bounds") or initial guess ("init") vectors that must be rewritten before the
+        next solve
+        """
+
+        for block, value in zip(VECTOR_BLOCKS[1:], (states, controls, parameters, algebraic_states)):
+            if value is not None:
+                self._outdated_blocks[vector].add(block)
+
+    def _flag_edited_blocks(self, vector: str):
+        """
+        Flag the blocks of the bounds ("bounds") or initial guess ("init") vectors whose content changed since they
+        were last assembled. This catches the direct edits that do not go through update_bounds or
+        update_initial_guess (e.g. mhe.nlp[0].x_bounds["q"].min[:, 0] = 0 in the update_function)
+        """
+
+        if vector == "bounds":
+            sources = (
+                [self.dt_parameter_bounds],
+                [nlp.x_bounds for nlp in self.nlp],
+                [nlp.u_bounds for nlp in self.nlp],
+                [self.parameter_bounds],
+                [nlp.a_bounds for nlp in self.nlp],
+            )
+        else:
+            sources = (
+                [self.dt_parameter_initial_guess],
+                [nlp.x_init for nlp in self.nlp],
+                [nlp.u_init for nlp in self.nlp],
+                [self.parameter_init],
+                [nlp.a_init for nlp in self.nlp],
+            )
+
+        for block, conditions in zip(VECTOR_BLOCKS, sources):
+            fingerprint = _path_conditions_fingerprint(conditions)
+            if fingerprint is None or fingerprint != self._fingerprints[vector].get(block):
+                self._outdated_blocks[vector].add(block)
+            self._fingerprints[vector][block] = fingerprint
+
+    def _merged_window(self, sol: Solution) -> tuple[dict, dict]:
+        """
+        The decision states and controls of a window merged by nodes. They are computed once per window and shared by
+        the export and the advance_window methods
+        """
+
+        if self._merged_window_cache is None or self._merged_window_cache[0] is not sol:
+            self._merged_window_cache = (
+                sol,
+                sol.decision_states(to_merge=SolutionMerge.NODES),
+                sol.decision_controls(to_merge=SolutionMerge.NODES),
+            )
+        return self._merged_window_cache[1], self._merged_window_cache[2]
+
     def advance_window(self, sol: Solution, steps: int = 0, **advance_options):
         state_bounds_have_changed = self.advance_window_bounds_states(sol, **advance_options)
         control_bounds_have_changed = self.advance_window_bounds_controls(sol, **advance_options)
@@ -294,7 +664,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
             )
 
     def advance_window_bounds_states(self, sol, **advance_options):
-        states = sol.decision_states(to_merge=SolutionMerge.NODES)
+        states = self._merged_window(sol)[0]
 
         for key in self.nlp[0].x_bounds.keys():
             if self.nlp[0].x_bounds[key].type == InterpolationType.CONSTANT:
@@ -318,7 +688,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
         return False
 
     def advance_window_initial_guess_states(self, sol, **advance_options):
-        states = sol.decision_states(to_merge=SolutionMerge.NODES)
+        states = self._merged_window(sol)[0]
 
         for key in states.keys():
             if self.nlp[0].x_init[key].type != InterpolationType.EACH_FRAME:
@@ -328,13 +698,13 @@ class RecedingHorizonOptimization(OptimalControlProgram):
                 )
                 self.nlp[0].x_init[key].check_and_adjust_dimensions(len(self.nlp[0].states[key]), self.nlp[0].ns)
 
-            self.nlp[0].x_init[key].init[:, :] = np.concatenate(
-                (states[key][:, 1:], states[key][:, -1][:, np.newaxis]), axis=1
-            )
+            # Shift in place, the last frame is duplicated
+            self.nlp[0].x_init[key].init[:, :-1] = states[key][:, 1:]
+            self.nlp[0].x_init[key].init[:, -1] = states[key][:, -1]
         return True
 
     def advance_window_initial_guess_controls(self, sol, **advance_options):
-        controls = sol.decision_controls(to_merge=SolutionMerge.NODES)
+        controls = self._merged_window(sol)[1]
         for key in self.nlp[0].u_init.keys():
             self.nlp[0].controls.node_index = 0
 
@@ -349,9 +719,8 @@ class RecedingHorizonOptimization(OptimalControlProgram):
                 self.nlp[0].u_init[key].check_and_adjust_dimensions(
                     len(self.nlp[0].controls[key]), self.nlp[0].n_controls_nodes - 1
                 )
-            self.nlp[0].u_init[key].init[:, :] = np.concatenate(
-                (controls[key][:, 1:], controls[key][:, -1][:, np.newaxis]), axis=1
-            )
+            self.nlp[0].u_init[key].init[:, :-1] = controls[key][:, 1:]
+            self.nlp[0].u_init[key].init[:, -1] = controls[key][:, -1]
         return True
 
     def advance_window_initial_guess_parameters(self, sol, **advance_options):
@@ -362,8 +731,7 @@ class RecedingHorizonOptimization(OptimalControlProgram):
         return True
 
     def export_data(self, sol) -> tuple:
-        merged_states = sol.decision_states(to_merge=SolutionMerge.NODES)
-        merged_controls = sol.decision_controls(to_merge=SolutionMerge.NODES)
+        merged_states, merged_controls = self._merged_window(sol)
 
         states = {}
         controls = {}
@@ -452,6 +820,7 @@ class CyclicRecedingHorizonOptimization(RecedingHorizonOptimization):
             **kwargs,
         )
         self.time_idx_to_cycle = -1
+        self._exported_windows_overlap = True
 
     def solve(
         self,
@@ -498,20 +867,14 @@ class CyclicRecedingHorizonOptimization(RecedingHorizonOptimization):
 
         return states, controls, parameters
 
-    def _initialize_solution(self, dt: float, states: list, controls: list, parameters: list):
+    def _initialize_solution(self, dt: float, states: dict, controls: dict, parameters: list):
         x_init = InitialGuessList()
         for key in self.nlp[0].states.keys():
-            x_init.add(
-                key,
-                np.concatenate([state[key][:, :-1] for state in states] + [states[-1][key][:, -1:]], axis=1),
-                interpolation=InterpolationType.EACH_FRAME,
-                phase=0,
-            )
+            x_init.add(key, states[key], interpolation=InterpolationType.EACH_FRAME, phase=0)
 
         u_init = InitialGuessList()
         for key in self.nlp[0].controls.keys():
-            controls_tp = np.concatenate([control[key] for control in controls], axis=1)
-            u_init.add(key, controls_tp, interpolation=InterpolationType.EACH_FRAME, phase=0)
+            u_init.add(key, controls[key], interpolation=InterpolationType.EACH_FRAME, phase=0)
 
         p_init = InitialGuessList()
         for key in self.nlp[0].parameters.keys():
@@ -573,7 +936,7 @@ class CyclicRecedingHorizonOptimization(RecedingHorizonOptimization):
                 self.nlp[0].x_bounds[key].max[s, 2] = self.nlp[0].x_bounds[key].max[s, 0] + range_of_motion * 0.01
             else:
                 t = self.time_idx_to_cycle * self.nb_intermediate_frames
-                states = sol.decision_states(to_merge=SolutionMerge.NODES)
+                states = self._merged_window(sol)[0]
                 self.nlp[0].x_bounds[key].min[s, 2] = states[key][s, t] - range_of_motion * 0.01
                 self.nlp[0].x_bounds[key].max[s, 2] = states[key][s, t] + range_of_motion * 0.01
 
@@ -583,7 +946,7 @@ class CyclicRecedingHorizonOptimization(RecedingHorizonOptimization):
             self.ocp_solver.set_lagrange_multiplier(sol)
 
     def advance_window_bounds_states(self, sol, **advance_options):
-        states = sol.decision_states(to_merge=SolutionMerge.NODES)
+        states = self._merged_window(sol)[0]
 
         # Update the initial frame bounds
         for key in states.keys():
@@ -592,7 +955,7 @@ class CyclicRecedingHorizonOptimization(RecedingHorizonOptimization):
         return True
 
     def advance_window_initial_guess_states(self, sol, **advance_options):
-        states = sol.decision_states(to_merge=SolutionMerge.NODES)
+        states = self._merged_window(sol)[0]
 
         for key in states.keys():
             if self.nlp[0].x_init[key].type != InterpolationType.EACH_FRAME:
@@ -605,7 +968,7 @@ class CyclicRecedingHorizonOptimization(RecedingHorizonOptimization):
         return True
 
     def advance_window_initial_guess_controls(self, sol, **advance_options):
-        controls = sol.decision_controls(to_merge=SolutionMerge.NODES)
+        controls = self._merged_window(sol)[1]
 
         for key in self.nlp[0].controls.keys():
             self.nlp[0].controls.node_index = 0
@@ -673,7 +1036,7 @@ class MultiCyclicRecedingHorizonOptimization(CyclicRecedingHorizonOptimization):
         self.time_idx_to_cycle = self.n_cycles_to_advance * self.cycle_len
 
     def advance_window_initial_guess_states(self, sol, **advance_options):
-        states = sol.decision_states(to_merge=SolutionMerge.NODES)
+        states = self._merged_window(sol)[0]
 
         for key in states.keys():
             if isinstance(self.nlp[0].dynamics_type.ode_solver, OdeSolver.COLLOCATION):
@@ -715,7 +1078,7 @@ class MultiCyclicRecedingHorizonOptimization(CyclicRecedingHorizonOptimization):
                     self.nlp[0].x_init[key].init[:, :] = states[key][:, self.initial_guess_frames]
 
     def advance_window_initial_guess_controls(self, sol, **advance_options):
-        controls = sol.decision_controls(to_merge=SolutionMerge.NODES)
+        controls = self._merged_window(sol)[1]
 
         for key in self.nlp[0].controls.keys():
             self.nlp[0].controls.node_index = 0
@@ -798,8 +1161,7 @@ class MultiCyclicRecedingHorizonOptimization(CyclicRecedingHorizonOptimization):
     def export_cycles(self, sol: Solution, cycle_number: int = 0) -> tuple[dict, dict, dict]:
         """Exports the solution of the desired cycle from the full window solution"""
 
-        decision_states = sol.decision_states(to_merge=SolutionMerge.NODES)
-        decision_controls = sol.decision_controls(to_merge=SolutionMerge.NODES)
+        decision_states, decision_controls = self._merged_window(sol)
 
         states = {}
         controls = {}
@@ -822,20 +1184,14 @@ class MultiCyclicRecedingHorizonOptimization(CyclicRecedingHorizonOptimization):
 
         return states, controls, parameters
 
-    def _initialize_solution(self, dt: float, states: list, controls: list, parameters: list):
+    def _initialize_solution(self, dt: float, states: dict, controls: dict, parameters: list):
         x_init = InitialGuessList()
         for key in self.nlp[0].states.keys():
-            x_init.add(
-                key,
-                np.concatenate([state[key][:, :-1] for state in states] + [states[-1][key][:, -1:]], axis=1),
-                interpolation=self.nlp[0].x_init.type,
-                phase=0,
-            )
+            x_init.add(key, states[key], interpolation=self.nlp[0].x_init.type, phase=0)
 
         u_init = InitialGuessList()
         for key in self.nlp[0].controls.keys():
-            controls_tp = np.concatenate([control[key] for control in controls], axis=1)
-            u_init.add(key, controls_tp, interpolation=InterpolationType.EACH_FRAME, phase=0)
+            u_init.add(key, controls[key], interpolation=InterpolationType.EACH_FRAME, phase=0)
 
         model_serialized = self.nlp[0].model.serialize()
         model_class = model_serialized[0]
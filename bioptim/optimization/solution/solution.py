@@ -1,14 +1,14 @@
 import numpy as np
 from casadi import vertcat, DM, Function
 from copy import deepcopy
-from matplotlib import pyplot as plt
 from scipy import interpolate as sci_interp
 from typing import Any
 
 from .solution_data import SolutionData, SolutionMerge, TimeAlignment, TimeResolution
+from .solution_file import SolutionFile
 from ..optimization_vector import OptimizationVectorHelper
 from ...dynamics.ode_solvers import OdeSolver
-from ...interfaces.solve_ivp_interface import solve_ivp_interface
+from ...interfaces.solve_ivp_interface import solve_ivp_interface, solve_ivp_batch_interface
 from ...limits.path_conditions import InitialGuess, InitialGuessList
 from ...limits.penalty_helpers import PenaltyHelpers
 from ...misc.enums import (
@@ -47,6 +47,8 @@ class Solution:
         The scaled dual infeasibility at each iteration
     solver_time_to_optimize: float
         The total time to solve the program
+    real_time_stats: RealTimeStats
+        The timings of each window when the solution comes from a receding horizon optimization, None otherwise
     iterations: int
         The number of iterations that were required to solve the program
     status: int
@@ -68,6 +70,12 @@ class Solution:
 
     Methods
     -------
+    save(self, path: str, include_stepwise_states: bool = True)
+        Save the solution in a binary file that can be memory-mapped
+    load(path: str, ocp=None) -> Solution | SolutionFile
+        Load a solution saved with Solution.save
+    sensitivity(self, parameters: str | list[str] = None) -> dict
+        The derivatives of the optimal solution with respect to the parameters of the nlp (targets, weights, ...)
     copy(self, skip_data: bool = False) -> Any
         Create a deepcopy of the Solution
     @property
@@ -151,6 +159,7 @@ class Solution:
         self.status, self.iterations = status, iterations
         self.lam_g, self.lam_p, self.lam_x, self.inf_pr, self.inf_du = lam_g, lam_p, lam_x, inf_pr, inf_du
         self.solver_time_to_optimize, self.real_time_to_optimize = solver_time_to_optimize, real_time_to_optimize
+        self.real_time_stats = None
 
         # Extract the data now for further use
         self._decision_states = None
@@ -159,6 +168,9 @@ class Solution:
         self._parameters = None
         self._decision_algebraic_states = None
 
+        # Shared by the evaluations of the penalties
+        self._merged_penalty_inputs = None
+
         self.vector = vector
         if self.vector is not None:
             self.phases_dt = OptimizationVectorHelper.extract_phase_dt(ocp, vector)
@@ -676,6 +688,92 @@ class Solution:
             return data
         return data if len(data) > 1 else data[0]
 
+    def save(self, path: str, include_stepwise_states: bool = True):
+        """
+        Save the solution in a binary file that can be memory-mapped (see SolutionFile). Contrary to pickling the
+        Solution, the ocp is not saved, so the file is compact and can be read without the model
+
+        Parameters
+        ----------
+        path: str
+            The path of the file
+        include_stepwise_states: bool
+            If the stepwise states should be saved. They are integrated if they were not yet
+        """
+
+        SolutionFile.write(self, path, include_stepwise_states=include_stepwise_states)
+
+    @staticmethod
+    def load(path: str, ocp=None) -> "Solution | SolutionFile":
+        """
+        Load a solution saved with Solution.save
+
+        Parameters
+        ----------
+        path: str
+            The path of the file
+        ocp: OptimalControlProgram
+            The ocp that produced the solution. If None, the SolutionFile is returned, which gives a lazy access to the
+            data without needing the ocp (nor the model)
+
+        Returns
+        -------
+        The Solution if the ocp is provided, the SolutionFile otherwise
+        """
+
+        solution_file = SolutionFile(path)
+        return solution_file if ocp is None else solution_file.to_solution(ocp)
+
+    def sensitivity(self, parameters: str | list[str] = None) -> dict:
+        """
+        The derivatives of the optimal solution with respect to the parameters of the nlp, i.e. the targets, the weights
+        and the numerical timeseries of the penalties. They are computed from the KKT system at the optimum, so the
+        sensitivities to all the parameters are obtained at once instead of solving the program again for each
+        perturbation. The solution must be the last one returned by ocp.solve with the solver in parametric mode
+        (solver.set_parametric(True)), otherwise a RuntimeError is raised.
+
+        Parameters
+        ----------
+        parameters: str | list[str]
+            The names of the parameters of the nlp to keep (e.g. "<penalty name>_phase<phase>_<list index>_weight" or
+            "<penalty name>_phase<phase>_<list index>_target_<node>"). If None, all the parameters are kept
+
+        Returns
+        -------
+        The derivatives of the (scaled) optimization vector (see Solution.vector) as "vector" (n_v x n_p), the
+        derivatives of the cost as "cost" (1 x n_p) and the name and size of each kept parameter in the order of the
+        columns as "parameter_names"
+        """
+
+        if self.ocp.ocp_solver is None:
+            raise RuntimeError("The sensitivities are only available for a solution returned by ocp.solve")
+
+        out = self.ocp.ocp_solver.sensitivity(self)
+        if parameters is None:
+            return out
+
+        if isinstance(parameters, str):
+            parameters = [parameters]
+
+        columns = []
+        parameter_names = []
+        offset = 0
+        for name, size in out["parameter_names"]:
+            if name in parameters:
+                columns += list(range(offset, offset + size))
+                parameter_names.append((name, size))
+            offset += size
+
+        missing = set(parameters) - {name for name, _ in parameter_names}
+        if missing:
+            raise ValueError(f"{', '.join(sorted(missing))} are not parameters of the nlp")
+
+        return {
+            "vector": out["vector"][:, columns],
+            "cost": out["cost"][:, columns],
+            "parameter_names": parameter_names,
+        }
+
     def copy(self, skip_data: bool = False) -> "Solution":
         """
         Create a deepcopy of the Solution
@@ -703,6 +801,7 @@ class Solution:
         new.inf_du = deepcopy(self.inf_du)
         new.solver_time_to_optimize = deepcopy(self.solver_time_to_optimize)
         new.real_time_to_optimize = deepcopy(self.real_time_to_optimize)
+        new.real_time_stats = deepcopy(self.real_time_stats)
         new.iterations = deepcopy(self.iterations)
 
         new.phases_dt = deepcopy(self.phases_dt)
@@ -814,6 +913,7 @@ class Solution:
                 d=d,
                 p=params,
                 method=integrator,
+                n_threads=self.ocp.n_threads,
             )
 
             out[p] = {}
@@ -845,17 +945,59 @@ class Solution:
         integrator: SolutionIntegrator = SolutionIntegrator.OCP,
         to_merge: SolutionMerge | list[SolutionMerge] = None,
         size: int = 100,
+        seed: int = None,
+        lock_step: bool = False,
+        parallelization: str = "serial",
+        n_threads: int = None,
+        statistics_only: bool = False,
     ):
         """
         Integrated the states with different noise values sampled from the covariance matrix.
+        The motor and sensory noises are sent as parameters of the dynamics, so in lock-step a single dynamics
+        function is mapped over all the samples which are then integrated at once.
+
+        Parameters
+        ----------
+        integrator: SolutionIntegrator
+            The type of integrator to use
+        to_merge: SolutionMerge | list[SolutionMerge]
+            The type of merge to perform. If None, then no merge is performed.
+        size: int
+            The number of random samples
+        seed: int
+            The seed of the random generator. If None, the global numpy random state is used
+        lock_step: bool
+            If the samples should be integrated in lock-step (sharing the same time steps). This is much faster, but
+            the step size of the scipy integrators is then controlled on all the samples at once, so the results differ
+            slightly from integrating each sample on its own (the default). The integrator of the ocp
+            (SolutionIntegrator.OCP) is always in lock-step
+        parallelization: str
+            How the dynamics are mapped over the samples ("serial", "thread" or "openmp")
+        n_threads: int
+            The number of threads to use when parallelization is "thread". If None, the number of threads of the ocp
+        statistics_only: bool
+            If only the mean and covariance of the samples should be returned instead of all the samples. In lock-step,
+            the samples of each node are reduced to their statistics as soon as the node is integrated, so only one node
+            of samples is in memory at a time. Otherwise (lock_step=False), the samples of a phase are reduced once all
+            of them are integrated
+
+        Returns
+        -------
+        The integrated states of each sample (n_elements x n_sub_nodes x size for each node). If statistics_only, a
+        dictionary with the "mean" (n_elements x n_sub_nodes for each node, merged according to to_merge) and the
+        "covariance" (n_elements x n_elements x n_sub_nodes for each node, never merged) of the samples
         """
         from ...optimization.stochastic_optimal_control_program import StochasticOptimalControlProgram
         from ...interfaces.interface_utils import get_numerical_timeseries
 
         if not isinstance(self.ocp, StochasticOptimalControlProgram):
             raise ValueError("This method is only available for StochasticOptimalControlProgram.")
+        if statistics_only and size < 2:
+            raise ValueError("At least two samples are required to compute the covariance of the samples.")
 
         t_spans, x, u, params, a = self._prepare_integrate(integrator=integrator)
+        rng = np.random if seed is None else np.random.RandomState(seed)
+        n_threads = self.ocp.n_threads if n_threads is None else n_threads
 
         cov_index = self.ocp.nlp[0].controls["cov"].index
         n_sub_nodes = x[0][0].shape[1]
@@ -868,17 +1010,17 @@ class Solution:
 
         # initialize the out dictionary
         out = [None] * len(self.ocp.nlp)
+        out_cov = [None] * len(self.ocp.nlp)
         for p, nlp in enumerate(self.ocp.nlp):
-            out[p] = {}
-            for key in self.ocp.nlp[0].states.keys():
-                out[p][key] = [None] * nlp.n_states_nodes
-                for i_node in range(nlp.ns):
-                    out[p][key][i_node] = np.zeros((len(nlp.states[key].index), n_sub_nodes, size))
-                out[p][key][nlp.ns] = np.zeros((len(nlp.states[key].index), 1, size))
+            out[p] = {key: [None] * nlp.n_states_nodes for key in nlp.states.keys()}
+            out_cov[p] = {key: [None] * nlp.n_states_nodes for key in nlp.states.keys()}
 
         cov_matrix = StochasticBioModel.reshape_to_matrix(u[0][0][cov_index, 0], self.ocp.nlp[0].model.matrix_shape_cov)
-        first_x = np.random.multivariate_normal(x[0][0][:, 0], cov_matrix, size=size).T
+        first_x = rng.multivariate_normal(x[0][0][:, 0], cov_matrix, size=size).T
         for p, nlp in enumerate(self.ocp.nlp):
+            if len(nlp.extra_dynamics_func) > 1:
+                raise NotImplementedError("Noisy integration is not available for multiple extra dynamics.")
+
             d = []
             for n_idx in range(nlp.ns + 1):
                 d_tp = get_numerical_timeseries(self.ocp, p, n_idx, 0)
@@ -889,77 +1031,102 @@ class Solution:
 
             motor_noise = np.zeros((len(params[motor_noise_index]), nlp.ns, size))
             for i in range(len(params[motor_noise_index])):
-                motor_noise[i, :] = np.random.normal(0, params[motor_noise_index[i]], size=(nlp.ns, size))
+                motor_noise[i, :] = rng.normal(0, params[motor_noise_index[i]], size=(nlp.ns, size))
             sensory_noise = (
                 np.zeros((len(sensory_noise_index), nlp.ns, size)) if sensory_noise_index is not None else None
             )
             if sensory_noise_index is not None:
                 for i in range(len(params[sensory_noise_index])):
-                    sensory_noise[i, :] = np.random.normal(0, params[sensory_noise_index[i]], size=(nlp.ns, size))
+                    sensory_noise[i, :] = rng.normal(0, params[sensory_noise_index[i]], size=(nlp.ns, size))
 
-            without_noise_idx = [
-                i for i in range(len(params)) if i not in motor_noise_index and i not in sensory_noise_index
-            ]
-            parameters_cx = nlp.parameters.cx[without_noise_idx]
-            parameters = params[without_noise_idx]
-            for i_random in range(size):
-                params_this_time = []
-                list_of_dynamics = []
-                for node in range(nlp.ns):
-                    params_this_time += [nlp.parameters.cx]
-                    params_this_time[node][motor_noise_index, :] = motor_noise[:, node, i_random]
-                    if sensory_noise_index is not None:
-                        params_this_time[node][sensory_noise_index, :] = sensory_noise[:, node, i_random]
-
-                    if len(nlp.extra_dynamics_func) > 1:
-                        raise NotImplementedError("Noisy integration is not available for multiple extra dynamics.")
-                    cas_func = Function(
-                        "noised_extra_dynamics",
-                        [
-                            nlp.time_cx,
-                            nlp.states.cx,
-                            nlp.controls.cx,
-                            parameters_cx,
-                            nlp.algebraic_states.cx,
-                            nlp.numerical_timeseries.cx,
-                        ],
-                        [
-                            nlp.extra_dynamics_func[0](
-                                nlp.time_cx,
-                                nlp.states.cx,
-                                nlp.controls.cx,
-                                params_this_time[node],
-                                nlp.algebraic_states.cx,
-                                nlp.numerical_timeseries.cx,
-                            )
-                        ],
-                    )
-                    list_of_dynamics += [cas_func]
+            # The noises are explicit inputs of the dynamics as they are sent in the parameters of each sample
+            noised_params = np.repeat(np.reshape(params, (-1, 1)), size, axis=1)
+            noised_params = np.repeat(noised_params[:, np.newaxis, :], nlp.ns, axis=1)
+            noised_params[motor_noise_index, :, :] = motor_noise
+            if sensory_noise_index is not None:
+                noised_params[sensory_noise_index, :, :] = sensory_noise
+            noised_params = [noised_params[:, node, :] for node in range(nlp.ns)] + [noised_params[:, -1, :]]
+
+            phase_end = {}
+
+            def samples_statistics(states: np.ndarray) -> tuple:
+                # The final states of the samples are kept to start the next phase from them
+                phase_end["x"] = states[:, -1, :]
+                states = states if n_sub_nodes > 1 else states[:, :1, :]
+                mean = np.mean(states, axis=2)
+                centered = states - mean[:, :, np.newaxis]
+                return mean, np.einsum("its,jts->ijt", centered, centered) / (size - 1)
+
+            if integrator == SolutionIntegrator.OCP or lock_step:
+                if integrator == SolutionIntegrator.OCP:
+                    list_of_dynamics = [
+                        nlp.dynamics[node].map(size, parallelization, n_threads) for node in range(nlp.ns)
+                    ]
+                else:
+                    list_of_dynamics = [nlp.extra_dynamics_func[0].map(size, parallelization, n_threads)] * nlp.ns
 
-                integrated_sol = solve_ivp_interface(
+                integrated_sol = solve_ivp_batch_interface(
                     list_of_dynamics=list_of_dynamics,
-                    shooting_type=Shooting.SINGLE,
                     nlp=nlp,
                     t=t_spans[p],
-                    x=[np.reshape(first_x[:, i_random], (-1, 1))],
+                    x0=first_x,
                     u=u[p],  # No need to add noise on the controls, the extra_dynamics should do it for us
+                    p=noised_params,
                     a=a[p],
-                    p=parameters,
                     d=d,
                     method=integrator,
+                    reduce=samples_statistics if statistics_only else None,
                 )
-                for i_node in range(nlp.ns + 1):
-                    for key in nlp.states.keys():
-                        states_integrated = (
-                            integrated_sol[i_node][nlp.states[key].index, :]
-                            if n_sub_nodes > 1
-                            else integrated_sol[i_node][nlp.states[key].index, 0].reshape(-1, 1)
+            else:
+                integrated_sol = [
+                    np.zeros((nlp.states.shape, nlp.n_states_stepwise_steps(node), size)) for node in range(nlp.ns)
+                ]
+                integrated_sol += [np.zeros((nlp.states.shape, 1, size))]
+                for i_random in range(size):
+                    list_of_dynamics = [
+                        lambda t, x, u, p, a, d, node=node: nlp.extra_dynamics_func[0](
+                            t, x, u, noised_params[node][:, i_random], a, d
                         )
-                        out[p][key][i_node][:, :, i_random] = states_integrated
-                first_x[:, i_random] = np.reshape(integrated_sol[-1], (-1,))
+                        for node in range(nlp.ns)
+                    ]
+                    sample_sol = solve_ivp_interface(
+                        list_of_dynamics=list_of_dynamics,
+                        shooting_type=Shooting.SINGLE,
+                        nlp=nlp,
+                        t=t_spans[p],
+                        x=[np.reshape(first_x[:, i_random], (-1, 1))],
+                        u=u[p],
+                        a=a[p],
+                        p=[],
+                        d=d,
+                        method=integrator,
+                    )
+                    for i_node in range(nlp.ns + 1):
+                        integrated_sol[i_node][:, :, i_random] = sample_sol[i_node]
+                if statistics_only:
+                    integrated_sol = [samples_statistics(states) for states in integrated_sol]
+
+            for i_node in range(nlp.ns + 1):
+                if statistics_only:
+                    mean, covariance = integrated_sol[i_node]
+                    for key in nlp.states.keys():
+                        index = list(nlp.states[key].index)
+                        out[p][key][i_node] = mean[index, :]
+                        out_cov[p][key][i_node] = covariance[np.ix_(index, index)]
+                else:
+                    states_integrated = integrated_sol[i_node] if n_sub_nodes > 1 else integrated_sol[i_node][:, :1, :]
+                    for key in nlp.states.keys():
+                        out[p][key][i_node] = states_integrated[nlp.states[key].index, :, :]
+            first_x = np.array(phase_end["x"] if statistics_only else integrated_sol[-1][:, -1, :])
+
         if to_merge:
             out = SolutionData.from_unscaled(self.ocp, out, "x").to_dict(to_merge=to_merge, scaled=False)
 
+        if statistics_only:
+            return {
+                "mean": out if len(out) > 1 else out[0],
+                "covariance": out_cov if len(out_cov) > 1 else out_cov[0],
+            }
         return out if len(out) > 1 else out[0]
 
     def _states_for_phase_integration(
@@ -1086,6 +1253,7 @@ class Solution:
                 p=params,
                 d=d,
                 method=SolutionIntegrator.OCP,
+                n_threads=self.ocp.n_threads,
             )
 
             unscaled[p] = {}
@@ -1193,7 +1361,7 @@ class Solution:
         shooting_type: Shooting = Shooting.MULTIPLE,
         integrator: SolutionIntegrator = SolutionIntegrator.OCP,
         save_name: str = None,
-    ) -> list[plt.figure]:
+    ) -> list["plt.Figure"]:
         """
         Show the graphs of the simulation
 
@@ -1213,6 +1381,8 @@ class Solution:
             If a name is provided, the figures will be saved with this name
         """
 
+        from matplotlib import pyplot as plt
+
         plot_ocp = self.ocp.prepare_plots(automatically_organize, show_bounds, shooting_type, integrator)
         plot_ocp.update_data(*plot_ocp.parse_data(**{"x": self.vector}))
         if save_name:
@@ -1286,23 +1456,40 @@ class Solution:
         else:
             return np.ndarray((0, 1))
 
+    def _penalty_inputs(self) -> tuple[list, list, list]:
+        """
+        The states, controls and algebraic states merged by keys as expected by the penalty functions. They are
+        computed once and shared by all the penalties
+
+        Returns
+        -------
+        The merged states, controls and algebraic states
+        """
+
+        if self._merged_penalty_inputs is None:
+            self._merged_penalty_inputs = (
+                self._decision_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True),
+                self._stepwise_controls.to_dict(to_merge=SolutionMerge.KEYS, scaled=True),
+                self._decision_algebraic_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True),
+            )
+        return self._merged_penalty_inputs
+
     def _get_penalty_cost(self, nlp, penalty):
         from ...interfaces.interface_utils import get_numerical_timeseries
 
         if nlp is None:
             raise NotImplementedError("penalty cost over the full ocp is not implemented yet")
 
-        val = []
-        val_weighted = []
-
         phases_dt = PenaltyHelpers.phases_dt(penalty, self.ocp, lambda p: np.array([self.phases_dt[idx] for idx in p]))
         params = PenaltyHelpers.parameters(
             penalty, 0, lambda p_idx, n_idx, sn_idx: self._dispatch_params(self._parameters.scaled[0])
         )
+        weight = PenaltyHelpers.weight(penalty)
+
+        merged_x, merged_u, merged_a = self._penalty_inputs()
 
-        merged_x = self._decision_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True)
-        merged_u = self._stepwise_controls.to_dict(to_merge=SolutionMerge.KEYS, scaled=True)
-        merged_a = self._decision_algebraic_states.to_dict(to_merge=SolutionMerge.KEYS, scaled=True)
+        # Gather the inputs of each node
+        inputs = []
         for idx in range(len(penalty.node_idx)):
             t0 = PenaltyHelpers.t0(penalty, idx, lambda p, n: self._stepwise_times[p][n][0])
             x = PenaltyHelpers.states(
@@ -1332,20 +1519,35 @@ class Solution:
                 lambda p_idx, n_idx, sn_idx: get_numerical_timeseries(self.ocp, p_idx, n_idx, sn_idx),
             )
             d = np.array([]) if d_tp.shape == (0, 0) else np.array(d_tp)
-
-            weight = PenaltyHelpers.weight(penalty)
             target = PenaltyHelpers.target(penalty, idx)
 
-            node_idx = penalty.node_idx[idx]
-            val.append(penalty.function[node_idx](t0, phases_dt, x, u, params, a, d))
-            val_weighted.append(penalty.weighted_function[node_idx](t0, phases_dt, x, u, params, a, d, weight, target))
+            inputs.append((t0, x, u, a, d, target))
 
-        if self.ocp.n_threads > 1:
-            val = [v[:, 0] for v in val]
-            val_weighted = [v[:, 0] for v in val_weighted]
-
-        val = np.nansum(val)
-        val_weighted = np.nansum(val_weighted)
+        # Evaluate all the nodes whose functions compute the same values in a single call
+        val = []
+        val_weighted = []
+        for indices in penalty.node_groups:
+            node_idx = penalty.node_idx[indices[0]]
+            function = penalty.function_non_threaded[node_idx]
+            weighted_function = penalty.weighted_function_non_threaded[node_idx]
+
+            stacked = _stack_penalty_inputs(weighted_function, [inputs[i] for i in indices])
+            if stacked is None:
+                # The nodes do not share the same shapes (e.g. final node without controls), evaluate them one by one
+                for i in indices:
+                    t0, x, u, a, d, target = inputs[i]
+                    val.append(np.array(function(t0, phases_dt, x, u, params, a, d)))
+                    val_weighted.append(np.array(weighted_function(t0, phases_dt, x, u, params, a, d, weight, target)))
+                continue
+
+            t0, x, u, a, d, target = stacked
+            function = penalty.mapped_function(function, len(indices), self.ocp.n_threads)
+            weighted_function = penalty.mapped_function(weighted_function, len(indices), self.ocp.n_threads)
+            val.append(np.array(function(t0, phases_dt, x, u, params, a, d)))
+            val_weighted.append(np.array(weighted_function(t0, phases_dt, x, u, params, a, d, weight, target)))
+
+        val = sum(np.nansum(v) for v in val)
+        val_weighted = sum(np.nansum(v) for v in val_weighted)
 
         return val, val_weighted
 
@@ -1377,9 +1579,6 @@ class Solution:
         Parameters
         ----------
         """
-        if self.ocp.n_threads > 1:
-            raise NotImplementedError("Computing detailed cost with n_thread > 1 is not implemented yet")
-
         self._detailed_cost = []
 
         for nlp in self.ocp.nlp:
@@ -1503,3 +1702,35 @@ class Solution:
             self.print_cost(CostType.CONSTRAINTS)
         else:
             raise ValueError("print can only be called with CostType.OBJECTIVES or CostType.CONSTRAINTS")
+
+
+def _stack_penalty_inputs(function: Function, inputs: list[tuple]) -> tuple | None:
+    """
+    Stack horizontally the inputs of several nodes so they can be sent to the function mapped over these nodes
+
+    Parameters
+    ----------
+    function: Function
+        The weighted function of a single node, which inputs are [t, dt, x, u, p, a, d, weight, target]
+    inputs: list[tuple]
+        The (t0, x, u, a, d, target) of each node
+
+    Returns
+    -------
+    The stacked (t0, x, u, a, d, target), or None if the nodes cannot be evaluated at once
+    """
+
+    if len(inputs) < 2:
+        return None
+
+    stacked = []
+    for values, input_index in zip(zip(*inputs), (0, 2, 3, 5, 6, 8)):
+        n_rows, n_cols = function.size_in(input_index)
+        columns = []
+        for value in values:
+            value = np.array(value, dtype=float)
+            if value.size != n_rows * n_cols:
+                return None
+            columns.append(value.reshape((n_rows, n_cols), order="F"))
+        stacked.append(np.concatenate(columns, axis=1))
+    return tuple(stacked)
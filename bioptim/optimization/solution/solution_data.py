@@ -33,17 +33,68 @@ class TimeResolution(Enum):
 
 
 class SolutionData:
-    def __init__(self, unscaled, scaled, n_nodes: list[int]):
+    """
+    The values of a type of variable (states, controls, parameters or algebraic states) of a solution, both scaled and
+    unscaled. When possible, each phase is stored in a single contiguous (n_variables x n_total_steps) buffer, so that
+    merging the keys and/or the nodes returns views of the buffer instead of concatenating the arrays of each node.
+    Only the unscaled values are stored, the scaled values are computed the first time they are needed.
+
+    Attributes
+    ----------
+    n_phases: int
+        The number of phases
+    n_nodes: list[int]
+        The number of nodes of each phase
+
+    Methods
+    -------
+    from_unscaled(ocp, unscaled: list, variable_type: str) -> SolutionData
+        Create a SolutionData from unscaled values
+    from_scaled(ocp, scaled: list, variable_type: str) -> SolutionData
+        Create a SolutionData from scaled values
+    unscaled(self) -> list
+        The unscaled values, as a list (phases) of dict (keys) of list (nodes) of arrays
+    scaled(self) -> list
+        The scaled values, as a list (phases) of dict (keys) of list (nodes) of arrays
+    keys(self, phase: int = 0)
+        The keys of a phase
+    phase_buffer(self, phase: int = 0) -> tuple[np.ndarray, dict, list]
+        The unscaled values of a phase as a single array, with its layout
+    to_dict(self, to_merge: SolutionMerge | list[SolutionMerge] = None, scaled: bool = False) -> list | dict | np.ndarray
+        The values, merged as requested
+    """
+
+    def __init__(self, unscaled: list | None, scaled: list | None, n_nodes: list[int], scaling: list[dict] = None):
         """
         Parameters
         ----------
-        ... # TODO
+        unscaled: list | None
+            The unscaled values, as a list (phases) of dict (keys) of list (nodes) of arrays. If None, they are computed
+            from the scaled values
+        scaled: list | None
+            The scaled values, as a list (phases) of dict (keys) of list (nodes) of arrays. If None, they are computed
+            from the unscaled values when first needed
         n_nodes: list
             The number of node at each phase
+        scaling: list[dict]
+            The VariableScaling of each key of each phase. It is mandatory if either unscaled or scaled is None
         """
-        self.unscaled = unscaled
-        self.scaled = scaled
-        self.n_phases = len(self.unscaled)
+
+        if unscaled is None and scaled is None:
+            raise ValueError("Either unscaled or scaled must be provided")
+        if (unscaled is None or scaled is None) and scaling is None:
+            raise ValueError("scaling must be provided to compute the missing values")
+
+        self._scaling = scaling
+        self._phases = {
+            False: None if unscaled is None else [_ColumnarPhase.from_nodes(phase) for phase in unscaled],
+            True: None if scaled is None else [_ColumnarPhase.from_nodes(phase) for phase in scaled],
+        }
+        if unscaled is None:
+            # The scaled values are dropped, they are computed back only if they are requested
+            self._get_phases(scaled=False)
+            self._phases[True] = None
+        self.n_phases = len(self._phases[False])
         self.n_nodes = n_nodes  # This is painfully necessary to get from outside to merge key if no keys are available
 
     @staticmethod
@@ -61,7 +112,7 @@ class SolutionData:
             The type of variable to convert (x for states or algebraic states, u for controls, p for parameters)
         """
         n_nodes = [nlp.n_states_nodes for nlp in ocp.nlp]
-        return SolutionData(unscaled, _to_scaled_values(unscaled, ocp, variable_type), n_nodes)
+        return SolutionData(unscaled, None, n_nodes, scaling=_scaling(ocp, unscaled, variable_type))
 
     @staticmethod
     def from_scaled(ocp, scaled: list, variable_type: str):
@@ -78,11 +129,48 @@ class SolutionData:
             The type of variable to convert (x for states or algebraic states, u for controls, p for parameters)
         """
         n_nodes = [nlp.n_states_nodes for nlp in ocp.nlp]
-        return SolutionData(_to_unscaled_values(scaled, ocp, variable_type), scaled, n_nodes)
+        return SolutionData(None, scaled, n_nodes, scaling=_scaling(ocp, scaled, variable_type))
+
+    def __getstate__(self) -> dict:
+        # The views of the buffers are rebuilt on demand, so the buffers are not duplicated when copying
+        state = self.__dict__.copy()
+        state["_phases"] = {
+            is_scaled: None if phases is None else [phase.without_views() for phase in phases]
+            for is_scaled, phases in self._phases.items()
+        }
+        return state
+
+    @property
+    def unscaled(self) -> list:
+        """
+        The unscaled values, as a list (phases) of dict (keys) of list (nodes) of arrays
+        """
+
+        return [phase.nodes() for phase in self._get_phases(scaled=False)]
+
+    @property
+    def scaled(self) -> list:
+        """
+        The scaled values, as a list (phases) of dict (keys) of list (nodes) of arrays
+        """
+
+        return [phase.nodes() for phase in self._get_phases(scaled=True)]
+
+    def _get_phases(self, scaled: bool) -> list:
+        """
+        The phases of the requested representation, computing them from the other representation if needed
+        """
+
+        if self._phases[scaled] is None:
+            self._phases[scaled] = [
+                phase.rescaled(scaling, to_scaled=scaled)
+                for phase, scaling in zip(self._phases[not scaled], self._scaling)
+            ]
+        return self._phases[scaled]
 
     def __getitem__(self, **keys):
         phase = 0
-        if len(self.unscaled) > 1:
+        if self.n_phases > 1:
             if "phase" not in keys:
                 raise RuntimeError("You must specify the phase when more than one phase is present in the solution")
             phase = keys["phase"]
@@ -90,10 +178,26 @@ class SolutionData:
         return self.unscaled[phase][key]
 
     def keys(self, phase: int = 0):
-        return self.unscaled[phase].keys()
+        return self._phases[False][phase].keys()
 
     def to_dict(self, to_merge: SolutionMerge | list[SolutionMerge] = None, scaled: bool = False):
-        data = self.scaled if scaled else self.unscaled
+        """
+        The values, merged as requested. Apart from merging the phases, the merged values are views of the internal
+        buffers, they must therefore not be modified in place
+
+        Parameters
+        ----------
+        to_merge: SolutionMerge | list[SolutionMerge]
+            The merging to perform
+        scaled: bool
+            If the scaled values should be returned
+
+        Returns
+        -------
+        The values
+        """
+
+        phases = self._get_phases(scaled=scaled)
 
         if to_merge is None:
             to_merge = []
@@ -105,17 +209,17 @@ class SolutionData:
             to_merge = [SolutionMerge.KEYS, SolutionMerge.NODES, SolutionMerge.PHASES]
 
         if not to_merge:
-            return data
+            return [phase.nodes() for phase in phases]
 
         # Before merging phases, we must go inside the phases
         out = []
-        for phase_idx in range(len(data)):
+        for phase_idx, phase in enumerate(phases):
             if SolutionMerge.KEYS in to_merge and SolutionMerge.NODES in to_merge:
-                phase_data = self._merge_keys_nodes(data, phase=phase_idx)
+                phase_data = phase.merged_keys_nodes(self.n_nodes[phase_idx])
             elif SolutionMerge.KEYS in to_merge:
-                phase_data = self._merge_keys(data, phase=phase_idx)
+                phase_data = phase.merged_keys(self.n_nodes[phase_idx])
             elif SolutionMerge.NODES in to_merge:
-                phase_data = self._merge_nodes(data, phase=phase_idx)
+                phase_data = phase.merged_nodes()
             else:
                 raise ValueError("Merging must at least contain SolutionMerge.KEYS or SolutionMerge.NODES")
 
@@ -126,6 +230,32 @@ class SolutionData:
 
         return out
 
+    def phase_buffer(self, phase: int = 0) -> tuple[np.ndarray, dict, list]:
+        """
+        The unscaled values of a phase as a single (n_variables x n_total_steps) array, with its layout
+
+        Parameters
+        ----------
+        phase: int
+            The index of the phase
+
+        Returns
+        -------
+        The values, the number of rows of each key (in the order of the rows) and the number of columns of each node
+        """
+
+        columnar = self._get_phases(scaled=False)[phase]
+        if columnar.buffer is not None:
+            return (
+                columnar.buffer,
+                {key: rows.stop - rows.start for key, rows in columnar.key_rows.items()},
+                [cols.stop - cols.start for cols in columnar.node_cols],
+            )
+
+        if columnar.keys():
+            raise ValueError("Only the values made of 2d arrays can be gathered in a single buffer")
+        return np.ndarray((0, 0)), {}, []
+
     @staticmethod
     def _merge_phases(data: list, to_merge: list[SolutionMerge]):
         """
@@ -142,116 +272,293 @@ class SolutionData:
 
         return np.concatenate(data, axis=1)
 
-    def _merge_keys_nodes(self, data: dict, phase: int):
+
+class _ColumnarPhase:
+    """
+    The values of a phase. When the nodes of all the keys are 2d arrays sharing the same number of columns for a same
+    node, they are stored in a single contiguous (n_variables x n_total_steps) buffer, the rows of the keys and the
+    columns of the nodes being precomputed. Otherwise, the values are kept as provided (dict of list of arrays).
+
+    Attributes
+    ----------
+    buffer: np.ndarray | None
+        The contiguous buffer, None if the values could not be stored in a single buffer
+    key_rows: dict[str, slice]
+        The rows of each key in the buffer
+    node_cols: list[slice]
+        The columns of each node in the buffer
+    values: dict
+        The values as provided, if they could not be stored in a single buffer
+    """
+
+    def __init__(self, buffer: np.ndarray = None, key_rows: dict = None, node_cols: list = None, values: dict = None):
+        self.buffer = buffer
+        self.key_rows = key_rows
+        self.node_cols = node_cols
+        self.values = values
+        self._nodes = None
+
+    @classmethod
+    def from_nodes(cls, values: dict) -> "_ColumnarPhase":
         """
-        Merge the steps by merging keys before.
+        Store the values of a phase in a contiguous buffer if possible
+
+        Parameters
+        ----------
+        values: dict
+            The values of the phase, as a dict (keys) of list (nodes) of arrays
+
+        Returns
+        -------
+        The phase
         """
-        return np.concatenate(self._merge_keys(data, phase=phase), axis=1)
 
-    @staticmethod
-    def _merge_nodes(data: dict, phase: int):
+        if not _is_columnar(values):
+            return cls(values=values)
+
+        first_key = next(iter(values))
+        node_cols = []
+        n_cols = 0
+        for node in values[first_key]:
+            node_cols.append(slice(n_cols, n_cols + node.shape[1]))
+            n_cols += node.shape[1]
+
+        key_rows = {}
+        n_rows = 0
+        for key, nodes in values.items():
+            key_rows[key] = slice(n_rows, n_rows + nodes[0].shape[0])
+            n_rows += nodes[0].shape[0]
+
+        buffer = np.empty((n_rows, n_cols))
+        for key, nodes in values.items():
+            for cols, node in zip(node_cols, nodes):
+                buffer[key_rows[key], cols] = node
+        return cls(buffer=buffer, key_rows=key_rows, node_cols=node_cols)
+
+    def without_views(self) -> "_ColumnarPhase":
         """
-        Merge the nodes of a SolutionData.unscaled or SolutionData.scaled, without merging the keys
+        The same phase, without the cached views of the buffer
+        """
+
+        return _ColumnarPhase(buffer=self.buffer, key_rows=self.key_rows, node_cols=self.node_cols, values=self.values)
+
+    def keys(self):
+        return self.key_rows.keys() if self.buffer is not None else self.values.keys()
+
+    def rescaled(self, scaling: dict, to_scaled: bool) -> "_ColumnarPhase":
+        """
+        The phase converted to the scaled (or unscaled) values
+
+        Parameters
+        ----------
+        scaling: dict
+            The VariableScaling of each key
+        to_scaled: bool
+            If the values should be divided (True) or multiplied (False) by the scaling
 
         Returns
         -------
-        The merged data
+        The converted phase
+        """
+
+        if self.buffer is None:
+            convert = _to_scaled_phase if to_scaled else _to_unscaled_phase
+            return _ColumnarPhase(values=convert(self.values, scaling))
+
+        rows_scaling = np.ones((self.buffer.shape[0], 1))
+        for key, rows in self.key_rows.items():
+            rows_scaling[rows, :] = scaling[key].to_array(1)
+        buffer = self.buffer / rows_scaling if to_scaled else self.buffer * rows_scaling
+        return _ColumnarPhase(buffer=buffer, key_rows=self.key_rows, node_cols=self.node_cols)
+
+    def nodes(self) -> dict:
+        """
+        The values as a dict (keys) of list (nodes) of arrays
         """
 
-        return {key: np.concatenate(data[phase][key], axis=1) for key in data[phase].keys()}
+        if self.buffer is None:
+            return self.values
+
+        if self._nodes is None:
+            self._nodes = {
+                key: [self.buffer[rows, cols] for cols in self.node_cols] for key, rows in self.key_rows.items()
+            }
+        return self._nodes
 
-    def _merge_keys(self, data: dict, phase: int):
+    def merged_keys(self, n_nodes: int) -> list:
         """
         Merge the keys without merging anything else
+
+        Parameters
+        ----------
+        n_nodes: int
+            The number of nodes, used if there is no keys
+
+        Returns
+        -------
+        The values as a list (nodes) of arrays
         """
 
-        if not data[phase].keys():
-            return [np.ndarray((0, 1))] * self.n_nodes[phase]
+        if self.buffer is not None:
+            return [self.buffer[:, cols] for cols in self.node_cols]
+
+        if not self.values.keys():
+            return [np.ndarray((0, 1))] * n_nodes
 
-        n_nodes = len(data[phase][list(data[phase].keys())[0]])
+        n_nodes = len(self.values[list(self.values.keys())[0]])
         out = []
         for node_idx in range(n_nodes):
-            out.append(np.concatenate([data[phase][key][node_idx] for key in data[phase].keys()], axis=0))
+            out.append(np.concatenate([self.values[key][node_idx] for key in self.values.keys()], axis=0))
         return out
 
+    def merged_nodes(self) -> dict:
+        """
+        Merge the nodes, without merging the keys
+
+        Returns
+        -------
+        The values as a dict (keys) of arrays
+        """
+
+        if self.buffer is not None:
+            return {key: self.buffer[rows, :] for key, rows in self.key_rows.items()}
 
-def _to_unscaled_values(scaled: list, ocp, variable_type: str) -> list:
+        return {key: np.concatenate(self.values[key], axis=1) for key in self.values.keys()}
+
+    def merged_keys_nodes(self, n_nodes: int) -> np.ndarray:
+        """
+        Merge the keys and the nodes
+
+        Parameters
+        ----------
+        n_nodes: int
+            The number of nodes, used if there is no keys
+
+        Returns
+        -------
+        The values as a single array
+        """
+
+        if self.buffer is not None:
+            return self.buffer
+
+        return np.concatenate(self.merged_keys(n_nodes), axis=1)
+
+
+def _is_columnar(values: dict) -> bool:
     """
-    Convert values of scaled solution to unscaled values
+    If the values of a phase can be stored in a single contiguous buffer, that is if all the keys have the same number
+    of nodes, all the nodes are 2d arrays and all the keys of a same node have the same number of columns
+    """
+
+    if not isinstance(values, dict) or not values:
+        return False
+
+    all_nodes = list(values.values())
+    if not all(isinstance(nodes, list) and nodes for nodes in all_nodes):
+        return False
+
+    n_nodes = len(all_nodes[0])
+    if any(len(nodes) != n_nodes for nodes in all_nodes):
+        return False
+
+    for nodes in all_nodes:
+        if any(not isinstance(node, np.ndarray) or node.ndim != 2 for node in nodes):
+            return False
+        if any(node.shape[0] != nodes[0].shape[0] for node in nodes):
+            return False
+        if any(node.shape[1] != reference.shape[1] for node, reference in zip(nodes, all_nodes[0])):
+            return False
+    return True
+
+
+def _scaling(ocp, values: list, variable_type: str) -> list[dict]:
+    """
+    The VariableScaling of each key of each phase
 
     Parameters
     ----------
-    scaled: list
-        The scaled values
+    ocp
+        A reference to the ocp
+    values: list
+        The values, as a list (phases) of dict (keys)
     variable_type: str
-        The type of variable to convert (x for states or algebraic states, u for controls, p for parameters)
+        The type of variable (x for states or algebraic states, u for controls, p for parameters)
     """
 
-    unscaled: list = [None for _ in range(len(scaled))]
-    for phase in range(len(scaled)):
-        unscaled[phase] = {}
-        for key in scaled[phase].keys():
-            if variable_type == "p":
-                scale_factor = ocp.parameters[key].scaling
-            else:
-                scale_factor = getattr(ocp.nlp[phase], f"{variable_type}_scaling")[key]
-
-            if isinstance(scaled[phase][key], list):  # Nodes are not merged
-                unscaled[phase][key] = []
-                for node in range(len(scaled[phase][key])):
-                    value = scaled[phase][key][node]
-                    unscaled[phase][key].append(value * scale_factor.to_array(value.shape[1]))
-            elif isinstance(scaled[phase][key], np.ndarray):  # Nodes are merged
-                value = scaled[phase][key]
-                unscaled[phase][key] = value * scale_factor.to_array(value.shape[1])
-            else:
-                raise ValueError(f"Unrecognized type {type(scaled[phase][key])} for {key}")
+    scaling = []
+    for phase in range(len(values)):
+        if variable_type == "p":
+            scaling.append({key: ocp.parameters[key].scaling for key in values[phase].keys()})
+        else:
+            phase_scaling = getattr(ocp.nlp[phase], f"{variable_type}_scaling")
+            scaling.append({key: phase_scaling[key] for key in values[phase].keys()})
+    return scaling
+
+
+def _to_unscaled_phase(scaled: dict, scaling: dict) -> dict:
+    """
+    Convert values of scaled solution to unscaled values
+
+    Parameters
+    ----------
+    scaled: dict
+        The scaled values of a phase
+    scaling: dict
+        The VariableScaling of each key
+    """
+
+    unscaled = {}
+    for key in scaled.keys():
+        scale_factor = scaling[key]
+
+        if isinstance(scaled[key], list):  # Nodes are not merged
+            unscaled[key] = []
+            for node in range(len(scaled[key])):
+                value = scaled[key][node]
+                unscaled[key].append(value * scale_factor.to_array(value.shape[1]))
+        elif isinstance(scaled[key], np.ndarray):  # Nodes are merged
+            value = scaled[key]
+            unscaled[key] = value * scale_factor.to_array(value.shape[1])
+        else:
+            raise ValueError(f"Unrecognized type {type(scaled[key])} for {key}")
 
     return unscaled
 
 
-def _to_scaled_values(unscaled: list, ocp, variable_type: str) -> list:
+def _to_scaled_phase(unscaled: dict, scaling: dict) -> dict:
     """
     Convert values of unscaled solution to scaled values
 
     Parameters
     ----------
-    unscaled: list
-        The unscaled values
-    variable_type: str
-        The type of variable to convert (x for states or algebraic states, u for controls, p for parameters)
+    unscaled: dict
+        The unscaled values of a phase
+    scaling: dict
+        The VariableScaling of each key
     """
 
-    if not unscaled:
-        return []
-
-    scaled: list = [None for _ in range(len(unscaled))]
-    for phase in range(len(unscaled)):
-        scaled[phase] = {}
-        for key in unscaled[phase].keys():
-            if variable_type == "p":
-                scale_factor = ocp.parameters[key].scaling
-            else:
-                scale_factor = getattr(ocp.nlp[phase], f"{variable_type}_scaling")[key]
-
-            if isinstance(unscaled[phase][key], list):  # Nodes are not merged
-                scaled[phase][key] = []
-                for node in range(len(unscaled[phase][key])):
-                    scaled[phase][key].append(
-                        np.zeros((unscaled[phase][key][node].shape[0], unscaled[phase][key][node].shape[1], 1))
+    scaled = {}
+    for key in unscaled.keys():
+        scale_factor = scaling[key]
+
+        if isinstance(unscaled[key], list):  # Nodes are not merged
+            scaled[key] = []
+            for node in range(len(unscaled[key])):
+                value = unscaled[key][node]
+                if len(value.shape) == 3:
+                    entry_size = value.shape[2]
+                    scaling_array = np.repeat(
+                        scale_factor.to_array(value.shape[1])[:, :, np.newaxis], entry_size, axis=2
                     )
-                    value = unscaled[phase][key][node]
-                    if len(unscaled[phase][key][node].shape) == 3:
-                        entry_size = unscaled[phase][key][node].shape[2]
-                        scaling = np.repeat(scale_factor.to_array(value.shape[1])[:, :, np.newaxis], entry_size, axis=2)
-                    else:
-                        scaling = scale_factor.to_array(value.shape[1])
-                    scaled[phase][key][node] = value / scaling
-
-            elif isinstance(unscaled[phase][key], np.ndarray):  # Nodes are merged
-                value = unscaled[phase][key]
-                scaled[phase][key] = value / scale_factor.to_array(value.shape[1])
-            else:
-                raise ValueError(f"Unrecognized type {type(unscaled[phase][key])} for {key}")
+                else:
+                    scaling_array = scale_factor.to_array(value.shape[1])
+                scaled[key].append(value / scaling_array)
+
+        elif isinstance(unscaled[key], np.ndarray):  # Nodes are merged
+            value = unscaled[key]
+            scaled[key] = value / scale_factor.to_array(value.shape[1])
+        else:
+            raise ValueError(f"Unrecognized type {type(unscaled[key])} for {key}")
 
     return scaled
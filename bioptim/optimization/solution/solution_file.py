@@ -0,0 +1,447 @@
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+from casadi import DM
+
+from .solution_data import SolutionData
+from ...misc.parameters_types import Int, Str, Bool, NpArray
+
+
+class SolutionFile:
+    """
+    A Solution saved on the disk (see Solution.save). The file is made of a json header describing the content followed
+    by the raw arrays, so it can be memory-mapped: nothing but the header is read when the file is opened, and the
+    arrays are only paged in when they are accessed. The data can therefore be scanned without the ocp (and without
+    the model) that produced them. The ocp is only needed to get back a full Solution (see to_solution), for instance to
+    reintegrate the states.
+
+    Attributes
+    ----------
+    path: str
+        The path of the file
+    n_phases: int
+        The number of phases of the program
+    status: int
+        The status of the solution
+    iterations: int
+        The number of iterations
+    solver_time_to_optimize: float
+        The time to optimize
+    real_time_to_optimize: float
+        The real time to optimize
+
+    Methods
+    -------
+    write(solution: Solution, path: str, include_stepwise_states: bool = True)
+        Save a Solution
+    keys(self, variable_type: str, phase: int = 0) -> list[str]
+        The keys of a type of variable
+    variable(self, variable_type: str, key: str = None, phase: int = 0, node: int = None) -> np.ndarray
+        The values of a variable
+    stepwise_time(self, phase: int = 0, node: int = None) -> np.ndarray
+        The time of the stepwise states
+    to_solution(self, ocp) -> Solution
+        The full Solution
+    """
+
+    _magic = b"BIOPTIMSOL"
+    _format_version = 1
+    _alignment = 64
+    variable_types = (
+        "decision_states",
+        "stepwise_states",
+        "stepwise_controls",
+        "decision_parameters",
+        "decision_algebraic_states",
+    )
+    _vectors = ("vector", "cost", "constraints", "lam_g", "lam_p", "lam_x", "inf_pr", "inf_du", "phases_dt")
+
+    def __init__(self, path: Str):
+        """
+        Open a file written by SolutionFile.write, only the header is read
+
+        Parameters
+        ----------
+        path: str
+            The path of the file
+        """
+
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(self._magic)) != self._magic:
+                raise ValueError(f"{path} is not a bioptim solution file")
+            format_version, header_size = struct.unpack("<IQ", file.read(struct.calcsize("<IQ")))
+            if format_version != self._format_version:
+                raise ValueError(
+                    f"{path} was written with the format version {format_version}, while this version of bioptim reads "
+                    f"the version {self._format_version}"
+                )
+            self._header = json.loads(file.read(header_size).decode())
+
+        self.n_phases = self._header["n_phases"]
+        self.status = self._header["stats"]["status"]
+        self.iterations = self._header["stats"]["iterations"]
+        self.solver_time_to_optimize = self._header["stats"]["solver_time_to_optimize"]
+        self.real_time_to_optimize = self._header["stats"]["real_time_to_optimize"]
+        self._memory_map = None
+
+    @classmethod
+    def write(cls, solution, path: Str, include_stepwise_states: Bool = True):
+        """
+        Save a Solution. The file is written atomically
+
+        Parameters
+        ----------
+        solution: Solution
+            The solution to save
+        path: str
+            The path of the file
+        include_stepwise_states: bool
+            If the stepwise states should be saved. They are integrated if they were not yet, which requires the model
+        """
+
+        if solution.vector is None:
+            raise ValueError("Only a solution with a vector can be saved")
+
+        arrays = {}
+        for name in cls._vectors:
+            value = getattr(solution, "_cost" if name == "cost" else name)
+            if value is not None:
+                arrays[name] = np.array(value, dtype=np.float64)
+
+        variables = {}
+        for variable_type in cls.variable_types:
+            if variable_type == "stepwise_states":
+                if not include_stepwise_states:
+                    continue
+                if solution._stepwise_states is None:
+                    solution._integrate_stepwise()
+            data: SolutionData = getattr(solution, _solution_data_attributes[variable_type])
+            variables[variable_type] = []
+            for phase in range(data.n_phases):
+                buffer, key_rows, node_cols = data.phase_buffer(phase)
+                arrays[f"{variable_type}/{phase}"] = buffer
+                variables[variable_type].append({"keys": key_rows, "node_cols": node_cols})
+
+        times = []
+        for phase, phase_times in enumerate(solution._stepwise_times):
+            phase_times = [np.array(node_times, dtype=np.float64).reshape(-1) for node_times in phase_times]
+            arrays[f"stepwise_time/{phase}"] = np.concatenate(phase_times) if phase_times else np.ndarray((0,))
+            times.append([node_times.shape[0] for node_times in phase_times])
+
+        header = {
+            "n_phases": solution.ocp.n_phases,
+            "stats": {
+                "status": None if solution.status is None else int(solution.status),
+                "iterations": None if solution.iterations is None else int(solution.iterations),
+                "solver_time_to_optimize": _to_float(solution.solver_time_to_optimize),
+                "real_time_to_optimize": _to_float(solution.real_time_to_optimize),
+            },
+            "variables": variables,
+            "stepwise_time": times,
+            "arrays": {},
+        }
+
+        # The offsets of the arrays depend on the size of the header, which itself depends on the offsets, so the header
+        # is serialized until its size is stable
+        header_size = 0
+        while True:
+            offset = _aligned(len(cls._magic) + struct.calcsize("<IQ") + header_size, cls._alignment)
+            for name, array in arrays.items():
+                header["arrays"][name] = {"offset": offset, "shape": list(array.shape), "dtype": array.dtype.str}
+                offset = _aligned(offset + array.nbytes, cls._alignment)
+            serialized_header = json.dumps(header).encode()
+            if len(serialized_header) == header_size:
+                break
+            header_size = len(serialized_header)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(cls._magic)
+                file.write(struct.pack("<IQ", cls._format_version, header_size))
+                file.write(serialized_header)
+                for name, array in arrays.items():
+                    file.seek(header["arrays"][name]["offset"])
+                    file.write(np.ascontiguousarray(array).tobytes())
+                file.truncate(offset)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _array(self, name: Str) -> NpArray | None:
+        """
+        A read-only view of an array of the file, paged in only when accessed
+        """
+
+        if name not in self._header["arrays"]:
+            return None
+
+        if self._memory_map is None:
+            self._memory_map = np.memmap(self.path, dtype=np.uint8, mode="r")
+        description = self._header["arrays"][name]
+        dtype = np.dtype(description["dtype"])
+        n_bytes = int(np.prod(description["shape"])) * dtype.itemsize
+        offset = description["offset"]
+        return self._memory_map[offset : offset + n_bytes].view(dtype).reshape(description["shape"])
+
+    @property
+    def vector(self) -> NpArray:
+        """
+        The optimization vector
+        """
+
+        return self._array("vector")
+
+    @property
+    def cost(self) -> NpArray | None:
+        """
+        The value of the cost function
+        """
+
+        return self._array("cost")
+
+    @property
+    def constraints(self) -> NpArray | None:
+        """
+        The values of the constraints
+        """
+
+        return self._array("constraints")
+
+    @property
+    def lam_g(self) -> NpArray | None:
+        """
+        The Lagrange multipliers of the constraints
+        """
+
+        return self._array("lam_g")
+
+    @property
+    def lam_p(self) -> NpArray | None:
+        """
+        The Lagrange multipliers of the parameters of the nlp
+        """
+
+        return self._array("lam_p")
+
+    @property
+    def lam_x(self) -> NpArray | None:
+        """
+        The Lagrange multipliers of the bounds of the optimization variables
+        """
+
+        return self._array("lam_x")
+
+    @property
+    def inf_pr(self) -> NpArray | None:
+        """
+        The primal infeasibility at each iteration
+        """
+
+        return self._array("inf_pr")
+
+    @property
+    def inf_du(self) -> NpArray | None:
+        """
+        The dual infeasibility at each iteration
+        """
+
+        return self._array("inf_du")
+
+    @property
+    def phases_dt(self) -> NpArray:
+        """
+        The time step of each phase
+        """
+
+        return self._array("phases_dt")
+
+    def __getstate__(self) -> dict:
+        # The memory map is reopened on demand
+        state = self.__dict__.copy()
+        state["_memory_map"] = None
+        return state
+
+    def _check_variable_type(self, variable_type: Str, phase: Int):
+        if variable_type not in self.variable_types:
+            raise ValueError(f"variable_type must be one of {self.variable_types}, not {variable_type}")
+        if variable_type not in self._header["variables"]:
+            raise ValueError(f"The {variable_type} were not saved in {self.path}")
+        if not 0 <= phase < len(self._header["variables"][variable_type]):
+            raise ValueError(f"phase {phase} does not exist in the {variable_type}")
+
+    def keys(self, variable_type: Str, phase: Int = 0) -> list[Str]:
+        """
+        The keys of a type of variable
+
+        Parameters
+        ----------
+        variable_type: str
+            The type of variable (see SolutionFile.variable_types)
+        phase: int
+            The index of the phase
+
+        Returns
+        -------
+        The keys
+        """
+
+        self._check_variable_type(variable_type, phase)
+        return list(self._header["variables"][variable_type][phase]["keys"].keys())
+
+    def variable(self, variable_type: Str, key: Str = None, phase: Int = 0, node: Int = None) -> NpArray:
+        """
+        The unscaled values of a variable. Only the requested values are read from the disk
+
+        Parameters
+        ----------
+        variable_type: str
+            The type of variable (see SolutionFile.variable_types)
+        key: str
+            The name of the variable. If None, all the variables of this type are returned, in the order of keys
+        phase: int
+            The index of the phase
+        node: int
+            The index of the node. If None, all the nodes are returned
+
+        Returns
+        -------
+        A read-only view of the values, of shape (n_rows, n_steps)
+        """
+
+        self._check_variable_type(variable_type, phase)
+        layout = self._header["variables"][variable_type][phase]
+        buffer = self._array(f"{variable_type}/{phase}")
+
+        rows = slice(None)
+        if key is not None:
+            if key not in layout["keys"]:
+                raise ValueError(
+                    f"{key} is not a key of the {variable_type}, available keys are {list(layout['keys'])}"
+                )
+            start = 0
+            for name, n_rows in layout["keys"].items():
+                if name == key:
+                    rows = slice(start, start + n_rows)
+                    break
+                start += n_rows
+
+        return buffer[rows, _node_columns(layout["node_cols"], node)]
+
+    def stepwise_time(self, phase: Int = 0, node: Int = None) -> NpArray:
+        """
+        The time of the stepwise states
+
+        Parameters
+        ----------
+        phase: int
+            The index of the phase
+        node: int
+            The index of the node. If None, all the nodes are returned
+
+        Returns
+        -------
+        A read-only view of the time
+        """
+
+        if not 0 <= phase < self.n_phases:
+            raise ValueError(f"phase {phase} does not exist")
+        return self._array(f"stepwise_time/{phase}")[_node_columns(self._header["stepwise_time"][phase], node)]
+
+    def to_solution(self, ocp):
+        """
+        The full Solution, which requires the ocp that produced the file
+
+        Parameters
+        ----------
+        ocp: OptimalControlProgram
+            The ocp that produced the solution
+
+        Returns
+        -------
+        The Solution
+        """
+
+        from .solution import Solution
+
+        vector = np.array(self.vector)
+        if vector.shape[0] != ocp.variables_vector.shape[0]:
+            raise ValueError(
+                f"The solution has {vector.shape[0]} variables while the ocp has {ocp.variables_vector.shape[0]}, "
+                f"make sure the ocp is the one that produced the solution"
+            )
+
+        def copy(name: Str, to_dm: Bool = True) -> DM | NpArray | None:
+            value = self._array(name)
+            if value is None:
+                return None
+            return DM(np.array(value)) if to_dm else np.array(value)
+
+        solution = Solution(
+            ocp=ocp,
+            vector=vector,
+            cost=copy("cost"),
+            constraints=copy("constraints"),
+            lam_g=copy("lam_g"),
+            lam_p=copy("lam_p"),
+            lam_x=copy("lam_x"),
+            inf_pr=copy("inf_pr", to_dm=False),
+            inf_du=copy("inf_du", to_dm=False),
+            solver_time_to_optimize=self.solver_time_to_optimize,
+            real_time_to_optimize=self.real_time_to_optimize,
+            iterations=self.iterations,
+            status=self.status,
+        )
+
+        # The stepwise states are restored so they do not have to be integrated again
+        if "stepwise_states" in self._header["variables"]:
+            unscaled = []
+            for phase, layout in enumerate(self._header["variables"]["stepwise_states"]):
+                unscaled.append(
+                    {
+                        key: [
+                            np.array(self.variable("stepwise_states", key, phase, node))
+                            for node in range(len(layout["node_cols"]))
+                        ]
+                        for key in layout["keys"]
+                    }
+                )
+            solution._stepwise_states = SolutionData.from_unscaled(ocp, unscaled, "x")
+
+        return solution
+
+
+_solution_data_attributes = {
+    "decision_states": "_decision_states",
+    "stepwise_states": "_stepwise_states",
+    "stepwise_controls": "_stepwise_controls",
+    "decision_parameters": "_parameters",
+    "decision_algebraic_states": "_decision_algebraic_states",
+}
+
+
+def _aligned(offset: Int, alignment: Int) -> Int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _to_float(value) -> float | None:
+    return None if value is None else float(value)
+
+
+def _node_columns(node_cols: list[Int], node: Int | None) -> slice:
+    """
+    The columns of a node, or all the columns if node is None
+    """
+
+    if node is None:
+        return slice(None)
+    if not 0 <= node < len(node_cols):
+        raise ValueError(f"node {node} does not exist, there are {len(node_cols)} nodes")
+    start = sum(node_cols[:node])
+    return slice(start, start + node_cols[node])
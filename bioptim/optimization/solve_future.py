@@ -0,0 +1,147 @@
+import asyncio
+from concurrent.futures import Future
+from threading import Event
+from typing import Callable
+
+from casadi import Callback, nlpsol_out, nlpsol_n_out, Sparsity
+
+from ..misc.parameters_types import AnyIterable, Bool, Int, Str, FloatOptional
+
+
+class CancellationCallback(Callback):
+    """
+    CasADi iteration callback that requests the solver to stop at its next iteration once a cancellation is requested.
+    The same callback is kept by the ocp from one solve to the other, so the solver does not have to be rebuilt
+    because of it (in parametric mode).
+
+    Attributes
+    ----------
+    event: Event | None
+        The event of the asynchronous solve in progress (None if there is none). The solver is stopped when it is set
+
+    Methods
+    -------
+    eval(self, arg: list | tuple, enforce: bool = False) -> list[int]
+        Return 1 (stop) if the cancellation of the current solve was requested, 0 (continue) otherwise
+    """
+
+    def __init__(self):
+        Callback.__init__(self)
+        self.event = None
+        self.construct("CancellationCallback", {})
+
+    @staticmethod
+    def get_n_in() -> Int:
+        return nlpsol_n_out()
+
+    @staticmethod
+    def get_n_out() -> Int:
+        return 1
+
+    @staticmethod
+    def get_name_in(i: Int) -> Str:
+        return nlpsol_out(i)
+
+    @staticmethod
+    def get_name_out(_) -> Str:
+        return "ret"
+
+    @staticmethod
+    def get_sparsity_in(_) -> Sparsity:
+        # The iterates are not needed, empty inputs are not sent by the solver
+        return Sparsity(0, 0)
+
+    def eval(self, arg: AnyIterable, enforce: Bool = False) -> list:
+        return [1 if self.event is not None and self.event.is_set() else 0]
+
+
+class SolveFuture:
+    """
+    The pending result of OptimalControlProgram.solve_async. It can be waited for from a thread (result) or awaited from
+    a coroutine (await future), and cancelled at any moment.
+
+    Methods
+    -------
+    result(self, timeout: float = None) -> Solution
+        Wait for the solve to finish and return its solution
+    done(self) -> bool
+        If the solve is finished (or was cancelled before it started)
+    running(self) -> bool
+        If the solve is in progress
+    cancel(self) -> bool
+        Request the cancellation of the solve
+    cancelled(self) -> bool
+        If the cancellation of the solve was requested
+    add_done_callback(self, fn: Callable)
+        Call fn(future) once the solve is finished
+    """
+
+    def __init__(self, future: Future, event: Event):
+        """
+        Parameters
+        ----------
+        future: Future
+            The future of the worker that solves the ocp
+        event: Event
+            The event the iteration callback of the solver checks to stop the solve
+        """
+
+        self._future = future
+        self._event = event
+
+    def result(self, timeout: FloatOptional = None):
+        """
+        Wait for the solve to finish and return its solution
+
+        Parameters
+        ----------
+        timeout: float
+            The maximum time to wait (in seconds). If None, there is no limit
+
+        Returns
+        -------
+        The solution. If the solve was cancelled while running, it is the last iterate of the solver (with a failed
+        status). If it was cancelled before it started, a concurrent.futures.CancelledError is raised
+        """
+
+        return self._future.result(timeout)
+
+    def done(self) -> Bool:
+        return self._future.done()
+
+    def running(self) -> Bool:
+        return self._future.running()
+
+    def cancel(self) -> Bool:
+        """
+        Request the cancellation of the solve. If it did not start yet, it never will. Otherwise, the solver stops at
+        its next iteration (IPOPT and SQP only, the other solvers are not interrupted)
+
+        Returns
+        -------
+        False if the solve was already finished, True otherwise
+        """
+
+        if self._future.done():
+            return False
+        self._event.set()
+        self._future.cancel()
+        return True
+
+    def cancelled(self) -> Bool:
+        return self._event.is_set()
+
+    def add_done_callback(self, fn: Callable):
+        """
+        Call fn(future) once the solve is finished (from the worker thread), or immediately if it is already finished
+
+        Parameters
+        ----------
+        fn: Callable
+            The function to call
+        """
+
+        self._future.add_done_callback(lambda _: fn(self))
+
+    def __await__(self):
+        return asyncio.wrap_future(self._future).__await__()
@@ -1,7 +1,7 @@
 from typing import Callable
 
 import numpy as np
-from casadi import DM_eye, vertcat, Function, horzcat
+from casadi import DM_eye, vertcat, Function
 
 from .non_linear_program import NonLinearProgram as NLP
 from .optimization_vector import OptimizationVectorHelper
@@ -363,52 +363,46 @@ class StochasticOptimalControlProgram(OptimalControlProgram):
             )
 
             x_guess = x_guess[:, 0 :: (self.problem_type.polynomial_degree + 2)]
-            for i in range(nlp.ns + 1):
-                ref_init_this_time = casadi_func(
-                    time_vector[-1] / nlp.ns,
-                    time_vector[i],
-                    x_guess[:, i],
-                    p_guess,
-                )
-                ref_init = ref_init_this_time if i == 0 else np.hstack((ref_init, ref_init_this_time))
-            return ref_init
+            # All the nodes are evaluated in a single call
+            ref_init = _map_nodes(casadi_func, nlp.ns + 1, self.n_threads)(
+                time_vector[-1] / nlp.ns, time_vector[np.newaxis, :], x_guess, p_guess
+            )
+            return np.array(ref_init)
+
+        def get_collocation_inputs(time_vector, x_guess, u_guess, nlp):
+            n_steps = self.problem_type.polynomial_degree + 2
+            starting_points = np.arange(nlp.ns) * n_steps
+            # The collocation points of all the nodes, node after node
+            collocation_points = (starting_points[:, np.newaxis] + np.arange(1, n_steps)[np.newaxis, :]).reshape(-1)
+            t_span = np.vstack((time_vector[:-1], np.diff(time_vector)))
+            return (
+                t_span,
+                x_guess[:, starting_points],
+                x_guess[:, collocation_points],
+                u_guess[:, : nlp.ns],
+                collocation_points,
+            )
 
-        def get_m_init(time_vector, x_guess, u_guess, p_guess, nlp, Fdz, Gdz):
+        def get_m_init(collocation_inputs, p_guess, nlp, Fdz, Gdz):
+            t_span, x_start, x_collocation, u_guess, collocation_points = collocation_inputs
             m_init = np.zeros((n_m, (self.problem_type.polynomial_degree + 2) * nlp.ns + 1))
-            for i in range(nlp.ns):
-                index_this_time = [
-                    i * (self.problem_type.polynomial_degree + 2) + j
-                    for j in range(self.problem_type.polynomial_degree + 2)
-                ]
-                df_dz = Fdz(
-                    vertcat(time_vector[i], time_vector[i + 1] - time_vector[i]),
-                    x_guess[:, index_this_time[0]],
-                    x_guess[:, index_this_time[1:]],
-                    u_guess[:, i],
-                    p_guess,
-                    [],
-                    [],
-                )
-                dg_dz = Gdz(
-                    vertcat(time_vector[i], time_vector[i + 1] - time_vector[i]),
-                    x_guess[:, index_this_time[0]],
-                    x_guess[:, index_this_time[1:]],
-                    u_guess[:, i],
-                    p_guess,
-                    [],
-                    [],
-                )
-                m_this_time = df_dz @ np.linalg.inv(dg_dz)
-
-                for i_col, idx in enumerate(index_this_time[1:]):
-                    m_init[:, idx] = np.reshape(
-                        StochasticBioModel.reshape_to_vector(
-                            m_this_time[
-                                :, i_col * nlp.model.matrix_shape_m[0] : (i_col + 1) * nlp.model.matrix_shape_m[0]
-                            ]
-                        ),
-                        (-1,),
-                    )
+
+            df_dz = _split_nodes(
+                _map_nodes(Fdz, nlp.ns, self.n_threads)(t_span, x_start, x_collocation, u_guess, p_guess, [], []),
+                nlp.ns,
+            )
+            dg_dz = _split_nodes(
+                _map_nodes(Gdz, nlp.ns, self.n_threads)(t_span, x_start, x_collocation, u_guess, p_guess, [], []),
+                nlp.ns,
+            )
+            # m = df_dz @ inv(dg_dz) for all the nodes at once, without inverting dg_dz
+            m_matrices = np.linalg.solve(dg_dz.transpose(0, 2, 1), df_dz.transpose(0, 2, 1)).transpose(0, 2, 1)
+
+            # Each block of columns of m is the matrix of a collocation point, stored as a column-major vector
+            n_rows = m_matrices.shape[1]
+            n_cols = nlp.model.matrix_shape_m[0]
+            m_vectors = m_matrices.reshape(nlp.ns, n_rows, -1, n_cols).transpose(0, 2, 3, 1).reshape(-1, n_m)
+            m_init[:, collocation_points] = m_vectors.T
 
             m_init[:, -1] = m_init[
                 :, -2
@@ -416,9 +410,7 @@ class StochasticOptimalControlProgram(OptimalControlProgram):
             return m_init
 
         def get_cov_init(
-            time_vector,
-            x_guess,
-            u_guess,
+            collocation_inputs,
             p_guess,
             m_init,
             nlp,
@@ -426,44 +418,43 @@ class StochasticOptimalControlProgram(OptimalControlProgram):
             Gdw,
             initial_covariance,
         ):
+            t_span, x_start, x_collocation, u_guess, collocation_points = collocation_inputs
             sigma_w_dm = vertcat(nlp.model.motor_noise_magnitude, nlp.model.sensory_noise_magnitude) * DM_eye(
                 vertcat(nlp.model.motor_noise_magnitude, nlp.model.sensory_noise_magnitude).shape[0]
             )
+            sigma_w = np.array(sigma_w_dm)
+
+            m_collocation = m_init[:, collocation_points]
+            dg_dx = _split_nodes(
+                _map_nodes(Gdx, nlp.ns, self.n_threads)(
+                    t_span, x_start, x_collocation, u_guess, p_guess, m_collocation, []
+                ),
+                nlp.ns,
+            )
+            dg_dw = _split_nodes(
+                _map_nodes(Gdw, nlp.ns, self.n_threads)(
+                    t_span, x_start, x_collocation, u_guess, p_guess, m_collocation, []
+                ),
+                nlp.ns,
+            )
+
+            # The matrices of the collocation points (column-major vectors) side by side, for each node
+            shape_0, shape_1 = nlp.model.matrix_shape_cov
+            m_matrix = (
+                m_collocation.T.reshape(nlp.ns, -1, shape_1, shape_0).transpose(0, 3, 1, 2).reshape(nlp.ns, shape_0, -1)
+            )
+
+            # Only the propagation itself depends on the previous covariance, everything else is computed at once
+            transition = m_matrix @ dg_dx
+            m_dg_dw = m_matrix @ dg_dw
+            noise = m_dg_dw @ sigma_w @ m_dg_dw.transpose(0, 2, 1)
 
             cov_init = np.zeros((n_cov, nlp.ns + 1))
-            cov_init[:, 0] = np.reshape(StochasticBioModel.reshape_to_vector(initial_covariance), (-1,))
+            cov_matrix = np.array(initial_covariance, dtype=float).reshape((shape_0, shape_1), order="F")
+            cov_init[:, 0] = cov_matrix.reshape(-1, order="F")
             for i in range(nlp.ns):
-                index_this_time = [
-                    i * (self.problem_type.polynomial_degree + 2) + j
-                    for j in range(self.problem_type.polynomial_degree + 2)
-                ]
-                dg_dx = Gdx(
-                    vertcat(time_vector[i], time_vector[i + 1] - time_vector[i]),
-                    x_guess[:, index_this_time[0]],
-                    x_guess[:, index_this_time[1:]],
-                    u_guess[:, i],
-                    p_guess,
-                    m_init[:, index_this_time[1:]],
-                    [],
-                )
-                dg_dw = Gdw(
-                    vertcat(time_vector[i], time_vector[i + 1] - time_vector[i]),
-                    x_guess[:, index_this_time[0]],
-                    x_guess[:, index_this_time[1:]],
-                    u_guess[:, i],
-                    p_guess,
-                    m_init[:, index_this_time[1:]],
-                    [],
-                )
-                cov_matrix = StochasticBioModel.reshape_to_matrix(cov_init[:, i], nlp.model.matrix_shape_cov)
-                mi_list = [
-                    StochasticBioModel.reshape_to_matrix(m_init[:, idx], nlp.model.matrix_shape_cov)
-                    for idx in index_this_time[1:]
-                ]
-                m_matrix = horzcat(*mi_list)
-
-                cov_this_time = m_matrix @ (dg_dx @ cov_matrix @ dg_dx.T + dg_dw @ sigma_w_dm @ dg_dw.T) @ m_matrix.T
-                cov_init[:, i + 1] = np.reshape(StochasticBioModel.reshape_to_vector(cov_this_time), (-1))
+                cov_matrix = transition[i] @ cov_matrix @ transition[i].T + noise[i]
+                cov_init[:, i + 1] = cov_matrix.reshape(-1, order="F")
             return cov_init
 
         if not isinstance(self.phase_time, list):
@@ -551,7 +542,8 @@ class StochasticOptimalControlProgram(OptimalControlProgram):
             )
             _, _, Gdx, Gdz, Gdw, Fdz = ConstraintFunction.Functions.collocation_jacobians(penalty, penalty_controller)
 
-            m_init = get_m_init(time_vector, x_guess, u_guess, p_guess, nlp, Fdz, Gdz)
+            collocation_inputs = get_collocation_inputs(time_vector, x_guess, u_guess, nlp)
+            m_init = get_m_init(collocation_inputs, p_guess, nlp, Fdz, Gdz)
             replace_initial_guess("m", n_m, m_init, a_init, i_phase, interpolation=InterpolationType.ALL_POINTS)
 
             if i_phase == 0:
@@ -559,9 +551,7 @@ class StochasticOptimalControlProgram(OptimalControlProgram):
             else:
                 initial_covariance = cov_init[:, -1]
             cov_init = get_cov_init(
-                time_vector,
-                x_guess,
-                u_guess,
+                collocation_inputs,
                 p_guess,
                 m_init,
                 nlp,
@@ -629,3 +619,23 @@ def _check_has_no_phase_dynamics_shared_during_the_phase(problem_type, **kwargs)
                     "The dynamics cannot be SHARED_DURING_THE_PHASE with a trapezoidal stochastic ocp."
                     "phase_dynamics is set to PhaseDynamics.ONE_PER_NODE by default."
                 )
+
+
+def _map_nodes(function: Function, n_nodes: int, n_threads: int) -> Function:
+    """
+    The function mapped over the nodes, so all of them are evaluated in a single call. The inputs of the nodes are
+    stacked horizontally, the inputs that are common to all the nodes can be sent once
+    """
+
+    if n_threads > 1:
+        return function.map(n_nodes, "thread", n_threads)
+    return function.map(n_nodes)
+
+
+def _split_nodes(value, n_nodes: int) -> np.ndarray:
+    """
+    Split the output of a mapped function (n_rows x n_nodes * n_cols) into a n_nodes x n_rows x n_cols array
+    """
+
+    value = np.array(value)
+    return value.reshape(value.shape[0], n_nodes, -1).transpose(1, 0, 2)
@@ -0,0 +1,276 @@
+import hashlib
+import os
+import pickle
+import socket
+import sqlite3
+from threading import Event, Thread
+from time import time
+from typing import Any, Iterator
+
+from ..misc.parameters_types import Int, Str
+
+
+class WorkQueue:
+    """
+    A queue of tasks stored in a SQLite database, that several processes (possibly on several hosts sharing the
+    filesystem) can consume at the same time. Each task is claimed by one process at a time and, once completed, its
+    record is checkpointed in the database, so a sweep that is started again only runs the tasks that are not completed.
+
+    A task claimed by a process that died before completing it is given back to the queue the next time a process of
+    the same host opens the queue. The tasks of the other hosts are given back after 'lease' seconds (if provided). The
+    lease of the tasks a process is running is renewed in the background, so a task that takes longer than the lease is
+    not claimed again while its process is alive.
+
+    Attributes
+    ----------
+    path: str
+        The path of the database
+    lease: float | None
+        The time (in seconds) after which a task claimed by a process of another host is considered abandoned
+    _heartbeat: Thread | None
+        The thread renewing the lease of the tasks claimed by this process
+    _stop_heartbeat: Event
+        Stops the heartbeat thread
+
+    Methods
+    -------
+    add(self, tasks: list)
+        Add the tasks that are not already in the queue
+    claim(self) -> Any
+        Claim the next task to run
+    claim_iter(self) -> Iterator
+        Claim the tasks one at a time, until there are none left
+    complete(self, task: Any, record: dict)
+        Checkpoint the record of a completed task
+    release(self)
+        Give back to the queue the tasks claimed by this process that are not completed
+    records(self) -> list[dict]
+        The records of all the completed tasks, in the order the tasks were added
+    progress(self) -> dict
+        The number of tasks that are pending, running and completed
+    """
+
+    def __init__(self, path: Str, lease: float = None):
+        """
+        Parameters
+        ----------
+        path: str
+            The path of the database. It is created if it does not exist
+        lease: float
+            The time (in seconds) after which a task claimed by a process of another host is considered abandoned. If
+            None, these tasks are never claimed again
+        """
+
+        if lease is not None and lease <= 0:
+            raise ValueError("lease must be positive")
+
+        self.path = os.path.abspath(path)
+        self.lease = lease
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._heartbeat = None
+        self._stop_heartbeat = Event()
+
+        with self._transaction() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "key TEXT PRIMARY KEY, position INTEGER, parameters BLOB, state TEXT, owner TEXT, claimed_at REAL, "
+                "record BLOB)"
+            )
+        self._recover()
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "lease": self.lease}
+
+    def __setstate__(self, state: dict):
+        self.path, self.lease = state["path"], state["lease"]
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._heartbeat = None
+        self._stop_heartbeat = Event()
+
+    def add(self, tasks: list):
+        """
+        Add the tasks that are not already in the queue (whatever their state)
+
+        Parameters
+        ----------
+        tasks: list
+            The parameters of each task. They must be picklable and their pickled bytes identify the task
+        """
+
+        with self._transaction() as connection:
+            position = connection.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()[0]
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks (key, position, parameters, state) VALUES (?, ?, ?, 'pending')",
+                [(_task_key(task), position + i, pickle.dumps(task)) for i, task in enumerate(tasks)],
+            )
+
+    def claim(self) -> Any:
+        """
+        Claim the next pending task (or abandoned one, see lease)
+
+        Returns
+        -------
+        The parameters of the task, or None if there is no task left to claim
+        """
+
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT key, parameters FROM tasks WHERE state = 'pending' "
+                "OR (state = 'running' AND ? IS NOT NULL AND claimed_at < ?) ORDER BY position LIMIT 1",
+                (self.lease, time() - (self.lease or 0)),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE tasks SET state = 'running', owner = ?, claimed_at = ? WHERE key = ?",
+                (self._owner, time(), row[0]),
+            )
+        self._start_heartbeat()
+        return pickle.loads(row[1])
+
+    def claim_iter(self) -> Iterator:
+        """
+        Claim the tasks one at a time, each one being claimed only when the previous one is requested
+
+        Returns
+        -------
+        The parameters of each claimed task
+        """
+
+        while (task := self.claim()) is not None:
+            yield task
+
+    def complete(self, task: Any, record: dict):
+        """
+        Checkpoint the record of a completed task. The outputs that cannot be pickled are not saved
+
+        Parameters
+        ----------
+        task: Any
+            The parameters of the task
+        record: dict
+            The record of the task
+        """
+
+        try:
+            record_blob = pickle.dumps(record)
+        except Exception:
+            record_blob = pickle.dumps({**record, "output": None})
+
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET state = 'done', record = ? WHERE key = ?", (record_blob, _task_key(task))
+            )
+
+    def release(self):
+        """
+        Give back to the queue the tasks claimed by this process that are not completed (e.g. when the sweep is
+        interrupted)
+        """
+
+        self._stop_heartbeat.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET state = 'pending', owner = NULL, claimed_at = NULL "
+                "WHERE state = 'running' AND owner = ?",
+                (self._owner,),
+            )
+
+    def records(self) -> list[dict]:
+        """
+        The records of all the completed tasks, in the order the tasks were added to the queue
+        """
+
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT record FROM tasks WHERE state = 'done' ORDER BY position").fetchall()
+        return [pickle.loads(row[0]) for row in rows]
+
+    def progress(self) -> dict:
+        """
+        The number of tasks in each state ("pending", "running" and "done")
+        """
+
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()
+        return {"pending": 0, "running": 0, "done": 0, **dict(rows)}
+
+    def _start_heartbeat(self):
+        """
+        Start renewing the lease of the tasks claimed by this process, every third of the lease, until release is
+        called. The thread is a daemon, so the lease expires if the process dies
+        """
+
+        if self.lease is None or (self._heartbeat is not None and self._heartbeat.is_alive()):
+            return
+        self._stop_heartbeat = Event()
+        self._heartbeat = Thread(target=self._renew_leases, args=(self._stop_heartbeat,), daemon=True)
+        self._heartbeat.start()
+
+    def _renew_leases(self, stop: Event):
+        while not stop.wait(self.lease / 3):
+            with self._transaction() as connection:
+                connection.execute(
+                    "UPDATE tasks SET claimed_at = ? WHERE state = 'running' AND owner = ?", (time(), self._owner)
+                )
+
+    def _recover(self):
+        """
+        Give back to the queue the tasks claimed by the processes of this host that do not exist anymore
+        """
+
+        host = socket.gethostname()
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT key, owner FROM tasks WHERE state = 'running'").fetchall()
+            abandoned = []
+            for key, owner in rows:
+                owner_host, _, pid = owner.rpartition(":")
+                if owner_host == host and not _process_exists(int(pid)):
+                    abandoned.append((key,))
+            connection.executemany(
+                "UPDATE tasks SET state = 'pending', owner = NULL, claimed_at = NULL WHERE key = ?", abandoned
+            )
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self.path)
+
+
+class _Transaction:
+    """
+    A write transaction on the database. The database is locked from the start of the transaction, so the
+    read-then-update sequences (e.g. claiming a task) are atomic across the processes
+    """
+
+    def __init__(self, path: Str):
+        self._path = path
+        self._connection = None
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._connection = sqlite3.connect(self._path, timeout=60, isolation_level=None)
+        self._connection.execute("BEGIN IMMEDIATE")
+        return self._connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self._connection.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+        finally:
+            self._connection.close()
+
+
+def _task_key(task: Any) -> Str:
+    # The repr of some parameters is truncated (e.g. large numpy arrays), so the pickled bytes are hashed instead
+    return hashlib.sha256(pickle.dumps(task)).hexdigest()
+
+
+def _process_exists(pid: Int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user
+        return True
+    return True
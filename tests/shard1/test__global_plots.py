@@ -55,6 +55,131 @@ def test_plot_check_conditioning(phase_dynamics):
     sol.graphs(automatically_organize=False)
 
 
+def test_check_conditioning_headless(tmp_path):
+    import json
+
+    from bioptim.examples.getting_started import example_multiphase as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/models/cube.bioMod",
+        long_optim=False,
+        phase_dynamics=PhaseDynamics.SHARED_DURING_THE_PHASE,
+        expand_dynamics=True,
+    )
+    report_path = str(tmp_path / "conditioning.json")
+    report = ocp.check_conditioning(report_path=report_path)
+
+    with open(report_path) as file:
+        written_report = json.load(file)
+    assert written_report["n_constraints"] == report["n_constraints"]
+    assert written_report["jacobian_rank"] == report["jacobian_rank"]
+    assert written_report["jacobian_rank_is_estimate"] is False
+    assert len(written_report["constraints_hessian_min_mean_max"]) == report["n_constraints"]
+    assert len(written_report["phases"]) == ocp.n_phases
+
+    assert report["jacobian_rank"] <= report["n_constraints"]
+    assert sum(phase["n_constraints"] for phase in report["phases"]) <= report["n_constraints"]
+    for phase in report["phases"]:
+        if phase["n_constraints"] > 0:
+            assert phase["jacobian_rank"] <= phase["n_constraints"]
+    np.testing.assert_array_less(
+        report["constraints_hessian_min_mean_max"][:, 0], report["constraints_hessian_min_mean_max"][:, 2] + 1e-12
+    )
+
+
+def test_check_conditioning_headless_without_matplotlib(tmp_path):
+    import json
+    import subprocess
+
+    from bioptim.examples.getting_started import example_multiphase as ocp_module
+
+    # The report is written on a machine that does not have matplotlib
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    report_path = str(tmp_path / "conditioning.json")
+    script = (
+        "import sys\n"
+        "sys.modules['matplotlib'] = None\n"
+        "from bioptim.examples.getting_started import example_multiphase as ocp_module\n"
+        f"ocp = ocp_module.prepare_ocp(biorbd_model_path={bioptim_folder + '/models/cube.bioMod'!r}, long_optim=False)\n"
+        f"ocp.check_conditioning(report_path={report_path!r})\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+    with open(report_path) as file:
+        report = json.load(file)
+    assert report["jacobian_rank_is_estimate"] is False
+    assert report["objective_eigen_values_are_estimates"] is False
+
+
+def _multiple_shooting_jacobian(n_shooting: int, n_duplicated_rows: int) -> "sparse.csr_matrix":
+    """
+    The jacobian of the continuity constraints x_k+1 - A_k x_k - B_k u_k = 0 (a single chain-connected block), with
+    some of its rows duplicated so it is rank deficient
+    """
+
+    from scipy import sparse
+
+    rng = np.random.default_rng(42)
+    n_states, n_controls = 4, 2
+    n_columns = (n_shooting + 1) * n_states + n_shooting * n_controls
+    jacobian = sparse.lil_matrix((n_shooting * n_states, n_columns))
+    for k in range(n_shooting):
+        rows = slice(k * n_states, (k + 1) * n_states)
+        jacobian[rows, k * n_states : (k + 1) * n_states] = rng.normal(size=(n_states, n_states)) * 1e3
+        jacobian[rows, (k + 1) * n_states : (k + 2) * n_states] = -np.eye(n_states)
+        controls = (n_shooting + 1) * n_states + k * n_controls
+        jacobian[rows, controls : controls + n_controls] = rng.normal(size=(n_states, n_controls)) * 1e-3
+    jacobian = jacobian.tocsr()
+    return sparse.vstack([jacobian, jacobian[:n_duplicated_rows, :]]).tocsr()
+
+
+@pytest.mark.parametrize("n_duplicated_rows", [0, 3, 20])
+def test_check_conditioning_rank_of_large_blocks(n_duplicated_rows, monkeypatch):
+    from bioptim.gui import check_conditioning
+
+    jacobian = _multiple_shooting_jacobian(n_shooting=50, n_duplicated_rows=n_duplicated_rows)
+    rank = np.linalg.matrix_rank(jacobian.toarray())
+    assert rank == 200
+    assert check_conditioning._sparse_matrix_rank(jacobian) == (rank, False)
+
+    # The block is too large to be densified, its rank is estimated and the deficiency is still detected
+    monkeypatch.setattr(check_conditioning, "_DENSE_SIZE_LIMIT", 0)
+    assert check_conditioning._sparse_matrix_rank(jacobian) == (rank, True)
+
+
+def test_check_conditioning_eigen_values_of_large_blocks(monkeypatch):
+    from scipy import sparse
+    from scipy.sparse.linalg import ArpackNoConvergence
+    from bioptim.gui import check_conditioning
+
+    # An indefinite and badly scaled hessian
+    hessian = sparse.random(200, 200, density=0.05, random_state=42)
+    hessian = (hessian + hessian.T + sparse.diags(np.linspace(-1, 1e4, 200))).tocsr()
+    eigen_values = np.linalg.eigvalsh(hessian.toarray())
+
+    monkeypatch.setattr(check_conditioning, "_DENSE_SIZE_LIMIT", 0)
+    ev_min, ev_max, are_estimates = check_conditioning._sparse_extreme_eigen_values(hessian)
+    np.testing.assert_almost_equal([ev_min, ev_max], [eigen_values[0], eigen_values[-1]], decimal=5)
+    assert not are_estimates
+
+    # The partial result of the Lanczos algorithm is used when it does not converge
+    def eigsh_partial(*args, **kwargs):
+        raise ArpackNoConvergence("No convergence", np.array([-0.5]), None)
+
+    monkeypatch.setattr(check_conditioning, "eigsh", eigsh_partial)
+    assert check_conditioning._sparse_extreme_eigen_values(hessian) == (-0.5, -0.5, True)
+
+    # And LOBPCG is used when there is no partial result
+    def eigsh_nothing(*args, **kwargs):
+        raise ArpackNoConvergence("No convergence", np.array([]), None)
+
+    monkeypatch.setattr(check_conditioning, "eigsh", eigsh_nothing)
+    ev_min, ev_max, are_estimates = check_conditioning._sparse_extreme_eigen_values(hessian)
+    np.testing.assert_almost_equal([ev_min, ev_max], [eigen_values[0], eigen_values[-1]], decimal=3)
+    assert are_estimates
+
+
 @pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
 def test_plot_check_conditioning_live(phase_dynamics):
     # Load graphs check conditioning
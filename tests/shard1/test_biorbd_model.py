@@ -125,3 +125,49 @@ def test_function_cached():
     marker2 = bio_model.center_of_mass()(bio_model.q, bio_model.parameters)
     assert marker_id2 == id(bio_model._cached_functions[("marker", (), frozenset({("index", 1)}))])
     assert len(bio_model._cached_functions.keys()) == 3
+
+
+def test_function_cached_on_disk(tmp_path):
+    from bioptim import FunctionDiskCache
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    model_path = bioptim_folder + "/models/pendulum.bioMod"
+    q = np.array([0.1, 0.2])
+    qdot = np.array([0.3, 0.4])
+    tau = np.array([1.0, 2.0])
+
+    # First model: the functions are generated and serialized
+    function_cache = FunctionDiskCache(str(tmp_path))
+    bio_model = BiorbdModel(model_path, function_cache=function_cache)
+    expected_com = bio_model.center_of_mass()(q, [])
+    expected_qddot = bio_model.forward_dynamics()(q, qdot, tau, [], [])
+    assert function_cache.hits == 0
+    assert function_cache.misses == 2
+    assert len(os.listdir(tmp_path)) == 2
+
+    # Second model (as another process would do): the functions are loaded from the disk
+    function_cache = FunctionDiskCache(str(tmp_path))
+    bio_model = BiorbdModel(model_path, function_cache=function_cache)
+    npt.assert_almost_equal(bio_model.center_of_mass()(q, []), expected_com)
+    npt.assert_almost_equal(bio_model.forward_dynamics()(q, qdot, tau, [], []), expected_qddot)
+    assert function_cache.hits == 2
+    assert function_cache.misses == 0
+    assert function_cache.hit_rate == 1
+
+    # Different arguments are different entries
+    bio_model.marker(index=0)
+    bio_model.marker(index=1)
+    assert function_cache.misses == 2
+    assert len(os.listdir(tmp_path)) == 4
+
+    # The least recently used entries are evicted when the cache is full
+    small_cache = FunctionDiskCache(str(tmp_path), max_size=function_cache.size // 2)
+    bio_model = BiorbdModel(model_path, function_cache=small_cache)
+    bio_model.marker(index=1)
+    bio_model.markers()
+    assert small_cache.size <= small_cache.max_size
+    assert len(os.listdir(tmp_path)) < 5
+
+    function_cache.clear()
+    assert len(os.listdir(tmp_path)) == 0
@@ -181,6 +181,20 @@ def test_model_holonomic():
         decimal=6,
     )
 
+    # Along a trajectory, each node is solved from the solution of the previous one
+    q_u_trajectory = np.linspace(0, 1, 5)[np.newaxis, :]
+    q_v_trajectory, residuals = model.compute_q_v_trajectory(5)(q_u_trajectory, DM([1.0, 1.0]))
+    npt.assert_equal(q_v_trajectory.shape, (2, 5))
+    npt.assert_equal(residuals.shape, (1, 5))
+    npt.assert_array_less(residuals.toarray(), 1e-8)
+    q_v_init = DM([1.0, 1.0])
+    for i in range(5):
+        npt.assert_almost_equal(
+            q_v_trajectory[:, i].toarray().squeeze(),
+            model.compute_q_v()(q_u_trajectory[:, i], q_v_init).toarray().squeeze(),
+        )
+        q_v_init = q_v_trajectory[:, i]
+
     TestUtils.assert_equal(
         model._compute_the_lagrangian_multipliers()(q, q_dot, q_ddot, tau), [20.34808, 27.119224], expand=False
     )
@@ -14,6 +14,7 @@ from bioptim import (
     QuadratureRule,
     SoftContactDynamics,
     ContactType,
+    ScalingStrategy,
 )
 
 from bioptim.misc.enums import SolverType, PenaltyType, ConstraintType
@@ -188,6 +189,15 @@ def test_magnitude_type():
     assert len(MagnitudeType) == 2
 
 
+def test_scaling_strategy():
+    assert ScalingStrategy.BOUNDS.value == "bounds"
+    assert ScalingStrategy.INITIAL_GUESS.value == "initial_guess"
+    assert ScalingStrategy.JACOBIAN.value == "jacobian"
+
+    # verify the number of elements
+    assert len(ScalingStrategy) == 3
+
+
 def test_multi_cyclic_cycle_solutions():
     assert MultiCyclicCycleSolutions.NONE.value == "none"
     assert MultiCyclicCycleSolutions.FIRST_CYCLES.value == "first_cycles"
@@ -15,6 +15,7 @@ from bioptim import (
     PhaseDynamics,
     SolutionMerge,
 )
+from bioptim.optimization.optimization_vector import OptimizationVectorHelper
 import numpy as np
 import numpy.testing as npt
 
@@ -164,3 +165,194 @@ def test_mhe_redim_xbounds_not_implemented(phase_dynamics):
         "CONSTANT or CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT",
     ):
         mhe.solve(update_functions, Solver.IPOPT())
+
+
+@pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
+def test_mhe_parametric(phase_dynamics):
+    from bioptim.examples.moving_horizon_estimation import mhe as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    bio_model = BiorbdModel(bioptim_folder + "/models/cart_pendulum.bioMod")
+    nq = bio_model.nb_q
+    torque_max = 5
+    n_frames = 12
+    window_len = 5
+    window_duration = 0.2
+
+    final_time = window_duration / window_len * n_frames
+    x_init = np.zeros((nq * 2, window_len + 1))
+    u_init = np.zeros((nq, window_len))
+
+    target_q, _, _, _ = ocp_module.generate_data(bio_model, final_time, [0, np.pi / 2, 0, 0], torque_max, n_frames, 0)
+    target = ocp_module.states_to_markers(bio_model, target_q)
+
+    all_states = []
+    for parametric in (False, True):
+        solvers = []
+
+        def update_functions(mhe, t, _):
+            if mhe.ocp_solver is not None:
+                solvers.append(mhe.ocp_solver.ocp_solver)
+            mhe.update_objectives_target(target=target[:, :, t : t + window_len + 1], list_index=0)
+            return t < n_frames - window_len - 1
+
+        sol = ocp_module.prepare_mhe(
+            bio_model=BiorbdModel(bioptim_folder + "/models/cart_pendulum.bioMod"),
+            window_len=window_len,
+            window_duration=window_duration,
+            max_torque=torque_max,
+            x_init=x_init,
+            u_init=u_init,
+            phase_dynamics=phase_dynamics,
+            expand_dynamics=True,
+        ).solve(update_functions, **ocp_module.get_solver_options(Solver.IPOPT(), parametric=parametric))
+        all_states.append(sol.decision_states(to_merge=SolutionMerge.NODES))
+
+        if parametric:
+            # The solver is built for the first window and once more for the second (options are different), then reused
+            assert len({id(solver) for solver in solvers[1:]}) == 1
+
+    for key in all_states[0]:
+        npt.assert_almost_equal(all_states[0][key], all_states[1][key], decimal=6)
+
+
+def test_mhe_incremental_window_vectors():
+    from bioptim.examples.moving_horizon_estimation import mhe as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    bio_model = BiorbdModel(bioptim_folder + "/models/cart_pendulum.bioMod")
+    nq = bio_model.nb_q
+    torque_max = 5
+    n_frames = 12
+    window_len = 5
+    window_duration = 0.2
+
+    final_time = window_duration / window_len * n_frames
+    x_init = np.zeros((nq * 2, window_len + 1))
+    u_init = np.zeros((nq, window_len))
+
+    target_q, _, _, _ = ocp_module.generate_data(bio_model, final_time, [0, np.pi / 2, 0, 0], torque_max, n_frames, 0)
+    target = ocp_module.states_to_markers(bio_model, target_q)
+
+    def update_functions(mhe, t, _):
+        # The vectors updated block by block between the windows are the same as the fully reassembled ones
+        v_bounds = mhe.bounds_vectors
+        npt.assert_equal(v_bounds[0], OptimizationVectorHelper.bounds_vectors(mhe)[0])
+        npt.assert_equal(v_bounds[1], OptimizationVectorHelper.bounds_vectors(mhe)[1])
+        npt.assert_equal(mhe.init_vector, OptimizationVectorHelper.init_vector(mhe))
+
+        # The bounds and initial guesses edited directly are also sent to the solver
+        mhe.nlp[0].u_bounds["tau"].max[1, :] = 0.1 * t
+        mhe.nlp[0].u_init["tau"].init[1, :] = 0.01 * t
+        v_bounds = mhe.bounds_vectors
+        npt.assert_equal(v_bounds[1], OptimizationVectorHelper.bounds_vectors(mhe)[1])
+        npt.assert_equal(mhe.init_vector, OptimizationVectorHelper.init_vector(mhe))
+
+        mhe.update_objectives_target(target=target[:, :, t : t + window_len + 1], list_index=0)
+        return t < n_frames - window_len - 1
+
+    sol = ocp_module.prepare_mhe(
+        bio_model=BiorbdModel(bioptim_folder + "/models/cart_pendulum.bioMod"),
+        window_len=window_len,
+        window_duration=window_duration,
+        max_torque=torque_max,
+        x_init=x_init,
+        u_init=u_init,
+        expand_dynamics=True,
+    ).solve(update_functions, **ocp_module.get_solver_options(Solver.IPOPT()))
+
+    # One frame is exported per window, plus the last frame of the last window
+    n_windows = n_frames - window_len - 1
+    states = sol.decision_states(to_merge=SolutionMerge.NODES)
+    assert states["q"].shape == (nq, n_windows + 1)
+
+
+@pytest.mark.parametrize("with_solver_first_iter", [True, False])
+@pytest.mark.parametrize("control_period", [None, 1e-9, 10])
+def test_mhe_real_time(control_period, with_solver_first_iter):
+    from bioptim.examples.moving_horizon_estimation import mhe as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    bio_model = BiorbdModel(bioptim_folder + "/models/cart_pendulum.bioMod")
+    nq = bio_model.nb_q
+    torque_max = 5
+    n_frames = 12
+    window_len = 5
+    window_duration = 0.2
+
+    final_time = window_duration / window_len * n_frames
+    x_init = np.zeros((nq * 2, window_len + 1))
+    u_init = np.zeros((nq, window_len))
+
+    target_q, _, _, _ = ocp_module.generate_data(bio_model, final_time, [0, np.pi / 2, 0, 0], torque_max, n_frames, 0)
+    target = ocp_module.states_to_markers(bio_model, target_q)
+
+    # The solver used by each window
+    used_solvers = []
+
+    def update_functions(mhe, t, _):
+        if t > 0:
+            used_solvers.append(mhe.ocp_solver.opts)
+        mhe.update_objectives_target(target=target[:, :, t : t + window_len + 1], list_index=0)
+        return t < n_frames - window_len - 1
+
+    solver_options = ocp_module.get_solver_options(Solver.IPOPT())
+    if not with_solver_first_iter:
+        solver_options["solver_first_iter"] = None
+    first_solver = solver_options["solver_first_iter"] or solver_options["solver"]
+    sol, all_solutions, _ = ocp_module.prepare_mhe(
+        bio_model=BiorbdModel(bioptim_folder + "/models/cart_pendulum.bioMod"),
+        window_len=window_len,
+        window_duration=window_duration,
+        max_torque=torque_max,
+        x_init=x_init,
+        u_init=u_init,
+        expand_dynamics=True,
+    ).solve(
+        update_functions,
+        real_time_options=None if control_period is None else {"control_period": control_period, "max_iterations": 3},
+        get_all_iterations=True,
+        **solver_options,
+    )
+
+    n_windows = n_frames - window_len - 1
+    stats = sol.real_time_stats
+    assert stats.control_period == control_period
+    assert stats.n_windows == n_windows
+    for step in ("build", "solve", "shift", "export", "latency"):
+        assert stats.latencies[step].shape == (n_windows,)
+        assert np.all(stats.latencies[step] >= 0)
+    counts, _ = stats.histogram(bins=5)
+    assert counts.sum() == n_windows
+    assert stats.summary()["n_windows"] == n_windows
+    with pytest.raises(ValueError, match="step must be one of"):
+        stats.histogram("not a step")
+
+    # The solvers sent are left untouched and the first window is never capped
+    assert used_solvers[0] is first_solver
+    assert solver_options["solver"].max_iter == 5
+    assert solver_options["solver"].max_wall_time is None
+    if with_solver_first_iter:
+        assert solver_options["solver_first_iter"].max_iter == 50
+
+    if control_period is None:
+        assert stats.overruns == []
+        assert used_solvers[1] is solver_options["solver"]
+    elif control_period == 10:
+        assert stats.overruns == []
+        # The next windows are solved with a capped copy of the solver
+        assert used_solvers[1] is not solver_options["solver"]
+        assert used_solvers[1].max_iter == 3
+        assert used_solvers[1].max_wall_time == 10
+    else:
+        # All the windows miss their deadline, but the first one has no previous solution to fall back on
+        assert stats.overruns == list(range(n_windows))
+        assert stats.fallbacks == list(range(1, n_windows))
+
+        # The fallback is the previous window shifted by one frame
+        previous = all_solutions[0].decision_states(to_merge=SolutionMerge.NODES)
+        fallback = all_solutions[1].decision_states(to_merge=SolutionMerge.NODES)
+        npt.assert_almost_equal(fallback["q"][:, :-1], previous["q"][:, 1:])
@@ -56,3 +56,80 @@ def test_double_pendulum_torque_driven_IOCP(phase_dynamics):
     # initial and final controls
     npt.assert_almost_equal(tau[:, 0], np.array([-11.9453666]))
     npt.assert_almost_equal(tau[:, -1], np.array([0.02482167]))
+
+
+@pytest.mark.parametrize("n_threads", [1, 4])
+def test_double_pendulum_torque_driven_IOCP_weights(n_threads):
+    from bioptim import Solver
+    from bioptim.examples.inverse_optimal_control import double_pendulum_torque_driven_IOCP as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    biorbd_model_path = bioptim_folder + "/models/double_pendulum.bioMod"
+
+    # Build the program once, the weights are changed afterward
+    ocp = ocp_module.prepare_ocp(
+        weights=[1, 1, 1], coefficients=[1, 1, 1], biorbd_model_path=biorbd_model_path, n_threads=n_threads
+    )
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+
+    sol = ocp.solve(solver, weights=[0.4, 0.3, 0.3])
+    assert ocp.ocp_solver.opts.parametric
+    assert not solver.parametric
+    npt.assert_almost_equal(float(sol.cost), 12.0765913088802, decimal=5)
+    nlpsol = ocp.ocp_solver.ocp_solver
+
+    # The same nlp is reused and warm started from the previous solution
+    sol_warm = ocp.solve(solver, weights=[0.4, 0.3, 0.3])
+    assert ocp.ocp_solver.ocp_solver is nlpsol
+    assert sol_warm.iterations < sol.iterations
+    npt.assert_almost_equal(float(sol_warm.cost), float(sol.cost), decimal=5)
+
+    sol_doubled = ocp.solve(solver, weights={(0, 0): 0.8, (0, 1): 0.6, (0, 2): 0.6})
+    assert ocp.ocp_solver.ocp_solver is nlpsol
+    npt.assert_almost_equal(float(sol_doubled.cost), 2 * float(sol.cost), decimal=4)
+
+    with pytest.raises(ValueError, match="'list_index' must be defined properly"):
+        ocp.solve(solver, weights=[0.4, 0.3, 0.3, 0.1])
+
+
+def test_double_pendulum_torque_driven_IOCP_sensitivity():
+    from bioptim import Solver
+    from bioptim.examples.inverse_optimal_control import double_pendulum_torque_driven_IOCP as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    biorbd_model_path = bioptim_folder + "/models/double_pendulum.bioMod"
+
+    weights = [0.4, 0.3, 0.3]
+    ocp = ocp_module.prepare_ocp(weights=weights, coefficients=[1, 1, 1], biorbd_model_path=biorbd_model_path)
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    solver.set_tol(1e-10)
+
+    sol = ocp.solve(solver, weights=weights)
+    sensitivity = sol.sensitivity()
+    n_p = sum(size for _, size in sensitivity["parameter_names"])
+    assert sensitivity["vector"].shape == (sol.vector.shape[0], n_p)
+    assert sensitivity["cost"].shape == (1, n_p)
+
+    # The weights are the only parameters and the cost is homogeneous in the weights
+    p = ocp.ocp_solver.limits["p"]
+    npt.assert_almost_equal(float(sensitivity["cost"] @ p), float(sol.cost), decimal=5)
+
+    # Compare with a perturbed solve
+    markers_weight = sol.sensitivity([name for name, _ in sensitivity["parameter_names"] if "MARKERS" in name])
+    h = 1e-5
+    sol_perturbed = ocp.solve(solver, weights=[weights[0], weights[1], weights[2] + h])
+    finite_difference = (np.array(sol_perturbed.vector) - np.array(sol.vector))[:, 0] / h
+    npt.assert_almost_equal(markers_weight["vector"].sum(axis=1), finite_difference, decimal=2)
+
+    with pytest.raises(ValueError, match="are not parameters of the nlp"):
+        sol_perturbed.sensitivity("not a parameter")
+
+    # The bounds and the parameters of the nlp are the ones of the last solve
+    with pytest.raises(RuntimeError, match="only available for the solution of the last solve"):
+        sol.sensitivity()
+
+    # The parameters of each penalty have their own names, even if the penalties share a name
+    names = [name for name, _ in sensitivity["parameter_names"]]
+    assert len(set(names)) == len(names)
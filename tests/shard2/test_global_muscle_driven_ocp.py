@@ -2,11 +2,32 @@
 Test for file IO
 """
 
+from typing import Callable
+
 import pytest
 
 import numpy as np
 import numpy.testing as npt
-from bioptim import OdeSolver, ControlType, PhaseDynamics, SolutionMerge
+from casadi import MX
+from bioptim import (
+    OdeSolver,
+    ControlType,
+    PhaseDynamics,
+    SolutionMerge,
+    ScalingStrategy,
+    Solver,
+    BoundsList,
+    ConfigureProblem,
+    ContactType,
+    DynamicsEvaluation,
+    DynamicsList,
+    InterpolationType,
+    NonLinearProgram,
+    ObjectiveFcn,
+    ObjectiveList,
+    OptimalControlProgram,
+    VariableScalingList,
+)
 
 from ..utils import TestUtils
 
@@ -144,3 +165,164 @@ def test_muscle_driven_ocp(ode_solver, phase_dynamics):
 
     # simulate
     TestUtils.simulate(sol, decimal_value=5)
+
+
+def test_muscle_driven_ocp_auto_scale():
+    from bioptim.examples.muscle_driven_ocp import static_arm as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    model_path = bioptim_folder + "/models/arm26.bioMod"
+    ocp = ocp_module.prepare_ocp(model_path, final_time=0.1, n_shooting=5, weight=1, n_threads=1)
+
+    # The bounds of the controls are of order one, the velocities are not
+    scaling = ocp.auto_scale(ScalingStrategy.BOUNDS)
+    npt.assert_almost_equal(scaling["u_scaling"]["muscles"].scaling, np.ones((6, 1)))
+    npt.assert_almost_equal(scaling["u_scaling"]["tau"].scaling, np.ones((2, 1)))
+    assert (scaling["x_scaling"]["qdot"].scaling > 1).all()
+    assert len(scaling["a_scaling"].keys()) == 0
+    assert len(scaling["parameter_scaling"].keys()) == 0
+
+    scaling = ocp.auto_scale(ScalingStrategy.JACOBIAN)
+    for key in ("q", "qdot"):
+        assert scaling["x_scaling"][key].scaling.shape == (2, 1)
+        assert ((scaling["x_scaling"][key].scaling >= 1e-4) & (scaling["x_scaling"][key].scaling <= 1e4)).all()
+
+    with pytest.raises(ValueError, match="strategy must be a ScalingStrategy"):
+        ocp.auto_scale("bounds")
+
+    # The scaled program converges to the same optimum
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    sol = ocp.solve(solver)
+    scaled_ocp = ocp_module.prepare_ocp(
+        model_path,
+        final_time=0.1,
+        n_shooting=5,
+        weight=1,
+        n_threads=1,
+        x_scaling=scaling["x_scaling"],
+        u_scaling=scaling["u_scaling"],
+    )
+    scaled_sol = scaled_ocp.solve(solver)
+    assert scaled_sol.status == 0
+    npt.assert_almost_equal(np.array(scaled_sol.cost), np.array(sol.cost), decimal=5)
+
+
+class IntegratorModel:
+    """
+    A single integrator (xdot = u), the continuity constraints of which are x_k + dt * u_k - x_k+1, whatever the
+    number of integration steps. The largest derivative of each row is max(1, dt), so the JACOBIAN strategy scales
+    the state by max(1, dt) and the control by max(1, dt) / dt
+    """
+
+    def __init__(self):
+        self._name = None
+
+    def serialize(self) -> tuple[Callable, dict]:
+        return IntegratorModel, {}
+
+    @property
+    def name_dof(self) -> list[str]:
+        return ["x"]
+
+    @property
+    def nb_state(self) -> int:
+        return 1
+
+    @property
+    def name(self) -> None | str:
+        return self._name
+
+    @staticmethod
+    def dynamics(
+        time: MX,
+        states: MX,
+        controls: MX,
+        parameters: MX,
+        algebraic_states: MX,
+        numerical_timeseries: MX,
+        nlp: NonLinearProgram,
+    ) -> DynamicsEvaluation:
+        return DynamicsEvaluation(dxdt=controls[0], defects=None)
+
+    def declare_variables(
+        self,
+        ocp: OptimalControlProgram,
+        nlp: NonLinearProgram,
+        numerical_data_timeseries: dict[str, np.ndarray] = None,
+        contact_type: list[ContactType] | tuple[ContactType] = (),
+    ):
+        ConfigureProblem.configure_new_variable("x", ["x"], ocp, nlp, as_states=True, as_controls=False)
+        ConfigureProblem.configure_new_variable("u", ["u"], ocp, nlp, as_states=False, as_controls=True)
+        ConfigureProblem.configure_dynamics_function(ocp, nlp, dyn_func=self.dynamics)
+
+
+def prepare_integrator_ocp(
+    final_time: float, n_shooting: int, x_scaling: VariableScalingList = None, u_scaling: VariableScalingList = None
+) -> OptimalControlProgram:
+    model = IntegratorModel()
+    dynamics = DynamicsList()
+    dynamics.add(
+        model.declare_variables,
+        dynamic_function=model.dynamics,
+        expand_dynamics=True,
+        ode_solver=OdeSolver.RK4(n_integration_steps=1),
+        phase_dynamics=PhaseDynamics.SHARED_DURING_THE_PHASE,
+    )
+
+    # The gradient of the objective is null at the initial guess (u = 0), so only the constraints set the scaling
+    objective_functions = ObjectiveList()
+    objective_functions.add(ObjectiveFcn.Lagrange.MINIMIZE_CONTROL, key="u")
+
+    # Go from 0 to 1000, the bounds do not change the JACOBIAN scaling
+    x_bounds = BoundsList()
+    x_bounds.add(
+        "x",
+        min_bound=[[0, -np.inf, 1000]],
+        max_bound=[[0, np.inf, 1000]],
+        interpolation=InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT,
+    )
+    u_bounds = BoundsList()
+    u_bounds.add("u", min_bound=[-1000], max_bound=[1000])
+
+    return OptimalControlProgram(
+        model,
+        dynamics,
+        n_shooting,
+        final_time,
+        objective_functions=objective_functions,
+        x_bounds=x_bounds,
+        u_bounds=u_bounds,
+        x_scaling=x_scaling,
+        u_scaling=u_scaling,
+    )
+
+
+@pytest.mark.parametrize(
+    "final_time, n_shooting, x_scaling, u_scaling, iterations, scaled_iterations",
+    [(2, 10, 1, 5, 7, 6), (20, 2, 10, 1, 6, 6)],
+)
+def test_auto_scale_jacobian(final_time, n_shooting, x_scaling, u_scaling, iterations, scaled_iterations):
+    ocp = prepare_integrator_ocp(final_time, n_shooting)
+    scaling = ocp.auto_scale(ScalingStrategy.JACOBIAN)
+    npt.assert_almost_equal(scaling["x_scaling"]["x"].scaling, np.array([[x_scaling]]))
+    npt.assert_almost_equal(scaling["u_scaling"]["u"].scaling, np.array([[u_scaling]]))
+
+    # The factors are expressed in the units of the variables, so scaling the program again does not change them
+    scaled_ocp = prepare_integrator_ocp(
+        final_time, n_shooting, x_scaling=scaling["x_scaling"], u_scaling=scaling["u_scaling"]
+    )
+    scaled_scaling = scaled_ocp.auto_scale(ScalingStrategy.JACOBIAN)
+    npt.assert_almost_equal(scaled_scaling["x_scaling"]["x"].scaling, np.array([[x_scaling]]))
+    npt.assert_almost_equal(scaled_scaling["u_scaling"]["u"].scaling, np.array([[u_scaling]]))
+
+    # The number of iterations IPOPT needs without and with the scaling
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    sol = ocp.solve(solver)
+    scaled_sol = scaled_ocp.solve(solver)
+    assert sol.status == 0
+    assert scaled_sol.status == 0
+    npt.assert_allclose(np.array(scaled_sol.cost), np.array(sol.cost), rtol=1e-8)
+    assert sol.iterations == iterations
+    assert scaled_sol.iterations == scaled_iterations
@@ -10,8 +10,9 @@ import pytest
 from ..utils import TestUtils
 
 
+@pytest.mark.parametrize("structured_qp", [False, True])
 @pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
-def test_pendulum(phase_dynamics):
+def test_pendulum(phase_dynamics, structured_qp):
     from bioptim.examples.sqp_method import pendulum as ocp_module
 
     bioptim_folder = TestUtils.module_folder(ocp_module)
@@ -29,6 +30,8 @@ def test_pendulum(phase_dynamics):
     solver.set_tol_pr(1e-1)
     solver.set_max_iter_ls(1)
     solver.set_maximum_iterations(1)
+    # The sparse QP solver must find the same step as the dense one
+    solver.set_structured_qp(structured_qp)
     sol = ocp.solve(solver)
 
     # Check objective function value
@@ -4,6 +4,7 @@ Test for file IO
 
 import tracemalloc
 import gc
+import os
 import pickle
 import platform
 import re
@@ -155,62 +156,48 @@ def test_pendulum(ode_solver, use_sx, n_threads, phase_dynamics):
     f = np.array(sol.cost)
     npt.assert_equal(f.shape, (1, 1))
 
-    if n_threads > 1:
-        with pytest.raises(
-            NotImplementedError, match="Computing detailed cost with n_thread > 1 is not implemented yet"
-        ):
-            detailed_cost = sol.detailed_cost[0]
-        detailed_cost = None
-    else:
-        detailed_cost = sol.detailed_cost[0]
+    detailed_cost = sol.detailed_cost[0]
 
     if isinstance(ode_solver_obj, OdeSolver.RK8):
         npt.assert_almost_equal(f[0, 0], 41.57063948309302)
         # detailed cost values
-        if detailed_cost is not None:
-            npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 41.57063948309302)
+        npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 41.57063948309302)
         npt.assert_almost_equal(sol.decision_states()["q"][15][:, 0], [-0.5010317, 0.6824593])
 
     elif isinstance(ode_solver_obj, OdeSolver.IRK):
         npt.assert_almost_equal(f[0, 0], 65.8236055171619)
         # detailed cost values
-        if detailed_cost is not None:
-            npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 65.8236055171619)
+        npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 65.8236055171619)
         npt.assert_almost_equal(sol.decision_states()["q"][15][:, 0], [0.5536468, -0.4129719])
 
     elif isinstance(ode_solver_obj, OdeSolver.COLLOCATION):
         npt.assert_almost_equal(f[0, 0], 46.667345680854794)
         # detailed cost values
-        if detailed_cost is not None:
-            npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 46.667345680854794)
+        npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 46.667345680854794)
         npt.assert_almost_equal(sol.decision_states()["q"][15][:, 0], [-0.1780507, 0.3254202])
 
     elif isinstance(ode_solver_obj, OdeSolver.RK1):
         npt.assert_almost_equal(f[0, 0], 47.360621044913245)
         # detailed cost values
-        if detailed_cost is not None:
-            npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 47.360621044913245)
+        npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 47.360621044913245)
         npt.assert_almost_equal(sol.decision_states()["q"][15][:, 0], [0.1463538, 0.0215651])
 
     elif isinstance(ode_solver_obj, OdeSolver.RK2):
         npt.assert_almost_equal(f[0, 0], 76.24887695462857)
         # detailed cost values
-        if detailed_cost is not None:
-            npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 76.24887695462857)
+        npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 76.24887695462857)
         npt.assert_almost_equal(sol.decision_states()["q"][15][:, 0], [0.652476, -0.496652])
 
     elif isinstance(ode_solver_obj, OdeSolver.TRAPEZOIDAL):
         npt.assert_almost_equal(f[0, 0], 31.423389566303985)
         # detailed cost values
-        if detailed_cost is not None:
-            npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 31.423389566303985)
+        npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 31.423389566303985)
         npt.assert_almost_equal(sol.decision_states()["q"][15][:, 0], [0.69364974, -0.48330043])
 
     else:
         npt.assert_almost_equal(f[0, 0], 41.58259426)
         # detailed cost values
-        if detailed_cost is not None:
-            npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 41.58259426)
+        npt.assert_almost_equal(detailed_cost["cost_value_weighted"], 41.58259426)
         npt.assert_almost_equal(sol.decision_states()["q"][15][:, 0], [-0.4961208, 0.6764171])
 
     # Check constraints
@@ -1607,9 +1594,14 @@ def test_multistart():
         save_folder=save_folder,
     )
     tak = time.time()
-    multi_start.solve()
+    summary = multi_start.solve()
     tok = time.time()
 
+    # The ocp built for the first seed is reused for the second one
+    assert [record["parameters"][2:] for record in summary] == [[5, 2], [5, 1], [10, 2], [10, 1]]
+    assert all(record["attempts"] == 1 and record["error"] is None for record in summary)
+    assert "status" in multi_start.summary_table()
+
     with open(f"{save_folder}/pendulum_multi_start_random_states_5_2.pkl", "rb") as file:
         multi_start_0 = pickle.load(file)
     with open(f"{save_folder}/pendulum_multi_start_random_states_5_1.pkl", "rb") as file:
@@ -1788,6 +1780,179 @@ def test_multistart():
     test_memory[f"multistart"] = [building_duration, solving_duration, mem_used]
 
 
+def test_multistart_work_queue(tmp_path):
+    from bioptim.examples.getting_started import example_multistart as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    combinatorial_parameters = {
+        "bio_model_path": [bioptim_folder + "/models/pendulum.bioMod"],
+        "final_time": [1],
+        "n_shooting": [5],
+        "seed": [0, 1, 2],
+    }
+    save_folder = str(tmp_path / "solutions")
+    queue_path = str(tmp_path / "queue.db")
+
+    # The sweep is interrupted after the first combination
+    multi_start = ocp_module.prepare_multi_start(
+        combinatorial_parameters, save_folder=save_folder, queue_path=queue_path
+    )
+    tasks = multi_start.solve_iter()
+    record = next(tasks)
+    tasks.close()
+    assert record["parameters"][3] == 0
+    assert multi_start.work_queue.progress() == {"pending": 2, "running": 0, "done": 1}
+
+    # Restarting it only solves the remaining combinations
+    multi_start = ocp_module.prepare_multi_start(
+        combinatorial_parameters, save_folder=save_folder, queue_path=queue_path
+    )
+    summary = multi_start.solve()
+    assert [record["parameters"][3] for record in summary] == [1, 2]
+    assert multi_start.work_queue.progress() == {"pending": 0, "running": 0, "done": 3}
+    assert [record["parameters"][3] for record in multi_start.checkpointed_records()] == [0, 1, 2]
+    assert multi_start.solve() == []
+
+    with pytest.raises(RuntimeError, match="The records are only checkpointed when the multi-start uses a work queue"):
+        ocp_module.prepare_multi_start(combinatorial_parameters, save_folder=save_folder).checkpointed_records()
+
+
+def test_work_queue_task_keys(tmp_path):
+    from bioptim.optimization.work_queue import WorkQueue
+
+    # The repr of these arrays is truncated to the same string, but they are different tasks
+    first, second = np.zeros(2000), np.zeros(2000)
+    second[1000] = 1
+    assert repr(first) == repr(second)
+
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.add([first, second, first.copy()])
+    assert queue.progress() == {"pending": 2, "running": 0, "done": 0}
+
+    task = queue.claim()
+    queue.complete(task, {"parameters": task})
+    queue.release()
+    assert queue.progress() == {"pending": 1, "running": 0, "done": 1}
+    npt.assert_equal(queue.claim(), second)
+    queue.release()
+
+
+def test_work_queue_lease(tmp_path):
+    import socket
+    import sqlite3
+    import subprocess
+    import sys
+    from bioptim.optimization.work_queue import WorkQueue
+
+    queue_path = str(tmp_path / "queue.db")
+    with pytest.raises(ValueError, match="lease must be positive"):
+        WorkQueue(queue_path, lease=0)
+
+    # The lease of a running task is renewed, so the task is not claimed again while its process is alive
+    queue = WorkQueue(queue_path, lease=0.3)
+    queue.add([0, 1])
+    assert queue.claim() == 0
+    other_queue = WorkQueue(queue_path, lease=0.3)
+    time.sleep(1)
+    assert other_queue.claim() == 1
+    assert other_queue.claim() is None
+
+    # Once the heartbeat stops (as if the process of another host died), the task is claimed again after the lease
+    queue._stop_heartbeat.set()
+    queue._heartbeat.join()
+    with sqlite3.connect(queue_path) as connection:
+        connection.execute("UPDATE tasks SET owner = 'another_host:1' WHERE position = 0")
+    time.sleep(0.5)
+    assert other_queue.claim() == 0
+    other_queue.release()
+    assert other_queue.progress() == {"pending": 2, "running": 0, "done": 0}
+
+    # Without a lease, the task of a dead process of the same host is given back when the queue is opened again
+    queue = WorkQueue(queue_path)
+    assert queue.claim() == 0
+    dead_process = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead_process.wait()
+    with sqlite3.connect(queue_path) as connection:
+        connection.execute(
+            "UPDATE tasks SET owner = ? WHERE state = 'running'", (f"{socket.gethostname()}:{dead_process.pid}",)
+        )
+    assert queue.progress() == {"pending": 1, "running": 1, "done": 0}
+    assert WorkQueue(queue_path).progress() == {"pending": 2, "running": 0, "done": 0}
+
+
+class _PoolTaskSolution:
+    status = 0
+    iterations = 1
+
+
+class _PoolTaskOcp:
+    """
+    A stand-in for an ocp whose solve succeeds, hangs, crashes its process or fails at its first attempt, so the
+    isolation of the tasks in the process pool can be tested without solving anything
+    """
+
+    def __init__(self, behavior: str, folder: str):
+        self.behavior = behavior
+        self.folder = folder
+
+    def solve(self, solver):
+        if self.behavior == "hang":
+            time.sleep(60)
+        elif self.behavior == "crash":
+            os._exit(1)
+        elif self.behavior == "flaky" and not os.path.exists(f"{self.folder}/flaky"):
+            open(f"{self.folder}/flaky", "w").close()
+            raise RuntimeError("The first attempt fails")
+        return _PoolTaskSolution()
+
+
+def _pool_task_output(sol, behavior: str, folder: str) -> str:
+    return behavior
+
+
+def _pool_task_should_solve(behavior: str, folder: str) -> bool:
+    return True
+
+
+def test_multistart_process_pool(tmp_path):
+    from bioptim import MultiStart
+
+    multi_start = MultiStart(
+        combinatorial_parameters={"behavior": ["success", "hang", "crash", "flaky"], "folder": [str(tmp_path)]},
+        prepare_ocp_callback=_PoolTaskOcp,
+        post_optimization_callback=(_pool_task_output, {}),
+        should_solve_callback=(_pool_task_should_solve, {}),
+        n_pools=2,
+        timeout=1,
+        n_retries=1,
+    )
+    tic = time.perf_counter()
+    records = {record["parameters"][0]: record for record in multi_start.solve()}
+
+    # The hanging workers are terminated instead of being waited for
+    assert time.perf_counter() - tic < 30
+    assert len(records) == 4
+
+    assert records["success"]["status"] == "success"
+    assert records["success"]["output"] == "success"
+    assert records["success"]["attempts"] == 1
+
+    # Each attempt of the hanging task is stopped at the timeout
+    assert records["hang"]["status"] == "timeout"
+    assert records["hang"]["attempts"] == 2
+    assert records["hang"]["wall_time"] >= 1
+
+    # The crash of a worker only fails the task that crashed it
+    assert records["crash"]["status"] == "failed"
+    assert records["crash"]["attempts"] == 2
+    assert "BrokenProcessPool" in records["crash"]["error"]
+
+    # A failing task is run again
+    assert records["flaky"]["status"] == "success"
+    assert records["flaky"]["output"] == "flaky"
+    assert records["flaky"]["attempts"] == 2
+
+
 @pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
 def test_example_variable_scaling(phase_dynamics):
     from bioptim.examples.getting_started import example_variable_scaling as ocp_module
@@ -1852,6 +2017,113 @@ def test_example_variable_scaling(phase_dynamics):
     test_memory[f"variable_scaling-{phase_dynamics}"] = [building_duration, solving_duration, mem_used]
 
 
+@pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
+def test_penalty_cost_mapped_evaluation(phase_dynamics, monkeypatch):
+    from bioptim import Solver
+    from bioptim.limits.penalty_option import PenaltyOption
+    from bioptim.optimization.solution import solution as solution_module
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/models/pendulum.bioMod",
+        final_time=1,
+        n_shooting=10,
+        phase_dynamics=phase_dynamics,
+    )
+    solver = Solver.IPOPT()
+    solver.set_maximum_iterations(5)
+    solver.set_print_level(0)
+    sol = ocp.solve(solver)
+    penalty = ocp.nlp[0].J[0]
+
+    mapped_nodes = []
+    mapped_function = PenaltyOption.mapped_function
+
+    def spy_mapped_function(self, function, n_nodes, n_threads):
+        mapped_nodes.append(n_nodes)
+        return mapped_function(self, function, n_nodes, n_threads)
+
+    monkeypatch.setattr(PenaltyOption, "mapped_function", spy_mapped_function)
+    val, val_weighted = sol._get_penalty_cost(ocp.nlp[0], penalty)
+
+    # Each node has its own Function, but all the nodes are evaluated in a single mapped call
+    assert len(penalty.node_idx) > 1
+    assert penalty.node_groups == [list(range(len(penalty.node_idx)))]
+    assert mapped_nodes == [len(penalty.node_idx)] * 2
+
+    # The groups and the mapped functions are computed once for the penalty, not for each solution
+    node_groups = penalty.node_groups
+    mapped_functions = dict(penalty._mapped_functions)
+    other_sol = ocp.solve(solver)
+    other_sol._get_penalty_cost(ocp.nlp[0], penalty)
+    assert penalty.node_groups is node_groups
+    assert penalty._mapped_functions == mapped_functions
+
+    # The mapped evaluation gives the same cost as the node by node one
+    monkeypatch.setattr(solution_module, "_stack_penalty_inputs", lambda function, inputs: None)
+    reference, reference_weighted = sol._get_penalty_cost(ocp.nlp[0], penalty)
+    npt.assert_almost_equal(val, reference)
+    npt.assert_almost_equal(val_weighted, reference_weighted)
+    npt.assert_almost_equal(val_weighted, float(sol.cost))
+
+
+def test_parametric_multi_thread_objectives():
+    from bioptim import ObjectiveFcn, ObjectiveList, Solver
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    n_shooting = 5
+
+    def prepare_ocp():
+        ocp = ocp_module.prepare_ocp(
+            biorbd_model_path=bioptim_folder + "/models/pendulum.bioMod",
+            final_time=1,
+            n_shooting=n_shooting,
+            n_threads=2,
+        )
+        objectives = ObjectiveList()
+        objectives.add(ObjectiveFcn.Lagrange.MINIMIZE_CONTROL, key="tau", target=np.zeros((2, n_shooting)))
+        objectives.add(
+            ObjectiveFcn.Mayer.MINIMIZE_STATE, key="qdot", node=Node.ALL, target=np.zeros((2, n_shooting + 1))
+        )
+        ocp.update_objectives(objectives)
+        return ocp
+
+    def update_objectives(ocp, weight, offset):
+        ocp.update_objectives_weight(weight, list_index=1)
+        ocp.update_objectives_target(np.full((2, n_shooting), offset), list_index=1)
+        ocp.update_objectives_weight(2 * weight, list_index=2)
+        ocp.update_objectives_target(np.full((2, n_shooting + 1), -offset), list_index=2)
+
+    parametric_ocp = prepare_ocp()
+    assert parametric_ocp.nlp[0].J[1].multi_thread and parametric_ocp.nlp[0].J[2].multi_thread
+    parametric_solver = Solver.IPOPT()
+    parametric_solver.set_parametric(True)
+    parametric_solver.set_print_level(0)
+
+    solvers = []
+    for weight, offset in ((1, 0), (10, 0.5), (0.1, -1)):
+        update_objectives(parametric_ocp, weight, offset)
+        sol = parametric_ocp.solve(parametric_solver)
+        solvers.append(parametric_ocp.ocp_solver.ocp_solver)
+
+        # Each penalty must receive its own weights and targets, the same as a program built with these values
+        reference_ocp = prepare_ocp()
+        update_objectives(reference_ocp, weight, offset)
+        solver = Solver.IPOPT()
+        solver.set_print_level(0)
+        reference = reference_ocp.solve(solver)
+
+        npt.assert_almost_equal(sol.cost, reference.cost, decimal=6)
+        for key, value in reference.decision_states(to_merge=SolutionMerge.NODES).items():
+            npt.assert_almost_equal(sol.decision_states(to_merge=SolutionMerge.NODES)[key], value, decimal=5)
+
+    # The weights and the targets are parameters of the nlp, so the solver is reused
+    assert len({id(solver) for solver in solvers[1:]}) == 1
+
+
 def test_memory_and_execution_time():
 
     if platform.system() == "Windows":
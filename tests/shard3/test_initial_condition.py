@@ -183,6 +183,67 @@ def test_initial_guess_update(phase_dynamics):
     npt.assert_almost_equal(ocp.init_vector, np.array([[0.2] + [1, 1, 1, 1] * 11 + [3, 3] * 10]).T)
 
 
+@pytest.mark.parametrize("interpolation", [*InterpolationType])
+def test_initial_guess_evaluate_all(interpolation):
+    n_elements = 6
+    n_shoot = 10
+
+    np.random.seed(42)
+    extra_params = {}
+    if interpolation == InterpolationType.CONSTANT:
+        init_val = np.random.random((n_elements, 1))
+    elif interpolation == InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT:
+        init_val = np.random.random((n_elements, 3))
+    elif interpolation == InterpolationType.LINEAR:
+        init_val = np.random.random((n_elements, 2))
+    elif interpolation in (InterpolationType.EACH_FRAME, InterpolationType.ALL_POINTS):
+        init_val = np.random.random((n_elements, n_shoot + 1))
+    elif interpolation == InterpolationType.SPLINE:
+        init_val = np.random.random((n_elements, 4))
+        extra_params["t"] = np.hstack((0.0, 1.0, 2.2, 6.0))
+    elif interpolation == InterpolationType.CUSTOM:
+        values = np.random.random((n_elements, 2))
+        init_val = lambda i: values[:, 0] + (values[:, 1] - values[:, 0]) * i / n_shoot
+    else:
+        raise NotImplementedError("This interpolation is not implemented yet")
+
+    init = InitialGuess(None, init_val, interpolation=interpolation, **extra_params)
+    init.check_and_adjust_dimensions(n_elements, n_shoot)
+    all_values = init.init.evaluate_all(n_shoot)
+    assert all_values.shape == (n_elements, n_shoot + 1)
+    for i in range(n_shoot + 1):
+        npt.assert_almost_equal(all_values[:, i], init.init.evaluate_at(i))
+
+    # The evaluation is read-only and cached, except for the custom functions which may depend on a mutable state
+    with pytest.raises(ValueError):
+        all_values[0, 0] = 0
+    if interpolation == InterpolationType.CUSTOM:
+        assert init.init.evaluate_all(n_shoot) is not all_values
+        values[:] = 0
+        npt.assert_almost_equal(init.init.evaluate_all(n_shoot), np.zeros((n_elements, n_shoot + 1)))
+        return
+    assert init.init.evaluate_all(n_shoot) is all_values
+
+    # Checking the dimensions again does not invalidate the cache, but changing the values in any way does
+    init.check_and_adjust_dimensions(n_elements, n_shoot)
+    assert init.init.evaluate_all(n_shoot) is all_values
+    init[:] = 0
+    assert init.init.evaluate_all(n_shoot) is not all_values
+    npt.assert_almost_equal(init.init.evaluate_all(n_shoot), np.zeros((n_elements, n_shoot + 1)))
+
+    # Through a view
+    init.init[:, 0][1] = 2
+    npt.assert_almost_equal(init.init.evaluate_all(n_shoot)[1, 0], 2)
+
+    # With in-place operations
+    init.init += 1
+    npt.assert_almost_equal(init.init.evaluate_all(n_shoot)[0, :], np.ones(n_shoot + 1))
+    init.init.fill(3)
+    npt.assert_almost_equal(init.init.evaluate_all(n_shoot), np.ones((n_elements, n_shoot + 1)) * 3)
+    np.copyto(init.init, 4)
+    npt.assert_almost_equal(init.init.evaluate_all(n_shoot), np.ones((n_elements, n_shoot + 1)) * 4)
+
+
 def test_initial_guess_custom():
     n_elements = 6
     n_shoot = 10
@@ -529,6 +529,61 @@ def test_integrate_all_cases(shooting, merge, integrator, ode_solver, phase_dyna
         assert states[key].shape == (shapes[i], n_shooting * n_steps + 1)
 
 
+@pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
+@pytest.mark.parametrize("integrator", [SolutionIntegrator.OCP, SolutionIntegrator.SCIPY_RK45])
+def test_integrate_multiple_shooting_in_parallel(integrator, phase_dynamics):
+    # Load pendulum
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/models/pendulum.bioMod",
+        final_time=1,
+        n_shooting=10,
+        phase_dynamics=phase_dynamics,
+        n_threads=3,
+    )
+
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    solver.set_maximum_iterations(5)
+    sol = ocp.solve(solver)
+
+    # The intervals are integrated all at once (mapped integrator or pool of threads)
+    sol_integrated = sol.integrate(
+        shooting_type=Shooting.MULTIPLE, integrator=integrator, to_merge=SolutionMerge.NODES, duplicated_times=True
+    )
+
+    # Reference integrated one interval at a time
+    nlp = ocp.nlp[0]
+    states = sol.decision_states(to_merge=SolutionMerge.KEYS)
+    controls = sol.stepwise_controls(to_merge=SolutionMerge.KEYS)
+    t_spans = sol.t_span()
+    if integrator == SolutionIntegrator.OCP:
+        expected = [
+            np.array(
+                nlp.dynamics[node](
+                    np.array([t_spans[node][0], t_spans[node][1] - t_spans[node][0]]),
+                    states[node],
+                    controls[node],
+                    [],
+                    [],
+                    [],
+                )[1]
+            )
+            for node in range(nlp.ns)
+        ]
+        npt.assert_almost_equal(sol_integrated["q"][:, :-1], np.concatenate(expected, axis=1)[:2, :])
+    else:
+        ocp.n_threads = 1
+        expected = sol.integrate(
+            shooting_type=Shooting.MULTIPLE, integrator=integrator, to_merge=SolutionMerge.NODES, duplicated_times=True
+        )
+        for key in sol_integrated.keys():
+            npt.assert_almost_equal(sol_integrated[key], expected[key])
+
+
 @pytest.mark.parametrize("phase_dynamics", [PhaseDynamics.SHARED_DURING_THE_PHASE, PhaseDynamics.ONE_PER_NODE])
 @pytest.mark.parametrize("ode_solver", [OdeSolver.RK4, OdeSolver.COLLOCATION])
 @pytest.mark.parametrize("shooting", [Shooting.SINGLE, Shooting.MULTIPLE, Shooting.SINGLE_DISCONTINUOUS_PHASE])
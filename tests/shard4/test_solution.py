@@ -1,4 +1,15 @@
-from bioptim import Shooting, OdeSolver, SolutionIntegrator, Solver, ControlType, PhaseDynamics, SolutionMerge
+from bioptim import (
+    Shooting,
+    OdeSolver,
+    SolutionIntegrator,
+    Solver,
+    ControlType,
+    PhaseDynamics,
+    SolutionMerge,
+    Solution,
+    SolutionFile,
+)
+import numpy as np
 import numpy.testing as npt
 import pytest
 
@@ -391,3 +402,86 @@ def test_generate_integrate(ode_solver, merge_phase, shooting_type, integrator,
     plt.rcParams["axes.titley"] = 1.0  # y is in axes-relative coordinates.
     plt.rcParams["axes.titlepad"] = -20
     # plt.show()
+
+
+def test_solution_data_views():
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/models/pendulum.bioMod",
+        final_time=2,
+        n_shooting=10,
+        ode_solver=OdeSolver.COLLOCATION(),
+    )
+    solver = Solver.IPOPT()
+    solver.set_maximum_iterations(0)
+    solver.set_print_level(0)
+    sol = ocp.solve(solver=solver)
+
+    states_nodes = sol.decision_states()
+    states_keys = sol.decision_states(to_merge=SolutionMerge.KEYS)
+    states_all = sol.decision_states(to_merge=[SolutionMerge.KEYS, SolutionMerge.NODES])
+
+    # The merged values are views of a single buffer, whatever the merging
+    assert np.shares_memory(states_all, states_keys[3])
+    assert np.shares_memory(states_all, states_nodes["qdot"][5])
+    npt.assert_equal(states_all[:2, :], sol.decision_states(to_merge=SolutionMerge.NODES)["q"])
+    npt.assert_equal(states_keys[3], np.concatenate((states_nodes["q"][3], states_nodes["qdot"][3])))
+
+    # The scaled values are computed from the unscaled ones
+    scaled = sol._decision_states.to_dict(to_merge=[SolutionMerge.KEYS, SolutionMerge.NODES], scaled=True)
+    scaling = np.concatenate([ocp.nlp[0].x_scaling[key].scaling for key in ("q", "qdot")])
+    npt.assert_almost_equal(scaled * scaling, states_all)
+
+
+def test_solution_save_load(tmp_path):
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+
+    ocp = ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/models/pendulum.bioMod",
+        final_time=1,
+        n_shooting=10,
+    )
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+    sol = ocp.solve(solver=solver)
+
+    path = str(tmp_path / "pendulum.bsol")
+    sol.save(path)
+
+    # Without the ocp, the data are accessed lazily from the file
+    sol_file = Solution.load(path)
+    assert isinstance(sol_file, SolutionFile)
+    assert sol_file.status == sol.status
+    assert sol_file.iterations == sol.iterations
+    npt.assert_equal(sol_file.cost, np.array(sol.cost))
+    npt.assert_equal(sol_file.vector, np.array(sol.vector))
+    assert sol_file.keys("decision_states") == ["q", "qdot"]
+
+    states = sol.decision_states(to_merge=SolutionMerge.NODES)
+    npt.assert_equal(sol_file.variable("decision_states", "qdot"), states["qdot"])
+    npt.assert_equal(sol_file.variable("decision_states", "q", node=3), sol.decision_states()["q"][3])
+    controls = sol.stepwise_controls(to_merge=SolutionMerge.NODES)
+    npt.assert_equal(sol_file.variable("stepwise_controls", "tau"), controls["tau"])
+    stepwise_states = sol.stepwise_states(to_merge=SolutionMerge.NODES)
+    npt.assert_equal(sol_file.variable("stepwise_states", "q"), stepwise_states["q"])
+    npt.assert_equal(sol_file.stepwise_time(node=2), sol.stepwise_time()[2][:, 0])
+
+    # With the ocp, the full solution is recovered
+    loaded = Solution.load(path, ocp=ocp)
+    assert isinstance(loaded, Solution)
+    npt.assert_equal(np.array(loaded.cost), np.array(sol.cost))
+    npt.assert_equal(loaded.decision_states(to_merge=SolutionMerge.NODES)["q"], states["q"])
+    npt.assert_equal(loaded.stepwise_states(to_merge=SolutionMerge.NODES)["q"], stepwise_states["q"])
+
+    with pytest.raises(ValueError, match="make sure the ocp is the one that produced the solution"):
+        Solution.load(
+            path,
+            ocp=ocp_module.prepare_ocp(
+                biorbd_model_path=bioptim_folder + "/models/pendulum.bioMod", final_time=1, n_shooting=5
+            ),
+        )
@@ -25,6 +25,7 @@ def test_ipopt_solver_options():
     assert solver.acceptable_constr_viol_tol == 1e-2
     assert solver.acceptable_compl_inf_tol == 1e-2
     assert solver.max_iter == 1000
+    assert solver.max_wall_time is None
     assert solver.hessian_approximation == "exact"
     assert solver.limited_memory_max_history == 50
     assert solver.linear_solver == "mumps"
@@ -62,6 +63,8 @@ def test_ipopt_solver_options():
     assert solver.acceptable_compl_inf_tol == 9
     solver.set_maximum_iterations(10)
     assert solver.max_iter == 10
+    solver.set_maximum_wall_time(0.05)
+    assert solver.max_wall_time == 0.05
     solver.set_hessian_approximation("hello bioptim")
     assert solver.hessian_approximation == "hello bioptim"
     solver.set_nlp_scaling_method("how are you?")
@@ -1075,3 +1075,94 @@ def test_update_noised_initial_guess_collocation(interpolation, phase_dynamics):
 
     with pytest.raises(RuntimeError, match="x_bounds should be built from a BoundsList"):
         ocp.update_bounds(x, u)
+
+
+@pytest.mark.parametrize("interpolation", [*InterpolationType])
+def test_vectorized_bounds_and_init_vectors(interpolation):
+    from time import perf_counter
+
+    bioptim_folder = TestUtils.bioptim_folder()
+    bio_model = BiorbdModel(bioptim_folder + "/examples/getting_started/models/pendulum.bioMod")
+    nq = bio_model.nb_q
+    ntau = bio_model.nb_tau
+    ns = 500
+    phase_time = 1.0
+
+    dynamics = DynamicsList()
+    dynamics.add(DynamicsFcn.TORQUE_DRIVEN, phase_dynamics=PhaseDynamics.SHARED_DURING_THE_PHASE)
+
+    np.random.seed(42)
+    extra_params = {}
+    if interpolation == InterpolationType.CONSTANT:
+        x_min, x_max, u_min, u_max = [-np.ones(nq)], [np.ones(nq)], [-np.ones(ntau)], [np.ones(ntau)]
+    elif interpolation == InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT:
+        x_min, x_max = [-np.random.random((nq, 3))], [np.random.random((nq, 3))]
+        u_min, u_max = [-np.random.random((ntau, 3))], [np.random.random((ntau, 3))]
+    elif interpolation == InterpolationType.LINEAR:
+        x_min, x_max = [-np.random.random((nq, 2))], [np.random.random((nq, 2))]
+        u_min, u_max = [-np.random.random((ntau, 2))], [np.random.random((ntau, 2))]
+    elif interpolation in (InterpolationType.EACH_FRAME, InterpolationType.ALL_POINTS):
+        x_min, x_max = [-np.random.random((nq, ns + 1))], [np.random.random((nq, ns + 1))]
+        u_min, u_max = [-np.random.random((ntau, ns))], [np.random.random((ntau, ns))]
+    elif interpolation == InterpolationType.SPLINE:
+        extra_params["t"] = np.hstack((0, np.sort(np.random.random((3,)) * phase_time), phase_time))
+        x_min, x_max = [-np.random.random((nq, 5))], [np.random.random((nq, 5))]
+        u_min, u_max = [-np.random.random((ntau, 5))], [np.random.random((ntau, 5))]
+    elif interpolation == InterpolationType.CUSTOM:
+        x_min, x_max = [lambda i: -np.ones(nq) * i], [lambda i: np.ones(nq) * i]
+        u_min, u_max = [lambda i: -np.ones(ntau) * i], [lambda i: np.ones(ntau) * i]
+    else:
+        raise NotImplementedError("This interpolation is not implemented yet")
+
+    x_bounds = BoundsList()
+    x_bounds.add("q", min_bound=x_min[0], max_bound=x_max[0], interpolation=interpolation, **extra_params)
+    x_bounds.add("qdot", min_bound=x_min[0], max_bound=x_max[0], interpolation=interpolation, **extra_params)
+    u_bounds = BoundsList()
+    u_bounds.add("tau", min_bound=u_min[0], max_bound=u_max[0], interpolation=interpolation, **extra_params)
+    x_init = InitialGuessList()
+    x_init.add("q", x_max[0], interpolation=interpolation, **extra_params)
+    x_init.add("qdot", x_min[0], interpolation=interpolation, **extra_params)
+    u_init = InitialGuessList()
+    u_init.add("tau", u_max[0], interpolation=interpolation, **extra_params)
+
+    ocp = OptimalControlProgram(
+        bio_model,
+        dynamics,
+        n_shooting=ns,
+        phase_time=phase_time,
+        x_bounds=x_bounds,
+        u_bounds=u_bounds,
+        x_init=x_init,
+        u_init=u_init,
+    )
+
+    tic = perf_counter()
+    v_min, v_max = ocp.bounds_vectors
+    v_init = ocp.init_vector
+    vectorized_time = perf_counter() - tic
+
+    # Reference built node by node as it used to be
+    nlp = ocp.nlp[0]
+    tic = perf_counter()
+    ref_min, ref_max, ref_init = [ocp.dt_parameter_bounds.min], [ocp.dt_parameter_bounds.max], [v_init[:1]]
+    for k in range(ns + 1):
+        for key in ("q", "qdot"):
+            ref_min.append(nlp.x_bounds[key].min.evaluate_at(k)[:, np.newaxis])
+            ref_max.append(nlp.x_bounds[key].max.evaluate_at(k)[:, np.newaxis])
+            ref_init.append(nlp.x_init[key].init.evaluate_at(k)[:, np.newaxis])
+    for k in range(ns):
+        ref_min.append(nlp.u_bounds["tau"].min.evaluate_at(k)[:, np.newaxis])
+        ref_max.append(nlp.u_bounds["tau"].max.evaluate_at(k)[:, np.newaxis])
+        ref_init.append(nlp.u_init["tau"].init.evaluate_at(k)[:, np.newaxis])
+    ref_min, ref_max, ref_init = np.concatenate(ref_min), np.concatenate(ref_max), np.concatenate(ref_init)
+    reference_time = perf_counter() - tic
+    print(f"{interpolation}: vectorized = {vectorized_time * 1000:.2f} ms, per node = {reference_time * 1000:.2f} ms")
+
+    npt.assert_almost_equal(v_min, ref_min)
+    npt.assert_almost_equal(v_max, ref_max)
+    npt.assert_almost_equal(v_init, ref_init)
+
+    # The layout is cached as long as the dimensions of the program do not change
+    layout = ocp.vector_layout
+    ocp.update_bounds(x_bounds, u_bounds)
+    assert ocp.vector_layout is layout
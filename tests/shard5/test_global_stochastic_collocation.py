@@ -569,6 +569,165 @@ def test_obstacle_avoidance_direct_collocation(use_sx: bool):
     npt.assert_almost_equal(
         integrated_stated_covariance, np.array([[0.00404452, -0.00100082], [-0.00100082, 0.00382313]]), decimal=6
     )
+
+    # Integrating all the samples in lock-step draws the same samples, only the step size control differs
+    integrated_states_lock_step = sol.noisy_integrate(
+        integrator=SolutionIntegrator.SCIPY_RK45,
+        to_merge=SolutionMerge.NODES,
+        seed=42,
+        lock_step=True,
+        parallelization="thread",
+    )
+    npt.assert_almost_equal(integrated_states_lock_step["q"][:, 0, :], integrated_states["q"][:, 0, :])
+    npt.assert_almost_equal(np.cov(integrated_states_lock_step["q"][:, -1, :]), integrated_stated_covariance, decimal=4)
+
+    # Only the statistics of the samples are kept if required
+    statistics = sol.noisy_integrate(
+        integrator=SolutionIntegrator.SCIPY_RK45,
+        to_merge=SolutionMerge.NODES,
+        seed=42,
+        lock_step=True,
+        statistics_only=True,
+    )
+    npt.assert_almost_equal(statistics["mean"]["q"], np.mean(integrated_states_lock_step["q"], axis=2))
+    npt.assert_almost_equal(
+        statistics["covariance"]["q"][-1][:, :, -1], np.cov(integrated_states_lock_step["q"][:, -1, :])
+    )
+    statistics = sol.noisy_integrate(
+        integrator=SolutionIntegrator.SCIPY_RK45,
+        to_merge=SolutionMerge.NODES,
+        seed=42,
+        statistics_only=True,
+    )
+    npt.assert_almost_equal(statistics["mean"]["q"], np.mean(integrated_states["q"], axis=2))
+    npt.assert_almost_equal(statistics["covariance"]["q"][-1][:, :, -1], integrated_stated_covariance)
     npt.assert_almost_equal(
         cov[:, -1].reshape(4, 4)[:2, :2], np.array([[0.00266764, -0.0005587], [-0.0005587, 0.00134316]]), decimal=6
     )
+
+
+@pytest.mark.parametrize("n_shooting", [4, 16, 64])
+def test_arm_reaching_torque_driven_collocations_auto_initialization(n_shooting: int, monkeypatch):
+    from time import perf_counter
+
+    from bioptim.examples.stochastic_optimal_control import arm_reaching_torque_driven_collocations as ocp_module
+    from bioptim.optimization import stochastic_optimal_control_program
+
+    final_time = 0.4
+    polynomial_degree = 3
+    hand_final_position = np.array([9.359873986980460e-12, 0.527332023564034])
+
+    dt = 0.05
+    motor_noise_magnitude = DM(np.array([0.05**2 / dt, 0.05**2 / dt]))
+    sensory_noise_magnitude = vertcat(
+        DM(np.array([3e-4**2 / dt, 3e-4**2 / dt])), DM(np.array([0.0024**2 / dt, 0.0024**2 / dt]))
+    )
+
+    # A straight reaching movement as guess of the states, at all the collocation points
+    n_points = (polynomial_degree + 2) * n_shooting + 1
+    q_opt = np.linspace([0.349065850398866, 2.245867726451909], [0.959931088596881, 1.159394851847144], n_points).T
+    qdot_opt = np.repeat(np.diff(q_opt[:, [0, -1]], axis=1) / final_time, n_points, axis=1)
+    tau_opt = np.zeros((2, n_shooting + 1))
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    problem = {
+        "biorbd_model_path": bioptim_folder + "/models/LeuvenArmModel.bioMod",
+        "final_time": final_time,
+        "n_shooting": n_shooting,
+        "polynomial_degree": polynomial_degree,
+        "hand_final_position": hand_final_position,
+        "motor_noise_magnitude": motor_noise_magnitude,
+        "sensory_noise_magnitude": sensory_noise_magnitude,
+    }
+
+    # Keep the jacobians of the collocation evaluated by the automatic initialization
+    jacobians = {}
+    map_nodes = stochastic_optimal_control_program._map_nodes
+
+    def spy_map_nodes(function, n_nodes, n_threads):
+        jacobians[function.name()] = function
+        return map_nodes(function, n_nodes, n_threads)
+
+    monkeypatch.setattr(stochastic_optimal_control_program, "_map_nodes", spy_map_nodes)
+
+    # Time the automatic initialization alone, the rest of the program is built as usual
+    socp_class = stochastic_optimal_control_program.StochasticOptimalControlProgram
+    auto_initialize = socp_class._auto_initialize
+    auto_initialize_time = []
+
+    def timed_auto_initialize(self, *args):
+        tic = perf_counter()
+        auto_initialize(self, *args)
+        auto_initialize_time.append(perf_counter() - tic)
+
+    monkeypatch.setattr(socp_class, "_auto_initialize", timed_auto_initialize)
+    socp = ocp_module.prepare_socp(**problem, q_opt=q_opt, qdot_opt=qdot_opt, tau_opt=tau_opt)
+
+    nlp = socp.nlp[0]
+    ref = nlp.u_init["ref"].init
+    m = nlp.a_init["m"].init
+    cov = nlp.u_init["cov"].init
+    npt.assert_equal(ref.shape, (4, n_shooting + 1))
+    npt.assert_equal(m.shape, (nlp.model.matrix_shape_m[0] * nlp.model.matrix_shape_m[1], n_points))
+    npt.assert_equal(cov.shape, (16, n_shooting + 1))
+    assert np.all(np.isfinite(ref)) and np.all(np.isfinite(m)) and np.all(np.isfinite(cov))
+    npt.assert_almost_equal(m[:, -1], m[:, -2])
+
+    # The propagated covariance remains a covariance matrix
+    for i in range(n_shooting + 1):
+        cov_matrix = StochasticBioModel.reshape_to_matrix(cov[:, i], nlp.model.matrix_shape_cov)
+        npt.assert_almost_equal(cov_matrix, cov_matrix.T)
+        assert np.min(np.linalg.eigvalsh(cov_matrix)) > -1e-10
+
+    # Same values as evaluating the jacobians node by node
+    n_steps = polynomial_degree + 2
+    time_vector = np.linspace(0, final_time, n_shooting + 1)
+    x_guess = np.concatenate((q_opt, qdot_opt))
+    # The covariance is still null when the jacobians are evaluated
+    u_guess = np.concatenate(
+        [np.zeros(nlp.u_init[key].init.shape) if key == "cov" else nlp.u_init[key].init for key in nlp.controls.keys()]
+    )
+    sigma_w = np.diag(np.array(vertcat(motor_noise_magnitude, sensory_noise_magnitude)).reshape(-1))
+    shape_cov = nlp.model.matrix_shape_cov
+
+    tic = perf_counter()
+    m_reference = np.zeros(m.shape)
+    cov_reference = np.zeros(cov.shape)
+    cov_reference[:, 0] = cov[:, 0]
+    for i in range(n_shooting):
+        index = [i * n_steps + j for j in range(n_steps)]
+        inputs = [
+            vertcat(time_vector[i], time_vector[i + 1] - time_vector[i]),
+            x_guess[:, index[0]],
+            x_guess[:, index[1:]],
+            u_guess[:, i],
+            np.zeros((0, 1)),
+            [],
+            [],
+        ]
+        df_dz = np.array(jacobians["Fdz_fun"](*inputs))
+        dg_dz = np.array(jacobians["Gdz_fun"](*inputs))
+        m_node = df_dz @ np.linalg.inv(dg_dz)
+        for i_col, idx in enumerate(index[1:]):
+            m_column = m_node[:, i_col * nlp.model.matrix_shape_m[0] : (i_col + 1) * nlp.model.matrix_shape_m[0]]
+            m_reference[:, idx] = StochasticBioModel.reshape_to_vector(m_column)
+
+        inputs[5] = m_reference[:, index[1:]]
+        dg_dx = np.array(jacobians["Gdx_fun"](*inputs))
+        dg_dw = np.array(jacobians["Gdw_fun"](*inputs))
+        cov_matrix = StochasticBioModel.reshape_to_matrix(cov_reference[:, i], shape_cov)
+        m_matrix = np.hstack(
+            [StochasticBioModel.reshape_to_matrix(m_reference[:, idx], shape_cov) for idx in index[1:]]
+        )
+        cov_node = m_matrix @ (dg_dx @ cov_matrix @ dg_dx.T + dg_dw @ sigma_w @ dg_dw.T) @ m_matrix.T
+        cov_reference[:, i + 1] = StochasticBioModel.reshape_to_vector(cov_node)
+    m_reference[:, -1] = m_reference[:, -2]
+    reference_time = perf_counter() - tic
+    assert len(auto_initialize_time) == 1
+    print(
+        f"n_shooting = {n_shooting}: _auto_initialize = {auto_initialize_time[0] * 1000:.2f} ms, "
+        f"per node = {reference_time * 1000:.2f} ms"
+    )
+
+    npt.assert_almost_equal(m, m_reference)
+    npt.assert_almost_equal(cov, cov_reference)
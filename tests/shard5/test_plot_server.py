@@ -1,8 +1,18 @@
-from bioptim.gui.online_callback_server import _serialize_xydata, _deserialize_xydata
+import socket
+import threading
+import time
+
+from bioptim.gui import online_callback_server
+from bioptim.gui.online_callback_server import _serialize_xydata, _deserialize_xydata, _snapshot_iterate
 from bioptim.gui.plot import PlotOcp
-from bioptim.gui.online_callback_server import _ResponseHeader
+from bioptim.gui.online_callback_server import (
+    _ResponseHeader,
+    _ServerMessages,
+    _HEADER_GENERIC_LEN,
+    OnlineCallbackServer,
+)
 from bioptim.optimization.optimization_vector import OptimizationVectorHelper
-from casadi import DM
+from casadi import DM, nlpsol_out
 import numpy as np
 
 from ..utils import TestUtils
@@ -43,6 +53,99 @@ def test_serialize_deserialize():
                 assert np.allclose(y_phase, deserialized_y_phase)
 
 
+def test_snapshot_iterate():
+    arg = [DM([1, 2, 3]), DM(4), DM([5, 6]), DM([7, 8, 9]), DM([10, 11]), DM.zeros(0, 1)]
+    iterate = _snapshot_iterate(arg)
+
+    assert list(iterate.keys()) == nlpsol_out()
+    for value, snapshot in zip(arg, iterate.values()):
+        assert snapshot.shape == (value.shape[0], 1)
+        np.testing.assert_equal(snapshot, np.array(value))
+
+    # All the outputs share a single contiguous buffer, which is independent of the solver data
+    assert iterate["x"].base is iterate["lam_g"].base
+    arg[0][0] = 42
+    assert iterate["x"][0, 0] == 1
+
+
+class _SlowPlotter:
+    def __init__(self, parsing_time: float):
+        self.parsing_time = parsing_time
+
+    def parse_data(self, **iterate):
+        time.sleep(self.parsing_time)
+        return [[np.array([0.0, 1.0])]], [[iterate["x"][:, 0]]]
+
+
+def _recv_exactly(client_socket: socket.socket, n_bytes: int) -> bytearray:
+    data = bytearray()
+    while len(data) < n_bytes:
+        data += client_socket.recv(n_bytes - len(data))
+    return data
+
+
+def _recv_new_data(server_socket: socket.socket) -> np.ndarray:
+    header = _recv_exactly(server_socket, _HEADER_GENERIC_LEN).decode().strip("\0").split("\n")
+    assert int(header[0]) == _ServerMessages.NEW_DATA
+    data = [_recv_exactly(server_socket, int(n_bytes)) for n_bytes in header[1][1:-1].split(",")]
+    return _deserialize_xydata(data)[1][0][0]
+
+
+def test_online_callback_server_sends_from_background(monkeypatch):
+    parsing_time = 0.2
+    monkeypatch.setattr(online_callback_server, "_MAX_PARSING_SHARE", 0.25)
+
+    # The connexion and the plotter are replaced, so only the exchange of the iterates is tested
+    client_socket, server_socket = socket.socketpair()
+    callback = OnlineCallbackServer.__new__(OnlineCallbackServer)
+    callback._socket = client_socket
+    callback._plotter = _SlowPlotter(parsing_time)
+    callback._should_wait_ok_to_client_on_new_data = False
+    callback._iterate_condition = threading.Condition()
+    callback._server_is_ready = False
+    callback._latest_iterate = None
+    callback._n_published = 0
+    callback._n_sent = 0
+    callback._is_sending = True
+    callback._is_enforced = False
+    threading.Thread(target=callback._send_iterates, daemon=True).start()
+
+    def iterate(value: float) -> list:
+        return [DM([value, value]), DM(0), DM(0), DM(0), DM(0), DM(0)]
+
+    # The iterates are discarded as long as the server is not ready
+    callback.eval(iterate(1))
+    assert callback._n_published == 0
+
+    # The solver does not wait for the parsing
+    server_socket.sendall(_ResponseHeader.READY_FOR_NEXT_DATA.encode())
+    while not callback._server_is_ready:
+        time.sleep(0.001)
+    tic = time.perf_counter()
+    callback.eval(iterate(2))
+    assert time.perf_counter() - tic < parsing_time / 2
+    np.testing.assert_equal(_recv_new_data(server_socket), [2, 2])
+
+    # The next iterate is only taken once the parsing is back under its share of the time
+    tic = time.perf_counter()
+    server_socket.sendall(_ResponseHeader.READY_FOR_NEXT_DATA.encode())
+    while not callback._server_is_ready:
+        time.sleep(0.001)
+    assert time.perf_counter() - tic > parsing_time / 2
+
+    # Unless the solver enforces its last iterate
+    callback.eval(iterate(3))
+    np.testing.assert_equal(_recv_new_data(server_socket), [3, 3])
+    server_socket.sendall(_ResponseHeader.READY_FOR_NEXT_DATA.encode())
+    tic = time.perf_counter()
+    callback.eval(iterate(4), enforce=True)
+    assert time.perf_counter() - tic < parsing_time * 2
+    np.testing.assert_equal(_recv_new_data(server_socket), [4, 4])
+
+    client_socket.close()
+    server_socket.close()
+
+
 def test_response_header():
     # Make sure all the response have the same length
     response_len = _ResponseHeader.response_len()
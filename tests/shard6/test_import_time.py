@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# The modules of the GUI stack that "import bioptim" must not load
+GUI_MODULES = ("matplotlib", "tkinter", "pyqtgraph", "bioviz", "pyorerun")
+
+# A generous budget (in seconds), to catch a heavy dependency being imported eagerly again
+IMPORT_TIME_BUDGET = 10
+
+
+def _run_in_fresh_interpreter(code: str) -> dict:
+    # The modules already loaded by the test session must not hide an eager import
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_import_does_not_load_gui():
+    result = _run_in_fresh_interpreter(
+        "import json, sys, time\n"
+        "tic = time.perf_counter()\n"
+        "import bioptim\n"
+        "elapsed = time.perf_counter() - tic\n"
+        f"loaded = sorted({{name.split('.')[0] for name in sys.modules}} & set({GUI_MODULES!r}))\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+
+    assert result["loaded"] == []
+    assert result["elapsed"] < IMPORT_TIME_BUDGET
+
+
+def test_lazy_gui_attributes():
+    pytest.importorskip("matplotlib")
+
+    result = _run_in_fresh_interpreter(
+        "import json, sys\n"
+        "import bioptim\n"
+        "from bioptim.gui.online_callback_server import PlottingServer\n"
+        "print(json.dumps({\n"
+        "    'same': bioptim.PlottingServer is PlottingServer,\n"
+        "    'in_dir': 'PlottingServer' in dir(bioptim),\n"
+        "    'matplotlib': 'matplotlib' in sys.modules,\n"
+        "}))\n"
+    )
+    assert result == {"same": True, "in_dir": True, "matplotlib": True}
+
+    with pytest.raises(AttributeError, match="module 'bioptim' has no attribute 'NotAnAttribute'"):
+        import bioptim
+
+        bioptim.NotAnAttribute
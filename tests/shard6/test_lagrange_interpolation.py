@@ -0,0 +1,130 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+from casadi import MX, Function, collocation_points, cos, sin, vertcat
+
+from bioptim import ControlType, DefectType
+from bioptim.dynamics.integrator import COLLOCATION, _collocation_matrices
+from bioptim.dynamics.lagrange_interpolation import LagrangeInterpolation
+
+
+@pytest.mark.parametrize("method", ["radau", "legendre"])
+@pytest.mark.parametrize("degree", [1, 3, 5, 8])
+def test_lagrange_matrices(method, degree):
+    time_grid = [0] + collocation_points(degree, method)
+    lagrange_interpolation = LagrangeInterpolation(time_grid=time_grid)
+    evaluation_times = [0.0, 0.3, 1.0] + time_grid[1:]
+
+    interpolation = lagrange_interpolation.interpolation_matrix(evaluation_times)
+    differentiation = lagrange_interpolation.differentiation_matrix(evaluation_times)
+    assert interpolation.shape == (len(evaluation_times), degree + 1)
+    assert differentiation.shape == (len(evaluation_times), degree + 1)
+
+    # The matrices give the same values as the symbolic interpolation
+    values = np.random.default_rng(42).random(degree + 1)
+    for i, t in enumerate(evaluation_times):
+        npt.assert_almost_equal(interpolation[i, :] @ values, lagrange_interpolation.interpolate(list(values), t))
+        npt.assert_almost_equal(
+            differentiation[i, :] @ values, lagrange_interpolation.interpolate_first_derivative(list(values), t)
+        )
+
+    # A polynomial of the same degree is interpolated (and differentiated) exactly
+    polynomial = np.array(time_grid) ** degree
+    npt.assert_almost_equal(interpolation @ polynomial, np.array(evaluation_times) ** degree)
+    npt.assert_almost_equal(differentiation @ polynomial, degree * np.array(evaluation_times) ** (degree - 1))
+
+
+def test_collocation_matrices_are_computed_once():
+    _collocation_matrices.cache_clear()
+    differentiation, end_interpolation = _collocation_matrices(4, "legendre")
+    assert differentiation.shape == (4, 5)
+    assert end_interpolation.shape == (5,)
+    npt.assert_almost_equal(end_interpolation.sum(), 1)
+
+    assert _collocation_matrices(4, "legendre")[0] is differentiation
+    assert _collocation_matrices.cache_info().hits == 1
+
+
+def _pendulum_collocation(method: str, control_type: ControlType, defects_type: DefectType) -> COLLOCATION:
+    """
+    A degree 3 collocation integrator of a forced pendulum (q_ddot = -p * sin(q) + u * cos(t)), built without any ocp
+    """
+
+    degree = 3
+    t_span = MX.sym("t_span", 2, 1)
+    x0 = MX.sym("x0", 2, 1)
+    a0 = MX.sym("a0", 0, 1)
+    u = MX.sym("u", 1, 2 if control_type == ControlType.LINEAR_CONTINUOUS else 1)
+    p = MX.sym("p", 1, 1)
+    d = MX.sym("d", 0, 1)
+
+    t_point = MX.sym("t", 2, 1)
+    x_point = MX.sym("x", 2, 1)
+    u_point = MX.sym("u_point", 1, 1)
+    a_point = MX.sym("a", 0, 1)
+    xdot = MX.sym("xdot", 2, 1)
+    dxdt = vertcat(x_point[1], -p * sin(x_point[0]) + u_point * cos(t_point[0]))
+    ode = {
+        "t": t_span,
+        "x": [x0, x0] + [MX.sym(f"x{i}", 2, 1) for i in range(1, degree + 1)],
+        "u": u,
+        "a": [a0, a0] + [MX.sym(f"a{i}", 0, 1) for i in range(1, degree + 1)],
+        "d": d,
+        "param": p,
+        "ode": Function(
+            "dynamics", [t_point, x_point, u_point, p, a_point, d], [dxdt], ["t", "x", "u", "p", "a", "d"], ["xdot"]
+        ),
+        "implicit_ode": Function("implicit_dynamics", [t_point, x_point, u_point, p, a_point, d, xdot], [xdot - dxdt]),
+    }
+    ode_opt = {
+        "model": None,
+        "cx": MX,
+        "control_type": control_type,
+        "defects_type": defects_type,
+        "ode_index": 0,
+        "duplicate_starting_point": False,
+        "method": method,
+        "irk_polynomial_interpolation_degree": degree,
+    }
+    return COLLOCATION(ode, ode_opt)
+
+
+@pytest.mark.parametrize("defects_type", [DefectType.EXPLICIT, DefectType.IMPLICIT])
+@pytest.mark.parametrize("control_type", [ControlType.CONSTANT, ControlType.LINEAR_CONTINUOUS])
+@pytest.mark.parametrize("method", ["radau", "legendre"])
+def test_collocation_defects(method, control_type, defects_type):
+    integrator = _pendulum_collocation(method, control_type, defects_type)
+    dt = 0.2
+    out = integrator.function(
+        t_span=np.array([0.5, dt]),
+        x0=np.array([[0.1, 0.3, 0.2, 0.5], [1.0, 0.8, 0.7, 0.4]]),
+        u=np.array([[2.0, -1.0]])[:, : integrator.u_sym.shape[1]],
+        p=9.81,
+        a=np.zeros((0, 4)),
+        d=np.zeros((0, 1)),
+    )
+
+    # The reference values are the ones of the point by point evaluation of the dynamics (before they were mapped)
+    if method == "radau":
+        xf = [0.5, 0.4]
+        if control_type == ControlType.CONSTANT:
+            defects = [0.5004540768504858, -0.6084903705570651, -0.3547635981803672, -0.0845865546595699]
+            defects += [2.27319726474218, -1.212106703430169]
+        else:
+            defects = [0.5004540768504858, -0.5282704487626848, -0.3547635981803672, 0.22832550092107767]
+            defects += [2.27319726474218, -0.7532013910594759]
+    else:
+        xf = [0.9666666666666668, 0.0666666666666671]
+        if control_type == ControlType.CONSTANT:
+            defects = [0.8908066615170341, -1.0176176719844918, -0.7945027756320974, 0.16866053232023345]
+            defects += [3.0363977794943233, -1.6546363344838635]
+        else:
+            defects = [0.8908066615170341, -0.9590204151635666, -0.7945027756320974, 0.416261216793137]
+            defects += [3.0363977794943233, -1.2398238918227569]
+
+    # The implicit defects are the explicit ones divided by the time step
+    if defects_type == DefectType.IMPLICIT:
+        defects = list(np.array(defects) / dt)
+
+    npt.assert_almost_equal(np.array(out["xf"])[:, 0], xf)
+    npt.assert_almost_equal(np.array(out["defects"])[:, 0], defects)
@@ -0,0 +1,56 @@
+import os
+
+import numpy.testing as npt
+import pytest
+
+from bioptim import NlpSnapshot, problem_fingerprint, SolutionMerge, Solver
+
+from ..utils import TestUtils
+
+
+def test_nlp_snapshot(tmp_path):
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    problem_definition = {
+        "biorbd_model_path": bioptim_folder + "/models/pendulum.bioMod",
+        "final_time": 1,
+        "n_shooting": 30,
+    }
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+
+    # Reference solution from the ocp itself
+    ocp = ocp_module.prepare_ocp(**problem_definition)
+    sol = ocp.solve(solver)
+
+    # The first call builds the ocp and saves its snapshot
+    snapshot = NlpSnapshot.cached(str(tmp_path), ocp_module.prepare_ocp, **problem_definition)
+    fingerprint = problem_fingerprint(ocp_module.prepare_ocp, **problem_definition)
+    assert snapshot.fingerprint == fingerprint
+    assert os.listdir(tmp_path) == [f"{fingerprint}.nlp"]
+
+    # The following calls load it
+    snapshot = NlpSnapshot.cached(str(tmp_path), ocp_module.prepare_ocp, **problem_definition)
+    assert len(snapshot.parameter_names) > 0
+
+    out = snapshot.solve(solver)
+    assert out["status"] == 0
+    npt.assert_almost_equal(float(out["f"]), float(sol.cost), decimal=5)
+
+    states = sol.decision_states(to_merge=SolutionMerge.NODES)
+    controls = sol.decision_controls(to_merge=SolutionMerge.NODES)
+    unpacked = snapshot.unpack(out["x"])
+    npt.assert_almost_equal(unpacked["states"][0]["q"], states["q"], decimal=5)
+    npt.assert_almost_equal(unpacked["controls"][0]["tau"], controls["tau"], decimal=5)
+
+    # The weights are parameters of the nlp, so they can be changed without rebuilding anything
+    out_doubled = snapshot.solve(solver, p=snapshot.p * 2)
+    npt.assert_almost_equal(float(out_doubled["f"]), 2 * float(out["f"]), decimal=4)
+
+    # Another problem definition has another fingerprint
+    assert problem_fingerprint(ocp_module.prepare_ocp, **{**problem_definition, "n_shooting": 31}) != fingerprint
+    with pytest.raises(ValueError, match="fingerprint mismatch"):
+        NlpSnapshot.load(os.path.join(tmp_path, f"{fingerprint}.nlp"), fingerprint="another one")
+    with pytest.raises(ValueError, match="is not a parameter of the nlp"):
+        snapshot.parameter_slice("not a parameter")
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from threading import Event
+
+import numpy.testing as npt
+import pytest
+
+from bioptim import Solver, SolveFuture
+
+from ..utils import TestUtils
+
+
+def _prepare_pendulum(n_shooting: int = 30):
+    from bioptim.examples.getting_started import pendulum as ocp_module
+
+    bioptim_folder = TestUtils.module_folder(ocp_module)
+    return ocp_module.prepare_ocp(
+        biorbd_model_path=bioptim_folder + "/models/pendulum.bioMod", final_time=1, n_shooting=n_shooting
+    )
+
+
+def test_solve_async():
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+
+    sol = _prepare_pendulum().solve(solver)
+
+    ocp = _prepare_pendulum()
+    future = ocp.solve_async(solver)
+    assert isinstance(future, SolveFuture)
+    sol_async = future.result()
+    assert future.done()
+    assert not future.cancelled()
+    npt.assert_almost_equal(float(sol_async.cost), float(sol.cost))
+
+    # The future can be awaited, and the solves of the same ocp are queued
+    async def solve_twice():
+        return await asyncio.gather(ocp.solve_async(solver), ocp.solve_async(solver=solver))
+
+    for sol_async in asyncio.run(solve_twice()):
+        npt.assert_almost_equal(float(sol_async.cost), float(sol.cost))
+
+    # The cancellation is only requested for asynchronous solves
+    assert "iteration_callback" not in ocp.ocp_solver.options_common
+    sol_sync = ocp.solve(solver)
+    assert sol_sync.status == 0
+
+    # The solves of a same ocp do not overlap, even if the executor could run them at the same time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [ocp.solve_async(solver, executor=executor) for _ in range(2)]
+        for future in futures:
+            npt.assert_almost_equal(float(future.result().cost), float(sol.cost))
+
+
+def test_solve_async_cancel():
+    solver = Solver.IPOPT()
+    solver.set_print_level(0)
+
+    ocp = _prepare_pendulum()
+    finished = Event()
+
+    # The first solve occupies the worker thread, so the second one cannot start before it is cancelled
+    first = ocp.solve_async(solver)
+    second = ocp.solve_async(solver)
+    first.add_done_callback(lambda _future: finished.set())
+    assert second.cancel()
+    assert first.cancel()
+    assert first.cancelled()
+
+    try:
+        sol = first.result()
+    except CancelledError:
+        # The worker did not pick the first solve yet
+        pass
+    else:
+        # The solver stopped at its first iteration
+        assert sol.status == 1
+    with pytest.raises(CancelledError):
+        second.result()
+    assert finished.wait(timeout=1)
+    assert not first.cancel()
+
+    # The ocp can still be solved once the cancelled solves are over
+    sol = ocp.solve_async(solver).result()
+    assert sol.status == 0
+
+    solver.show_online_optim = True
+    with pytest.raises(ValueError, match="The online optimization graphs cannot be shown while solving asynchronously"):
+        ocp.solve_async(solver).result()